@@ -2,7 +2,8 @@
 
 const fs = require('fs');
 const path = require('path');
-const { execSync } = require('child_process');
+const crypto = require('crypto');
+const { exec, execSync } = require('child_process');
 
 /**
  * API Development Tools Installer
@@ -21,6 +22,15 @@ const { execSync } = require('child_process');
  *   --with-storybook   Auto-initialize Storybook for component development
  *   --with-playwright  Auto-initialize Playwright for E2E testing
  *   --with-sandpack    Auto-install Sandpack for live UI previews
+ *   --dry-run          Show what would be installed or updated, change nothing
+ *   --jobs=N           Run up to N MCP checks / tool installs at once (default 4)
+ *   --recheck-mcp      Probe MCP servers even if a previous run found them configured
+ *
+ * Re-running the installer only copies files whose packaged version changed
+ * (tracked in .claude/install-manifest.json) and ends with a timing summary.
+ *
+ * Hook latency report (records written with API_DEV_HOOK_PROFILE=1):
+ *   npx @hustle-together/api-dev-tools report [--json]
  */
 
 // Parse command-line arguments
@@ -29,6 +39,13 @@ const scope = args.find(arg => arg.startsWith('--scope='))?.split('=')[1] || 'pr
 const withStorybook = args.includes('--with-storybook');
 const withPlaywright = args.includes('--with-playwright');
 const withSandpack = args.includes('--with-sandpack');
+const dryRun = args.includes('--dry-run');
+const recheckMcp = args.includes('--recheck-mcp');
+const jobs = Math.max(1, parseInt(args.find(arg => arg.startsWith('--jobs='))?.split('=')[1], 10) || 4);
+
+// Install manifest: hashes of the files the installer manages (relative to the project)
+const INSTALL_MANIFEST = 'install-manifest.json';
+const INSTALL_MANIFEST_VERSION = 1;
 
 // Colors for terminal output
 const colors = {
@@ -82,8 +99,14 @@ function verifyInstallation(claudeDir, hooksDir) {
   // Add hook checks if hooks directory exists (v3.0 has 18 hooks for 100% phase enforcement with user checkpoints)
   if (fs.existsSync(hooksDir)) {
     checks.push(
-      // Core utility hooks (5)
+      // Core utility hooks + shared hook modules (11)
       { path: path.join(hooksDir, 'session-startup.py'), name: 'session-startup.py' },
+      { path: path.join(hooksDir, 'hook-client.py'), name: 'hook-client.py' },
+      { path: path.join(hooksDir, 'hook-daemon.py'), name: 'hook-daemon.py' },
+      { path: path.join(hooksDir, 'hook-dispatcher.py'), name: 'hook-dispatcher.py' },
+      { path: path.join(hooksDir, 'hook_runtime.py'), name: 'hook_runtime.py' },
+      { path: path.join(hooksDir, 'hook_socket.py'), name: 'hook_socket.py' },
+      { path: path.join(hooksDir, 'state_store.py'), name: 'state_store.py' },
       { path: path.join(hooksDir, 'enforce-external-research.py'), name: 'enforce-external-research.py' },
       { path: path.join(hooksDir, 'track-tool-use.py'), name: 'track-tool-use.py' },
       { path: path.join(hooksDir, 'periodic-reground.py'), name: 'periodic-reground.py' },
@@ -116,8 +139,256 @@ function verifyInstallation(claudeDir, hooksDir) {
   return { success: failures.length === 0, failures };
 }
 
-function main() {
-  log('\n🚀 Installing API Development Tools for Claude Code...\n', 'bright');
+
+/**
+ * Install context: the install manifest plus per-run counters and timings.
+ *
+ * The manifest records, for every file the installer manages, the hash of
+ * the packaged source and the stat of the installed copy. A file is copied
+ * again only when the packaged hash changed or the installed copy no longer
+ * matches its recorded stat; source hashes are reused while the packaged
+ * file's size and mtime are unchanged, so an up-to-date project is checked
+ * with stats alone.
+ */
+function createInstallContext(targetDir, claudeDir) {
+  const manifestPath = path.join(claudeDir, INSTALL_MANIFEST);
+  let manifest = null;
+  try {
+    manifest = JSON.parse(fs.readFileSync(manifestPath, 'utf8'));
+  } catch (e) {
+    // First run (or unreadable manifest): every file is compared by hash once
+  }
+  if (!manifest || manifest.version !== INSTALL_MANIFEST_VERSION) {
+    manifest = { version: INSTALL_MANIFEST_VERSION, files: {}, mcp: {} };
+  }
+
+  return {
+    targetDir,
+    manifestPath,
+    manifest,
+    counts: { copied: 0, unchanged: 0, created: 0, preserved: 0, written: 0 },
+    changes: [],
+    timings: [],
+    lapStart: process.hrtime.bigint(),
+  };
+}
+
+/**
+ * Record the time since the previous lap under a section name
+ */
+function lap(ctx, name) {
+  const now = process.hrtime.bigint();
+  ctx.timings.push({ name, ms: Number(now - ctx.lapStart) / 1e6 });
+  ctx.lapStart = now;
+}
+
+function hashFile(file) {
+  return crypto.createHash('sha256').update(fs.readFileSync(file)).digest('hex');
+}
+
+function statKey(st) {
+  return { size: st.size, mtimeMs: st.mtimeMs };
+}
+
+function sameStat(a, b) {
+  return Boolean(a && b) && a.size === b.size && a.mtimeMs === b.mtimeMs;
+}
+
+function ensureDir(dir) {
+  if (!dryRun && !fs.existsSync(dir)) {
+    fs.mkdirSync(dir, { recursive: true });
+  }
+}
+
+/**
+ * Copy a packaged file the installer keeps up to date (commands, hooks, scripts).
+ * Returns 'copied' or 'unchanged'.
+ */
+function copyManaged(ctx, source, dest, mode) {
+  const key = path.relative(ctx.targetDir, dest);
+  const entry = ctx.manifest.files[key];
+  const sourceStat = statKey(fs.statSync(source));
+  const hash = entry && sameStat(entry.source, sourceStat) ? entry.hash : hashFile(source);
+
+  let destStat = null;
+  try {
+    destStat = statKey(fs.statSync(dest));
+  } catch (e) {
+    // Not installed yet
+  }
+
+  let upToDate = false;
+  if (destStat && entry && entry.hash === hash) {
+    upToDate = sameStat(entry.dest, destStat);
+  }
+  if (destStat && !upToDate && !entry && destStat.size === sourceStat.size) {
+    // Installed before the manifest existed: adopt it if the content matches
+    upToDate = hashFile(dest) === hash;
+  }
+
+  if (upToDate) {
+    ctx.manifest.files[key] = { hash, source: sourceStat, dest: destStat };
+    ctx.counts.unchanged++;
+    return 'unchanged';
+  }
+
+  ctx.counts.copied++;
+  ctx.changes.push(key);
+  if (!dryRun) {
+    fs.copyFileSync(source, dest);
+    if (mode) {
+      fs.chmodSync(dest, mode);
+    }
+    ctx.manifest.files[key] = { hash, source: sourceStat, dest: statKey(fs.statSync(dest)) };
+  }
+  return 'copied';
+}
+
+/**
+ * Copy a template the user owns once installed (state, registry, pages, ...).
+ * Returns 'created' or 'preserved'.
+ */
+function copyIfMissing(ctx, source, dest) {
+  if (fs.existsSync(dest)) {
+    ctx.counts.preserved++;
+    return 'preserved';
+  }
+  ctx.counts.created++;
+  ctx.changes.push(path.relative(ctx.targetDir, dest));
+  if (!dryRun) {
+    fs.copyFileSync(source, dest);
+  }
+  return 'created';
+}
+
+/**
+ * Write generated content (settings.json, CLAUDE.md) only if it differs.
+ * Returns 'written' or 'unchanged'.
+ */
+function writeIfChanged(ctx, dest, content) {
+  try {
+    if (fs.readFileSync(dest, 'utf8') === content) {
+      ctx.counts.unchanged++;
+      return 'unchanged';
+    }
+  } catch (e) {
+    // Does not exist yet
+  }
+  ctx.counts.written++;
+  ctx.changes.push(path.relative(ctx.targetDir, dest));
+  if (!dryRun) {
+    fs.writeFileSync(dest, content);
+  }
+  return 'written';
+}
+
+/**
+ * Copy a group of managed files, logging only the ones that changed
+ */
+function copyManagedFiles(ctx, files, sourceDir, destDir, mode) {
+  let unchanged = 0;
+  files.forEach(file => {
+    try {
+      if (copyManaged(ctx, path.join(sourceDir, file), path.join(destDir, file), mode) === 'copied') {
+        log(`   ${dryRun ? '→ would update' : '✅'} ${file}`, 'green');
+      } else {
+        unchanged++;
+      }
+    } catch (error) {
+      log(`   ❌ Failed to copy ${file}: ${error.message}`, 'red');
+    }
+  });
+  if (unchanged > 0) {
+    log(`   ✓ ${unchanged} unchanged`, 'blue');
+  }
+}
+
+function saveInstallManifest(ctx) {
+  if (dryRun) {
+    return;
+  }
+  const tmp = `${ctx.manifestPath}.${process.pid}.tmp`;
+  fs.writeFileSync(tmp, JSON.stringify(ctx.manifest, null, 2));
+  fs.renameSync(tmp, ctx.manifestPath);
+}
+
+/**
+ * Run a shell command without blocking the event loop
+ * Resolves to { ok, stdout, error }
+ */
+function run(command, options = {}) {
+  return new Promise(resolve => {
+    exec(command, { encoding: 'utf8', maxBuffer: 16 * 1024 * 1024, ...options }, (error, stdout, stderr) => {
+      resolve({ ok: !error, stdout: `${stdout || ''}${stderr || ''}`, error });
+    });
+  });
+}
+
+/**
+ * Run async tasks with at most `limit` in flight.
+ *
+ * Tasks sharing a `resource` (e.g. the project's package.json) run one after
+ * another in the order given; tasks on different resources run concurrently.
+ * Resolves to the results in task order.
+ */
+async function runLimited(tasks, limit) {
+  const results = new Array(tasks.length);
+  const busy = new Set();
+  const pending = tasks.map((task, index) => ({ ...task, index }));
+  let running = 0;
+
+  return new Promise(resolve => {
+    const next = () => {
+      if (pending.length === 0 && running === 0) {
+        resolve(results);
+        return;
+      }
+      while (running < limit) {
+        const i = pending.findIndex(task => !task.resource || !busy.has(task.resource));
+        if (i === -1) {
+          break;
+        }
+        const [task] = pending.splice(i, 1);
+        running++;
+        if (task.resource) {
+          busy.add(task.resource);
+        }
+        Promise.resolve()
+          .then(task.run)
+          .catch(error => ({ ok: false, error }))
+          .then(result => {
+            results[task.index] = result;
+            running--;
+            if (task.resource) {
+              busy.delete(task.resource);
+            }
+            next();
+          });
+      }
+    };
+    next();
+  });
+}
+
+/**
+ * Print what the run changed and where the time went
+ */
+function printInstallSummary(ctx, totalMs) {
+  const c = ctx.counts;
+  log(`\n⏱️  ${dryRun ? 'Dry run' : 'Install'} summary (${totalMs.toFixed(0)} ms):`, 'bright');
+  log(`   ${dryRun ? 'Would update' : 'Updated'}: ${c.copied} files, ${dryRun ? 'would create' : 'created'}: ${c.created + c.written}, unchanged: ${c.unchanged}, preserved: ${c.preserved}`, 'blue');
+  if (dryRun && ctx.changes.length > 0) {
+    ctx.changes.forEach(change => log(`   • ${change}`, 'yellow'));
+  }
+  const width = Math.max(...ctx.timings.map(t => t.name.length));
+  ctx.timings
+    .filter(t => t.ms >= 0.5)
+    .forEach(t => log(`   ${t.name.padEnd(width)}  ${t.ms.toFixed(1).padStart(8)} ms`, 'blue'));
+}
+
+async function main() {
+  const startedAt = process.hrtime.bigint();
+  log(`\n🚀 ${dryRun ? 'Checking (dry run)' : 'Installing'} API Development Tools for Claude Code...\n`, 'bright');
 
   // Check Python availability first
   const python = checkPython();
@@ -149,12 +420,14 @@ function main() {
     process.exit(1);
   }
 
+  const ctx = createInstallContext(targetDir, claudeDir);
+
   // ========================================
   // 1. Install Commands
   // ========================================
   if (!fs.existsSync(commandsDir)) {
     log(`📁 Creating directory: ${commandsDir}`, 'blue');
-    fs.mkdirSync(commandsDir, { recursive: true });
+    ensureDir(commandsDir);
   }
 
   const commandFiles = fs.readdirSync(sourceCommandsDir).filter(file =>
@@ -165,18 +438,9 @@ function main() {
     log('⚠️  Warning: No command files found to install', 'yellow');
   } else {
     log('📦 Installing commands:', 'blue');
-    commandFiles.forEach(file => {
-      const source = path.join(sourceCommandsDir, file);
-      const dest = path.join(commandsDir, file);
-
-      try {
-        fs.copyFileSync(source, dest);
-        log(`   ✅ ${file}`, 'green');
-      } catch (error) {
-        log(`   ❌ Failed to copy ${file}: ${error.message}`, 'red');
-      }
-    });
+    copyManagedFiles(ctx, commandFiles, sourceCommandsDir, commandsDir);
   }
+  lap(ctx, 'commands');
 
   // ========================================
   // 2. Install Hooks (Programmatic Enforcement)
@@ -184,7 +448,7 @@ function main() {
   if (fs.existsSync(sourceHooksDir)) {
     if (!fs.existsSync(hooksDir)) {
       log(`\n📁 Creating directory: ${hooksDir}`, 'blue');
-      fs.mkdirSync(hooksDir, { recursive: true });
+      ensureDir(hooksDir);
     }
 
     const hookFiles = fs.readdirSync(sourceHooksDir).filter(file =>
@@ -193,19 +457,8 @@ function main() {
 
     if (hookFiles.length > 0) {
       log('\n🔒 Installing enforcement hooks:', 'cyan');
-      hookFiles.forEach(file => {
-        const source = path.join(sourceHooksDir, file);
-        const dest = path.join(hooksDir, file);
-
-        try {
-          fs.copyFileSync(source, dest);
-          // Make executable
-          fs.chmodSync(dest, '755');
-          log(`   ✅ ${file}`, 'green');
-        } catch (error) {
-          log(`   ❌ Failed to copy ${file}: ${error.message}`, 'red');
-        }
-      });
+      // Made executable when copied
+      copyManagedFiles(ctx, hookFiles, sourceHooksDir, hooksDir, '755');
 
       log('\n   Hook purposes:', 'blue');
       log('   • enforce-research.py  - Blocks code writing without research', 'blue');
@@ -213,6 +466,7 @@ function main() {
       log('   • api-workflow-check.py - Prevents stopping until complete', 'blue');
     }
   }
+  lap(ctx, 'hooks');
 
   // ========================================
   // 3. Install/Merge Settings (Hook Registration)
@@ -229,18 +483,29 @@ function main() {
       if (fs.existsSync(settingsDest)) {
         // Merge with existing settings
         const existingSettings = JSON.parse(fs.readFileSync(settingsDest, 'utf8'));
-        const mergedSettings = mergeSettings(existingSettings, newSettings);
-        fs.writeFileSync(settingsDest, JSON.stringify(mergedSettings, null, 2));
-        log('   ✅ Merged with existing settings.json', 'green');
+        const packagedHooks = fs.existsSync(sourceHooksDir)
+          ? fs.readdirSync(sourceHooksDir).filter(file => file.endsWith('.py'))
+          : [];
+        const mergedSettings = mergeSettings(
+          pruneSupersededHooks(existingSettings, newSettings, packagedHooks),
+          newSettings
+        );
+        if (writeIfChanged(ctx, settingsDest, JSON.stringify(mergedSettings, null, 2)) === 'written') {
+          log('   ✅ Merged with existing settings.json', 'green');
+        } else {
+          log('   ✓ settings.json already up to date', 'blue');
+        }
       } else {
         // Create new settings file
-        fs.writeFileSync(settingsDest, JSON.stringify(newSettings, null, 2));
+        ensureDir(claudeDir);
+        writeIfChanged(ctx, settingsDest, JSON.stringify(newSettings, null, 2));
         log('   ✅ Created settings.json with hook configuration', 'green');
       }
     } catch (error) {
       log(`   ❌ Failed to configure settings: ${error.message}`, 'red');
     }
   }
+  lap(ctx, 'settings');
 
   // ========================================
   // 4. Install State File Template
@@ -251,15 +516,14 @@ function main() {
   if (fs.existsSync(stateSource)) {
     log('\n📊 Setting up state tracking:', 'cyan');
 
-    if (!fs.existsSync(stateDest)) {
-      try {
-        fs.copyFileSync(stateSource, stateDest);
+    try {
+      if (copyIfMissing(ctx, stateSource, stateDest) === 'created') {
         log('   ✅ Created api-dev-state.json template', 'green');
-      } catch (error) {
-        log(`   ❌ Failed to create state file: ${error.message}`, 'red');
+      } else {
+        log('   ℹ️  State file already exists (preserved)', 'blue');
       }
-    } else {
-      log('   ℹ️  State file already exists (preserved)', 'blue');
+    } catch (error) {
+      log(`   ❌ Failed to create state file: ${error.message}`, 'red');
     }
   }
 
@@ -272,15 +536,14 @@ function main() {
   if (fs.existsSync(registrySource)) {
     log('\n📋 Setting up central registry:', 'cyan');
 
-    if (!fs.existsSync(registryDest)) {
-      try {
-        fs.copyFileSync(registrySource, registryDest);
+    try {
+      if (copyIfMissing(ctx, registrySource, registryDest) === 'created') {
         log('   ✅ Created registry.json (tracks APIs, components, pages)', 'green');
-      } catch (error) {
-        log(`   ❌ Failed to create registry: ${error.message}`, 'red');
+      } else {
+        log('   ℹ️  Registry already exists (preserved)', 'blue');
       }
-    } else {
-      log('   ℹ️  Registry already exists (preserved)', 'blue');
+    } catch (error) {
+      log(`   ❌ Failed to create registry: ${error.message}`, 'red');
     }
   }
 
@@ -293,15 +556,14 @@ function main() {
   if (fs.existsSync(brandGuideSource)) {
     log('\n🎨 Setting up brand guide:', 'cyan');
 
-    if (!fs.existsSync(brandGuideDest)) {
-      try {
-        fs.copyFileSync(brandGuideSource, brandGuideDest);
+    try {
+      if (copyIfMissing(ctx, brandGuideSource, brandGuideDest) === 'created') {
         log('   ✅ Created BRAND_GUIDE.md (customize for your project branding)', 'green');
-      } catch (error) {
-        log(`   ❌ Failed to create brand guide: ${error.message}`, 'red');
+      } else {
+        log('   ℹ️  Brand guide already exists (preserved)', 'blue');
       }
-    } else {
-      log('   ℹ️  Brand guide already exists (preserved)', 'blue');
+    } catch (error) {
+      log(`   ❌ Failed to create brand guide: ${error.message}`, 'red');
     }
   }
 
@@ -314,15 +576,14 @@ function main() {
   if (fs.existsSync(perfBudgetsSource)) {
     log('\n📊 Setting up performance budgets:', 'cyan');
 
-    if (!fs.existsSync(perfBudgetsDest)) {
-      try {
-        fs.copyFileSync(perfBudgetsSource, perfBudgetsDest);
+    try {
+      if (copyIfMissing(ctx, perfBudgetsSource, perfBudgetsDest) === 'created') {
         log('   ✅ Created performance-budgets.json (thresholds for TDD gates)', 'green');
-      } catch (error) {
-        log(`   ❌ Failed to create performance budgets: ${error.message}`, 'red');
+      } else {
+        log('   ℹ️  Performance budgets already exist (preserved)', 'blue');
       }
-    } else {
-      log('   ℹ️  Performance budgets already exist (preserved)', 'blue');
+    } catch (error) {
+      log(`   ❌ Failed to create performance budgets: ${error.message}`, 'red');
     }
   }
 
@@ -337,22 +598,23 @@ function main() {
 
   if (!fs.existsSync(researchDir)) {
     try {
-      fs.mkdirSync(researchDir, { recursive: true });
+      ensureDir(researchDir);
       log('   ✅ Created .claude/research/ directory', 'green');
     } catch (error) {
       log(`   ❌ Failed to create research directory: ${error.message}`, 'red');
     }
   }
 
-  if (fs.existsSync(researchIndexSource) && !fs.existsSync(researchIndexDest)) {
+  if (fs.existsSync(researchIndexSource)) {
     try {
-      fs.copyFileSync(researchIndexSource, researchIndexDest);
-      log('   ✅ Created research/index.json for freshness tracking', 'green');
+      if (copyIfMissing(ctx, researchIndexSource, researchIndexDest) === 'created') {
+        log('   ✅ Created research/index.json for freshness tracking', 'green');
+      } else {
+        log('   ℹ️  Research index already exists (preserved)', 'blue');
+      }
     } catch (error) {
       log(`   ❌ Failed to create research index: ${error.message}`, 'red');
     }
-  } else if (fs.existsSync(researchIndexDest)) {
-    log('   ℹ️  Research index already exists (preserved)', 'blue');
   }
 
   // ========================================
@@ -386,19 +648,16 @@ function main() {
       const apiTestStructureSource = path.join(testUiSourceDir, 'test-structure', 'route.ts');
       const apiTestStructureDest = path.join(apiTestStructureDir, 'route.ts');
 
-      if (!fs.existsSync(apiTestStructureDir)) {
-        fs.mkdirSync(apiTestStructureDir, { recursive: true });
-      }
+      ensureDir(apiTestStructureDir);
 
-      if (!fs.existsSync(apiTestStructureDest)) {
-        try {
-          fs.copyFileSync(apiTestStructureSource, apiTestStructureDest);
+      try {
+        if (copyIfMissing(ctx, apiTestStructureSource, apiTestStructureDest) === 'created') {
           log('   ✅ Created /api/test-structure route (parses Vitest files)', 'green');
-        } catch (error) {
-          log(`   ❌ Failed to create test-structure API: ${error.message}`, 'red');
+        } else {
+          log('   ℹ️  /api/test-structure already exists (preserved)', 'blue');
         }
-      } else {
-        log('   ℹ️  /api/test-structure already exists (preserved)', 'blue');
+      } catch (error) {
+        log(`   ❌ Failed to create test-structure API: ${error.message}`, 'red');
       }
 
       // Install test UI page
@@ -406,19 +665,16 @@ function main() {
       const apiTestPageSource = path.join(testUiSourceDir, 'page.tsx');
       const apiTestPageDest = path.join(apiTestPageDir, 'page.tsx');
 
-      if (!fs.existsSync(apiTestPageDir)) {
-        fs.mkdirSync(apiTestPageDir, { recursive: true });
-      }
+      ensureDir(apiTestPageDir);
 
-      if (!fs.existsSync(apiTestPageDest)) {
-        try {
-          fs.copyFileSync(apiTestPageSource, apiTestPageDest);
+      try {
+        if (copyIfMissing(ctx, apiTestPageSource, apiTestPageDest) === 'created') {
           log('   ✅ Created /api-test page (displays test structure)', 'green');
-        } catch (error) {
-          log(`   ❌ Failed to create test UI page: ${error.message}`, 'red');
+        } else {
+          log('   ℹ️  /api-test page already exists (preserved)', 'blue');
         }
-      } else {
-        log('   ℹ️  /api-test page already exists (preserved)', 'blue');
+      } catch (error) {
+        log(`   ❌ Failed to create test UI page: ${error.message}`, 'red');
       }
 
       log('   💡 Test UI available at http://localhost:3000/api-test', 'yellow');
@@ -479,9 +735,7 @@ function main() {
       }
 
       // Create destination directory
-      if (!fs.existsSync(template.dest)) {
-        fs.mkdirSync(template.dest, { recursive: true });
-      }
+      ensureDir(template.dest);
 
       let installedFiles = [];
 
@@ -490,10 +744,11 @@ function main() {
         const srcFile = path.join(sourceDir, file);
         const destFile = path.join(template.dest, file);
 
-        if (fs.existsSync(srcFile) && !fs.existsSync(destFile)) {
+        if (fs.existsSync(srcFile)) {
           try {
-            fs.copyFileSync(srcFile, destFile);
-            installedFiles.push(file);
+            if (copyIfMissing(ctx, srcFile, destFile) === 'created') {
+              installedFiles.push(file);
+            }
           } catch (error) {
             log(`   ❌ Failed to copy ${file}: ${error.message}`, 'red');
           }
@@ -506,18 +761,17 @@ function main() {
         const destComponentsDir = path.join(template.dest, template.componentsDir);
 
         if (fs.existsSync(srcComponentsDir)) {
-          if (!fs.existsSync(destComponentsDir)) {
-            fs.mkdirSync(destComponentsDir, { recursive: true });
-          }
+          ensureDir(destComponentsDir);
 
           for (const file of template.componentFiles) {
             const srcFile = path.join(srcComponentsDir, file);
             const destFile = path.join(destComponentsDir, file);
 
-            if (fs.existsSync(srcFile) && !fs.existsSync(destFile)) {
+            if (fs.existsSync(srcFile)) {
               try {
-                fs.copyFileSync(srcFile, destFile);
-                installedFiles.push(`_components/${file}`);
+                if (copyIfMissing(ctx, srcFile, destFile) === 'created') {
+                  installedFiles.push(`_components/${file}`);
+                }
               } catch (error) {
                 log(`   ❌ Failed to copy ${file}: ${error.message}`, 'red');
               }
@@ -542,9 +796,9 @@ function main() {
   }
 
   // ========================================
-  // 4g. Install Component/Page Templates (v3.9.0)
+  // 4g. Install Component/Page/API Templates (v3.9.0)
   // ========================================
-  log('\n📦 Setting up component/page templates:', 'cyan');
+  log('\n📦 Setting up component/page/API templates:', 'cyan');
 
   const componentPageTemplates = [
     {
@@ -556,6 +810,11 @@ function main() {
       source: 'page',
       dest: path.join(claudeDir, 'templates', 'page'),
       name: 'Page templates'
+    },
+    {
+      source: 'api',
+      dest: path.join(claudeDir, 'templates', 'api'),
+      name: 'API route templates (response cache)'
     }
   ];
 
@@ -567,9 +826,7 @@ function main() {
       continue;
     }
 
-    if (!fs.existsSync(template.dest)) {
-      fs.mkdirSync(template.dest, { recursive: true });
-    }
+    ensureDir(template.dest);
 
     const files = fs.readdirSync(sourceDir);
     let copiedCount = 0;
@@ -578,10 +835,11 @@ function main() {
       const srcFile = path.join(sourceDir, file);
       const destFile = path.join(template.dest, file);
 
-      if (fs.statSync(srcFile).isFile() && !fs.existsSync(destFile)) {
+      if (fs.statSync(srcFile).isFile()) {
         try {
-          fs.copyFileSync(srcFile, destFile);
-          copiedCount++;
+          if (copyIfMissing(ctx, srcFile, destFile) === 'created') {
+            copiedCount++;
+          }
         } catch (error) {
           log(`   ❌ Failed to copy ${file}: ${error.message}`, 'red');
         }
@@ -598,32 +856,21 @@ function main() {
   // ========================================
   // 4h. Install Manifest Generation Scripts
   // ========================================
+  lap(ctx, 'templates');
   log('\n📊 Setting up manifest generation scripts:', 'cyan');
 
   const sourceScriptsDir = path.join(packageDir, 'scripts');
   const targetScriptsDir = path.join(targetDir, 'scripts', 'api-dev-tools');
 
   if (fs.existsSync(sourceScriptsDir)) {
-    if (!fs.existsSync(targetScriptsDir)) {
-      fs.mkdirSync(targetScriptsDir, { recursive: true });
-    }
+    ensureDir(targetScriptsDir);
 
     const scriptFiles = fs.readdirSync(sourceScriptsDir).filter(file =>
       file.endsWith('.ts')
     );
 
     if (scriptFiles.length > 0) {
-      scriptFiles.forEach(file => {
-        const source = path.join(sourceScriptsDir, file);
-        const dest = path.join(targetScriptsDir, file);
-
-        try {
-          fs.copyFileSync(source, dest);
-          log(`   ✅ ${file}`, 'green');
-        } catch (error) {
-          log(`   ❌ Failed to copy ${file}: ${error.message}`, 'red');
-        }
-      });
+      copyManagedFiles(ctx, scriptFiles, sourceScriptsDir, targetScriptsDir);
 
       log('\n   Script purposes:', 'blue');
       log('   • generate-test-manifest.ts - Parses tests → manifest (NO LLM)', 'blue');
@@ -641,35 +888,56 @@ function main() {
   // ========================================
   // NOTE: We use `claude mcp add` directly because .mcp.json requires manual approval
   // and doesn't auto-load. Using the CLI ensures servers are immediately available.
+  lap(ctx, 'scripts');
   log('\n🔌 Configuring MCP servers:', 'cyan');
 
-  const { execSync } = require('child_process');
-
   const mcpServers = [
     { name: 'context7', command: 'npx -y @upstash/context7-mcp', description: 'Live documentation from library source code' },
     { name: 'github', command: 'npx -y @modelcontextprotocol/server-github', description: 'GitHub issues, PRs, and repository access' }
   ];
 
-  for (const server of mcpServers) {
-    try {
+  // Servers a previous run found configured are not probed again (--recheck-mcp forces it);
+  // the rest are checked, and added if missing, concurrently
+  const mcpResults = await runLimited(mcpServers.map(server => ({
+    run: async () => {
+      if (!recheckMcp && ctx.manifest.mcp[server.name] === 'configured') {
+        return { status: 'cached' };
+      }
       // Check if server already exists
-      const checkResult = execSync(`claude mcp get ${server.name} 2>&1`, { encoding: 'utf8', stdio: ['pipe', 'pipe', 'pipe'] });
-      if (checkResult.includes('Connected') || checkResult.includes('Scope:')) {
-        log(`   ✓ ${server.name} - already configured`, 'blue');
+      const check = await run(`claude mcp get ${server.name}`);
+      if (check.ok && (check.stdout.includes('Connected') || check.stdout.includes('Scope:'))) {
+        return { status: 'configured' };
       }
-    } catch (checkError) {
-      // Server doesn't exist, add it
-      try {
-        execSync(`claude mcp add ${server.name} -- ${server.command}`, { encoding: 'utf8', stdio: ['pipe', 'pipe', 'pipe'] });
-        log(`   ✅ ${server.name} - ${server.description}`, 'green');
-      } catch (addError) {
-        log(`   ⚠️  ${server.name} - Could not add (run manually: claude mcp add ${server.name} -- ${server.command})`, 'yellow');
+      if (dryRun) {
+        return { status: 'missing' };
       }
+      // Server doesn't exist, add it
+      const added = await run(`claude mcp add ${server.name} -- ${server.command}`);
+      return { status: added.ok ? 'added' : 'failed' };
     }
-  }
+  })), jobs);
+
+  mcpServers.forEach((server, i) => {
+    const { status } = mcpResults[i];
+    if (status === 'cached' || status === 'configured') {
+      log(`   ✓ ${server.name} - already configured`, 'blue');
+    } else if (status === 'added') {
+      log(`   ✅ ${server.name} - ${server.description}`, 'green');
+    } else if (status === 'missing') {
+      log(`   → ${server.name} - would add (claude mcp add ${server.name} -- ${server.command})`, 'yellow');
+    } else {
+      log(`   ⚠️  ${server.name} - Could not add (run manually: claude mcp add ${server.name} -- ${server.command})`, 'yellow');
+    }
+    if (status === 'configured' || status === 'added') {
+      ctx.manifest.mcp[server.name] = 'configured';
+    } else if (status !== 'cached') {
+      delete ctx.manifest.mcp[server.name];
+    }
+  });
 
   log('\n   ⚠️  GitHub MCP requires GITHUB_PERSONAL_ACCESS_TOKEN in env', 'yellow');
   log('   💡 Restart Claude Code for MCP tools to be available', 'yellow');
+  lap(ctx, 'mcp');
 
   // ========================================
   // 6. Update CLAUDE.md with workflow documentation
@@ -686,73 +954,90 @@ function main() {
     if (fs.existsSync(projectClaudeMd)) {
       const existingContent = fs.readFileSync(projectClaudeMd, 'utf8');
 
-      if (existingContent.includes(sectionMarker)) {
+      if (existingContent.includes(sectionContent)) {
+        log('   ✓ API Development Workflow section already up to date', 'blue');
+      } else if (existingContent.includes(sectionMarker)) {
         // Update existing section
         const beforeSection = existingContent.split(sectionMarker)[0];
         // Find the next ## heading or end of file
         const afterMatch = existingContent.match(/## API Development Workflow[\s\S]*?((?=\n## )|$)/);
         const afterSection = afterMatch ? existingContent.substring(existingContent.indexOf(afterMatch[0]) + afterMatch[0].length) : '';
 
-        fs.writeFileSync(projectClaudeMd, beforeSection + sectionContent + afterSection);
+        writeIfChanged(ctx, projectClaudeMd, beforeSection + sectionContent + afterSection);
         log('   ✅ Updated API Development Workflow section in CLAUDE.md', 'green');
       } else {
         // Append section
-        fs.appendFileSync(projectClaudeMd, '\n\n' + sectionContent);
+        writeIfChanged(ctx, projectClaudeMd, existingContent + '\n\n' + sectionContent);
         log('   ✅ Added API Development Workflow section to CLAUDE.md', 'green');
       }
     } else {
       // Create new CLAUDE.md with section
-      fs.writeFileSync(projectClaudeMd, '# Project Instructions\n\n' + sectionContent);
+      writeIfChanged(ctx, projectClaudeMd, '# Project Instructions\n\n' + sectionContent);
       log('   ✅ Created CLAUDE.md with API Development Workflow section', 'green');
     }
   }
 
+  lap(ctx, 'CLAUDE.md');
+
   // ========================================
   // 7. Install Optional Development Tools
   // ========================================
+  // All three write the project's package.json / node_modules, so they share a
+  // resource and run one at a time; the pool keeps them off the event loop
   if (withStorybook || withPlaywright || withSandpack) {
     log('\n🔧 Installing optional development tools:', 'cyan');
 
-    if (withSandpack) {
-      try {
-        log('   📦 Installing Sandpack for live component previews...', 'blue');
-        execSync('pnpm add @codesandbox/sandpack-react 2>&1', { cwd: targetDir, encoding: 'utf8', stdio: ['pipe', 'pipe', 'pipe'] });
-        log('   ✅ Sandpack installed successfully', 'green');
-      } catch (error) {
-        // Try npm if pnpm fails
-        try {
-          execSync('npm install @codesandbox/sandpack-react 2>&1', { cwd: targetDir, encoding: 'utf8', stdio: ['pipe', 'pipe', 'pipe'] });
-          log('   ✅ Sandpack installed successfully (via npm)', 'green');
-        } catch (npmError) {
-          log('   ⚠️  Could not install Sandpack automatically. Run manually:', 'yellow');
-          log('      pnpm add @codesandbox/sandpack-react', 'yellow');
+    const toolOptions = { cwd: targetDir, timeout: 300000 };
+    const tools = [
+      withSandpack && {
+        icon: '📦',
+        label: 'Sandpack for live component previews',
+        resource: 'package.json',
+        run: async () => {
+          if ((await run('pnpm add @codesandbox/sandpack-react', toolOptions)).ok) {
+            return { ok: true, message: '   ✅ Sandpack installed successfully' };
+          }
+          // Try npm if pnpm fails
+          if ((await run('npm install @codesandbox/sandpack-react', toolOptions)).ok) {
+            return { ok: true, message: '   ✅ Sandpack installed successfully (via npm)' };
+          }
+          return { ok: false, message: '   ⚠️  Could not install Sandpack automatically. Run manually:\n      pnpm add @codesandbox/sandpack-react' };
         }
+      },
+      withStorybook && {
+        icon: '📖',
+        label: 'Storybook',
+        resource: 'package.json',
+        run: async () => (await run('npx storybook@latest init --yes', toolOptions)).ok
+          ? { ok: true, message: '   ✅ Storybook initialized successfully\n   💡 Run with: pnpm storybook' }
+          : { ok: false, message: '   ⚠️  Storybook init failed. Run manually:\n      npx storybook@latest init' }
+      },
+      withPlaywright && {
+        icon: '🎭',
+        label: 'Playwright',
+        resource: 'package.json',
+        run: async () => (await run('npm init playwright@latest -- --yes', toolOptions)).ok
+          ? { ok: true, message: '   ✅ Playwright initialized successfully\n   💡 Run tests with: npx playwright test' }
+          : { ok: false, message: '   ⚠️  Playwright init failed. Run manually:\n      npm init playwright@latest' }
       }
-    }
+    ].filter(Boolean);
 
-    if (withStorybook) {
-      try {
-        log('   📖 Initializing Storybook (this may take a moment)...', 'blue');
-        execSync('npx storybook@latest init --yes 2>&1', { cwd: targetDir, encoding: 'utf8', stdio: ['pipe', 'pipe', 'pipe'], timeout: 300000 });
-        log('   ✅ Storybook initialized successfully', 'green');
-        log('   💡 Run with: pnpm storybook', 'yellow');
-      } catch (error) {
-        log('   ⚠️  Storybook init failed. Run manually:', 'yellow');
-        log('      npx storybook@latest init', 'yellow');
-      }
+    if (dryRun) {
+      tools.forEach(tool => log(`   → would install ${tool.label}`, 'yellow'));
+    } else {
+      tools.forEach(tool => log(`   ${tool.icon} Installing ${tool.label}...`, 'blue'));
+      const results = await runLimited(tools, jobs);
+      results.forEach(result => log(result.message || `   ⚠️  ${result.error}`, result.ok ? 'green' : 'yellow'));
     }
+    lap(ctx, 'tools');
+  }
 
-    if (withPlaywright) {
-      try {
-        log('   🎭 Initializing Playwright (this may take a moment)...', 'blue');
-        execSync('npm init playwright@latest -- --yes 2>&1', { cwd: targetDir, encoding: 'utf8', stdio: ['pipe', 'pipe', 'pipe'], timeout: 300000 });
-        log('   ✅ Playwright initialized successfully', 'green');
-        log('   💡 Run tests with: npx playwright test', 'yellow');
-      } catch (error) {
-        log('   ⚠️  Playwright init failed. Run manually:', 'yellow');
-        log('      npm init playwright@latest', 'yellow');
-      }
-    }
+  saveInstallManifest(ctx);
+
+  if (dryRun) {
+    printInstallSummary(ctx, Number(process.hrtime.bigint() - startedAt) / 1e6);
+    log('\n   Dry run: nothing was written. Run without --dry-run to apply.\n', 'yellow');
+    return;
   }
 
   // ========================================
@@ -903,6 +1188,10 @@ function main() {
     verification.failures.forEach(f => log(`   • Missing: ${f}`, 'yellow'));
     log('   Some features may not work correctly.\n', 'yellow');
   }
+  lap(ctx, 'verify');
+
+  printInstallSummary(ctx, Number(process.hrtime.bigint() - startedAt) / 1e6);
+  log('');
 }
 
 /**
@@ -924,6 +1213,52 @@ function mergeMcpServers(existing, newMcp) {
   return merged;
 }
 
+/**
+ * Extract the hook script name from a settings command
+ * e.g. "$CLAUDE_PROJECT_DIR/.claude/hooks/hook-dispatcher.py pre-write" -> "hook-dispatcher.py"
+ */
+function hookScriptName(command) {
+  const match = (command || '').match(/\.claude\/hooks\/([\w.-]+\.py)/);
+  return match ? match[1] : null;
+}
+
+/**
+ * Remove registrations of packaged hooks that the new settings no longer
+ * register with the same command (e.g. enforce-* hooks now run by
+ * hook-dispatcher.py, or hooks now run through hook-client.py). Without
+ * this, upgrading would run those hooks twice on every tool call.
+ * User-added hooks are never touched.
+ */
+function pruneSupersededHooks(existing, newSettings, packagedHooks) {
+  if (!existing.hooks || !newSettings.hooks) {
+    return existing;
+  }
+
+  const registered = new Set();
+  for (const groups of Object.values(newSettings.hooks)) {
+    for (const group of groups) {
+      for (const hook of group.hooks || []) {
+        registered.add(hook.command);
+      }
+    }
+  }
+
+  const pruned = { ...existing, hooks: {} };
+  for (const [hookType, groups] of Object.entries(existing.hooks)) {
+    pruned.hooks[hookType] = groups
+      .map(group => ({
+        ...group,
+        hooks: (group.hooks || []).filter(hook => {
+          const name = hookScriptName(hook.command);
+          return !name || !packagedHooks.includes(name) || registered.has(hook.command);
+        })
+      }))
+      .filter(group => group.hooks.length > 0);
+  }
+
+  return pruned;
+}
+
 /**
  * Merge two settings objects, combining hooks arrays
  */
@@ -957,11 +1292,144 @@ function mergeSettings(existing, newSettings) {
   return merged;
 }
 
-// Run installer
-try {
-  main();
-} catch (error) {
-  log(`\n❌ Installation failed: ${error.message}`, 'red');
-  log(`   ${error.stack}\n`, 'red');
-  process.exit(1);
+/**
+ * Read hook profile records (.claude/hook-profile.1.jsonl, then the current
+ * .claude/hook-profile.jsonl), skipping torn lines
+ */
+function readHookProfile(claudeDir) {
+  const records = [];
+  for (const file of ['hook-profile.1.jsonl', 'hook-profile.jsonl']) {
+    const filePath = path.join(claudeDir, file);
+    if (!fs.existsSync(filePath)) {
+      continue;
+    }
+    for (const line of fs.readFileSync(filePath, 'utf8').split('\n')) {
+      if (!line.trim()) {
+        continue;
+      }
+      try {
+        records.push(JSON.parse(line));
+      } catch (e) {
+        // Torn write from a crashed hook
+      }
+    }
+  }
+  return records;
+}
+
+/**
+ * Nearest-rank percentile of an ascending array
+ */
+function percentile(sorted, p) {
+  if (sorted.length === 0) {
+    return 0;
+  }
+  const rank = Math.ceil((p / 100) * sorted.length);
+  return sorted[Math.min(Math.max(rank, 1), sorted.length) - 1];
+}
+
+/**
+ * Aggregate profile records by a key into latency and I/O statistics
+ */
+function summarizeProfile(records, keyOf) {
+  const groups = new Map();
+  for (const record of records) {
+    const key = keyOf(record);
+    if (!groups.has(key)) {
+      groups.set(key, []);
+    }
+    groups.get(key).push(record);
+  }
+
+  const rows = [];
+  for (const [key, group] of groups) {
+    const wall = group.map(r => r.wall_ms || 0).sort((a, b) => a - b);
+    const cpu = group.map(r => r.cpu_ms || 0).sort((a, b) => a - b);
+    const total = wall.reduce((sum, ms) => sum + ms, 0);
+    rows.push({
+      key,
+      count: group.length,
+      p50: percentile(wall, 50),
+      p95: percentile(wall, 95),
+      p99: percentile(wall, 99),
+      cpuP50: percentile(cpu, 50),
+      totalMs: total,
+      stateReadKb: group.reduce((sum, r) => sum + (r.state_read_bytes || 0), 0) / group.length / 1024,
+      stateWrittenKb: group.reduce((sum, r) => sum + (r.state_written_bytes || 0), 0) / group.length / 1024,
+      peakRssMb: Math.max(0, ...group.map(r => r.peak_rss_kb || 0)) / 1024,
+      failures: group.filter(r => r.exit_code !== 0).length,
+    });
+  }
+  return rows.sort((a, b) => b.totalMs - a.totalMs);
+}
+
+function printProfileTable(title, rows) {
+  const header = ['', 'runs', 'p50 ms', 'p95 ms', 'p99 ms', 'cpu p50', 'total ms', 'state r/w KB', 'rss MB', 'exit!=0'];
+  const lines = rows.map(r => [
+    r.key,
+    String(r.count),
+    r.p50.toFixed(1),
+    r.p95.toFixed(1),
+    r.p99.toFixed(1),
+    r.cpuP50.toFixed(1),
+    r.totalMs.toFixed(0),
+    `${r.stateReadKb.toFixed(1)}/${r.stateWrittenKb.toFixed(1)}`,
+    r.peakRssMb.toFixed(1),
+    String(r.failures),
+  ]);
+  const widths = header.map((h, i) => Math.max(h.length, ...lines.map(l => l[i].length)));
+  const format = cells => cells.map((c, i) => (i === 0 ? c.padEnd(widths[i]) : c.padStart(widths[i]))).join('  ');
+
+  log(`\n${title}`, 'bright');
+  log(format(header), 'cyan');
+  lines.forEach(l => log(format(l)));
+}
+
+/**
+ * Print p50/p95/p99 hook latency per hook and per event type
+ *
+ * Event rows only count top-level hook runs (what Claude Code waits for);
+ * hooks run inside hook-dispatcher.py are already part of its time.
+ */
+function report() {
+  const claudeDir = path.join(process.cwd(), '.claude');
+  const records = readHookProfile(claudeDir);
+
+  if (records.length === 0) {
+    log('No hook profile found in .claude/hook-profile.jsonl', 'yellow');
+    log('   Set API_DEV_HOOK_PROFILE=1 in the environment Claude Code runs in, then use it as usual.', 'yellow');
+    return;
+  }
+
+  const byHook = summarizeProfile(records, r => r.hook || 'unknown');
+  const byEvent = summarizeProfile(records.filter(r => !r.parent), r => r.event || 'unknown');
+
+  if (args.includes('--json')) {
+    console.log(JSON.stringify({ records: records.length, hooks: byHook, events: byEvent }, null, 2));
+    return;
+  }
+
+  log(`\n📊 Hook latency report (${records.length} hook runs)`, 'bright');
+  printProfileTable('Per hook (slowest total first)', byHook);
+  printProfileTable('Per event type (top-level hook runs)', byEvent);
+  log('');
+}
+
+// Run installer (or the hook latency report)
+function fail(what) {
+  return error => {
+    log(`\n❌ ${what} failed: ${error.message}`, 'red');
+    log(`   ${error.stack}\n`, 'red');
+    process.exit(1);
+  };
+}
+
+if (args[0] === 'report') {
+  try {
+    report();
+  } catch (error) {
+    fail('Hook latency report')(error);
+  }
+} else {
+  main().catch(fail('Installation'));
 }
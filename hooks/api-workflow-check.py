@@ -17,6 +17,16 @@ v3.6.7 Enhancement:
 - Research cache location
 - Summary statistics
 
+Updated in v3.11.0:
+- Blocks completion while the API budgets measured by verify-api-budgets.py
+  are exceeded, and reports the measured numbers in the completion output
+- Combine workflows: reports dependency-graph problems (unknown source
+  APIs, cycles) in combine_config
+- Combine workflows: adds the latency predicted by latency_plan.py
+  (p50/p95 under the call graph, against the latency budget) to the
+  completion output
+- Exports registry.json if registry writes are pending (registry_store.py)
+
 Returns:
   - {"decision": "approve"} - Allow stopping
   - {"decision": "block", "reason": "..."} - Prevent stopping with explanation
@@ -28,6 +38,12 @@ import re
 from datetime import datetime
 from pathlib import Path
 
+import flow_graph
+import history_store
+import latency_plan
+import registry_store
+import state_store
+
 # State file is in .claude/ directory (sibling to hooks/)
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 RESEARCH_DIR = Path(__file__).parent.parent / "research"
@@ -123,23 +139,22 @@ def validate_combine_workflow(state):
 
     # Verify all source APIs exist in registry
     try:
-        registry_path = STATE_FILE.parent / "registry.json"
-        if registry_path.exists():
-            registry = json.loads(registry_path.read_text())
-            apis = registry.get("apis", {})
-
+        if registry_store.present():
             for elem in source_elements:
                 elem_name = elem.get("name", "") if isinstance(elem, dict) else str(elem)
-                if elem_name and elem_name not in apis:
+                if elem_name and not registry_store.exists("apis", elem_name):
                     issues.append(f"⚠️ Source API '{elem_name}' not found in registry")
                     issues.append(f"   Run /api-create {elem_name} first")
     except Exception:
         pass
 
-    # Check flow type is defined
+    # Check flow type (or a dependency graph) is defined
     flow_type = combine_config.get("flow_type", "")
-    if not flow_type:
-        issues.append("⚠️ Flow type not defined (sequential/parallel/conditional)")
+    if not flow_type and not combine_config.get("dependencies"):
+        issues.append("⚠️ Flow type not defined (sequential/parallel/conditional/dag)")
+
+    for issue in flow_graph.graph_issues(flow_graph.build_graph(combine_config)):
+        issues.append(f"❌ Dependency graph: {issue}")
 
     return issues
 
@@ -171,34 +186,6 @@ def validate_ui_workflow(state):
     return issues
 
 
-def get_active_endpoint(state):
-    """Get active endpoint - supports both old and new state formats."""
-    if "endpoints" in state and "active_endpoint" in state:
-        active = state.get("active_endpoint")
-        if active and active in state["endpoints"]:
-            return active, state["endpoints"][active]
-        return None, None
-
-    # Support for elements (UI workflow)
-    if "elements" in state and "active_element" in state:
-        active = state.get("active_element")
-        if active and active in state["elements"]:
-            return active, state["elements"][active]
-        return None, None
-
-    # Old format: single endpoint
-    endpoint = state.get("endpoint")
-    if endpoint:
-        return endpoint, state
-
-    # Try active_element without elements dict
-    active = state.get("active_element")
-    if active:
-        return active, state
-
-    return None, None
-
-
 def get_git_modified_files() -> list[str]:
     """Get list of modified files from git.
 
@@ -234,6 +221,49 @@ def check_verification_warnings(state: dict) -> list[str]:
     return []
 
 
+def check_api_budget(phases: dict) -> list[str]:
+    """Budget violations recorded in Phase 10 by verify-api-budgets.py."""
+    budget = phases.get("verify", {}).get("api_budget", {})
+    if budget.get("status") != "exceeded":
+        return []
+    return [
+        "❌ API budgets exceeded (measured against the dev server in Phase 10):",
+        *[f"  - {v}" for v in budget.get("violations", [])],
+        "",
+        "Optimize the route and re-run the tests, or change .claude/performance-budgets.json with the user's approval.",
+    ]
+
+
+def generate_budget_summary(endpoint_data: dict) -> list[str]:
+    """Measured API budget numbers for the completion output."""
+    budget = endpoint_data.get("phases", {}).get("verify", {}).get("api_budget", {})
+    measured = budget.get("measured")
+    if not measured:
+        return []
+    return [
+        "## API Budgets",
+        "",
+        f"- **p95 latency:** {measured['p95_latency_ms']}ms (p50 {measured['p50_latency_ms']}ms)",
+        f"- **Largest response:** {measured['response_kb']}KB",
+        f"- **Upstream call sites:** {measured['upstream_calls']}",
+        f"- **First request:** {measured.get('first_request_ms', measured.get('cold_start_ms'))}ms",
+        f"- **Checked:** {budget.get('checked_at', 'unknown')} against `{budget.get('base_url', '')}`",
+    ]
+
+
+def generate_latency_plan_summary(endpoint: str, endpoint_data: dict, state: dict) -> list[str]:
+    """Predicted latency of a combined endpoint, from its sources' known latencies."""
+    combine_config = state.get("combine_config", {})
+    if not combine_config.get("source_elements"):
+        return []
+    decisions = endpoint_data.get("phases", {}).get("interview", {}).get("decisions", {})
+    try:
+        result = latency_plan.plan_combined(endpoint, combine_config, decisions)
+    except (OSError, ValueError, KeyError):
+        return []
+    return latency_plan.format_plan(result).split("\n")
+
+
 def check_interview_implementation_match(state: dict, endpoint_data: dict = None) -> list[str]:
     """Verify implementation matches interview requirements.
 
@@ -244,7 +274,7 @@ def check_interview_implementation_match(state: dict, endpoint_data: dict = None
     # Use endpoint_data if provided (multi-API), otherwise use state directly
     data = endpoint_data if endpoint_data else state
     interview = data.get("phases", {}).get("interview", {})
-    questions = interview.get("questions", [])
+    questions = history_store.load(history_store.history_endpoint(state), "questions", interview.get("questions", []))
 
     # Extract key requirements from interview
     all_text = " ".join(str(q) for q in questions)
@@ -560,6 +590,16 @@ def generate_completion_output(endpoint: str, endpoint_data: dict, state: dict)
         lines.extend(scope_lines)
         lines.append("")
 
+    budget_lines = generate_budget_summary(endpoint_data)
+    if budget_lines:
+        lines.extend(budget_lines)
+        lines.append("")
+
+    plan_lines = generate_latency_plan_summary(endpoint, endpoint_data, state)
+    if plan_lines:
+        lines.extend(plan_lines)
+        lines.append("")
+
     # Research Cache Location
     research_cache = RESEARCH_DIR / endpoint
     if research_cache.exists():
@@ -585,6 +625,12 @@ def generate_completion_output(endpoint: str, endpoint_data: dict, state: dict)
 
 
 def main():
+    # Registry writes only reach registry.json on export; flush before the session ends
+    try:
+        registry_store.export()
+    except Exception:
+        pass
+
     # If no state file, we're not in an API workflow - allow stop
     if not STATE_FILE.exists():
         print(json.dumps({"decision": "approve"}))
@@ -592,7 +638,7 @@ def main():
 
     # Load state
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         # Corrupted state, allow stop
         print(json.dumps({"decision": "approve"}))
@@ -602,7 +648,7 @@ def main():
     workflow_type = get_workflow_type(state)
 
     # Get active endpoint (multi-API support)
-    endpoint, endpoint_data = get_active_endpoint(state)
+    endpoint, endpoint_data = state_store.get_active_workflow(state)
 
     # If no active endpoint, check if using old format
     if not endpoint_data:
@@ -690,12 +736,18 @@ def main():
         all_issues.append("\n⚠️ Gap 4: Implementation verification:")
         all_issues.extend([f"  {i}" for i in match_issues])
 
+    # API budgets measured in Phase 10 block completion like a missing phase
+    budget_issues = check_api_budget(phases)
+    if budget_issues:
+        all_issues.append("\n" + "\n".join(budget_issues))
+
     # Block if required phases incomplete
-    if incomplete_required:
-        all_issues.append("\n\nTo continue:")
-        all_issues.append("  1. Complete required phases above")
-        all_issues.append("  2. Use /api-status to see detailed progress")
-        all_issues.append("  3. Run `git diff --name-only` to verify changes")
+    if incomplete_required or budget_issues:
+        if incomplete_required:
+            all_issues.append("\n\nTo continue:")
+            all_issues.append("  1. Complete required phases above")
+            all_issues.append("  2. Use /api-status to see detailed progress")
+            all_issues.append("  3. Run `git diff --name-only` to verify changes")
 
         print(json.dumps({
             "decision": "block",
@@ -21,28 +21,14 @@ import os
 from datetime import datetime
 from pathlib import Path
 
+import history_store
+import state_store
+
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 RESEARCH_DIR = Path(__file__).parent.parent / "research"
 RESEARCH_INDEX = RESEARCH_DIR / "index.json"
 
 
-def get_active_endpoint(state):
-    """Get active endpoint - supports both old and new state formats."""
-    # New format (v3.6.7+): endpoints object with active_endpoint pointer
-    if "endpoints" in state and "active_endpoint" in state:
-        active = state.get("active_endpoint")
-        if active and active in state["endpoints"]:
-            return active, state["endpoints"][active]
-        return None, None
-
-    # Old format: single endpoint field
-    endpoint = state.get("endpoint")
-    if endpoint:
-        return endpoint, state
-
-    return None, None
-
-
 def create_sources_json(endpoint_dir, state, endpoint_data):
     """Create sources.json from research queries in state."""
     sources_file = endpoint_dir / "sources.json"
@@ -63,7 +49,7 @@ def create_sources_json(endpoint_dir, state, endpoint_data):
 
     # From initial research phase
     initial_research = endpoint_data.get("phases", {}).get("research_initial", {})
-    for src in initial_research.get("sources", []):
+    for src in history_store.load(endpoint_dir.name, "sources", initial_research.get("sources", [])):
         if isinstance(src, dict):
             sources.append(src)
         elif isinstance(src, str):
@@ -77,14 +63,18 @@ def create_sources_json(endpoint_dir, state, endpoint_data):
         elif isinstance(src, str):
             sources.append({"url": src, "summary": ""})
 
-    # Deduplicate by URL
-    seen_urls = set()
+    # Deduplicate by URL, keeping a stored content reference from any duplicate
+    seen_urls = {}
     unique_sources = []
     for src in sources:
         url = src.get("url", src.get("query", ""))
-        if url and url not in seen_urls:
-            seen_urls.add(url)
+        if not url:
+            continue
+        if url not in seen_urls:
+            seen_urls[url] = src
             unique_sources.append(src)
+        elif src.get("content") and not seen_urls[url].get("content"):
+            seen_urls[url]["content"] = src["content"]
 
     data = {
         "created_at": datetime.now().isoformat(),
@@ -104,7 +94,7 @@ def create_interview_json(endpoint_dir, endpoint_data):
 
     interview = endpoint_data.get("phases", {}).get("interview", {})
     decisions = interview.get("decisions", {})
-    questions = interview.get("questions", [])
+    questions = history_store.load(endpoint_dir.name, "questions", interview.get("questions", []))
 
     data = {
         "created_at": datetime.now().isoformat(),
@@ -269,12 +259,12 @@ def main():
         sys.exit(0)
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE, for_update=True)
     except json.JSONDecodeError:
         print(json.dumps({"continue": True}))
         sys.exit(0)
 
-    endpoint, endpoint_data = get_active_endpoint(state)
+    endpoint, endpoint_data = state_store.get_active_endpoint(state)
     if not endpoint or not endpoint_data:
         print(json.dumps({"continue": True}))
         sys.exit(0)
@@ -318,7 +308,7 @@ def main():
     # Update state to indicate research is cached
     if files_created:
         doc_phase["research_cached"] = True
-        STATE_FILE.write_text(json.dumps(state, indent=2))
+        state_store.save_state(state, STATE_FILE)
 
     output = {
         "hookSpecificOutput": {
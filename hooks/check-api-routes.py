@@ -9,9 +9,11 @@ that required API routes are available.
 """
 
 import json
-import sys
 import os
-import glob
+
+import hook_runtime
+import route_index
+import state_store
 
 def load_state():
     """Load the api-dev-state.json file"""
@@ -22,8 +24,7 @@ def load_state():
 
     for path in state_paths:
         if os.path.exists(path):
-            with open(path, 'r') as f:
-                return json.load(f)
+            return state_store.load_state(path)
     return None
 
 def is_page_workflow(state):
@@ -70,33 +71,13 @@ def get_required_api_routes(state, element_name):
     return data_sources
 
 def find_existing_api_routes():
-    """Find all existing API routes in the project"""
-    routes = []
-
-    # Check src/app/api paths
-    api_patterns = [
-        "src/app/api/**/*.ts",
-        "src/app/api/**/*.tsx",
-        "app/api/**/*.ts",
-        "app/api/**/*.tsx",
-    ]
-
-    for pattern in api_patterns:
-        for file_path in glob.glob(pattern, recursive=True):
-            if "route.ts" in file_path or "route.tsx" in file_path:
-                # Extract route name from path
-                route = file_path.replace("src/app/api/", "/api/")
-                route = route.replace("app/api/", "/api/")
-                route = route.replace("/route.ts", "")
-                route = route.replace("/route.tsx", "")
-                routes.append(route)
-
-    return routes
+    """Find all existing API routes in the project (src/app/api and app/api)"""
+    return route_index.routes()
 
 def main():
     try:
         # Read tool input from stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = hook_runtime.read_input()
         tool_name = input_data.get("tool_name", "")
         tool_input = input_data.get("tool_input", {})
 
@@ -19,11 +19,13 @@ import json
 import sys
 from pathlib import Path
 
+import hook_runtime
+
 
 def main():
     # Read hook input from stdin
     try:
-        input_data = json.load(sys.stdin)
+        input_data = hook_runtime.read_input()
     except json.JSONDecodeError:
         print(json.dumps({"continue": True}))
         sys.exit(0)
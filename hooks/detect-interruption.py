@@ -18,6 +18,8 @@ import os
 from datetime import datetime
 from pathlib import Path
 
+import state_store
+
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 
 
@@ -134,7 +136,7 @@ def main():
         sys.exit(0)
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"continue": True}))
         sys.exit(0)
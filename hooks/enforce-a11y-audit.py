@@ -17,6 +17,8 @@ import json
 import sys
 from pathlib import Path
 
+import state_store
+
 # State file is in .claude/ directory (sibling to hooks/)
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 
@@ -132,7 +134,7 @@ def main():
 
     # Load state
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"continue": True}))
         sys.exit(0)
@@ -18,6 +18,9 @@ import sys
 import re
 from pathlib import Path
 
+import hook_runtime
+import state_store
+
 # State file is in .claude/ directory (sibling to hooks/)
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 BRAND_GUIDE_FILE = Path(__file__).parent.parent / "BRAND_GUIDE.md"
@@ -157,7 +160,7 @@ def extract_brand_summary(content):
 def main():
     # Read hook input from stdin
     try:
-        input_data = json.load(sys.stdin)
+        input_data = hook_runtime.read_input()
     except json.JSONDecodeError:
         print(json.dumps({"continue": True}))
         sys.exit(0)
@@ -186,7 +189,7 @@ def main():
 
     # Load state
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"continue": True}))
         sys.exit(0)
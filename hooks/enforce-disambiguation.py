@@ -17,6 +17,9 @@ import json
 import sys
 from pathlib import Path
 
+import hook_runtime
+import state_store
+
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 
 # Minimum search variations required
@@ -25,7 +28,7 @@ MIN_SEARCH_VARIATIONS = 2
 
 def main():
     try:
-        input_data = json.load(sys.stdin)
+        input_data = hook_runtime.read_input()
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
@@ -60,7 +63,7 @@ Phase 1 (Disambiguation) is required before any implementation."""
         sys.exit(0)
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
@@ -24,27 +24,13 @@ import json
 import sys
 from pathlib import Path
 
+import hook_runtime
+import state_store
+
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 RESEARCH_DIR = Path(__file__).parent.parent / "research"
 
 
-def get_active_endpoint(state):
-    """Get active endpoint - supports both old and new state formats."""
-    # New format (v3.6.7+): endpoints object with active_endpoint pointer
-    if "endpoints" in state and "active_endpoint" in state:
-        active = state.get("active_endpoint")
-        if active and active in state["endpoints"]:
-            return active, state["endpoints"][active]
-        return None, None
-
-    # Old format: single endpoint field
-    endpoint = state.get("endpoint")
-    if endpoint:
-        return endpoint, state
-
-    return None, None
-
-
 def check_research_cache_exists(endpoint):
     """Check if research cache files actually exist."""
     cache_dir = RESEARCH_DIR / endpoint
@@ -62,7 +48,7 @@ def check_research_cache_exists(endpoint):
 
 def main():
     try:
-        input_data = json.load(sys.stdin)
+        input_data = hook_runtime.read_input()
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
@@ -87,13 +73,13 @@ def main():
         sys.exit(0)
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
 
     # Get active endpoint (supports both old and new formats)
-    endpoint, endpoint_data = get_active_endpoint(state)
+    endpoint, endpoint_data = state_store.get_active_endpoint(state)
     if not endpoint or not endpoint_data:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
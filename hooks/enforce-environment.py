@@ -18,6 +18,9 @@ import os
 import sys
 from pathlib import Path
 
+import hook_runtime
+import state_store
+
 # State file is in .claude/ directory (sibling to hooks/)
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 
@@ -76,7 +79,7 @@ def infer_required_keys(endpoint: str, external_services: list) -> list:
 def main():
     # Read hook input from stdin
     try:
-        input_data = json.load(sys.stdin)
+        input_data = hook_runtime.read_input()
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
@@ -104,7 +107,7 @@ def main():
 
     # Load state
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
@@ -20,12 +20,15 @@ Returns:
   - Prints context to stdout (injected into conversation)
   - Exit 0 to allow the prompt to proceed
 """
+import itertools
 import json
 import sys
 import re
 from pathlib import Path
 from datetime import datetime
 
+import state_store
+
 # State file is in .claude/ directory (sibling to hooks/)
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 
@@ -109,6 +112,132 @@ EXCLUDE_PATTERNS = [
     r"^(?:\d+[\s+\-*/]\d+|calculate|math).*$",  # Simple math
 ]
 
+# ============================================================================
+# COMPILED MATCHERS
+# ============================================================================
+# The pattern lists above are compiled once at import into matchers that scan
+# the prompt in (close to) one pass each, instead of running every pattern
+# separately and re-running matches to extract them, so long pasted prompts
+# (logs, docs, code) no longer cost a regex pass per pattern. The results are
+# identical (scripts/benchmark-prompt-detection.py checks and times both).
+
+# A TECHNICAL_TERMS entry that is a plain list of whole words
+_WORD_LIST = re.compile(r"^\\b\(\?:([a-z]+(?:\|[a-z]+)*)\)\\b$")
+
+
+def _gap_search(head: re.Pattern, tail: re.Pattern):
+    """Linear equivalent of re.search(f"{head} .+ {tail}") for one phrase.
+
+    The regex engine retries the greedy `.+` from every head occurrence,
+    which is quadratic on long lines without a tail. Per line, the match (if
+    any) runs from the first head followed by a space to the rightmost tail,
+    provided the tail starts after at least one character of gap.
+    """
+    def search(text: str):
+        for line in text.split("\n"):
+            last_tail = tail.match(line)  # rightmost " <tail>" on the line
+            if last_tail is None:
+                continue
+            tail_start = last_tail.start(1)
+            for m in head.finditer(line):
+                if line[m.end():m.end() + 1] != " ":
+                    continue
+                if m.end() + 2 <= tail_start:
+                    return line[m.start():last_tail.end()]
+                break  # later heads end later and cannot do better
+        return None
+    return search
+
+
+def _compile_phrase(pattern: str):
+    """Return search(text) -> matched text or None for an ALWAYS_RESEARCH phrase."""
+    if pattern.count(" .+ ") == 1:
+        head, tail = pattern.split(" .+ ")
+        if ".+" not in tail:
+            return _gap_search(
+                re.compile(head, re.IGNORECASE),
+                re.compile(f".*( (?:{tail}))", re.IGNORECASE),
+            )
+    compiled = re.compile(pattern, re.IGNORECASE)
+
+    def search(text: str):
+        m = compiled.search(text)
+        return m.group(0) if m else None
+    return search
+
+
+def _compile_terms(patterns: list):
+    """Return terms(text) -> the first 3 matches of each pattern, in pattern order.
+
+    Whole-word lists are merged into one word -> entry table and the text is
+    scanned once, word by word (a whole-word match is always an entire \\w+
+    run, so this finds exactly what each pattern's findall would). Non-ASCII
+    words go through the equivalent regex to keep re.IGNORECASE's Unicode
+    case folding. The remaining patterns keep their own regex but stop after
+    3 matches.
+    """
+    table, groups, others = {}, [], []
+    for i, pattern in enumerate(patterns):
+        words = _WORD_LIST.match(pattern)
+        if words:
+            groups.append(f"(?P<t{i}>{words.group(1)})")
+            for word in words.group(1).split("|"):
+                table.setdefault(word, []).append(i)
+        else:
+            others.append((i, re.compile(pattern, re.IGNORECASE)))
+    words_re = re.compile("(?:" + "|".join(groups) + ")", re.IGNORECASE)
+    word_run = re.compile(r"\w+")
+
+    def terms(text: str) -> list:
+        found = {}
+        for m in word_run.finditer(text):
+            word = m.group(0)
+            entries = table.get(word)
+            if entries is None and not word.isascii():
+                folded = words_re.fullmatch(word)
+                entries = [int(folded.lastgroup[1:])] if folded else None
+            for i in entries or ():
+                hits = found.setdefault(i, [])
+                if len(hits) < 3:
+                    hits.append(word)
+        for i, compiled in others:
+            hits = [m.group(0) for m in itertools.islice(compiled.finditer(text), 3)]
+            if hits:
+                found[i] = hits
+        return [term for i in sorted(found) for term in found[i]]
+    return terms
+
+
+def _compile_question(patterns: list):
+    """Return matches(text) -> True if any QUESTION_PATTERN matches.
+
+    Patterns ending in `.*\\?` are checked per line against the text before
+    the line's last "?", instead of letting `.*` backtrack from every match.
+    """
+    ask, plain = [], []
+    for pattern in patterns:
+        if pattern.endswith(r".*\?"):
+            ask.append(re.compile(pattern[:-len(r".*\?")], re.IGNORECASE))
+        else:
+            plain.append(pattern)
+    plain_re = re.compile("|".join(f"(?:{p})" for p in plain), re.IGNORECASE)
+
+    def matches(text: str) -> bool:
+        if plain_re.search(text):
+            return True
+        for line in text.split("\n"):
+            last = line.rfind("?")
+            if last >= 0 and any(head.search(line, 0, last) for head in ask):
+                return True
+        return False
+    return matches
+
+
+_PHRASE_SEARCHES = [_compile_phrase(p) for p in ALWAYS_RESEARCH_PHRASES]
+_find_terms = _compile_terms(TECHNICAL_TERMS)
+_is_question = _compile_question(QUESTION_PATTERNS)
+_EXCLUDE_RES = [re.compile(p, re.IGNORECASE) for p in EXCLUDE_PATTERNS]
+
 # ============================================================================
 # DETECTION LOGIC
 # ============================================================================
@@ -119,8 +248,8 @@ def is_excluded(prompt: str) -> bool:
 
     # Very short prompts that are just greetings
     if len(prompt_clean) < 20:
-        for pattern in EXCLUDE_PATTERNS:
-            if re.match(pattern, prompt_clean, re.IGNORECASE):
+        for pattern in _EXCLUDE_RES:
+            if pattern.match(prompt_clean):
                 return True
 
     return False
@@ -151,26 +280,21 @@ def detect_technical_question(prompt: str) -> dict:
     patterns_matched = []
 
     # Check for ALWAYS_RESEARCH_PHRASES first (highest priority)
-    for pattern in ALWAYS_RESEARCH_PHRASES:
-        if re.search(pattern, prompt_lower, re.IGNORECASE):
+    for search in _PHRASE_SEARCHES:
+        phrase = search(prompt_lower)
+        if phrase is not None:
             patterns_matched.append("always_research")
-            # Extract the matched phrase
-            match = re.search(pattern, prompt_lower, re.IGNORECASE)
-            if match:
-                detected_terms.append(match.group(0)[:50])
-
-    # Check technical terms
-    for pattern in TECHNICAL_TERMS:
-        matches = re.findall(pattern, prompt_lower, re.IGNORECASE)
-        if matches:
-            detected_terms.extend(matches[:3])  # Limit per pattern
-            patterns_matched.append("technical_term")
+            detected_terms.append(phrase[:50])
+
+    # Check technical terms (first 3 matches per pattern)
+    terms = _find_terms(prompt_lower)
+    if terms:
+        detected_terms.extend(terms)
+        patterns_matched.append("technical_term")
 
     # Check question patterns
-    for pattern in QUESTION_PATTERNS:
-        if re.search(pattern, prompt_lower, re.IGNORECASE):
-            patterns_matched.append("question_pattern")
-            break
+    if _is_question(prompt_lower):
+        patterns_matched.append("question_pattern")
 
     # Deduplicate
     detected_terms = list(dict.fromkeys(detected_terms))[:10]
@@ -207,7 +331,7 @@ def check_active_workflow() -> bool:
         return False
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
         phases = state.get("phases", {})
 
         for phase_key, phase_data in phases.items():
@@ -225,26 +349,22 @@ def check_active_workflow() -> bool:
 def log_detection(prompt: str, detection: dict, injected: bool) -> None:
     """Log this detection for debugging/auditing."""
     try:
-        if STATE_FILE.exists():
-            state = json.loads(STATE_FILE.read_text())
-        else:
-            state = {"prompt_detections": []}
-
-        if "prompt_detections" not in state:
-            state["prompt_detections"] = []
-
-        state["prompt_detections"].append({
+        entry = {
             "timestamp": datetime.now().isoformat(),
             "prompt_preview": prompt[:100] + "..." if len(prompt) > 100 else prompt,
             "detection": detection,
             "injected": injected,
-        })
-
-        # Keep only last 50 detections
-        state["prompt_detections"] = state["prompt_detections"][-50:]
+        }
 
-        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        STATE_FILE.write_text(json.dumps(state, indent=2))
+        if STATE_FILE.exists():
+            # Keep only last 50 detections
+            state = state_store.load_state(STATE_FILE)
+            state_store.apply_ops(state, [
+                {"op": "append", "path": ["prompt_detections"], "value": entry, "limit": 50}
+            ], STATE_FILE)
+        else:
+            STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            state_store.save_state({"prompt_detections": [entry]}, STATE_FILE)
     except Exception:
         pass  # Don't fail the hook on logging errors
 
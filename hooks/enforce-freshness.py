@@ -27,6 +27,9 @@ import os
 from datetime import datetime
 from pathlib import Path
 
+import hook_runtime
+import state_store
+
 # State file is in .claude/ directory (sibling to hooks/)
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 RESEARCH_INDEX = Path(__file__).parent.parent / "research" / "index.json"
@@ -35,22 +38,6 @@ RESEARCH_INDEX = Path(__file__).parent.parent / "research" / "index.json"
 FRESHNESS_THRESHOLD_DAYS = 7
 
 
-def get_active_endpoint(state):
-    """Get active endpoint - supports both old and new state formats."""
-    if "endpoints" in state and "active_endpoint" in state:
-        active = state.get("active_endpoint")
-        if active and active in state["endpoints"]:
-            return active, state["endpoints"][active]
-        return None, None
-
-    # Old format
-    endpoint = state.get("endpoint")
-    if endpoint:
-        return endpoint, state
-
-    return None, None
-
-
 def load_research_index():
     """Load research index from .claude/research/index.json file."""
     if not RESEARCH_INDEX.exists():
@@ -98,7 +85,7 @@ def is_api_related_file(file_path):
 def main():
     # Read hook input from stdin
     try:
-        input_data = json.load(sys.stdin)
+        input_data = hook_runtime.read_input()
     except json.JSONDecodeError:
         input_data = {}
 
@@ -117,13 +104,13 @@ def main():
         sys.exit(0)
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"continue": True}))
         sys.exit(0)
 
     # Get active endpoint
-    endpoint, endpoint_data = get_active_endpoint(state)
+    endpoint, endpoint_data = state_store.get_active_endpoint(state)
     if not endpoint or not endpoint_data:
         # No active endpoint - allow
         print(json.dumps({"continue": True}))
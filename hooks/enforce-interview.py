@@ -27,6 +27,9 @@ import json
 import sys
 from pathlib import Path
 
+import hook_runtime
+import state_store
+
 # State file is in .claude/ directory (sibling to hooks/)
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 
@@ -56,7 +59,7 @@ SELF_ANSWER_INDICATORS = [
 def main():
     # Read hook input from stdin
     try:
-        input_data = json.load(sys.stdin)
+        input_data = hook_runtime.read_input()
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
@@ -92,7 +95,7 @@ Run /api-create [endpoint-name] to begin the interview-driven workflow."""
 
     # Load state
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
@@ -108,7 +111,7 @@ Run /api-create [endpoint-name] to begin the interview-driven workflow."""
     # Check 0: Research must be complete FIRST (questions based on research)
     research_status = research.get("status", "not_started")
     if research_status != "complete":
-        sources_count = len(research.get("sources", []))
+        sources_count = max(research.get("source_count", 0), len(research.get("sources", [])))
         print(json.dumps({
             "permissionDecision": "deny",
             "reason": f"""❌ BLOCKED: Research phase must complete BEFORE interview.
@@ -364,6 +367,7 @@ def _build_decision_summary(decisions: dict) -> str:
         "error_handling": "Error Handling",
         "api_key_handling": "API Key Handling",
         "external_services": "External Services",
+        "cache_strategy": "Response Caching",
     }
 
     for key, data in decisions.items():
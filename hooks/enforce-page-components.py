@@ -9,10 +9,13 @@ encourages reuse of existing components from the registry.
 """
 
 import json
-import sys
 import os
 import re
 
+import hook_runtime
+import registry_store
+import state_store
+
 def load_state():
     """Load the api-dev-state.json file"""
     state_paths = [
@@ -22,23 +25,9 @@ def load_state():
 
     for path in state_paths:
         if os.path.exists(path):
-            with open(path, 'r') as f:
-                return json.load(f)
+            return state_store.load_state(path)
     return None
 
-def load_registry():
-    """Load the registry.json file"""
-    registry_paths = [
-        ".claude/registry.json",
-        os.path.join(os.environ.get("CLAUDE_PROJECT_DIR", ""), ".claude/registry.json")
-    ]
-
-    for path in registry_paths:
-        if os.path.exists(path):
-            with open(path, 'r') as f:
-                return json.load(f)
-    return {}
-
 def is_page_workflow(state):
     """Check if current workflow is ui-create-page"""
     workflow = state.get("workflow", "")
@@ -87,15 +76,14 @@ def check_page_analysis_phase(state, element_name):
     page_analysis = phases.get("page_analysis", {})
     return page_analysis.get("status") == "complete"
 
-def get_available_components(registry):
+def get_available_components():
     """Get list of available components from registry"""
-    components = registry.get("components", {})
-    return list(components.keys())
+    return registry_store.names("components")
 
 def main():
     try:
         # Read tool input from stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = hook_runtime.read_input()
         tool_name = input_data.get("tool_name", "")
         tool_input = input_data.get("tool_input", {})
 
@@ -131,9 +119,8 @@ def main():
         if is_creating_new_component(file_path):
             # Check if page analysis phase is complete
             if not check_page_analysis_phase(state, element_name):
-                # Load registry to show available components
-                registry = load_registry()
-                available = get_available_components(registry)
+                # Look up available components in the registry
+                available = get_available_components()
 
                 component_list = "\n".join([f"  - {c}" for c in available[:10]])
                 if len(available) > 10:
@@ -162,8 +149,7 @@ If you need a NEW component, consider:
                 return
 
             # Even if phase is complete, notify about registry
-            registry = load_registry()
-            available = get_available_components(registry)
+            available = get_available_components()
 
             if available:
                 print(json.dumps({
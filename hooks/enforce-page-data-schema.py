@@ -9,10 +9,12 @@ allowing page implementation in Phase 9.
 """
 
 import json
-import sys
 import os
 import re
 
+import hook_runtime
+import state_store
+
 def load_state():
     """Load the api-dev-state.json file"""
     state_paths = [
@@ -22,8 +24,7 @@ def load_state():
 
     for path in state_paths:
         if os.path.exists(path):
-            with open(path, 'r') as f:
-                return json.load(f)
+            return state_store.load_state(path)
     return None
 
 def is_page_workflow(state):
@@ -83,7 +84,7 @@ def check_data_schema_phase(state, element_name):
 def main():
     try:
         # Read tool input from stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = hook_runtime.read_input()
         tool_name = input_data.get("tool_name", "")
         tool_input = input_data.get("tool_input", {})
 
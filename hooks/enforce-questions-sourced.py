@@ -8,6 +8,10 @@ generated from actual research findings, not generic template questions.
 
 Added in v3.6.7 for question quality enforcement.
 
+Updated in v3.11.0:
+  - Research sources are matched through the endpoint's full-text index
+    (research_index.py) instead of re-reading the source history per question
+
 Returns:
   - {"permissionDecision": "allow"} - Question is properly sourced
   - {"permissionDecision": "allow", "message": "..."} - Allow with reminder
@@ -16,22 +20,11 @@ import json
 import sys
 from pathlib import Path
 
-STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
-
+import history_store
+import research_index
+import state_store
 
-def get_active_endpoint(state):
-    """Get active endpoint - supports both old and new state formats."""
-    if "endpoints" in state and "active_endpoint" in state:
-        active = state.get("active_endpoint")
-        if active and active in state["endpoints"]:
-            return active, state["endpoints"][active]
-        return None, None
-
-    endpoint = state.get("endpoint")
-    if endpoint:
-        return endpoint, state
-
-    return None, None
+STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 
 
 def get_research_keywords(state, endpoint_data):
@@ -45,15 +38,9 @@ def get_research_keywords(state, endpoint_data):
         words = [w.lower() for w in q.split() if len(w) > 3]
         keywords.update(words)
 
-    # From initial research sources
-    initial = endpoint_data.get("phases", {}).get("research_initial", {})
-    for src in initial.get("sources", []):
-        if isinstance(src, dict):
-            summary = src.get("summary", "")
-            words = [w.lower() for w in summary.split() if len(w) > 3]
-            keywords.update(words)
+    # Initial research sources are matched through research_index (see main)
 
-    # From deep research sources
+    # From deep research sources (only kept inline in the state)
     deep = endpoint_data.get("phases", {}).get("research_deep", {})
     for src in deep.get("sources", []):
         if isinstance(src, dict):
@@ -83,12 +70,12 @@ def main():
         sys.exit(0)
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
 
-    endpoint, endpoint_data = get_active_endpoint(state)
+    endpoint, endpoint_data = state_store.get_active_endpoint(state)
     if not endpoint or not endpoint_data:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
@@ -119,13 +106,22 @@ def main():
     question_lower = question.lower()
     found_keywords = [k for k in keywords if k in question_lower]
 
-    if not found_keywords and len(keywords) > 5:
+    # Rank the recorded sources (and their fetched pages) against the question
+    history = history_store.history_endpoint(state)
+    inline_sources = initial.get("sources", [])
+    matches = research_index.search(history, question, inline=inline_sources)
+    for match in matches:
+        found_keywords.extend(t for t in match["terms"] if t not in found_keywords)
+
+    research_terms = len(keywords) + research_index.term_count(history, inline_sources)
+    if not found_keywords and research_terms > 5:
         # No research keywords found - this might be a generic question
+        examples = (list(keywords) + research_index.top_terms(history, 10, inline_sources))[:10]
         print(json.dumps({
             "permissionDecision": "allow",
             "message": f"""NOTE: This question doesn't appear to reference terms discovered in research.
 
-Research-derived terms include: {', '.join(list(keywords)[:10])}...
+Research-derived terms include: {', '.join(examples)}...
 
 BEST PRACTICE: Interview questions should be generated FROM research findings.
 Example: "I discovered the API supports [feature]. Do you want to implement this?"
@@ -138,6 +134,7 @@ Proceeding anyway, but consider revising the question."""
     print(json.dumps({
         "permissionDecision": "allow",
         "message": f"Question references research terms: {', '.join(found_keywords[:5])}"
+                   + (f" (closest source: {matches[0]['label']})" if matches else "")
     }))
     sys.exit(0)
 
@@ -17,6 +17,9 @@ import json
 import sys
 from pathlib import Path
 
+import hook_runtime
+import state_store
+
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 
 # Minimum sources required
@@ -25,7 +28,7 @@ MIN_SOURCES = 2
 
 def main():
     try:
-        input_data = json.load(sys.stdin)
+        input_data = hook_runtime.read_input()
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
@@ -57,7 +60,7 @@ Run /api-create [endpoint-name] to start the workflow."""
         sys.exit(0)
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
@@ -68,14 +71,15 @@ Run /api-create [endpoint-name] to start the workflow."""
     status = research.get("status", "not_started")
 
     if status != "complete":
-        sources = research.get("sources", [])
+        # Only the latest sources are kept inline; source_count is the total
+        source_count = max(research.get("source_count", 0), len(research.get("sources", [])))
         user_question_asked = research.get("user_question_asked", False)
         user_approved = research.get("user_approved", False)
         summary_shown = research.get("summary_shown", False)
 
         missing = []
-        if len(sources) < MIN_SOURCES:
-            missing.append(f"Sources ({len(sources)}/{MIN_SOURCES} minimum)")
+        if source_count < MIN_SOURCES:
+            missing.append(f"Sources ({source_count}/{MIN_SOURCES} minimum)")
         if not summary_shown:
             missing.append("Research summary table not shown to user")
         if not user_question_asked:
@@ -88,7 +92,7 @@ Run /api-create [endpoint-name] to start the workflow."""
             "reason": f"""❌ BLOCKED: Initial research (Phase 3) not complete.
 
 Status: {status}
-Sources consulted: {len(sources)}
+Sources consulted: {source_count}
 Summary shown: {summary_shown}
 User question asked: {user_question_asked}
 User approved: {user_approved}
@@ -145,11 +149,11 @@ WHY: Implementation must match CURRENT API documentation."""
         sys.exit(0)
 
     # Research complete - inject context
-    sources = research.get("sources", [])
+    source_count = max(research.get("source_count", 0), len(research.get("sources", [])))
     print(json.dumps({
         "permissionDecision": "allow",
         "message": f"""✅ Initial research complete.
-Sources: {len(sources)}
+Sources: {source_count}
 User approved proceeding to interview."""
     }))
     sys.exit(0)
@@ -18,22 +18,11 @@ import sys
 import re
 from pathlib import Path
 
-STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
-
-
-def get_active_endpoint(state):
-    """Get active endpoint - supports both old and new state formats."""
-    if "endpoints" in state and "active_endpoint" in state:
-        active = state.get("active_endpoint")
-        if active and active in state["endpoints"]:
-            return active, state["endpoints"][active]
-        return None, None
+import history_store
+import hook_runtime
+import state_store
 
-    endpoint = state.get("endpoint")
-    if endpoint:
-        return endpoint, state
-
-    return None, None
+STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 
 
 def extract_schema_fields_from_content(content):
@@ -53,13 +42,13 @@ def extract_schema_fields_from_content(content):
     return fields
 
 
-def extract_interview_approved_fields(endpoint_data):
+def extract_interview_approved_fields(endpoint, endpoint_data):
     """Extract field names that were approved during interview."""
     approved_fields = set()
 
     interview = endpoint_data.get("phases", {}).get("interview", {})
     decisions = interview.get("decisions", {})
-    questions = interview.get("questions", [])
+    questions = history_store.load(endpoint, "questions", interview.get("questions", []))
 
     # Extract from decisions
     for key, value in decisions.items():
@@ -109,7 +98,7 @@ def extract_interview_approved_fields(endpoint_data):
 
 def main():
     try:
-        input_data = json.load(sys.stdin)
+        input_data = hook_runtime.read_input()
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
@@ -143,12 +132,12 @@ def main():
         sys.exit(0)
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
 
-    endpoint, endpoint_data = get_active_endpoint(state)
+    endpoint, endpoint_data = state_store.get_active_endpoint(state)
     if not endpoint or not endpoint_data:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
@@ -182,7 +171,7 @@ def main():
         sys.exit(0)
 
     # Extract approved fields from interview
-    approved_fields = extract_interview_approved_fields(endpoint_data)
+    approved_fields = extract_interview_approved_fields(endpoint, endpoint_data)
 
     if not approved_fields:
         # No interview data to compare against
@@ -18,12 +18,15 @@ import json
 import sys
 from pathlib import Path
 
+import hook_runtime
+import state_store
+
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 
 
 def main():
     try:
-        input_data = json.load(sys.stdin)
+        input_data = hook_runtime.read_input()
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
@@ -54,7 +57,7 @@ def main():
         sys.exit(0)
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
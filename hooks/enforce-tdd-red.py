@@ -18,36 +18,29 @@ import json
 import sys
 from pathlib import Path
 
+import hook_runtime
+import state_store
+import test_index
+
 # State file is in .claude/ directory (sibling to hooks/)
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 
 
 def find_test_file(route_path: str) -> tuple[bool, str]:
     """Check if a test file exists for the given route file."""
-    route_file = Path(route_path)
-
-    # Common test file patterns
-    # route.ts -> route.test.ts, __tests__/route.test.ts, route.spec.ts
-    possible_tests = [
-        route_file.with_suffix(".test.ts"),
-        route_file.with_suffix(".test.tsx"),
-        route_file.with_suffix(".spec.ts"),
-        route_file.parent / "__tests__" / f"{route_file.stem}.test.ts",
-        route_file.parent / "__tests__" / f"{route_file.stem}.test.tsx",
-        route_file.parent.parent / "__tests__" / f"{route_file.parent.name}.test.ts",
-    ]
-
-    for test_path in possible_tests:
-        if test_path.exists():
-            return True, str(test_path)
+    # route.test.ts, route.spec.ts, __tests__/route.test.ts,
+    # __tests__/<endpoint>.api.test.ts, ../__tests__/<endpoint>.test.ts, ...
+    tests = test_index.tests_for(route_path)
+    if tests:
+        return True, tests[0]
 
-    return False, str(possible_tests[0])  # Return expected path
+    return False, str(Path(route_path).with_suffix(".test.ts"))  # Return expected path
 
 
 def main():
     # Read hook input from stdin
     try:
-        input_data = json.load(sys.stdin)
+        input_data = hook_runtime.read_input()
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
@@ -61,7 +54,7 @@ def main():
         sys.exit(0)
 
     # Allow if this IS a test file (shouldn't match but safety check)
-    if ".test." in file_path or "/__tests__/" in file_path or ".spec." in file_path:
+    if test_index.is_test_file(file_path):
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
 
@@ -108,7 +101,7 @@ Example test structure:
 
     # Load state
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
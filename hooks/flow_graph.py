@@ -0,0 +1,180 @@
+"""
+Dependency graph of a combined API's source calls.
+
+combine_config only recorded a flow_type ("sequential" by default) and an
+error_strategy, so the manifest generator, the registry and the workflow
+check all treated a combined endpoint as a chain of its source APIs, even
+when most of the calls did not need each other's results.
+
+The combine workflow now records which source API needs which other API's
+results:
+
+  "combine_config": {
+    "source_elements": [{"type": "api", "name": "brandfetch"}, ...],
+    "dependencies": {"elevenlabs": ["brandfetch"], "openai": []},
+    "error_strategy": "fail-fast" | "partial" | "retry",
+    "call_timeout_ms": 5000 or {"default": 5000, "brandfetch": 2000},
+    "max_concurrency": 4
+  }
+
+Without "dependencies" the graph follows flow_type: sequential and
+conditional chain the sources in selection order, parallel has no edges.
+
+  build_graph(combine_config, decisions)   normalized graph (JSON-serializable)
+  graph_issues(graph)                      unknown dependencies and cycles
+  levels(graph)                            calls that can run together, in order
+  critical_path(graph, durations)          (ms, path) of the slowest chain
+  describe(graph)                          "a → [b || c] → d"
+
+Added in v3.11.0.
+"""
+import re
+
+FLOW_TYPES = ["sequential", "parallel", "conditional", "dag"]
+
+DEFAULT_CALL_TIMEOUT_MS = 10000
+
+# Interview answers -> error strategy (checked in order)
+ERROR_STRATEGIES = [
+    ("partial", re.compile(r"partial|continue", re.I)),
+    ("retry", re.compile(r"retry", re.I)),
+    ("fail-fast", re.compile(r"fail|abort|stop", re.I)),
+]
+
+
+def _answer(value):
+    # Decisions are {"response", "value"} dicts or plain values
+    if isinstance(value, dict):
+        value = value.get("value") or value.get("response")
+    return str(value) if value is not None else ""
+
+
+def source_names(combine_config: dict) -> list:
+    names = []
+    for elem in combine_config.get("source_elements", []):
+        name = elem.get("name", "unknown") if isinstance(elem, dict) else str(elem)
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def _flow_type(combine_config: dict, decisions: dict) -> str:
+    text = _answer(combine_config.get("flow_type")) or _answer(
+        decisions.get("execution_order") or decisions.get("flow_type"))
+    text = text.lower()
+    for flow_type in FLOW_TYPES:
+        if flow_type in text:
+            return flow_type
+    if "graph" in text or "depend" in text:
+        return "dag"
+    return "sequential"
+
+
+def _error_strategy(combine_config: dict, decisions: dict) -> str:
+    text = _answer(combine_config.get("error_strategy")) or _answer(
+        decisions.get("error_strategy") or decisions.get("error_handling"))
+    for strategy, pattern in ERROR_STRATEGIES:
+        if pattern.search(text):
+            return strategy
+    return "fail-fast"
+
+
+def build_graph(combine_config: dict, decisions: dict = None) -> dict:
+    """The combined endpoint's call graph, from combine_config (interview decisions as fallback)."""
+    decisions = decisions or {}
+    nodes = source_names(combine_config)
+    dependencies = combine_config.get("dependencies")
+    flow_type = _flow_type(combine_config, decisions)
+
+    if isinstance(dependencies, dict):
+        depends_on = {n: [d for d in dict.fromkeys(dependencies.get(n) or []) if d != n] for n in nodes}
+        if flow_type != "conditional":
+            flow_type = "dag"
+    elif flow_type == "parallel":
+        depends_on = {n: [] for n in nodes}
+    else:
+        depends_on = {n: nodes[i - 1:i] for i, n in enumerate(nodes)}
+
+    timeouts = combine_config.get("call_timeout_ms")
+    if isinstance(timeouts, dict):
+        default = timeouts.get("default", DEFAULT_CALL_TIMEOUT_MS)
+        call_timeout_ms = {n: timeouts.get(n, default) for n in nodes}
+    else:
+        call_timeout_ms = {n: timeouts or DEFAULT_CALL_TIMEOUT_MS for n in nodes}
+
+    return {
+        "flow_type": flow_type,
+        "nodes": nodes,
+        "depends_on": depends_on,
+        "error_strategy": _error_strategy(combine_config, decisions),
+        "call_timeout_ms": call_timeout_ms,
+        "max_concurrency": combine_config.get("max_concurrency") or len(nodes) or 1,
+    }
+
+
+def graph_issues(graph: dict) -> list:
+    """Dependencies on unknown calls, and dependency cycles."""
+    issues = []
+    nodes = set(graph["nodes"])
+    for node, deps in graph["depends_on"].items():
+        for dep in deps:
+            if dep not in nodes:
+                issues.append(f"'{node}' depends on '{dep}', which is not a selected source API")
+    try:
+        levels(graph)
+    except ValueError as e:
+        issues.append(str(e))
+    return issues
+
+
+def levels(graph: dict) -> list:
+    """Calls grouped into waves: every call's dependencies are in earlier waves.
+
+    Raises ValueError on a cycle.
+    """
+    nodes = graph["nodes"]
+    known = set(nodes)
+    remaining = {n: {d for d in graph["depends_on"].get(n, []) if d in known} for n in nodes}
+    done, waves = set(), []
+    while remaining:
+        wave = [n for n in nodes if n in remaining and remaining[n] <= done]
+        if not wave:
+            raise ValueError(f"dependency cycle between {', '.join(sorted(remaining))}")
+        for n in wave:
+            del remaining[n]
+        done.update(wave)
+        waves.append(wave)
+    return waves
+
+
+def critical_path(graph: dict, durations: dict) -> tuple:
+    """(ms, [calls]) of the slowest dependency chain, given each call's duration.
+
+    With unlimited concurrency this is the least time the whole flow can take;
+    calls without a duration count as 0.
+    """
+    finish, via = {}, {}
+    for wave in levels(graph):
+        for node in wave:
+            deps = [d for d in graph["depends_on"].get(node, []) if d in finish]
+            before = max(deps, key=lambda d: finish[d]) if deps else None
+            finish[node] = (finish[before] if before else 0) + float(durations.get(node) or 0)
+            via[node] = before
+    if not finish:
+        return 0.0, []
+
+    node = max(graph["nodes"], key=lambda n: finish[n])
+    total, path = finish[node], []
+    while node is not None:
+        path.append(node)
+        node = via[node]
+    return total, path[::-1]
+
+
+def describe(graph: dict) -> str:
+    """The flow as text: waves in order, concurrent calls in brackets."""
+    try:
+        waves = levels(graph)
+    except ValueError:
+        return " ⟲ ".join(graph["nodes"])
+    return " → ".join(wave[0] if len(wave) == 1 else f"[{' || '.join(wave)}]" for wave in waves)
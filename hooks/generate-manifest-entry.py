@@ -15,151 +15,47 @@ What it generates:
   - Test cases from the test file
   - Response schema
 
+Updated in v3.11.0:
+  - Endpoints with a cache_strategy interview decision get ordered
+    cache test cases (miss, hit on repeated and on equivalent input,
+    no-cache bypass) asserting the route's X-Cache header
+  - Combined endpoints are described by their call graph (flow_graph.py):
+    orchestration examples show which calls run concurrently, a test case
+    asserts the total latency stays close to the critical path, and the
+    graph is recorded in the entry's metadata
+  - A combined endpoint's build-cache key covers the route and schema files
+    of the APIs it combines (impact.dependencies), so a changed base API
+    regenerates the combined entry; the hook reports which registry entries
+    the regenerated endpoint affects (impact.py)
+
 Returns:
   - {"continue": true} - Always continues
 """
+import hashlib
 import json
-import sys
 import re
+import sys
 from datetime import datetime
 from pathlib import Path
 
+import flow_graph
+import impact
+import manifest_cache
+import state_store
+import zod_parser
+
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 # Default manifest location - can be overridden
 DEFAULT_MANIFEST = Path.cwd() / "src" / "app" / "api-test" / "api-tests-manifest.json"
 
 
-def get_active_endpoint(state):
-    """Get active endpoint - supports both old and new state formats."""
-    if "endpoints" in state and "active_endpoint" in state:
-        active = state.get("active_endpoint")
-        if active and active in state["endpoints"]:
-            return active, state["endpoints"][active]
-        return None, None
-
-    endpoint = state.get("endpoint")
-    if endpoint:
-        return endpoint, state
-
-    return None, None
-
+def parse_zod_schema(schema_content: str, schema_path: Path = None) -> dict:
+    """Parse Zod schema content into a JSON Schema for the request body.
 
-def parse_zod_schema(schema_content: str) -> dict:
-    """Parse Zod schema content and extract all field information."""
-    properties = {}
-    required = []
-
-    # Match Zod object definitions
-    # Pattern: fieldName: z.type(...).chain()
-    field_pattern = r'(\w+):\s*z\.(\w+)\(([^)]*)\)([^\n,}]*)'
-
-    for match in re.finditer(field_pattern, schema_content):
-        field_name = match.group(1)
-        zod_type = match.group(2)
-        type_args = match.group(3)
-        chain = match.group(4) or ""
-
-        # Skip if it's not a real field
-        if field_name in {'z', 'const', 'export', 'type', 'schema'}:
-            continue
-
-        prop = {}
-
-        # Map Zod types to JSON Schema types
-        type_map = {
-            "string": "string",
-            "number": "number",
-            "boolean": "boolean",
-            "array": "array",
-            "object": "object",
-            "date": "string",
-            "bigint": "integer",
-            "any": "any",
-            "unknown": "any",
-            "null": "null",
-            "undefined": "null",
-            "void": "null",
-            "never": "null",
-        }
-
-        # Handle enum
-        if zod_type == "enum":
-            prop["type"] = "string"
-            # Extract enum values: z.enum(["a", "b", "c"])
-            enum_match = re.search(r'\[([^\]]+)\]', type_args)
-            if enum_match:
-                enum_str = enum_match.group(1)
-                enum_values = re.findall(r'["\']([^"\']+)["\']', enum_str)
-                if enum_values:
-                    prop["enum"] = enum_values
-        elif zod_type == "literal":
-            prop["type"] = "string"
-            literal_match = re.search(r'["\']([^"\']+)["\']', type_args)
-            if literal_match:
-                prop["const"] = literal_match.group(1)
-        elif zod_type == "union":
-            prop["type"] = "string"  # Simplified
-        elif zod_type == "array":
-            prop["type"] = "array"
-            prop["items"] = {"type": "any"}
-        else:
-            prop["type"] = type_map.get(zod_type, "string")
-
-        # Check for optional
-        is_optional = ".optional()" in chain or ".nullish()" in chain
-
-        # Extract description
-        desc_match = re.search(r'\.describe\(["\']([^"\']+)["\']', chain)
-        if desc_match:
-            prop["description"] = desc_match.group(1)
-
-        # Extract default
-        default_match = re.search(r'\.default\(([^)]+)\)', chain)
-        if default_match:
-            default_val = default_match.group(1).strip()
-            # Try to parse the default value
-            if default_val.startswith('"') or default_val.startswith("'"):
-                prop["default"] = default_val.strip('"\'')
-            elif default_val == "true":
-                prop["default"] = True
-            elif default_val == "false":
-                prop["default"] = False
-            elif default_val.isdigit():
-                prop["default"] = int(default_val)
-            else:
-                try:
-                    prop["default"] = float(default_val)
-                except ValueError:
-                    prop["default"] = default_val
-
-        # Extract min/max for numbers
-        min_match = re.search(r'\.min\((\d+)\)', chain)
-        if min_match:
-            prop["minimum"] = int(min_match.group(1))
-
-        max_match = re.search(r'\.max\((\d+)\)', chain)
-        if max_match:
-            prop["maximum"] = int(max_match.group(1))
-
-        # Extract minLength/maxLength for strings
-        min_len_match = re.search(r'\.min\((\d+)\)', chain)
-        if min_len_match and prop.get("type") == "string":
-            prop["minLength"] = int(min_len_match.group(1))
-
-        max_len_match = re.search(r'\.max\((\d+)\)', chain)
-        if max_len_match and prop.get("type") == "string":
-            prop["maxLength"] = int(max_len_match.group(1))
-
-        properties[field_name] = prop
-
-        if not is_optional:
-            required.append(field_name)
-
-    return {
-        "type": "object",
-        "properties": properties,
-        "required": required
-    }
+    Nested objects, arrays, unions and multi-line chains are handled by
+    zod_parser; results are memoized by content hash and cached per schema file.
+    """
+    return zod_parser.parse_schema(schema_content, str(schema_path) if schema_path else None)
 
 
 def detect_http_method(route_content: str) -> str:
@@ -200,6 +96,9 @@ def generate_example_value(prop: dict, field_name: str, variant: str = "default"
     if "const" in prop:
         return prop["const"]
 
+    if prop.get("anyOf"):
+        return generate_example_value(prop["anyOf"][0], field_name, variant)
+
     if variant == "default" and "default" in prop:
         return prop["default"]
 
@@ -304,12 +203,201 @@ def get_all_enum_fields(properties: dict) -> list:
     return enum_fields
 
 
-def generate_curl_examples(endpoint: str, method: str, schema: dict) -> list:
+# Test case / example generation options (state["test_generation"], or per
+# endpoint in endpoints[name]["test_generation"]):
+#   strategy:        "all"      - one valid case per enum value per enum field
+#                    "pairwise" - valid enum cases cover every pair of values
+#                                 across enum fields in as few cases as possible
+#   max_test_cases:  cap on test cases (None = no cap)
+#   max_examples:    cap on curl examples (None = no cap)
+DEFAULT_TEST_GENERATION = {
+    "strategy": "all",
+    "max_test_cases": None,
+    "max_examples": None,
+}
+GENERATION_CAPS = ("max_test_cases", "max_examples")
+
+
+def _cap_value(value):
+    """A cap as an int >= 1, None for no cap, or ValueError if it isn't a number."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError(value)
+    return max(1, int(float(value)))
+
+
+def test_generation_options(endpoint_data: dict, state: dict) -> dict:
+    """Merge state-wide and per-endpoint test_generation options over the defaults.
+
+    Caps are coerced to int and clamped at 1; values that are not numbers
+    are ignored, null switches a cap off.
+    """
+    options = dict(DEFAULT_TEST_GENERATION)
+    for overrides in (state.get("test_generation"), endpoint_data.get("test_generation")):
+        if not isinstance(overrides, dict):
+            continue
+        for key, value in overrides.items():
+            if key in GENERATION_CAPS:
+                try:
+                    value = _cap_value(value)
+                except (TypeError, ValueError, OverflowError):
+                    continue
+            options[key] = value
+    return options
+
+
+class ExampleValues:
+    """generate_example_value() results for one schema, computed once per (field, variant).
+
+    Request bodies built from these share the value objects; they are only
+    serialized, never mutated.
+    """
+
+    def __init__(self, properties: dict):
+        self.properties = properties
+        self._values = {}
+
+    def get(self, field: str, variant: str = "default"):
+        key = (field, variant)
+        if key not in self._values:
+            self._values[key] = generate_example_value(self.properties[field], field, variant)
+        return self._values[key]
+
+    def body(self, fields, variant: str = "default") -> dict:
+        return {f: self.get(f, variant) for f in fields if f in self.properties}
+
+
+def derive_body(base: dict, changes: dict = None, drop: str = None) -> dict:
+    """Copy-on-write variant of a base body: base plus changes, minus drop."""
+    body = dict(base)
+    if drop is not None:
+        body.pop(drop, None)
+    if changes:
+        body.update(changes)
+    return body
+
+
+class CaseSet:
+    """Ordered cases, deduplicated by a canonical hash of their body.
+
+    Each case has a category; cap() keeps the cases spread over categories
+    instead of truncating the tail (which would drop whole categories).
+    """
+
+    def __init__(self):
+        self.cases = []
+        self._seen = set()
+
+    def seen(self, body: dict, *discriminators) -> bool:
+        """Record a body; True if an identical one was already added."""
+        canonical = json.dumps([body, discriminators], sort_keys=True, default=str)
+        digest = hashlib.sha1(canonical.encode()).digest()
+        if digest in self._seen:
+            return True
+        self._seen.add(digest)
+        return False
+
+    def append(self, category: str, case: dict) -> None:
+        self.cases.append((category, case))
+
+    def cap(self, limit) -> list:
+        """Return at most limit cases, taken round-robin across categories, in original order."""
+        if not limit or len(self.cases) <= limit:
+            return [case for _, case in self.cases]
+
+        by_category = {}
+        for i, (category, _) in enumerate(self.cases):
+            by_category.setdefault(category, []).append(i)
+
+        keep = set()
+        queues = list(by_category.values())
+        depth = 0
+        while len(keep) < limit:
+            for queue in queues:
+                if depth < len(queue) and len(keep) < limit:
+                    keep.add(queue[depth])
+            depth += 1
+        return [case for i, (_, case) in enumerate(self.cases) if i in keep]
+
+
+def pairwise_rows(factors: list) -> list:
+    """Rows (one value index per factor) covering every pair of values of any two factors.
+
+    Greedy construction: each row starts from the uncovered pair whose values
+    have the most pairs left to cover, then picks for every other factor the
+    value covering the most still-uncovered pairs with the row so far.
+    """
+    uncovered = set()
+    for i in range(len(factors)):
+        for j in range(i + 1, len(factors)):
+            for a in range(len(factors[i])):
+                for b in range(len(factors[j])):
+                    uncovered.add((i, a, j, b))
+
+    # (factor, value) -> number of its pairs not covered yet
+    open_pairs = {}
+    for i, a, j, b in uncovered:
+        open_pairs[(i, a)] = open_pairs.get((i, a), 0) + 1
+        open_pairs[(j, b)] = open_pairs.get((j, b), 0) + 1
+
+    rows = []
+    while uncovered:
+        i, a, j, b = max(uncovered, key=lambda p: (
+            open_pairs[(p[0], p[1])] + open_pairs[(p[2], p[3])], [-x for x in p]))
+        row = [None] * len(factors)
+        row[i], row[j] = a, b
+        for k in range(len(factors)):
+            if row[k] is not None:
+                continue
+            best, best_score = 0, None
+            for v in range(len(factors[k])):
+                gain = 0
+                for m, w in enumerate(row):
+                    if w is None:
+                        continue
+                    pair = (m, w, k, v) if m < k else (k, v, m, w)
+                    if pair in uncovered:
+                        gain += 1
+                score = (gain, open_pairs.get((k, v), 0))
+                if best_score is None or score > best_score:
+                    best, best_score = v, score
+            row[k] = best
+        for m in range(len(row)):
+            for n in range(m + 1, len(row)):
+                pair = (m, row[m], n, row[n])
+                if pair in uncovered:
+                    uncovered.discard(pair)
+                    open_pairs[(m, row[m])] -= 1
+                    open_pairs[(n, row[n])] -= 1
+        rows.append(row)
+    return rows
+
+
+def pairwise_enum_changes(enum_fields: list, per_field: int) -> list:
+    """Field -> value assignments covering every pair of values of any two enum fields."""
+    factors = [f["values"][:per_field] for f in enum_fields]
+    return [
+        {f["name"]: factors[k][v] for k, (f, v) in enumerate(zip(enum_fields, row))}
+        for row in pairwise_rows(factors)
+    ]
+
+
+def use_pairwise(enum_fields: list, options: dict) -> bool:
+    return options.get("strategy") == "pairwise" and len(enum_fields) > 1
+
+
+def generate_curl_examples(endpoint: str, method: str, schema: dict, options: dict = None) -> list:
     """Generate comprehensive curl examples covering all parameter possibilities."""
-    examples = []
+    options = options or DEFAULT_TEST_GENERATION
+    examples = CaseSet()
     properties = schema.get("properties", {})
     required = schema.get("required", [])
 
+    # Example values are computed once; every request body derives from base
+    values = ExampleValues(properties)
+    base = values.body(required)
+
     base_url = f"http://localhost:3001/api/v2/{endpoint}"
 
     def make_curl(body: dict, extra_headers: list = None) -> str:
@@ -338,114 +426,71 @@ def generate_curl_examples(endpoint: str, method: str, schema: dict) -> list:
                     curl += f" \\\n  -H \"{h}\""
         return curl
 
+    def add(category: str, name: str, description: str, body: dict, extra_headers: list = None):
+        """Add an example unless an identical request was already added."""
+        if examples.seen(body, extra_headers):
+            return
+        examples.append(category, {
+            "name": name,
+            "description": description,
+            "request": body,
+            "curl": make_curl(body, extra_headers)
+        })
+
     # ================================================================
     # Example 1: Minimal (required fields only)
     # ================================================================
-    if required:
-        minimal_body = {}
-        for field in required:
-            if field in properties:
-                minimal_body[field] = generate_example_value(properties[field], field, "default")
-
-        if minimal_body:
-            examples.append({
-                "name": "Minimal (required fields only)",
-                "description": f"Request with only required fields: {', '.join(required)}",
-                "request": minimal_body,
-                "curl": make_curl(minimal_body)
-            })
+    if required and base:
+        add("basic", "Minimal (required fields only)",
+            f"Request with only required fields: {', '.join(required)}", base)
 
     # ================================================================
     # Example 2: Full (all parameters)
     # ================================================================
     if properties:
-        full_body = {}
-        for field, prop in properties.items():
-            full_body[field] = generate_example_value(prop, field, "default")
-
-        examples.append({
-            "name": "Full (all parameters)",
-            "description": f"Request with all {len(properties)} parameters",
-            "request": full_body,
-            "curl": make_curl(full_body)
-        })
+        add("basic", "Full (all parameters)",
+            f"Request with all {len(properties)} parameters", values.body(properties))
 
     # ================================================================
     # Example 3: With authentication header
     # ================================================================
-    auth_body = {}
-    for field in required[:2]:  # First 2 required fields
-        if field in properties:
-            auth_body[field] = generate_example_value(properties[field], field, "default")
+    auth_body = values.body(required[:2])  # First 2 required fields
     if not auth_body:
         auth_body = {"param": "value"}
-
-    examples.append({
-        "name": "With authentication",
-        "description": "Request with X-API-Key header",
-        "request": auth_body,
-        "curl": make_curl(auth_body, ["X-API-Key: your-api-key"])
-    })
+    add("basic", "With authentication", "Request with X-API-Key header",
+        auth_body, ["X-API-Key: your-api-key"])
 
     # ================================================================
-    # Example 4-N: Enum variations (one example per enum field per value)
+    # Example 4-N: Enum variations (one example per enum field per value,
+    # or pairwise combinations)
     # ================================================================
     enum_fields = get_all_enum_fields(properties)
-    for enum_field in enum_fields:
-        field_name = enum_field["name"]
-        enum_values = enum_field["values"]
-
-        for i, enum_val in enumerate(enum_values[:4]):  # Cap at 4 values per enum
-            enum_body = {}
-            # Include required fields
-            for field in required:
-                if field in properties:
-                    enum_body[field] = generate_example_value(properties[field], field, "default")
-            # Set the enum field to this specific value
-            enum_body[field_name] = enum_val
-
-            examples.append({
-                "name": f"{field_name}={enum_val}",
-                "description": f"Using {field_name} option: {enum_val}",
-                "request": enum_body,
-                "curl": make_curl(enum_body)
-            })
+    if use_pairwise(enum_fields, options):
+        for n, changes in enumerate(pairwise_enum_changes(enum_fields, 4), 1):
+            summary = ", ".join(f"{k}={v}" for k, v in changes.items())
+            add("enum", f"Enum combination {n}", f"Using {summary}", derive_body(base, changes))
+    else:
+        for enum_field in enum_fields:
+            field_name = enum_field["name"]
+            for enum_val in enum_field["values"][:4]:  # Cap at 4 values per enum
+                add("enum", f"{field_name}={enum_val}", f"Using {field_name} option: {enum_val}",
+                    derive_body(base, {field_name: enum_val}))
 
     # ================================================================
     # Example: Alternative values
     # ================================================================
     if len(properties) > 1:
-        alt_body = {}
-        for field, prop in properties.items():
-            alt_body[field] = generate_example_value(prop, field, "alt")
-
-        examples.append({
-            "name": "Alternative values",
-            "description": "Request with alternative/varied parameter values",
-            "request": alt_body,
-            "curl": make_curl(alt_body)
-        })
+        add("basic", "Alternative values", "Request with alternative/varied parameter values",
+            values.body(properties, "alt"))
 
     # ================================================================
     # Example: Array fields with multiple items
     # ================================================================
     array_fields = [f for f, p in properties.items() if p.get("type") == "array"]
     if array_fields:
-        array_body = {}
-        for field in required:
-            if field in properties:
-                array_body[field] = generate_example_value(properties[field], field, "default")
-
-        # Show arrays with multiple items
-        for field in array_fields:
-            array_body[field] = generate_example_value(properties[field], field, "multiple")
-
-        examples.append({
-            "name": "With array items",
-            "description": f"Request showing array fields with multiple items: {', '.join(array_fields)}",
-            "request": array_body,
-            "curl": make_curl(array_body)
-        })
+        add("array", "With array items",
+            f"Request showing array fields with multiple items: {', '.join(array_fields)}",
+            derive_body(base, values.body(array_fields, "multiple")))
 
     # ================================================================
     # Example: Boundary values (min/max)
@@ -454,116 +499,73 @@ def generate_curl_examples(endpoint: str, method: str, schema: dict) -> list:
                       if p.get("type") in ["number", "integer"]
                       and (p.get("minimum") is not None or p.get("maximum") is not None)]
     if numeric_fields:
-        # Minimum values example
-        min_body = {}
-        for field in required:
-            if field in properties:
-                if field in numeric_fields:
-                    min_body[field] = generate_example_value(properties[field], field, "min")
-                else:
-                    min_body[field] = generate_example_value(properties[field], field, "default")
-        for field in numeric_fields:
-            min_body[field] = generate_example_value(properties[field], field, "min")
-
-        examples.append({
-            "name": "Minimum boundary values",
-            "description": f"Request with minimum values for: {', '.join(numeric_fields)}",
-            "request": min_body,
-            "curl": make_curl(min_body)
-        })
-
-        # Maximum values example
-        max_body = {}
-        for field in required:
-            if field in properties:
-                if field in numeric_fields:
-                    max_body[field] = generate_example_value(properties[field], field, "max")
-                else:
-                    max_body[field] = generate_example_value(properties[field], field, "default")
-        for field in numeric_fields:
-            max_body[field] = generate_example_value(properties[field], field, "max")
-
-        examples.append({
-            "name": "Maximum boundary values",
-            "description": f"Request with maximum values for: {', '.join(numeric_fields)}",
-            "request": max_body,
-            "curl": make_curl(max_body)
-        })
+        add("boundary", "Minimum boundary values",
+            f"Request with minimum values for: {', '.join(numeric_fields)}",
+            derive_body(base, values.body(numeric_fields, "min")))
+        add("boundary", "Maximum boundary values",
+            f"Request with maximum values for: {', '.join(numeric_fields)}",
+            derive_body(base, values.body(numeric_fields, "max")))
 
     # ================================================================
     # Example: Optional fields only (no required - for APIs with all optional)
     # ================================================================
     optional_fields = [f for f in properties.keys() if f not in required]
     if optional_fields and len(optional_fields) > 1:
-        optional_body = {}
-        for field in optional_fields[:3]:  # First 3 optional
-            optional_body[field] = generate_example_value(properties[field], field, "default")
-
-        # Must include required fields too
-        for field in required:
-            if field in properties:
-                optional_body[field] = generate_example_value(properties[field], field, "default")
+        # First 3 optional, plus the required fields
+        optional_body = derive_body(values.body(optional_fields[:3]), base)
 
         if len(optional_body) != len(properties):  # Only if different from full
-            examples.append({
-                "name": "With optional parameters",
-                "description": f"Request including optional fields: {', '.join(optional_fields[:3])}",
-                "request": optional_body,
-                "curl": make_curl(optional_body)
-            })
+            add("optional", "With optional parameters",
+                f"Request including optional fields: {', '.join(optional_fields[:3])}",
+                optional_body)
 
-    return examples
+    return examples.cap(options.get("max_examples"))
 
 
-def generate_test_cases(schema: dict) -> list:
+def generate_test_cases(schema: dict, options: dict = None) -> list:
     """Generate comprehensive test case definitions covering all parameter scenarios."""
-    test_cases = []
+    options = options or DEFAULT_TEST_GENERATION
+    test_cases = CaseSet()
     properties = schema.get("properties", {})
     required = schema.get("required", [])
 
-    # Helper to create valid base body
-    def make_valid_body():
-        body = {}
-        for field in required:
-            if field in properties:
-                body[field] = generate_example_value(properties[field], field, "default")
-        return body
+    # Valid base body, built once; each case is a copy-on-write variant of it
+    values = ExampleValues(properties)
+    base = values.body(required)
+
+    def add(category: str, case: dict):
+        """Add a test case unless an identical input/status pair was already added."""
+        if not test_cases.seen(case["input"], case["expectedStatus"]):
+            test_cases.append(category, case)
 
     # ================================================================
     # SUCCESS CASES
     # ================================================================
 
     # Test: Valid request with required fields only
-    valid_body = make_valid_body()
-    if valid_body:
-        test_cases.append({
+    if base:
+        add("success", {
             "name": "Valid request (required only)",
             "description": "Should succeed with valid required parameters",
-            "input": valid_body,
+            "input": base,
             "expectedStatus": 200
         })
 
     # Test: Valid request with all fields
     if properties:
-        full_body = {}
-        for field, prop in properties.items():
-            full_body[field] = generate_example_value(prop, field, "default")
-        test_cases.append({
+        add("success", {
             "name": "Valid request (all fields)",
             "description": f"Should succeed with all {len(properties)} parameters",
-            "input": full_body,
+            "input": values.body(properties),
             "expectedStatus": 200
         })
 
     # Test: Valid request with alternative values
     if len(properties) > 1:
-        alt_body = {}
-        for field, prop in properties.items():
-            alt_body[field] = generate_example_value(prop, field, "alt")
-        test_cases.append({
+        add("success", {
             "name": "Valid request (alternative values)",
             "description": "Should succeed with different valid values",
-            "input": alt_body,
+            "input": values.body(properties, "alt"),
             "expectedStatus": 200
         })
 
@@ -571,28 +573,36 @@ def generate_test_cases(schema: dict) -> list:
     # ENUM VALIDATION TESTS
     # ================================================================
     enum_fields = get_all_enum_fields(properties)
+    pairwise = use_pairwise(enum_fields, options)
+    if pairwise:
+        for n, changes in enumerate(pairwise_enum_changes(enum_fields, 3), 1):
+            summary = ", ".join(f"{k}='{v}'" for k, v in changes.items())
+            add("enum", {
+                "name": f"Valid enum combination {n}",
+                "description": f"Should succeed with {summary}",
+                "input": derive_body(base, changes),
+                "expectedStatus": 200
+            })
+
     for enum_field in enum_fields:
         field_name = enum_field["name"]
         enum_values = enum_field["values"]
 
         # Test: Each valid enum value
-        for enum_val in enum_values[:3]:  # First 3 values
-            enum_body = make_valid_body()
-            enum_body[field_name] = enum_val
-            test_cases.append({
-                "name": f"Valid enum: {field_name}={enum_val}",
-                "description": f"Should succeed with {field_name}='{enum_val}'",
-                "input": enum_body,
-                "expectedStatus": 200
-            })
+        if not pairwise:
+            for enum_val in enum_values[:3]:  # First 3 values
+                add("enum", {
+                    "name": f"Valid enum: {field_name}={enum_val}",
+                    "description": f"Should succeed with {field_name}='{enum_val}'",
+                    "input": derive_body(base, {field_name: enum_val}),
+                    "expectedStatus": 200
+                })
 
         # Test: Invalid enum value
-        invalid_enum_body = make_valid_body()
-        invalid_enum_body[field_name] = "INVALID_ENUM_VALUE_XYZ"
-        test_cases.append({
+        add("enum", {
             "name": f"Invalid enum: {field_name}",
             "description": f"Should fail with invalid {field_name} value",
-            "input": invalid_enum_body,
+            "input": derive_body(base, {field_name: "INVALID_ENUM_VALUE_XYZ"}),
             "expectedStatus": 400,
             "expectedError": f"Invalid {field_name}"
         })
@@ -601,13 +611,11 @@ def generate_test_cases(schema: dict) -> list:
     # REQUIRED FIELD TESTS
     # ================================================================
     for req_field in required:
-        missing_body = make_valid_body()
-        if req_field in missing_body:
-            del missing_body[req_field]
-            test_cases.append({
+        if req_field in base:
+            add("required", {
                 "name": f"Missing required: {req_field}",
                 "description": f"Should fail when {req_field} is missing",
-                "input": missing_body,
+                "input": derive_body(base, drop=req_field),
                 "expectedStatus": 400,
                 "expectedError": f"Required"
             })
@@ -615,33 +623,24 @@ def generate_test_cases(schema: dict) -> list:
     # ================================================================
     # TYPE VALIDATION TESTS
     # ================================================================
+    wrong_types = {
+        "string": (12345, "number instead of string"),  # Number instead of string
+        "number": ("not-a-number", "string instead of number"),
+        "integer": ("not-a-number", "string instead of number"),
+        "boolean": ("not-a-boolean", "string instead of boolean"),
+        "array": ("not-an-array", "string instead of array"),
+        "object": ("not-an-object", "string instead of object"),
+    }
     for field_name, prop in properties.items():
         field_type = prop.get("type", "string")
-        invalid_body = make_valid_body()
-
-        # Generate wrong type based on field type
-        if field_type == "string":
-            invalid_body[field_name] = 12345  # Number instead of string
-            type_desc = "number instead of string"
-        elif field_type in ["number", "integer"]:
-            invalid_body[field_name] = "not-a-number"
-            type_desc = "string instead of number"
-        elif field_type == "boolean":
-            invalid_body[field_name] = "not-a-boolean"
-            type_desc = "string instead of boolean"
-        elif field_type == "array":
-            invalid_body[field_name] = "not-an-array"
-            type_desc = "string instead of array"
-        elif field_type == "object":
-            invalid_body[field_name] = "not-an-object"
-            type_desc = "string instead of object"
-        else:
+        if field_type not in wrong_types:
             continue
+        wrong_value, type_desc = wrong_types[field_type]
 
-        test_cases.append({
+        add("type", {
             "name": f"Invalid type: {field_name}",
             "description": f"Should fail with {type_desc} for {field_name}",
-            "input": invalid_body,
+            "input": derive_body(base, {field_name: wrong_value}),
             "expectedStatus": 400
         })
 
@@ -658,43 +657,35 @@ def generate_test_cases(schema: dict) -> list:
 
             if minimum is not None:
                 # Test at minimum (should pass)
-                min_body = make_valid_body()
-                min_body[field_name] = minimum
-                test_cases.append({
+                add("boundary", {
                     "name": f"Boundary: {field_name} at minimum ({minimum})",
                     "description": f"Should succeed at minimum value",
-                    "input": min_body,
+                    "input": derive_body(base, {field_name: minimum}),
                     "expectedStatus": 200
                 })
 
                 # Test below minimum (should fail)
-                below_min_body = make_valid_body()
-                below_min_body[field_name] = minimum - 1
-                test_cases.append({
+                add("boundary", {
                     "name": f"Boundary: {field_name} below minimum",
                     "description": f"Should fail below minimum ({minimum - 1} < {minimum})",
-                    "input": below_min_body,
+                    "input": derive_body(base, {field_name: minimum - 1}),
                     "expectedStatus": 400
                 })
 
             if maximum is not None:
                 # Test at maximum (should pass)
-                max_body = make_valid_body()
-                max_body[field_name] = maximum
-                test_cases.append({
+                add("boundary", {
                     "name": f"Boundary: {field_name} at maximum ({maximum})",
                     "description": f"Should succeed at maximum value",
-                    "input": max_body,
+                    "input": derive_body(base, {field_name: maximum}),
                     "expectedStatus": 200
                 })
 
                 # Test above maximum (should fail)
-                above_max_body = make_valid_body()
-                above_max_body[field_name] = maximum + 1
-                test_cases.append({
+                add("boundary", {
                     "name": f"Boundary: {field_name} above maximum",
                     "description": f"Should fail above maximum ({maximum + 1} > {maximum})",
-                    "input": above_max_body,
+                    "input": derive_body(base, {field_name: maximum + 1}),
                     "expectedStatus": 400
                 })
 
@@ -705,23 +696,19 @@ def generate_test_cases(schema: dict) -> list:
 
             if min_length is not None and min_length > 0:
                 # Test below minLength
-                short_body = make_valid_body()
-                short_body[field_name] = "x" * (min_length - 1) if min_length > 1 else ""
-                test_cases.append({
+                add("boundary", {
                     "name": f"Boundary: {field_name} too short",
                     "description": f"Should fail when {field_name} < {min_length} chars",
-                    "input": short_body,
+                    "input": derive_body(base, {field_name: "x" * (min_length - 1) if min_length > 1 else ""}),
                     "expectedStatus": 400
                 })
 
             if max_length is not None:
                 # Test above maxLength
-                long_body = make_valid_body()
-                long_body[field_name] = "x" * (max_length + 1)
-                test_cases.append({
+                add("boundary", {
                     "name": f"Boundary: {field_name} too long",
                     "description": f"Should fail when {field_name} > {max_length} chars",
-                    "input": long_body,
+                    "input": derive_body(base, {field_name: "x" * (max_length + 1)}),
                     "expectedStatus": 400
                 })
 
@@ -731,22 +718,18 @@ def generate_test_cases(schema: dict) -> list:
     array_fields = [(f, p) for f, p in properties.items() if p.get("type") == "array"]
     for field_name, prop in array_fields:
         # Empty array (if allowed)
-        empty_array_body = make_valid_body()
-        empty_array_body[field_name] = []
-        test_cases.append({
+        add("array", {
             "name": f"Array: {field_name} empty",
             "description": f"Test with empty {field_name} array",
-            "input": empty_array_body,
+            "input": derive_body(base, {field_name: []}),
             "expectedStatus": 200  # Usually allowed unless minItems
         })
 
         # Array with multiple items
-        multi_array_body = make_valid_body()
-        multi_array_body[field_name] = generate_example_value(prop, field_name, "multiple")
-        test_cases.append({
+        add("array", {
             "name": f"Array: {field_name} multiple items",
             "description": f"Test with multiple items in {field_name}",
-            "input": multi_array_body,
+            "input": derive_body(base, {field_name: values.get(field_name, "multiple")}),
             "expectedStatus": 200
         })
 
@@ -755,7 +738,7 @@ def generate_test_cases(schema: dict) -> list:
     # ================================================================
 
     # Empty body
-    test_cases.append({
+    add("edge", {
         "name": "Empty body",
         "description": "Should fail with empty request body",
         "input": {},
@@ -764,52 +747,146 @@ def generate_test_cases(schema: dict) -> list:
 
     # Null values for required fields
     for req_field in required[:2]:  # First 2 required
-        null_body = make_valid_body()
-        null_body[req_field] = None
-        test_cases.append({
+        add("edge", {
             "name": f"Null value: {req_field}",
             "description": f"Should fail when {req_field} is null",
-            "input": null_body,
+            "input": derive_body(base, {req_field: None}),
             "expectedStatus": 400
         })
 
     # Extra unknown field (should be ignored or error depending on strictness)
-    extra_field_body = make_valid_body()
-    extra_field_body["unknownExtraField123"] = "should-be-ignored"
-    test_cases.append({
+    add("edge", {
         "name": "Extra unknown field",
         "description": "Test behavior with unexpected field",
-        "input": extra_field_body,
+        "input": derive_body(base, {"unknownExtraField123": "should-be-ignored"}),
         "expectedStatus": 200,  # Most APIs ignore extra fields
         "note": "Depends on schema strictness"
     })
 
-    return test_cases
+    return test_cases.cap(options.get("max_test_cases"))
+
+
+# Response cache (templates/api/response-cache.ts) chosen in the interview
+# (checked in order: "stale-while-revalidate" also mentions revalidation)
+CACHE_STRATEGIES = [
+    ("swr", re.compile(r"stale|swr", re.I)),
+    ("next-tags", re.compile(r"tag|revalidate|next\.?js", re.I)),
+    ("lru", re.compile(r"lru|memory|ttl", re.I)),
+]
+
+NO_CACHE = re.compile(r"^\s*(?:no|none)\b|\bno cach|\bdon'?t cache", re.I)
+
+TTL = re.compile(r"(\d+(?:\.\d+)?)\s*(s|sec|seconds?|m|min|minutes?|h|hours?)?\b", re.I)
+
+TTL_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+DEFAULT_CACHE_TTL = 60
+
+
+def cache_strategy(decisions: dict):
+    """{"strategy", "ttlSeconds"} from the cache_strategy decision, or None without caching."""
+    answer = decisions.get("cache_strategy")
+    if not isinstance(answer, dict):
+        return None
+    text = str(answer.get("value") or answer.get("response") or "")
+    if NO_CACHE.search(text):
+        return None
+    strategy = next((name for name, pattern in CACHE_STRATEGIES if pattern.search(text)), None)
+    if strategy is None:
+        return None
+
+    ttl = DEFAULT_CACHE_TTL
+    match = TTL.search(text)
+    if match:
+        unit = (match.group(2) or "s")[0].lower()
+        ttl = int(float(match.group(1)) * TTL_UNITS[unit])
+    return {"strategy": strategy, "ttlSeconds": ttl}
+
+
+def generate_cache_test_cases(schema: dict, cache: dict) -> list:
+    """Ordered cases proving the cache layer: each depends on the one before it.
+
+    The route answers with X-Cache HIT/MISS/STALE/BYPASS; "Cache-Control:
+    no-cache" skips the lookup (lru/swr refill the entry, next-tags bypasses
+    the data cache, which has no per-entry refresh).
+    """
+    properties = schema.get("properties", {})
+    values = ExampleValues(properties)
+    body = values.body(schema.get("required", [])) or values.body(properties)
+    no_cache = {"Cache-Control": "no-cache"}
+    in_memory = cache["strategy"] in ("lru", "swr")
+
+    cases = []
+
+    def add(case: dict):
+        if cases:
+            case["dependsOn"] = cases[-1]["name"]
+        cases.append(case)
+
+    if in_memory:
+        add({
+            "name": "Cache miss (no-cache request)",
+            "description": "Should call the upstream API and store the result",
+            "input": body,
+            "headers": no_cache,
+            "expectedStatus": 200,
+            "expectedHeaders": {"X-Cache": "MISS"}
+        })
+    else:
+        add({
+            "name": "Cache fill (first request)",
+            "description": "Should store the result in the Next.js data cache (MISS on a cold cache)",
+            "input": body,
+            "expectedStatus": 200
+        })
+
+    add({
+        "name": "Cache hit (repeated input)",
+        "description": f"Should be served from the cache within {cache['ttlSeconds']}s",
+        "input": body,
+        "expectedStatus": 200,
+        "expectedHeaders": {"X-Cache": "HIT"}
+    })
+
+    if len(body) > 1:
+        add({
+            "name": "Cache hit (equivalent input)",
+            "description": "Same validated input with fields in another order shares the cache key",
+            "input": dict(reversed(list(body.items()))),
+            "expectedStatus": 200,
+            "expectedHeaders": {"X-Cache": "HIT"}
+        })
+
+    if not in_memory:
+        add({
+            "name": "Cache bypass (no-cache request)",
+            "description": "Should call the upstream API without reading the cache",
+            "input": body,
+            "headers": no_cache,
+            "expectedStatus": 200,
+            "expectedHeaders": {"X-Cache": "BYPASS"}
+        })
+
+    return cases
 
 
-def generate_orchestration_examples(endpoint: str, combine_config: dict, method: str) -> list:
+def generate_orchestration_examples(endpoint: str, combine_config: dict, method: str,
+                                    decisions: dict = None) -> list:
     """Generate orchestration examples for combined API endpoints.
 
     Shows how multiple APIs are called in sequence/parallel and how data flows.
     """
     examples = []
-    source_elements = combine_config.get("source_elements", [])
-    flow_type = combine_config.get("flow_type", "sequential")
-    error_strategy = combine_config.get("error_strategy", "fail-fast")
+    graph = flow_graph.build_graph(combine_config, decisions)
+    flow_type = graph["flow_type"]
+    error_strategy = graph["error_strategy"]
+    source_names = graph["nodes"]
 
-    if len(source_elements) < 2:
+    if len(source_names) < 2:
         return examples
 
     base_url = f"http://localhost:3001/api/v2/{endpoint}"
 
-    # Get source API names
-    source_names = []
-    for elem in source_elements:
-        if isinstance(elem, dict):
-            source_names.append(elem.get("name", "unknown"))
-        else:
-            source_names.append(str(elem))
-
     # ================================================================
     # Example 1: Sequential flow
     # ================================================================
@@ -880,6 +957,31 @@ def generate_orchestration_examples(endpoint: str, combine_config: dict, method:
             "flow": f"{source_names[0]} ? {source_names[1]} : fallback"
         })
 
+    # ================================================================
+    # Dependency graph: each call starts when its dependencies finish
+    # ================================================================
+    elif flow_type == "dag":
+        dag_body = {
+            "calls": [
+                {"api": name, "dependsOn": graph["depends_on"][name],
+                 "timeoutMs": graph["call_timeout_ms"][name]}
+                for name in source_names
+            ],
+            "max_concurrency": graph["max_concurrency"]
+        }
+        curl = f'curl -X {method} {base_url} \\\n'
+        curl += '  -H "Content-Type: application/json" \\\n'
+        curl += f"  -d '{json.dumps(dag_body, indent=2)}'"
+
+        waves = flow_graph.levels(graph) if not flow_graph.graph_issues(graph) else [source_names]
+        examples.append({
+            "name": "Dependency graph orchestration",
+            "description": f"Runs {len(source_names)} calls in {len(waves)} waves; independent calls run concurrently",
+            "request": dag_body,
+            "curl": curl,
+            "flow": flow_graph.describe(graph)
+        })
+
     # ================================================================
     # Example 4: With error handling
     # ================================================================
@@ -899,7 +1001,8 @@ def generate_orchestration_examples(endpoint: str, combine_config: dict, method:
         "name": f"With {error_strategy} error handling",
         "description": f"Orchestration with {error_strategy} strategy and retry logic",
         "request": error_body,
-        "curl": curl
+        "curl": curl,
+        "flow": flow_graph.describe(graph)
     })
 
     # ================================================================
@@ -944,55 +1047,142 @@ Input → [{source_names[0]}] → transform → [{source_names[1]}] → Output
     return examples
 
 
-def generate_manifest_entry(endpoint: str, endpoint_data: dict, state: dict) -> dict:
-    """Generate a complete manifest entry for the endpoint."""
-    # Check if this is a combined workflow
-    combine_config = state.get("combine_config", {})
-    is_combined = bool(combine_config.get("source_elements"))
+# Allowed gap between a combined request's total latency and its critical path
+CRITICAL_PATH_RATIO = 1.25
+CRITICAL_PATH_SLACK_MS = 50
+
+
+def generate_orchestration_test_cases(schema: dict, graph: dict) -> list:
+    """Latency cases for a combined endpoint, checked against the route's meta timings.
 
-    # Find schema file
+    The orchestrator returns meta.timings (per call), meta.totalMs and
+    meta.criticalPathMs (the slowest dependency chain of the measured calls);
+    total latency must stay within CRITICAL_PATH_RATIO of the critical path,
+    and calls in the same wave must overlap instead of adding up.
+    """
+    if len(graph["nodes"]) < 2 or flow_graph.graph_issues(graph):
+        return []
+
+    properties = schema.get("properties", {})
+    values = ExampleValues(properties)
+    body = values.body(schema.get("required", [])) or values.body(properties)
+    waves = flow_graph.levels(graph)
+    _, chain = flow_graph.critical_path(graph, {n: 1 for n in graph["nodes"]})
+
+    cases = [{
+        "name": "Total latency tracks the critical path",
+        "description": (f"Should take about as long as the longest dependency chain ({' → '.join(chain)}), "
+                        f"not the sum of all {len(graph['nodes'])} calls"),
+        "input": body,
+        "expectedStatus": 200,
+        "expectedTiming": {
+            "source": "meta",
+            "maxCriticalPathRatio": CRITICAL_PATH_RATIO,
+            "slackMs": CRITICAL_PATH_SLACK_MS,
+            "calls": graph["nodes"]
+        }
+    }]
+
+    concurrent = [wave for wave in waves if len(wave) > 1]
+    if concurrent:
+        cases.append({
+            "name": "Independent calls run concurrently",
+            "description": f"Calls {' and '.join('[' + ', '.join(w) + ']' for w in concurrent)} should overlap",
+            "input": body,
+            "expectedStatus": 200,
+            "expectedTiming": {
+                "source": "meta",
+                "overlapping": concurrent,
+                "totalBelowSumOfCalls": True
+            }
+        })
+    return cases
+
+
+def find_source_files(endpoint: str, endpoint_data: dict, state: dict) -> tuple:
+    """Return (schema_file, schema_path, route_path) for the endpoint.
+
+    route_path is None if no route.ts is recorded in files_created.
+    """
     schema_file = endpoint_data.get("phases", {}).get("schema_creation", {}).get("schema_file")
     if not schema_file:
         # Try to find it
         schema_file = f"src/lib/schemas/{endpoint}.ts"
 
     schema_path = STATE_FILE.parent.parent / schema_file
-    schema_content = ""
-    if schema_path.exists():
-        schema_content = schema_path.read_text()
 
-    # Find route file
-    route_content = ""
+    route_path = None
     files_created = endpoint_data.get("files_created", []) or state.get("files_created", [])
     for f in files_created:
         if "route.ts" in f:
             route_path = STATE_FILE.parent.parent / f
-            if route_path.exists():
-                route_content = route_path.read_text()
             break
 
+    return schema_file, schema_path, route_path
+
+
+def manifest_input_key(endpoint: str, endpoint_data: dict, state: dict) -> str:
+    """Build-cache key over everything generate_manifest_entry() reads."""
+    _, schema_path, route_path = find_source_files(endpoint, endpoint_data, state)
+    # Files of the APIs a combined endpoint is built from (empty for base APIs)
+    root = STATE_FILE.parent.parent
+    sources = [root / f for kind, name in impact.dependencies("combined", endpoint, state)
+               for f in impact.entry_files(kind, name)]
+    return manifest_cache.input_key(endpoint, [schema_path, route_path] + sources, {
+        "decisions": endpoint_data.get("phases", {}).get("interview", {}).get("decisions", {}),
+        "combine_config": state.get("combine_config", {}),
+        "test_generation": test_generation_options(endpoint_data, state),
+    })
+
+
+def generate_manifest_entry(endpoint: str, endpoint_data: dict, state: dict) -> dict:
+    """Generate a complete manifest entry for the endpoint."""
+    # Check if this is a combined workflow
+    combine_config = state.get("combine_config", {})
+    is_combined = bool(combine_config.get("source_elements"))
+
+    schema_file, schema_path, route_path = find_source_files(endpoint, endpoint_data, state)
+
+    schema_content = ""
+    if schema_path.exists():
+        schema_content = schema_path.read_text()
+
+    route_content = ""
+    if route_path is not None and route_path.exists():
+        route_content = route_path.read_text()
+
     # Parse schema
-    request_schema = parse_zod_schema(schema_content) if schema_content else {"type": "object", "properties": {}}
+    request_schema = parse_zod_schema(schema_content, schema_path) if schema_content else {"type": "object", "properties": {}}
 
     # Detect method
     method = detect_http_method(route_content)
 
-    # Generate examples
-    examples = generate_curl_examples(endpoint, method, request_schema)
-
-    # Add orchestration examples for combined endpoints
-    if is_combined:
-        orchestration_examples = generate_orchestration_examples(endpoint, combine_config, method)
-        examples.extend(orchestration_examples)
+    options = test_generation_options(endpoint_data, state)
 
-    # Generate test cases
-    test_cases = generate_test_cases(request_schema)
+    # Generate examples
+    examples = generate_curl_examples(endpoint, method, request_schema, options)
 
     # Get interview decisions for description
     interview = endpoint_data.get("phases", {}).get("interview", {})
     decisions = interview.get("decisions", {})
     questions = interview.get("questions", [])
 
+    # Generate test cases
+    test_cases = generate_test_cases(request_schema, options)
+
+    # Add orchestration examples and latency cases for combined endpoints
+    graph = None
+    if is_combined:
+        graph = flow_graph.build_graph(combine_config, decisions)
+        orchestration_examples = generate_orchestration_examples(endpoint, combine_config, method, decisions)
+        examples.extend(orchestration_examples)
+        test_cases.extend(generate_orchestration_test_cases(request_schema, graph))
+
+    # Cache cases run in order after the others (not subject to max_test_cases)
+    cache = cache_strategy(decisions)
+    if cache:
+        test_cases.extend(generate_cache_test_cases(request_schema, cache))
+
     # Build description from interview
     description = f"API endpoint for {endpoint}"
     if decisions:
@@ -1025,19 +1215,21 @@ def generate_manifest_entry(endpoint: str, endpoint_data: dict, state: dict) ->
         }
     }
 
+    if cache:
+        entry["metadata"]["cache"] = cache
+
     # Add combined workflow metadata
     if is_combined:
-        source_names = []
-        for elem in combine_config.get("source_elements", []):
-            if isinstance(elem, dict):
-                source_names.append(elem.get("name", "unknown"))
-            else:
-                source_names.append(str(elem))
-
         entry["metadata"]["isCombined"] = True
-        entry["metadata"]["sourceApis"] = source_names
-        entry["metadata"]["flowType"] = combine_config.get("flow_type", "sequential")
-        entry["metadata"]["errorStrategy"] = combine_config.get("error_strategy", "fail-fast")
+        entry["metadata"]["sourceApis"] = graph["nodes"]
+        entry["metadata"]["flowType"] = graph["flow_type"]
+        entry["metadata"]["errorStrategy"] = graph["error_strategy"]
+        entry["metadata"]["flowGraph"] = {
+            "dependsOn": graph["depends_on"],
+            "callTimeoutMs": graph["call_timeout_ms"],
+            "maxConcurrency": graph["max_concurrency"],
+            "flow": flow_graph.describe(graph)
+        }
 
     return entry
 
@@ -1087,8 +1279,8 @@ def update_manifest(entry: dict, manifest_path: Path = None):
     # Update timestamp
     manifest["lastUpdated"] = datetime.now().strftime("%Y-%m-%d")
 
-    # Write back
-    manifest_path.write_text(json.dumps(manifest, indent=2))
+    # Write back (records entry positions so later updates can patch in place)
+    manifest_cache.write_manifest(manifest_path, manifest)
     return True
 
 
@@ -1104,12 +1296,12 @@ def main():
         sys.exit(0)
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE, for_update=True)
     except json.JSONDecodeError:
         print(json.dumps({"continue": True}))
         sys.exit(0)
 
-    endpoint, endpoint_data = get_active_endpoint(state)
+    endpoint, endpoint_data = state_store.get_active_endpoint(state)
     if not endpoint or not endpoint_data:
         print(json.dumps({"continue": True}))
         sys.exit(0)
@@ -1127,21 +1319,38 @@ def main():
 
     # Generate manifest entry
     try:
-        entry = generate_manifest_entry(endpoint, endpoint_data, state)
-
         # Update manifest file
         manifest_path = STATE_FILE.parent.parent / "src" / "app" / "api-test" / "api-tests-manifest.json"
         if manifest_path.exists():
-            update_manifest(entry, manifest_path)
+            # Skip regeneration if the schema, route, decisions and generator
+            # are unchanged and the manifest still holds the entry we wrote
+            key = manifest_input_key(endpoint, endpoint_data, state)
+            built = manifest_cache.up_to_date(manifest_path, endpoint, key)
+            if built:
+                entry_id, example_count, test_count = built["id"], built["examples"], built["testCases"]
+            else:
+                entry = generate_manifest_entry(endpoint, endpoint_data, state)
+                if not manifest_cache.patch_entry(manifest_path, entry):
+                    update_manifest(entry, manifest_path)
+                manifest_cache.record(endpoint, key, entry)
+                entry_id, example_count, test_count = entry["id"], len(entry["examples"]), len(entry["testCases"])
+
+            # Registry entries built on this endpoint need rebuilding and retesting
+            affected = impact.impact([endpoint], state)["affected"]
 
             # Update state to mark manifest as updated
             doc_phase["manifest_updated"] = True
-            doc_phase["manifest_entry_id"] = entry["id"]
-            STATE_FILE.write_text(json.dumps(state, indent=2))
-
+            doc_phase["manifest_entry_id"] = entry_id
+            doc_phase["affected"] = [f"{a['kind']}/{a['name']}" for a in affected]
+            state_store.save_state(state, STATE_FILE)
+
+            message = f"Generated manifest entry: {entry_id} with {example_count} examples and {test_count} test cases"
+            if affected:
+                message += (f". Affected: {', '.join(doc_phase['affected'])} - "
+                            f"see python3 .claude/hooks/impact.py {endpoint} --tests")
             print(json.dumps({
                 "continue": True,
-                "message": f"Generated manifest entry: {entry['id']} with {len(entry['examples'])} examples and {len(entry['testCases'])} test cases"
+                "message": message
             }))
         else:
             print(json.dumps({
@@ -0,0 +1,130 @@
+"""
+Per-endpoint history segments for interview questions and research sources.
+
+track-tool-use.py used to append every AskUserQuestion (with its response)
+and every research source to api-dev-state.json, so the state file grew for
+the whole session and every hook paid for it on every parse.
+
+The full history now lives in append-only JSONL segment files:
+
+  .claude/research/<endpoint>/history/questions.0001.jsonl
+  .claude/research/<endpoint>/history/sources.0001.jsonl
+
+A segment holds SEGMENT_RECORDS records before the next one is started. The
+state keeps the INLINE_LIMIT most recent entries plus counters
+(user_question_count, source_count, source_counts), which is all the gate
+hooks need. Hooks that need the complete history (enforce-questions-sourced,
+verify-implementation, cache-research, ...) call load() lazily.
+
+State files written before segments existed still carry the full lists
+inline; the first append migrates them into the segments, and load() falls
+back to the inline list for endpoints without segments.
+
+Added in v3.11.0.
+"""
+import json
+from pathlib import Path
+
+import state_store
+
+RESEARCH_DIR = Path(__file__).parent.parent / "research"
+
+# Most recent entries kept inline in api-dev-state.json
+INLINE_LIMIT = 10
+
+# Records per segment file before rotating to the next one
+SEGMENT_RECORDS = 200
+
+# Segment directory used when no endpoint is active yet
+UNASSIGNED = "_unassigned"
+
+# segment path -> (stat key, records)
+_cache = {}
+
+
+def history_endpoint(state: dict) -> str:
+    """Endpoint whose history a state belongs to."""
+    endpoint, _ = state_store.get_active_endpoint(state)
+    return endpoint or UNASSIGNED
+
+
+def _history_dir(endpoint: str) -> Path:
+    return RESEARCH_DIR / endpoint / "history"
+
+
+def _segments(endpoint: str, kind: str) -> list:
+    return sorted(_history_dir(endpoint).glob(f"{kind}.*.jsonl"))
+
+
+def segment_paths(endpoint: str, kind: str) -> list:
+    """The endpoint's segment files for a kind, oldest first."""
+    return _segments(endpoint, kind)
+
+
+def _read_segment(path: Path) -> list:
+    st = path.stat()
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _cache.get(str(path))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    records = []
+    for line in path.read_text().splitlines():
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue  # torn write from a crashed hook
+    _cache[str(path)] = (key, records)
+    return records
+
+
+def _write_records(endpoint: str, kind: str, records: list) -> None:
+    history_dir = _history_dir(endpoint)
+
+    segments = _segments(endpoint, kind)
+    if segments:
+        current = segments[-1]
+        count = len(_read_segment(current))
+        number = int(current.name.split(".")[1])
+    else:
+        current, count, number = None, SEGMENT_RECORDS, 0
+
+    for record in records:
+        if count >= SEGMENT_RECORDS:
+            number += 1
+            current = history_dir / f"{kind}.{number:04d}.jsonl"
+            count = 0
+        with open(current, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        count += 1
+
+
+def append(endpoint: str, kind: str, record: dict, inline: list) -> list:
+    """Append a record to the endpoint's history.
+
+    Returns the bounded inline list to store back in the state. Entries that
+    only exist inline (state written before segments) are migrated first.
+    """
+    inline = inline if isinstance(inline, list) else []
+    _history_dir(endpoint).mkdir(parents=True, exist_ok=True)
+    with state_store.locked(_history_dir(endpoint) / kind):
+        pending = [record]
+        if not _segments(endpoint, kind):
+            pending = inline + pending
+        _write_records(endpoint, kind, pending)
+    return (inline + [record])[-INLINE_LIMIT:]
+
+
+def load(endpoint: str, kind: str, inline: list = None) -> list:
+    """Load the complete history (oldest first).
+
+    Falls back to the inline list when the endpoint has no segments yet.
+    """
+    segments = _segments(endpoint, kind)
+    if not segments:
+        return inline if isinstance(inline, list) else []
+
+    records = []
+    for segment in segments:
+        records.extend(_read_segment(segment))
+    return records
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Hook: any event (client shim)
+Purpose: Run a hook through the hook daemon, or in-process if it is not running
+
+settings.json registers every hook as:
+  $CLAUDE_PROJECT_DIR/.claude/hooks/hook-client.py <hook-name> [args...]
+
+If hook-daemon.py is running, the hook payload is forwarded over its Unix
+socket and the hook runs in the already-warm daemon. Otherwise the hook is
+imported and run in this process, exactly as if it had been registered
+directly. Either way the client prints the hook's stdout/stderr and exits
+with its exit code.
+
+The daemon is off unless started, so the default path is: connect to the
+socket, find no daemon, run the hook in-process. That costs one failed
+connect() and the client's own start-up (about 7ms per hook run) over
+registering the hook script directly. In return, every hook run goes through
+hook_runtime.run_hook(), which is where API_DEV_HOOK_PROFILE recording
+happens, and starting the daemon needs no change to settings.json.
+
+The client deliberately imports only json/os/socket/sys before it knows
+whether a daemon answers; everything else is loaded on the fallback path.
+
+The daemon runs one hook at a time. A client that is not served within
+QUEUE_TIMEOUT_SECONDS gives up on the daemon before sending its request and
+runs the hook in-process, so a hook never waits behind a slow one for long.
+Hooks that take seconds (IN_PROCESS_HOOKS) always run in-process, so they do
+not hold up the daemon in the first place.
+
+With API_DEV_HOOK_DAEMON=1 set, a client that finds no daemon starts one in
+the background for the next hook run.
+
+Added in v3.11.0.
+
+Returns:
+  - Whatever the named hook returns
+"""
+import os
+import sys
+
+import hook_socket
+
+AUTOSTART_ENV = "API_DEV_HOOK_DAEMON"
+
+# Longest wait for the daemon to start serving this request
+QUEUE_TIMEOUT_SECONDS = 1.0
+
+# Hooks that benchmark the endpoint or run the test suite: seconds per run
+IN_PROCESS_HOOKS = {"verify-api-budgets", "verify-after-green"}
+
+
+def start_daemon():
+    """Start hook-daemon.py in the background without waiting for it."""
+    import subprocess
+
+    daemon = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hook-daemon.py")
+    subprocess.Popen(
+        [sys.executable, daemon, "serve"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def run_in_process(name: str, args: list, raw: str) -> dict:
+    import hook_runtime
+
+    return hook_runtime.run_hook(name, args, raw)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: hook-client.py <hook-name> [args...]", file=sys.stderr)
+        sys.exit(1)
+
+    name, args = sys.argv[1], sys.argv[2:]
+    raw = sys.stdin.read()
+
+    sock = None
+    if name not in IN_PROCESS_HOOKS:
+        try:
+            sock = hook_socket.connect()
+        except OSError:
+            if os.environ.get(AUTOSTART_ENV) == "1":
+                start_daemon()
+        else:
+            # Busy with another hook: nothing was sent yet, so running here is safe
+            if not hook_socket.wait_ready(sock, QUEUE_TIMEOUT_SECONDS):
+                sock.close()
+                sock = None
+
+    if sock is None:
+        result = run_in_process(name, args, raw)
+    else:
+        request = {
+            "hook": name,
+            "args": args,
+            "input": raw,
+            "cwd": os.getcwd(),
+            "env": dict(os.environ),
+        }
+        try:
+            result = hook_socket.exchange(sock, request)
+        except (OSError, ValueError) as e:
+            # The request reached the daemon, so the hook may already have run;
+            # re-running it here could repeat its side effects.
+            print(f"Hook daemon failed while running {name}: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    sys.stdout.write(result["stdout"])
+    sys.stderr.write(result["stderr"])
+    sys.exit(result["exit_code"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Hook daemon (opt-in)
+Purpose: Serve hook runs from one long-lived Python process
+
+Most hooks finish their actual work in microseconds; what a hook invocation
+costs is starting Python and importing json/re/pathlib. The daemon pays that
+once. It keeps the hook scripts loaded as modules (re-importing a script if it
+changes on disk) and api-dev-state.json parsed in memory (state_store re-reads
+it only when its mtime/size changes), and serves hook runs over a Unix socket
+only this user can connect to.
+
+hook-client.py is the command registered in settings.json. It sends the hook
+name, arguments, payload, working directory and environment to the daemon and
+replays the result. If the daemon is not running, the client runs the hook
+in-process, so the daemon is purely an optimization. Without it (the default)
+every hook still goes through the client: see hook-client.py.
+
+Only scripts named like hooks (with a hyphen; shared modules are snake_case)
+are preloaded or served, so a new module needs no registration here.
+
+Requests are served one at a time, in the order they arrive, with the
+client's cwd and environment applied for the duration of the run. A client
+that is not served within hook-client.py's QUEUE_TIMEOUT_SECONDS runs its
+hook in-process instead, and the long-running hooks (benchmarks, test result
+collection) always run in-process, so no hook waits behind them.
+
+Usage:
+  .claude/hooks/hook-daemon.py start    # start in the background
+  .claude/hooks/hook-daemon.py stop
+  .claude/hooks/hook-daemon.py status
+  .claude/hooks/hook-daemon.py serve    # run in the foreground
+
+Set API_DEV_HOOK_DAEMON=1 to let hook-client.py start the daemon on first use.
+The daemon exits after IDLE_TIMEOUT_SECONDS without requests.
+
+Added in v3.11.0.
+"""
+import fcntl
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import hook_runtime
+import hook_socket
+from hook_socket import send_request
+
+IDLE_TIMEOUT_SECONDS = 2 * 60 * 60
+REQUEST_TIMEOUT_SECONDS = 30
+START_TIMEOUT_SECONDS = 5
+
+# Held for the daemon's lifetime so two racing starts cannot both serve
+LOCK_FILE = hook_runtime.HOOKS_DIR.parent / "hook-daemon.lock"
+
+# Hyphenated like the hooks, but the daemon's own scripts: never preloaded or served
+DAEMON_SCRIPTS = {"hook-daemon", "hook-client"}
+
+
+def is_hook(name: str) -> bool:
+    """Hook scripts are named with hyphens (enforce-tdd-red); shared modules are snake_case (state_store)."""
+    return "-" in name and name not in DAEMON_SCRIPTS
+
+
+def preload_hooks():
+    """Import every hook script once so the first request is already warm."""
+    for path in sorted(hook_runtime.HOOKS_DIR.glob("*.py")):
+        if not is_hook(path.stem):
+            continue
+        try:
+            hook_runtime.load_hook(path.stem)
+        except Exception:
+            pass
+
+
+def run_request(request: dict) -> dict:
+    """Run one hook with the client's cwd and environment."""
+    name = request.get("hook", "")
+    if not is_hook(name) or not (hook_runtime.HOOKS_DIR / f"{name}.py").exists():
+        return {"exit_code": 1, "stdout": "", "stderr": f"Unknown hook: {name}\n"}
+
+    saved_cwd = os.getcwd()
+    saved_env = dict(os.environ)
+    try:
+        os.chdir(request.get("cwd") or saved_cwd)
+        if "env" in request:
+            os.environ.clear()
+            os.environ.update(request["env"])
+        result = hook_runtime.run_hook(name, request.get("args", []), request.get("input", ""))
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+
+    return {k: result[k] for k in ("exit_code", "stdout", "stderr")}
+
+
+def serve(idle_timeout: int = IDLE_TIMEOUT_SECONDS):
+    """Serve requests until stopped or idle for idle_timeout seconds."""
+    path = hook_socket.socket_path()
+    lock = open(LOCK_FILE, "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        print(f"Hook daemon already running on {path}", file=sys.stderr)
+        return 1
+
+    # Left behind by a daemon that did not shut down cleanly
+    if os.path.exists(path):
+        os.unlink(path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+    server.settimeout(idle_timeout)
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    preload_hooks()
+
+    started = time.time()
+    served = 0
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+
+            with conn:
+                conn.settimeout(REQUEST_TIMEOUT_SECONDS)
+                try:
+                    # A client that gave up waiting has closed without a request
+                    conn.sendall(hook_socket.READY)
+                    request = json.loads(hook_socket.recv_all(conn))
+                except (OSError, ValueError):
+                    continue
+
+                command = request.get("command", "run")
+                if command == "ping":
+                    response = {"pid": os.getpid(), "uptime": round(time.time() - started), "served": served}
+                elif command == "stop":
+                    response = {"stopped": True}
+                else:
+                    response = run_request(request)
+                    served += 1
+
+                try:
+                    conn.sendall(json.dumps(response).encode())
+                except OSError:
+                    pass
+
+                if command == "stop":
+                    break
+    finally:
+        server.close()
+        if os.path.exists(path):
+            os.unlink(path)
+        lock.close()
+    return 0
+
+
+def start():
+    """Start the daemon in the background and wait until it answers."""
+    try:
+        info = send_request({"command": "ping"}, timeout=1)
+        print(f"Hook daemon already running (pid {info['pid']})")
+        return 0
+    except (OSError, ValueError):
+        pass
+
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "serve"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+    deadline = time.time() + START_TIMEOUT_SECONDS
+    while time.time() < deadline:
+        try:
+            info = send_request({"command": "ping"}, timeout=1)
+            print(f"Hook daemon started (pid {info['pid']}) on {hook_socket.socket_path()}")
+            return 0
+        except (OSError, ValueError):
+            time.sleep(0.05)
+
+    print("Hook daemon did not start; hooks will keep running in-process", file=sys.stderr)
+    return 1
+
+
+def stop():
+    try:
+        send_request({"command": "stop"}, timeout=5)
+        print("Hook daemon stopped")
+    except (OSError, ValueError):
+        print("Hook daemon is not running")
+    return 0
+
+
+def status():
+    try:
+        info = send_request({"command": "ping"}, timeout=1)
+    except (OSError, ValueError):
+        print("Hook daemon is not running")
+        return 1
+    print(f"Hook daemon running (pid {info['pid']}, up {info['uptime']}s, {info['served']} hook runs served)")
+    return 0
+
+
+def main():
+    commands = {"start": start, "stop": stop, "status": status, "serve": serve}
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print(f"Usage: hook-daemon.py <{'|'.join(commands)}>", file=sys.stderr)
+        sys.exit(1)
+    sys.exit(commands[sys.argv[1]]())
+
+
+if __name__ == "__main__":
+    main()
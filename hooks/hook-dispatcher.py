@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Hook: PreToolUse for Write/Edit (dispatcher)
+Purpose: Run a whole chain of enforcement hooks in ONE Python process
+
+Registering every enforce-* hook as its own command forks one interpreter per
+hook on every Write/Edit, and each of them re-parses stdin and re-reads
+api-dev-state.json. This dispatcher imports the hooks of a chain as modules
+and runs their main() functions in order against:
+  - one parsed hook input (hook_runtime.read_input)
+  - one parsed state file (state_store.load_state, re-read only if a hook
+    in the chain writes it)
+
+Every hook still prints exactly what it printed as a standalone script. The
+dispatcher combines those outputs the way Claude Code combines a chain of
+separate hook commands:
+  - Any hook exiting with code 2 blocks; its stdout/stderr are replayed and
+    the dispatcher exits 2
+  - Otherwise the first denying hook wins ("permissionDecision": "deny",
+    "decision": "block" or "continue": false); its output is replayed as-is
+  - Otherwise the tool is allowed and the hooks' outputs are merged in
+    chain order: message, notify, systemMessage and additionalContext texts
+    are joined, other keys keep the first hook's value
+
+All hooks in the chain always run, so side effects (e.g. file tracking in
+verify-implementation.py) happen exactly as before.
+
+Usage (settings.json):
+  $CLAUDE_PROJECT_DIR/.claude/hooks/hook-dispatcher.py pre-write
+
+Added in v3.11.0.
+
+Returns:
+  - The combined hook decision (see above)
+"""
+import json
+import sys
+
+import hook_runtime
+
+# Chains run by the dispatcher, in the order they used to be registered
+CHAINS = {
+    "pre-write": [
+        "enforce-disambiguation",
+        "enforce-ui-disambiguation",
+        "enforce-scope",
+        "enforce-research",
+        "enforce-interview",
+        "enforce-ui-interview",
+        "enforce-deep-research",
+        "enforce-schema",
+        "enforce-environment",
+        "enforce-tdd-red",
+        "verify-implementation",
+        "enforce-verify",
+        "enforce-refactor",
+        "enforce-documentation",
+        "enforce-schema-from-interview",
+        "enforce-freshness",
+        "enforce-brand-guide",
+        "check-storybook-setup",
+        "check-playwright-setup",
+        "check-api-routes",
+        "enforce-page-components",
+        "enforce-page-data-schema",
+    ],
+}
+
+def parse_output(result: dict) -> dict:
+    """Parse a hook's stdout as JSON, or {} if it printed nothing/plain text."""
+    text = result["stdout"].strip()
+    if not text:
+        return {}
+    try:
+        output = json.loads(text)
+    except json.JSONDecodeError:
+        return {}
+    return output if isinstance(output, dict) else {}
+
+
+# Text fields every hook of the chain contributes to, joined in chain order
+JOINED_KEYS = {"message", "notify", "systemMessage", "additionalContext"}
+
+
+def merge_output(combined: dict, output: dict) -> None:
+    """Merge one hook's output into the chain's: join texts, keep the first value otherwise."""
+    for key, value in output.items():
+        if key not in combined:
+            combined[key] = dict(value) if isinstance(value, dict) else value
+        elif key in JOINED_KEYS and isinstance(value, str) and isinstance(combined[key], str):
+            if value:
+                combined[key] = f"{combined[key]}\n\n{value}" if combined[key] else value
+        elif isinstance(value, dict) and isinstance(combined[key], dict):
+            merge_output(combined[key], value)
+
+
+def is_denied(output: dict) -> bool:
+    """Check whether a hook output blocks the tool call."""
+    return (
+        output.get("permissionDecision") == "deny"
+        or output.get("decision") == "block"
+        or output.get("continue") is False
+    )
+
+
+def combine_results(results: list) -> tuple[int, str, str]:
+    """Combine per-hook results into one (exit_code, stdout, stderr)."""
+    stderr = "".join(r["stderr"] for r in results if r["exit_code"] != 2)
+
+    for result in results:
+        if result["exit_code"] == 2:
+            return 2, result["stdout"], result["stderr"]
+
+    for result in results:
+        if is_denied(parse_output(result)):
+            return 0, result["stdout"], stderr
+
+    combined = {"permissionDecision": "allow"}
+    for result in results:
+        merge_output(combined, parse_output(result))
+    return 0, json.dumps(combined) + "\n", stderr
+
+
+def dispatch(chain: str, raw_input: str) -> tuple[int, str, str]:
+    """Run every hook of a chain against one payload."""
+    hook_runtime.set_input(raw_input)
+    results = [hook_runtime.run_hook(name) for name in CHAINS[chain]]
+    return combine_results(results)
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in CHAINS:
+        print(f"Usage: hook-dispatcher.py <{'|'.join(CHAINS)}>", file=sys.stderr)
+        print(json.dumps({"permissionDecision": "allow"}))
+        sys.exit(0)
+
+    exit_code, stdout, stderr = dispatch(sys.argv[1], sys.stdin.read())
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
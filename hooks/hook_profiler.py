@@ -0,0 +1,116 @@
+"""
+Opt-in per-hook latency profiling.
+
+With API_DEV_HOOK_PROFILE=1 set, every hook run through hook_runtime.run_hook()
+(hook-client.py, hook-dispatcher.py chains and hook-daemon.py alike) appends
+one record to .claude/hook-profile.jsonl:
+
+  {"ts": ..., "hook": "enforce-interview", "event": "PreToolUse",
+   "tool": "Write", "parent": "hook-dispatcher", "exit_code": 0,
+   "wall_ms": 1.8, "cpu_ms": 1.6, "state_read_bytes": 5120,
+   "state_written_bytes": 0, "peak_rss_kb": 14336}
+
+  event / tool        from the hook payload (hook_event_name / tool_name)
+  parent              the dispatcher a chained hook ran under, if any
+  wall_ms / cpu_ms    time spent in the hook's main(); interpreter startup
+                      is not included, since every hook pays it equally
+  state_*_bytes       api-dev-state.json and its operation log, as counted
+                      by state_store (a cached parse reads 0 bytes)
+  peak_rss_kb         the process's peak RSS so far; inside the daemon this
+                      is the daemon's peak, not the hook's own
+
+The file is rotated to hook-profile.1.jsonl once it passes MAX_BYTES, so
+profiling can stay on for a whole session. `npx @hustle-together/api-dev-tools
+report` aggregates both files into p50/p95/p99 per hook and per event type.
+
+Profiling is off by default and costs one environment lookup per hook run.
+
+Added in v3.11.0.
+"""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, peak RSS is not recorded
+    resource = None
+
+import state_store
+
+PROFILE_ENV = "API_DEV_HOOK_PROFILE"
+
+PROFILE_FILE = Path(__file__).parent.parent / "hook-profile.jsonl"
+ROTATED_FILE = PROFILE_FILE.with_name("hook-profile.1.jsonl")
+
+# Rotate the profile once it grows past this
+MAX_BYTES = 5 * 1024 * 1024
+
+
+def enabled() -> bool:
+    return os.environ.get(PROFILE_ENV) == "1"
+
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def start() -> dict:
+    """Snapshot counters before a hook runs."""
+    return {
+        "wall": time.perf_counter(),
+        "cpu": time.process_time(),
+        "read": state_store.io_bytes["read"],
+        "written": state_store.io_bytes["written"],
+    }
+
+
+def _payload_fields(payload) -> dict:
+    if not isinstance(payload, dict):
+        payload = {}
+    return {
+        "event": payload.get("hook_event_name") or "unknown",
+        "tool": payload.get("tool_name"),
+    }
+
+
+def finish(snapshot: dict, name: str, exit_code: int, payload, parent: str = None) -> None:
+    """Append the record for one hook run (payload: the parsed hook input). Never raises."""
+    try:
+        record = {
+            "ts": round(time.time(), 3),
+            "hook": name,
+            **_payload_fields(payload),
+            "parent": parent,
+            "exit_code": exit_code,
+            "wall_ms": round((time.perf_counter() - snapshot["wall"]) * 1000, 3),
+            "cpu_ms": round((time.process_time() - snapshot["cpu"]) * 1000, 3),
+            "state_read_bytes": state_store.io_bytes["read"] - snapshot["read"],
+            "state_written_bytes": state_store.io_bytes["written"] - snapshot["written"],
+            "peak_rss_kb": _peak_rss_kb(),
+        }
+        _append(json.dumps(record) + "\n")
+    except Exception:
+        pass  # profiling must never change a hook's outcome
+
+
+def _append(line: str) -> None:
+    # One O_APPEND write per record, so concurrent hooks do not interleave
+    fd = os.open(PROFILE_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line.encode())
+        size = os.fstat(fd).st_size
+    finally:
+        os.close(fd)
+
+    if size > MAX_BYTES:
+        with state_store.locked(PROFILE_FILE):
+            # Another process may have rotated it while we waited
+            if PROFILE_FILE.exists() and PROFILE_FILE.stat().st_size > MAX_BYTES:
+                os.replace(PROFILE_FILE, ROTATED_FILE)
@@ -0,0 +1,150 @@
+"""
+Shared runtime helpers for hook scripts.
+
+Every hook receives its JSON payload on stdin. When a hook runs as its own
+process, read_input() parses stdin exactly like `json.load(sys.stdin)` did.
+When hooks run inside hook-dispatcher.py, the dispatcher hands the raw payload
+over once with set_input() and every hook in the chain gets the same parsed
+object instead of re-reading and re-parsing stdin.
+
+load_hook() and run_hook() import a hook script as a module and run its main()
+with stdout/stderr captured. They are shared by hook-dispatcher.py, the
+opt-in hook-daemon.py and the hook-client.py fallback, so a hook behaves the
+same whether it runs as a process, in a chain or inside the daemon. That also
+makes run_hook() the one place every hook run is timed when profiling is on
+(hook_profiler.py).
+
+Added in v3.11.0 for the single-process hook dispatcher.
+"""
+import contextlib
+import importlib.util
+import io
+import json
+import sys
+import traceback
+from pathlib import Path
+
+import hook_profiler
+import state_store
+
+HOOKS_DIR = Path(__file__).parent
+
+_raw_input = None
+_parsed_input = None
+_input_error = None
+
+
+def set_input(raw: str) -> None:
+    """Install the raw hook payload for the hooks run in this process."""
+    global _raw_input, _parsed_input, _input_error
+    _raw_input = raw
+    _parsed_input = None
+    _input_error = None
+
+
+def read_raw_input() -> str:
+    """Return the raw hook payload, reading stdin on first use."""
+    global _raw_input
+    if _raw_input is None:
+        _raw_input = sys.stdin.read()
+    return _raw_input
+
+
+def read_input():
+    """Return the parsed hook payload.
+
+    Raises json.JSONDecodeError for malformed input, same as json.load(sys.stdin),
+    so hooks keep their existing error handling. The result (or the error) is
+    cached, so a dispatched chain parses the payload once.
+    """
+    global _parsed_input, _input_error
+    if _parsed_input is None and _input_error is None:
+        try:
+            _parsed_input = json.loads(read_raw_input())
+        except json.JSONDecodeError as e:
+            _input_error = e
+    if _input_error is not None:
+        raise _input_error
+    return _parsed_input
+
+
+# name -> (source mtime, module)
+_modules = {}
+
+# Hooks currently running in this process (a dispatcher and its chained hook)
+_running = []
+
+
+def load_hook(name: str):
+    """Import hooks/<name>.py as a module.
+
+    The module is cached for the process lifetime and re-imported when the
+    script changes on disk (e.g. after reinstalling), which matters for the
+    long-lived daemon.
+    """
+    path = HOOKS_DIR / f"{name}.py"
+    mtime = path.stat().st_mtime_ns
+    cached = _modules.get(name)
+    if cached is None or cached[0] != mtime:
+        spec = importlib.util.spec_from_file_location(name.replace("-", "_"), path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[name] = (mtime, module)
+    return _modules[name][1]
+
+
+def run_hook(name: str, args: list = None, raw: str = None) -> dict:
+    """Run one hook's main() and capture what it would have printed.
+
+    args become sys.argv[1:]. When raw is given it is installed as the hook
+    payload (and as sys.stdin); otherwise the payload already set with
+    set_input() is reused, which is how a dispatched chain shares one parse.
+    """
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    exit_code = 0
+    profile = hook_profiler.start() if hook_profiler.enabled() else None
+    parent = _running[-1] if _running else None
+    _running.append(name)
+
+    saved_argv, saved_stdin = sys.argv, sys.stdin
+    sys.argv = [str(HOOKS_DIR / f"{name}.py")] + list(args or [])
+    if raw is not None:
+        set_input(raw)
+        sys.stdin = io.StringIO(raw)
+
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            load_hook(name).main()
+        except SystemExit as e:
+            if e.code is None:
+                exit_code = 0
+            elif isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                print(e.code, file=sys.stderr)
+                exit_code = 1
+        except Exception:
+            # A crashing hook is a non-blocking error, same as a failed command
+            traceback.print_exc()
+            exit_code = 1
+            # It may have left the shared state half-modified
+            state_store.forget()
+        finally:
+            sys.argv, sys.stdin = saved_argv, saved_stdin
+            _running.pop()
+            state_store.release_locks()
+
+    if profile is not None:
+        try:
+            payload = read_input() if _raw_input is not None else None
+        except json.JSONDecodeError:
+            payload = None
+        hook_profiler.finish(profile, name, exit_code, payload, parent)
+
+    return {
+        "hook": name,
+        "exit_code": exit_code,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+    }
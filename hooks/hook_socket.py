@@ -0,0 +1,102 @@
+"""
+Unix-socket transport between hook-client.py and hook-daemon.py.
+
+Kept separate from hook_runtime so the client only imports json, os and socket
+on its fast path; everything heavier is loaded by the daemon, or by the client
+only when it has to fall back to running the hook in-process.
+
+The daemon serves one connection at a time. When it starts serving a
+connection it sends READY; only then does the client write its request, one
+JSON object, and shut down its write side. The response is one JSON object,
+read until the daemon closes the connection. A client that stops waiting for
+READY closes the socket without having sent anything, so the daemon cannot
+run a request the client has given up on.
+
+Added in v3.11.0 for the opt-in hook daemon.
+"""
+import json
+import os
+import socket
+
+SOCKET_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "hook-daemon.sock")
+
+# AF_UNIX paths are limited to 104 bytes on macOS (108 on Linux)
+MAX_SOCKET_PATH = 100
+
+# Sent by the daemon when it starts serving a connection
+READY = b"+"
+
+
+def socket_path() -> str:
+    """Socket path of this project's hook daemon.
+
+    Uses .claude/hook-daemon.sock, or a per-project path in the temp directory
+    when the project path is too long for a Unix socket.
+    """
+    if len(SOCKET_FILE.encode()) <= MAX_SOCKET_PATH:
+        return SOCKET_FILE
+
+    import hashlib
+    import tempfile
+
+    digest = hashlib.sha1(SOCKET_FILE.encode()).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"api-dev-hooks-{digest}.sock")
+
+
+def recv_all(conn) -> bytes:
+    """Read from a socket until the peer shuts down its write side."""
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def connect(timeout=None):
+    """Connect to the daemon. Raises OSError if no daemon is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(socket_path())
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def wait_ready(sock, timeout) -> bool:
+    """Wait up to timeout seconds for the daemon to start serving this connection.
+
+    The socket's own timeout applies again once READY has arrived.
+    """
+    previous = sock.gettimeout()
+    sock.settimeout(timeout)
+    try:
+        ready = sock.recv(len(READY)) == READY
+    except socket.timeout:
+        return False
+    sock.settimeout(previous)
+    return ready
+
+
+def exchange(sock, request: dict) -> dict:
+    """Send one request over a socket the daemon is serving and return the response."""
+    with sock:
+        sock.sendall(json.dumps(request).encode())
+        sock.shutdown(socket.SHUT_WR)
+        return json.loads(recv_all(sock))
+
+
+def send_request(request: dict, timeout=None) -> dict:
+    """Connect, send one request and return the response.
+
+    Raises OSError if no daemon is listening or it does not start serving the
+    request within timeout seconds, and ValueError if the response is not
+    valid JSON.
+    """
+    sock = connect(timeout)
+    if not wait_ready(sock, timeout):
+        sock.close()
+        raise socket.timeout("hook daemon did not accept the request")
+    return exchange(sock, request)
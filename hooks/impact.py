@@ -0,0 +1,310 @@
+"""
+Reverse-dependency index: what has to be rebuilt when an entry changes.
+
+The registry records what each entry is built from (combined "combines",
+pages' "uses_components" and "data_sources"), but nothing answered the
+reverse question. When a base API's schema changed, every manifest entry
+was regenerated and every test rerun, because nobody knew which combined
+APIs and pages consume it.
+
+The index is registry_store's refs table (one row per combines,
+uses_components or data_sources item, indexed by target) plus the edges of
+the workflow in progress, which are not in the registry yet:
+
+  combine-api / combine-ui    combine_config.source_elements of the active
+                              endpoint ("combined", combines)
+  ui-create-page              ui_config.data_sources and uses_components,
+                              phases.component_analysis.selected_components
+
+Data sources may be route paths ("/api/v2/brandfetch"); they are matched to
+the API of that name.
+
+  dependents(name, state=None)         direct dependents [(kind, name, relation)]
+  impact(names, state=None)            everything affected, transitively
+  dependencies(kind, name, state=None) what an entry is built from, transitively
+  resolve(name_or_path)                (kind, name) of a registry name or file
+  test_files(result, state=None)       unit and e2e tests to rerun
+  format_impact(result)                markdown report
+
+  python3 .claude/hooks/impact.py NAME|PATH ... [--json] [--tests] [--no-state]
+
+Added in v3.11.0.
+"""
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+import registry_store
+import state_store
+
+STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Lookup order when a bare name is given
+KINDS = ["apis", "combined", "components", "pages"]
+
+# Entry fields holding the entry's own files
+FILE_FIELDS = ["route", "schemas", "file", "story", "tests"]
+
+# "/api/v2/brandfetch", "/api/brandfetch/" -> "brandfetch"
+API_ROUTE = re.compile(r"^/?(?:src/app/)?api/(?:v\d+/)?(?P<name>[^/?#]+)")
+
+# Files of entries that are not registered yet
+API_DIR = re.compile(r"(?:^|/)src/app/api/(?:v\d+/)?(?P<name>[^/]+)/")
+SCHEMA_FILE = re.compile(r"(?:^|/)src/lib/schemas/(?P<name>[^/]+)\.ts$")
+COMPONENT_DIR = re.compile(r"(?:^|/)src/components/(?P<name>[^/]+)/")
+
+COMBINE_WORKFLOWS = ["combine-api", "combine-ui"]
+
+
+def _target_name(target):
+    if isinstance(target, dict):
+        target = target.get("name") or target.get("endpoint") or target.get("route")
+    if not isinstance(target, str) or not target:
+        return None
+    match = API_ROUTE.match(target)
+    return match.group("name") if match else target
+
+
+def _aliases(name: str) -> list:
+    # How refs may name the entry: by key, by its API route, or (components)
+    # by the PascalCase name pages list in uses_components
+    aliases = [name, f"/api/v2/{name}", f"/api/{name}"]
+    component = registry_store.get("components", name) or {}
+    if isinstance(component.get("name"), str):
+        aliases.append(component["name"])
+    return list(dict.fromkeys(aliases))
+
+
+def state_refs(state: dict) -> list:
+    """(kind, name, relation, target) edges of the workflow in progress."""
+    refs = []
+    if not state:
+        return refs
+    workflow = state.get("workflow", "")
+
+    if workflow in COMBINE_WORKFLOWS:
+        name, _ = state_store.get_active_endpoint(state)
+        if not name:
+            name, _ = state_store.get_active_element(state)
+        for elem in (state.get("combine_config") or {}).get("source_elements", []):
+            target = _target_name(elem)
+            if name and target:
+                refs.append(("combined", name, "combines", target))
+
+    elif workflow == "ui-create-page":
+        name, element = state_store.get_active_element(state)
+        element = element or {}
+        ui_config = state.get("ui_config") or element.get("ui_config") or {}
+        phases = element.get("phases", state.get("phases", {}))
+        selected = phases.get("component_analysis", {}).get("selected_components") or []
+        for relation, targets in [("data_sources", ui_config.get("data_sources")),
+                                  ("uses_components", ui_config.get("uses_components")),
+                                  ("uses_components", selected)]:
+            for target in targets if isinstance(targets, list) else []:
+                target = _target_name(target)
+                if name and target:
+                    refs.append(("pages", name, relation, target))
+
+    return list(dict.fromkeys(refs))
+
+
+def dependents(name: str, state: dict = None) -> list:
+    """(kind, name, relation) of the registry entries and workflow in progress that use name."""
+    found = []
+    for alias in _aliases(name):
+        found.extend(registry_store.referencing(alias))
+    found.extend((k, n, r) for k, n, r, target in state_refs(state) if target == name)
+    return [ref for ref in dict.fromkeys(found) if ref[1] != name]
+
+
+def resolve(value: str) -> tuple:
+    """(kind, name) for a registry name or one of an entry's files; kind None if unknown."""
+    value = value.strip()
+    if "/" not in value or value.startswith("/api/"):
+        name = _target_name(value)
+        for kind in KINDS:
+            if registry_store.exists(kind, name):
+                return kind, name
+        for key, entry in registry_store.entries("components").items():
+            if entry.get("name") == name:
+                return "components", key
+        return None, name
+
+    path = value[len(str(PROJECT_ROOT)) + 1:] if value.startswith(str(PROJECT_ROOT) + "/") else value
+    for kind in KINDS:
+        for name, entry in registry_store.entries(kind).items():
+            for field in FILE_FIELDS:
+                own = entry.get(field)
+                if not isinstance(own, str) or not own.startswith("src/") and not own.startswith("tests/"):
+                    continue
+                if path == own or own.endswith("/") and path.startswith(own):
+                    return kind, name
+                if field == "route" and kind in ("apis", "combined") and \
+                        path.startswith(own.rsplit("/", 1)[0] + "/"):
+                    return kind, name
+
+    for pattern, kinds in [(API_DIR, ["apis", "combined"]), (SCHEMA_FILE, ["apis", "combined"]),
+                           (COMPONENT_DIR, ["components"])]:
+        match = pattern.search(path)
+        if match:
+            name = match.group("name")
+            for kind in kinds:
+                if registry_store.exists(kind, name):
+                    return kind, name
+            return None, name
+    return None, path
+
+
+def impact(names: list, state: dict = None) -> dict:
+    """Everything that has to be rebuilt and retested when names change.
+
+    names are registry names or file paths. affected lists the dependents in
+    breadth-first order, each with the entry it was reached from (via).
+    """
+    changed, unknown = [], []
+    for value in names:
+        kind, name = resolve(value)
+        if kind is None and name not in {n for _, n, _, _ in state_refs(state)}:
+            unknown.append(name)
+        if (kind, name) not in changed:
+            changed.append((kind, name))
+
+    seen = {name for _, name in changed}
+    affected, queue = [], [name for _, name in changed]
+    while queue:
+        current = queue.pop(0)
+        for kind, name, relation in dependents(current, state):
+            if name in seen:
+                continue
+            seen.add(name)
+            affected.append({"kind": kind, "name": name, "relation": relation, "via": current})
+            queue.append(name)
+
+    by_kind = {kind: [a["name"] for a in affected if a["kind"] == kind] for kind in KINDS}
+    return {
+        "changed": [{"kind": k, "name": n} for k, n in changed],
+        "affected": affected,
+        "by_kind": by_kind,
+        "unknown": unknown,
+    }
+
+
+def dependencies(kind: str, name: str, state: dict = None) -> list:
+    """(kind, name) of every registry entry name is built from, nearest first."""
+    found, queue = [], [(kind, name)]
+    while queue:
+        kind, name = queue.pop(0)
+        entry = (registry_store.get(kind, name) or {}) if kind else {}
+        targets = []
+        for relation in registry_store.REF_FIELDS:
+            items = entry.get(relation)
+            targets.extend(items if isinstance(items, list) else [])
+        targets.extend(t for k, n, _, t in state_refs(state) if (k, n) == (kind, name))
+
+        for target in dict.fromkeys(filter(None, map(_target_name, targets))):
+            for source_kind in KINDS:
+                if registry_store.exists(source_kind, target):
+                    if (source_kind, target) not in found:
+                        found.append((source_kind, target))
+                        queue.append((source_kind, target))
+                    break
+    return found
+
+
+def entry_files(kind: str, name: str) -> list:
+    """The route/schema/component files of a registry entry (tests excluded)."""
+    entry = registry_store.get(kind, name) or {}
+    return [entry[f] for f in FILE_FIELDS if f != "tests" and isinstance(entry.get(f), str)
+            and not entry[f].startswith("/")]
+
+
+def test_files(result: dict, state: dict = None) -> dict:
+    """{"unit": [...], "e2e": [...], "missing": [...]} for the changed and affected entries.
+
+    Unit tests run under Vitest (directories act as path filters); e2e specs
+    are Playwright tests. Tests of entries not in the registry yet come from
+    the state's tdd_red phase.
+    """
+    tests = {"unit": [], "e2e": [], "missing": []}
+    items = [(c["kind"], c["name"]) for c in result["changed"]]
+    items += [(a["kind"], a["name"]) for a in result["affected"]]
+
+    for kind, name in items:
+        path = (registry_store.get(kind, name) or {}).get("tests") if kind else None
+        if not path and state:
+            endpoint, data = state_store.get_active_workflow(state)
+            if endpoint == name:
+                path = (data or {}).get("phases", {}).get("tdd_red", {}).get("test_file")
+        if not isinstance(path, str):
+            continue
+        if not (PROJECT_ROOT / path).exists():
+            tests["missing"].append(path)
+        elif path.startswith("tests/e2e/") or path.endswith(".spec.ts"):
+            tests["e2e"].append(path)
+        else:
+            tests["unit"].append(path)
+
+    for paths in tests.values():
+        paths[:] = list(dict.fromkeys(paths))
+    return tests
+
+
+def format_impact(result: dict, tests: dict = None) -> str:
+    changed = ", ".join(f"{c['name']} ({c['kind'] or 'not registered'})" for c in result["changed"])
+    lines = [f"## Impact of {changed}", ""]
+    if not result["affected"]:
+        lines.append("Nothing in the registry or the workflow in progress depends on it.")
+    else:
+        lines.append("Rebuild and retest:")
+        lines.append("")
+        lines.append("| Kind | Name | Uses |")
+        lines.append("|------|------|------|")
+        for a in result["affected"]:
+            lines.append(f"| {a['kind']} | {a['name']} | {a['via']} ({a['relation']}) |")
+
+    if result["unknown"]:
+        lines.append("")
+        lines.append(f"⚠️ Not in the registry: {', '.join(result['unknown'])}")
+
+    if tests:
+        lines.append("")
+        if tests["unit"]:
+            lines.append(f"Unit: npx vitest run {' '.join(tests['unit'])}")
+        if tests["e2e"]:
+            lines.append(f"E2E:  npx playwright test {' '.join(tests['e2e'])}")
+        if tests["missing"]:
+            lines.append(f"⚠️ Registered tests not found: {', '.join(tests['missing'])}")
+        if not (tests["unit"] or tests["e2e"]):
+            lines.append("No tests to rerun.")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List what has to be rebuilt and retested when entries change.")
+    parser.add_argument("names", nargs="+", help="registry names or changed files")
+    parser.add_argument("--tests", action="store_true", help="list the tests to rerun")
+    parser.add_argument("--no-state", action="store_true", help="ignore the workflow in progress")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    state = {}
+    if not args.no_state and STATE_FILE.exists():
+        try:
+            state = state_store.load_state(STATE_FILE)
+        except json.JSONDecodeError:
+            state = {}
+
+    result = impact(args.names, state)
+    tests = test_files(result, state) if args.tests or args.json else None
+    if args.json:
+        print(json.dumps({**result, "tests": tests}, indent=2))
+    else:
+        print(format_impact(result, tests))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+"""
+Static latency planner for combined endpoints.
+
+registry.json records which APIs a combined endpoint combines and, since the
+dependency-graph workflow, which of them wait for which (depends_on). This
+module predicts the combined endpoint's latency from what is already known
+about each source API, so a combination whose sequential chain cannot meet
+the latency budget is flagged during the /hustle-combine interview, before
+it is built.
+
+Per-API latency, first available of:
+
+  load test     loadTestResults.latencyMs p50/p95 in api-tests-manifest.json
+  verify        the p50/p95 verify-api-budgets.py measured, kept in the
+                registry entry as latency_ms
+  test runs     testResults.duration / tests run (mocked upstreams, so only
+                a lower bound; no spread)
+  estimate      declared: combine_config.latency_estimates_ms[api], or the
+                registry entry's latency_estimate_ms (ms, or {p50, p95})
+
+Each API's latency is modelled as log-normal through its p50 and p95, and
+the flow graph (flow_graph.py) is evaluated over SAMPLES draws with a fixed
+seed: a call finishes at the latest finish of its dependencies plus its own
+latency. The p50/p95 of the last finish are the combined endpoint's
+predicted latency (concurrency limits are not modelled). The p95 is checked
+against the endpoint's p95_latency_max_ms budget (performance-budgets.json
+"api" section, or the interview's latency answer).
+
+  plan(graph, latencies)                   p50/p95, critical path, chain sum
+  plan_combined(name, combine_config=...)  sources, plan and budget check
+  format_plan(result)                      markdown report
+
+  python3 .claude/hooks/latency_plan.py [NAME ...] [--state] [--json]
+      [--apis a,b,c] [--depends c=a,b] [--flow sequential|parallel|dag]
+      [--estimate a=300 | a=300/900]
+
+Without arguments every registry combined entry is planned; --state plans
+the combine workflow in progress; --apis plans a combination not built yet.
+
+Added in v3.11.0.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+from pathlib import Path
+
+import flow_graph
+import hook_runtime
+import load_test
+import registry_store
+import state_store
+
+STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+MANIFEST_FILE = PROJECT_ROOT / "src" / "app" / "api-test" / "api-tests-manifest.json"
+
+SAMPLES = 4000
+SEED = 7
+
+# z-score of the 95th percentile of a normal distribution
+Z95 = 1.6449
+
+
+def _positive(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+
+def _pair(value):
+    """(p50, p95) from a number or a {p50, p95} dict; None if neither (or not above 0 ms)."""
+    if _positive(value):
+        return float(value), float(value)
+    if isinstance(value, dict) and _positive(value.get("p50")):
+        p50 = float(value["p50"])
+        p95 = value.get("p95")
+        return p50, float(p95) if _positive(p95) else p50
+    return None
+
+
+def api_latency(name: str, manifest: dict, entry: dict, estimates: dict) -> dict:
+    """{"p50", "p95", "source"} for one source API; source "unknown" (0 ms) without data."""
+    for found in load_test.find_entries(manifest, name):
+        results = found.get("loadTestResults") or {}
+        if not results.get("requests") or results.get("errors", 0) >= results["requests"]:
+            continue  # every request failed: its latencies are zeros, not measurements
+        pair = _pair(results.get("latencyMs"))
+        if pair:
+            return {"p50": pair[0], "p95": pair[1], "source": "load test"}
+
+    entry = entry or {}
+    pair = _pair(entry.get("latency_ms"))
+    if pair:
+        return {"p50": pair[0], "p95": pair[1], "source": "verify"}
+
+    for found in load_test.find_entries(manifest, name):
+        results = found.get("testResults") or {}
+        runs = (results.get("passed") or 0) + (results.get("failed") or 0)
+        if runs and results.get("duration"):
+            mean = round(results["duration"] / runs, 1)
+            return {"p50": mean, "p95": mean, "source": "test runs"}
+
+    pair = _pair((estimates or {}).get(name)) or _pair(entry.get("latency_estimate_ms"))
+    if pair:
+        return {"p50": pair[0], "p95": pair[1], "source": "estimate"}
+    return {"p50": 0.0, "p95": 0.0, "source": "unknown"}
+
+
+def _sampler(latency: dict):
+    p50, p95 = latency["p50"], max(latency["p95"], latency["p50"])
+    if p50 <= 0:
+        return lambda rng: 0.0
+    sigma = math.log(p95 / p50) / Z95
+    if sigma == 0:
+        return lambda rng: p50
+    mu = math.log(p50)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def plan(graph: dict, latencies: dict, samples: int = SAMPLES, seed: int = SEED) -> dict:
+    """Predicted p50/p95 of the flow; raises ValueError on a dependency cycle."""
+    waves = flow_graph.levels(graph)
+    samplers = {n: _sampler(latencies[n]) for n in graph["nodes"]}
+    rng = random.Random(seed)
+
+    totals = []
+    for _ in range(samples):
+        finish = {}
+        for wave in waves:
+            for node in wave:
+                deps = [finish[d] for d in graph["depends_on"].get(node, []) if d in finish]
+                finish[node] = max(deps, default=0.0) + samplers[node](rng)
+        totals.append(max(finish.values(), default=0.0))
+    totals.sort()
+
+    p50_ms, path = flow_graph.critical_path(graph, {n: latencies[n]["p50"] for n in graph["nodes"]})
+    return {
+        "p50": round(load_test.percentile(totals, 50), 1),
+        "p95": round(load_test.percentile(totals, 95), 1),
+        "critical_path": path,
+        "critical_path_p50": round(p50_ms, 1),
+        # What the same calls would cost one after another
+        "chain_p95": round(sum(latencies[n]["p95"] for n in graph["nodes"]), 1),
+        "waves": waves,
+    }
+
+
+def latency_budget(name: str, decisions: dict):
+    """The endpoint's p95 budget in ms (same sources as verify-api-budgets.py), or None."""
+    budgets, _ = hook_runtime.load_hook("verify-api-budgets").load_budgets(name, decisions or {})
+    return budgets.get("p95_latency_max_ms")
+
+
+def _manifest() -> dict:
+    try:
+        return json.loads(MANIFEST_FILE.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def plan_combined(name: str, combine_config: dict = None, decisions: dict = None,
+                  manifest: dict = None) -> dict:
+    """Plan a combined endpoint from combine_config, or from its registry entry.
+
+    status is "ok", "over_budget", "no_budget" or "invalid" (dependency cycle
+    or unknown APIs); apis lists each source API's latency and its source.
+    """
+    if combine_config is None:
+        entry = registry_store.get("combined", name) or {}
+        combine_config = {
+            "source_elements": [{"type": "api", "name": n} for n in entry.get("combines", [])],
+            "flow_type": entry.get("flow_type", "sequential"),
+            "error_strategy": entry.get("error_strategy"),
+            "latency_estimates_ms": entry.get("latency_estimates_ms"),
+        }
+        if isinstance(entry.get("depends_on"), dict):
+            combine_config["dependencies"] = entry["depends_on"]
+
+    graph = flow_graph.build_graph(combine_config, decisions)
+    result = {"name": name, "flow": flow_graph.describe(graph), "budget_ms": latency_budget(name, decisions)}
+    issues = flow_graph.graph_issues(graph)
+    if issues or not graph["nodes"]:
+        result.update(status="invalid", issues=issues or ["no source APIs"])
+        return result
+
+    manifest = _manifest() if manifest is None else manifest
+    estimates = combine_config.get("latency_estimates_ms") or {}
+    apis = {n: api_latency(n, manifest, registry_store.get("apis", n), estimates) for n in graph["nodes"]}
+    predicted = plan(graph, apis)
+
+    result.update(apis=apis, **predicted)
+    result["unknown"] = [n for n, latency in apis.items() if latency["source"] == "unknown"]
+    budget = result["budget_ms"]
+    if budget is None:
+        result["status"] = "no_budget"
+    else:
+        result["status"] = "over_budget" if predicted["p95"] > budget else "ok"
+    return result
+
+
+def format_plan(result: dict) -> str:
+    lines = [f"## Latency plan: {result['name']}", "", f"Flow: {result['flow']}", ""]
+    if result["status"] == "invalid":
+        lines.append("❌ Cannot plan this flow:")
+        lines.extend(f"  • {issue}" for issue in result["issues"])
+        return "\n".join(lines)
+
+    lines.append("| API | p50 | p95 | Source |")
+    lines.append("|-----|-----|-----|--------|")
+    for name, latency in result["apis"].items():
+        lines.append(f"| {name} | {latency['p50']:.0f}ms | {latency['p95']:.0f}ms | {latency['source']} |")
+    lines.append("")
+    lines.append(f"Predicted: p50 {result['p50']:.0f}ms, p95 {result['p95']:.0f}ms "
+                 f"(all calls one after another: p95 {result['chain_p95']:.0f}ms)")
+    lines.append(f"Critical path: {' → '.join(result['critical_path'])} "
+                 f"({result['critical_path_p50']:.0f}ms at p50)")
+
+    if result["unknown"]:
+        lines.append("")
+        lines.append(f"⚠️ No latency data for {', '.join(result['unknown'])} (counted as 0ms): "
+                     "load-test them or declare latency_estimates_ms")
+    if result["status"] == "over_budget":
+        lines.append("")
+        lines.append(f"❌ OVER BUDGET: predicted p95 {result['p95']:.0f}ms > {result['budget_ms']:.0f}ms")
+        lines.append("   Run independent calls concurrently (dependencies), cache slow sources,")
+        lines.append("   or agree a higher latency budget before building this combination.")
+    elif result["status"] == "ok":
+        lines.append(f"✓ Within the p95 budget of {result['budget_ms']:.0f}ms")
+    return "\n".join(lines)
+
+
+def _pairs(values: list) -> dict:
+    # ["c=a,b", "d=c"] -> {"c": ["a", "b"], "d": ["c"]}
+    parsed = {}
+    for value in values or []:
+        name, _, rest = value.partition("=")
+        parsed[name.strip()] = [v.strip() for v in rest.split(",") if v.strip()]
+    return parsed
+
+
+def _estimate(value: str) -> tuple:
+    # argparse type: "b=300/900" -> ("b", {"p50": 300.0, "p95": 900.0})
+    name, _, ms = value.partition("=")
+    p50, _, p95 = ms.partition("/")
+    try:
+        pair = {"p50": float(p50), "p95": float(p95 or p50)}
+    except ValueError:
+        pair = None
+    if not name.strip() or not pair or pair["p50"] <= 0 or pair["p95"] < pair["p50"]:
+        raise argparse.ArgumentTypeError(f"expected API=P50[/P95] in ms (P95 >= P50 > 0), got {value!r}")
+    return name.strip(), pair
+
+
+def _estimates(values: list) -> dict:
+    # [("a", {...}), ("b", {...})] from --estimate -> {"a": {...}, "b": {...}}
+    return dict(values or [])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Predict the latency of combined endpoints.")
+    parser.add_argument("names", nargs="*", help="registry combined entries (default: all)")
+    parser.add_argument("--state", action="store_true", help="plan the combine workflow in progress")
+    parser.add_argument("--apis", help="comma-separated source APIs of a combination not built yet")
+    parser.add_argument("--depends", action="append", metavar="API=DEP,DEP", help="dependencies (repeatable)")
+    parser.add_argument("--flow", help="flow type without --depends (sequential, parallel)")
+    parser.add_argument("--estimate", action="append", type=_estimate, metavar="API=P50[/P95]",
+                        help="declared latency in ms")
+    parser.add_argument("--name", default="planned", help="budget lookup name for --apis")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.apis:
+        config = {"source_elements": [{"type": "api", "name": n.strip()} for n in args.apis.split(",")],
+                  "flow_type": args.flow or "sequential", "latency_estimates_ms": _estimates(args.estimate)}
+        if args.depends:
+            config["dependencies"] = _pairs(args.depends)
+        results = [plan_combined(args.name, config)]
+    elif args.state:
+        state = state_store.load_state(STATE_FILE) if STATE_FILE.exists() else {}
+        name, endpoint_data = state_store.get_active_endpoint(state)
+        decisions = (endpoint_data or {}).get("phases", {}).get("interview", {}).get("decisions", {})
+        config = dict(state.get("combine_config") or {})
+        if not config.get("source_elements"):
+            print("No combine workflow in progress.")
+            return 1
+        config["latency_estimates_ms"] = {**(config.get("latency_estimates_ms") or {}), **_estimates(args.estimate)}
+        results = [plan_combined(name or "combined", config, decisions)]
+    else:
+        names = args.names or registry_store.names("combined")
+        results = [plan_combined(name) for name in names]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    elif not results:
+        print("No combined endpoints in the registry.")
+    else:
+        print("\n\n".join(format_plan(r) for r in results))
+    return 1 if any(r["status"] in ("over_budget", "invalid") for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
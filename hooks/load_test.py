@@ -0,0 +1,490 @@
+"""
+Local load-test runner for the endpoints in api-tests-manifest.json.
+
+generate-manifest-entry.py writes `examples` and `testCases` for every
+generated endpoint, and collect-test-results.ts records how the Vitest run
+went, but nothing replays those requests against the running dev server to
+see how an endpoint behaves under load.
+
+This module fires an endpoint's test cases at the local base URL
+(the manifest's baseUrl, http://localhost:3001 by default) from one asyncio
+event loop:
+
+  - requests are scheduled at a target rate (--rps) for --duration seconds,
+    ramping linearly from zero over the first --ramp-up seconds; --rps 0
+    sends back to back instead
+  - latency is measured from each request's scheduled send time, so time
+    spent waiting behind slow requests counts (no coordinated omission)
+  - at most --concurrency requests are in flight; a request scheduled while
+    every slot is busy waits for one (and counts as "delayed"), but no
+    longer than --timeout or the end of --duration; one that gets no slot
+    by then is not sent and counts as "dropped" (and as an error)
+  - connections are kept alive and reused, so the numbers measure the
+    route rather than TCP setup
+
+Test cases are replayed round-robin with their own expected status; a
+different status, a timeout or a connection error counts as an error.
+Endpoints without test case inputs fall back to their examples (any status
+below 400 passes), and GET endpoints with neither to a bare request.
+
+Each endpoint's p50/p95/p99 latency, error rate and throughput is written to
+its manifest entry as "loadTestResults", next to the "testResults" that
+collect-test-results.ts records, with a "lastLoadTest" summary at the top
+level.
+
+  python3 .claude/hooks/load_test.py [--endpoint ID_OR_PATH] [--base-url URL]
+      [--rps N] [--duration S] [--ramp-up S] [--concurrency N]
+      [--timeout S] [--manifest PATH] [--no-write] [--json]
+
+  load_endpoint(entry, base_url, ...)   one endpoint, returns its stats
+  run_manifest(manifest_path, ...)      every (matching) endpoint, recorded
+  probe(entry, base_url)                time a single request
+  reachable(base_url)                   whether anything listens there
+
+Added in v3.11.0.
+"""
+import argparse
+import asyncio
+import json
+import math
+import socket
+import ssl
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+import manifest_cache
+
+DEFAULT_MANIFEST = Path.cwd() / "src" / "app" / "api-test" / "api-tests-manifest.json"
+DEFAULT_BASE_URL = "http://localhost:3001"
+
+DEFAULTS = {"rps": 10.0, "duration": 10.0, "ramp_up": 0.0, "concurrency": 10, "timeout": 10.0}
+
+BODY_METHODS = {"POST", "PUT", "PATCH"}
+
+
+class LoadTestError(Exception):
+    """The manifest or the target server cannot be used."""
+
+
+# What a request can fail with: refused/reset connections (OSError), timeouts
+# (asyncio.TimeoutError is not the builtin TimeoutError before Python 3.11),
+# a body cut short (asyncio.IncompleteReadError is an EOFError) and malformed
+# status lines or chunk sizes (IndexError, ValueError)
+TRANSPORT_ERRORS = (OSError, asyncio.TimeoutError, EOFError, IndexError, ValueError)
+
+
+def manifest_endpoints(manifest: dict) -> list:
+    """Every endpoint entry: generated sections and the test manifest's top-level list."""
+    found = [e for e in manifest.get("endpoints", []) if isinstance(e, dict)]
+    for section in manifest.get("sections", []):
+        if isinstance(section, dict):
+            found.extend(e for e in section.get("endpoints", []) if isinstance(e, dict))
+    return found
+
+
+def endpoint_path(entry: dict) -> str:
+    return entry.get("path") or entry.get("endpoint") or ""
+
+
+def _query_string(body: dict) -> str:
+    # Same encoding as the curl examples: strings as-is, everything else as JSON
+    params = []
+    for key, value in body.items():
+        text = value if isinstance(value, str) else json.dumps(value)
+        params.append(f"{quote(str(key))}={quote(text)}")
+    return "&".join(params)
+
+
+def request_plan(entry: dict) -> list:
+    """The requests to replay: [{"name", "target", "body", "expected"}].
+
+    "expected" is the status a test case expects, or None for "below 400".
+    """
+    method = (entry.get("method") or "GET").upper()
+    path = endpoint_path(entry)
+
+    def make(name, body, expected):
+        body = body if isinstance(body, dict) else {}
+        target, payload = path, None
+        if method in BODY_METHODS:
+            payload = json.dumps(body).encode()
+        elif body:
+            target = f"{path}?{_query_string(body)}"
+        return {"name": name, "target": target, "body": payload, "expected": expected}
+
+    cases = [c for c in entry.get("testCases", []) if isinstance(c, dict) and "input" in c]
+    if cases:
+        return [make(c.get("name", "case"), c["input"], c.get("expectedStatus")) for c in cases]
+
+    examples = [e for e in entry.get("examples", []) if isinstance(e, dict) and "request" in e]
+    if examples:
+        return [make(e.get("name", "example"), e["request"], None) for e in examples]
+
+    if method == "GET" and path:
+        return [make("GET", {}, None)]
+    return []
+
+
+def percentile(ordered: list, p: float) -> float:
+    """Nearest-rank percentile of a sorted list (same as the installer's report)."""
+    if not ordered:
+        return 0.0
+    rank = math.ceil(p / 100 * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+class _Connections:
+    """Keep-alive HTTP/1.1 connections to one host, reused between requests."""
+
+    def __init__(self, base_url: str):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise LoadTestError(f"Unsupported base URL: {base_url}")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.prefix = parts.path.rstrip("/")
+        self.host_header = parts.netloc
+        self.idle = []
+
+    async def request(self, method: str, target: str, body: bytes = None) -> tuple[int, int]:
+        """Send one request; returns (status, response body bytes)."""
+        if not self.idle:
+            return await self._send(method, target, body, await self._open())
+        try:
+            return await self._send(method, target, body, self.idle.pop())
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # The server closed an idle keep-alive connection: retry once on a new one
+            return await self._send(method, target, body, await self._open())
+
+    async def _open(self):
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+
+    async def _send(self, method: str, target: str, body: bytes, connection) -> tuple[int, int]:
+        reader, writer = connection
+        try:
+            head = [f"{method} {self.prefix}{target} HTTP/1.1", f"Host: {self.host_header}",
+                    "Accept: application/json", "Connection: keep-alive"]
+            if body is not None:
+                head += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + (body or b""))
+            await writer.drain()
+            status, size, reusable = await self._response(reader)
+        except BaseException:
+            writer.close()
+            raise
+        if reusable:
+            self.idle.append((reader, writer))
+        else:
+            writer.close()
+        return status, size
+
+    @staticmethod
+    async def _response(reader) -> tuple[int, int, bool]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed before a response")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        reusable = headers.get("connection", "").lower() != "close"
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            size = 0
+            while True:
+                chunk = int((await reader.readline()).split(b";")[0], 16)
+                await reader.readexactly(chunk + 2)
+                size += chunk
+                if chunk == 0:
+                    break
+            return status, size, reusable
+        if "content-length" in headers:
+            size = int(headers["content-length"])
+            await reader.readexactly(size)
+            return status, size, reusable
+        if status in (204, 304) or 100 <= status < 200:
+            return status, 0, reusable
+        return status, len(await reader.read()), False
+
+    def close(self) -> None:
+        for _, writer in self.idle:
+            writer.close()
+        self.idle = []
+
+
+def _summary(latencies: list, sent: int, errors: int, elapsed: float, dropped: int = 0) -> dict:
+    ordered = sorted(latencies)
+    scheduled = sent + dropped
+    return {
+        "requests": scheduled,
+        "errors": errors,
+        "errorRate": round(errors / scheduled, 4) if scheduled else 0.0,
+        "throughput": round(sent / elapsed, 2) if elapsed else 0.0,
+        "latencyMs": {
+            "p50": round(percentile(ordered, 50), 2),
+            "p95": round(percentile(ordered, 95), 2),
+            "p99": round(percentile(ordered, 99), 2),
+            "mean": round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+            "max": round(ordered[-1], 2) if ordered else 0.0,
+        },
+    }
+
+
+def _due_time(n: int, rps: float, ramp_up: float) -> float:
+    """Seconds after the start at which request n (0-based) is due.
+
+    The inverse of the requests due by time t: rps * t^2 / (2 * ramp_up)
+    while ramping, rps * (t - ramp_up / 2) after.
+    """
+    if ramp_up > 0 and n < rps * ramp_up / 2:
+        return math.sqrt(2 * ramp_up * n / rps)
+    return n / rps + ramp_up / 2
+
+
+async def _load(entry: dict, base_url: str, rps: float, duration: float, ramp_up: float,
+                concurrency: int, timeout: float) -> dict:
+    plan = request_plan(entry)
+    method = (entry.get("method") or "GET").upper()
+    connections = _Connections(base_url)
+    slots = asyncio.Semaphore(concurrency)
+    latencies, statuses, failures = [], {}, {}
+    counters = {"sent": 0, "errors": 0, "delayed": 0, "dropped": 0, "bytes": 0, "max_bytes": 0}
+    start = time.perf_counter()
+    end = start + duration
+
+    async def fire(item: dict, scheduled: float) -> None:
+        if slots.locked():
+            counters["delayed"] += 1
+            # Wait for a slot, but not past the request's timeout or the end of the run
+            try:
+                await asyncio.wait_for(slots.acquire(), min(scheduled + timeout, end) - time.perf_counter())
+            except asyncio.TimeoutError:
+                counters["dropped"] += 1
+                counters["errors"] += 1
+                failures["dropped (no free slot)"] = failures.get("dropped (no free slot)", 0) + 1
+                return
+        else:
+            await slots.acquire()
+        try:
+            counters["sent"] += 1
+            try:
+                status, size = await asyncio.wait_for(
+                    connections.request(method, item["target"], item["body"]), timeout)
+            except TRANSPORT_ERRORS as e:
+                counters["errors"] += 1
+                reason = "timeout" if isinstance(e, asyncio.TimeoutError) else type(e).__name__
+                failures[reason] = failures.get(reason, 0) + 1
+                return
+        finally:
+            slots.release()
+        # From the scheduled send time: queueing behind slow requests is part of the latency
+        latencies.append((time.perf_counter() - scheduled) * 1000)
+        counters["bytes"] += size
+        counters["max_bytes"] = max(counters["max_bytes"], size)
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+        expected = item["expected"]
+        if (status != expected) if expected is not None else status >= 400:
+            counters["errors"] += 1
+            key = f"{item['name']}: {status}"
+            failures[key] = failures.get(key, 0) + 1
+
+    pending = set()
+    n = 0
+    try:
+        while True:
+            if rps > 0:
+                scheduled = start + _due_time(n, rps, ramp_up)
+                if scheduled >= end:
+                    break
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            else:
+                await slots.acquire()
+                slots.release()
+                scheduled = time.perf_counter()
+                if scheduled >= end:
+                    break
+            task = asyncio.ensure_future(fire(plan[n % len(plan)], scheduled))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            n += 1
+            if rps <= 0:
+                await asyncio.sleep(0)
+        if pending:
+            await asyncio.gather(*pending)
+    finally:
+        connections.close()
+    elapsed = time.perf_counter() - start
+
+    result = _summary(latencies, counters["sent"], counters["errors"], elapsed, counters["dropped"])
+    result.update({
+        "statusCodes": dict(sorted(statuses.items())),
+        "failures": failures,
+        "delayed": counters["delayed"],
+        "dropped": counters["dropped"],
+        "responseBytes": counters["bytes"],
+        "maxResponseBytes": counters["max_bytes"],
+        "cases": len(plan),
+        "config": {"rps": rps, "duration": duration, "rampUp": ramp_up,
+                   "concurrency": concurrency, "timeout": timeout, "baseUrl": base_url},
+        "lastRun": datetime.now().isoformat(),
+    })
+    return result
+
+
+def load_endpoint(entry: dict, base_url: str = DEFAULT_BASE_URL, rps: float = DEFAULTS["rps"],
+                  duration: float = DEFAULTS["duration"], ramp_up: float = DEFAULTS["ramp_up"],
+                  concurrency: int = DEFAULTS["concurrency"], timeout: float = DEFAULTS["timeout"]) -> dict:
+    """Load-test one manifest entry and return its stats (None if it has nothing to replay)."""
+    if not request_plan(entry):
+        return None
+    return asyncio.run(_load(entry, base_url, rps, duration, ramp_up, max(1, concurrency), timeout))
+
+
+async def _probe(item: dict, method: str, base_url: str, timeout: float) -> dict:
+    connections = _Connections(base_url)
+    try:
+        started = time.perf_counter()
+        status, size = await asyncio.wait_for(connections.request(method, item["target"], item["body"]), timeout)
+        return {"status": status, "latencyMs": round((time.perf_counter() - started) * 1000, 2), "bytes": size}
+    except TRANSPORT_ERRORS as e:
+        reason = f"timed out after {timeout:g}s" if isinstance(e, asyncio.TimeoutError) else \
+            f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        raise LoadTestError(f"{item['name']} request failed ({reason})") from e
+    finally:
+        connections.close()
+
+
+def probe(entry: dict, base_url: str = DEFAULT_BASE_URL, timeout: float = 30.0) -> dict:
+    """Time one request with the entry's first case: {"status", "latencyMs", "bytes"}.
+
+    None if the entry has nothing to send. Connection errors, timeouts and
+    malformed responses raise LoadTestError.
+    """
+    plan = request_plan(entry)
+    if not plan:
+        return None
+    return asyncio.run(_probe(plan[0], (entry.get("method") or "GET").upper(), base_url, timeout))
+
+
+def reachable(base_url: str = DEFAULT_BASE_URL, timeout: float = 0.5) -> bool:
+    """Whether a server accepts connections at the base URL."""
+    parts = urlsplit(base_url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    try:
+        socket.create_connection((parts.hostname or "localhost", port), timeout=timeout).close()
+        return True
+    except OSError:
+        return False
+
+
+def _matches(entry: dict, wanted: str) -> bool:
+    return wanted in (entry.get("id"), endpoint_path(entry)) or endpoint_path(entry).endswith(f"/{wanted}")
+
+
+def find_entries(manifest: dict, endpoint: str) -> list:
+    """Manifest entries for an endpoint id, path or last path segment."""
+    return [e for e in manifest_endpoints(manifest) if _matches(e, endpoint)]
+
+
+def run_manifest(manifest_path: Path = DEFAULT_MANIFEST, endpoint: str = None, base_url: str = None,
+                 write: bool = True, report=None, **options) -> dict:
+    """Load-test the manifest's endpoints one after another; {id or path: stats}.
+
+    Results are written back into the manifest unless write is False.
+    report(label, stats) is called as each endpoint finishes.
+    """
+    manifest_path = Path(manifest_path)
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, json.JSONDecodeError) as e:
+        raise LoadTestError(f"Cannot read {manifest_path}: {e}") from None
+    base_url = base_url or manifest.get("baseUrl") or DEFAULT_BASE_URL
+
+    entries = find_entries(manifest, endpoint) if endpoint else manifest_endpoints(manifest)
+    if not entries:
+        raise LoadTestError(f"No endpoint matching {endpoint!r} in {manifest_path}" if endpoint
+                            else f"No endpoints in {manifest_path}")
+
+    results = {}
+    for entry in entries:
+        label = entry.get("id") or endpoint_path(entry)
+        stats = load_endpoint(entry, base_url, **options)
+        if stats is None:
+            continue
+        entry["loadTestResults"] = stats
+        results[label] = stats
+        if report:
+            report(label, stats)
+
+    if write and results:
+        # Re-read so a manifest rewritten during the run is not clobbered with stale entries
+        try:
+            current = json.loads(manifest_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            current = manifest
+        for entry in manifest_endpoints(current):
+            label = entry.get("id") or endpoint_path(entry)
+            if label in results:
+                entry["loadTestResults"] = results[label]
+        current["lastLoadTest"] = {
+            "endpoints": len(results),
+            "requests": sum(s["requests"] for s in results.values()),
+            "errors": sum(s["errors"] for s in results.values()),
+            "timestamp": datetime.now().isoformat(),
+        }
+        manifest_cache.write_manifest(manifest_path, current)
+    return results
+
+
+def _print_stats(label: str, stats: dict) -> None:
+    latency = stats["latencyMs"]
+    print(f"{label:<28} {stats['requests']:>6} req  {stats['throughput']:>7.1f} req/s  "
+          f"p50 {latency['p50']:>7.1f}  p95 {latency['p95']:>7.1f}  p99 {latency['p99']:>7.1f} ms  "
+          f"errors {stats['errorRate'] * 100:5.1f}%")
+    for reason, count in sorted(stats["failures"].items(), key=lambda item: -item[1])[:3]:
+        print(f"{'':<28}   {count} × {reason}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay api-tests-manifest.json test cases against a local server under load.")
+    parser.add_argument("--endpoint", help="endpoint id or path (default: every endpoint)")
+    parser.add_argument("--base-url", help=f"server to test (default: the manifest's baseUrl or {DEFAULT_BASE_URL})")
+    parser.add_argument("--rps", type=float, default=DEFAULTS["rps"], help="target requests per second, 0 for back to back")
+    parser.add_argument("--duration", type=float, default=DEFAULTS["duration"], help="seconds per endpoint")
+    parser.add_argument("--ramp-up", type=float, default=DEFAULTS["ramp_up"], help="seconds to ramp up to --rps")
+    parser.add_argument("--concurrency", type=int, default=DEFAULTS["concurrency"], help="maximum requests in flight")
+    parser.add_argument("--timeout", type=float, default=DEFAULTS["timeout"], help="seconds before a request counts as failed")
+    parser.add_argument("--manifest", default=str(DEFAULT_MANIFEST))
+    parser.add_argument("--no-write", action="store_true", help="do not record the results in the manifest")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    try:
+        results = run_manifest(
+            Path(args.manifest), endpoint=args.endpoint, base_url=args.base_url, write=not args.no_write,
+            report=None if args.json else _print_stats, rps=args.rps, duration=args.duration,
+            ramp_up=min(args.ramp_up, args.duration), concurrency=args.concurrency, timeout=args.timeout,
+        )
+    except LoadTestError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    elif not results:
+        print("No endpoint has test cases or examples to replay.")
+    elif not args.no_write:
+        print(f"\nRecorded loadTestResults in {args.manifest}")
+    return 1 if any(s["errors"] for s in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
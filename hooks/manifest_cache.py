@@ -0,0 +1,267 @@
+"""
+Incremental build cache for api-tests-manifest.json.
+
+generate-manifest-entry.py used to rebuild an endpoint's entry (every curl
+example and test case) and re-serialize the whole manifest on every run, so
+a one-endpoint change cost as much as the manifest was large.
+
+This module keeps an index in .claude/cache/manifest-index.json:
+
+  files      path -> (inode, mtime, size, sha256) of every input file, so
+             unchanged files are not even re-read to compute their hash
+  endpoints  endpoint -> key of its inputs (schema file, route file,
+             interview decisions, combine config, generator sources) and
+             the entry id/example/test counts it produced
+  manifest   the manifest's (inode, mtime, size) when we last wrote it, plus
+             the character span of every generated entry and of lastUpdated
+
+With that:
+  - an endpoint whose key is unchanged, in a manifest nobody else touched
+    since, is not regenerated at all (up_to_date())
+  - a changed endpoint's entry is spliced into the file at its recorded span
+    instead of re-parsing and re-serializing the rest (patch_entry())
+  - anything else (new endpoint, manifest edited or rewritten elsewhere)
+    falls back to a full rewrite, which records fresh spans (write_manifest())
+
+Spliced output is byte-identical to json.dumps(manifest, indent=2) of the
+updated manifest.
+
+Added in v3.11.0.
+"""
+import hashlib
+import json
+import os
+import secrets
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import state_store
+
+CACHE_DIR = Path(__file__).parent.parent / "cache"
+INDEX_FILE = CACHE_DIR / "manifest-index.json"
+
+# Bump when the index layout changes
+INDEX_VERSION = 1
+
+GENERATED_SECTION = "generated-apis"
+
+# Generator sources: editing them invalidates every cached key
+GENERATOR_FILES = [
+    Path(__file__).parent / "generate-manifest-entry.py",
+    Path(__file__).parent / "zod_parser.py",
+]
+
+
+def _stat_key(path: Path) -> list:
+    st = path.stat()
+    return [st.st_ino, st.st_mtime_ns, st.st_size]
+
+
+def load_index() -> dict:
+    try:
+        index = json.loads(INDEX_FILE.read_text())
+    except (OSError, json.JSONDecodeError):
+        index = {}
+    if index.get("version") != INDEX_VERSION:
+        index = {"version": INDEX_VERSION, "files": {}, "endpoints": {}, "manifest": None}
+    return index
+
+
+def _locked():
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    return state_store.locked(INDEX_FILE)
+
+
+def _save_index(index: dict) -> None:
+    _atomic_write(INDEX_FILE, json.dumps(index))
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(text)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def file_digest(path: Optional[Path], index: dict) -> Optional[str]:
+    """sha256 of a file, re-read only when its stat changed. None if missing."""
+    if path is None:
+        return None
+    path = Path(path)
+    try:
+        key = _stat_key(path)
+    except OSError:
+        index["files"].pop(str(path), None)
+        return None
+
+    known = index["files"].get(str(path))
+    if known and known[:3] == key:
+        return known[3]
+
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    index["files"][str(path)] = key + [digest]
+    return digest
+
+
+def input_key(endpoint: str, paths: list, extra: dict) -> str:
+    """Key over everything an endpoint's manifest entry is generated from."""
+    with _locked():
+        index = load_index()
+        parts = {
+            "endpoint": endpoint,
+            "inputs": [[str(p), file_digest(p, index)] for p in paths],
+            "generator": [file_digest(p, index) for p in GENERATOR_FILES],
+            "extra": extra,
+        }
+        _save_index(index)
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _manifest_unchanged(index: dict, manifest_path: Path) -> Optional[dict]:
+    recorded = index.get("manifest")
+    if not recorded or recorded.get("path") != str(manifest_path):
+        return None
+    try:
+        if _stat_key(manifest_path) != recorded["stat"]:
+            return None
+    except OSError:
+        return None
+    return recorded
+
+
+def up_to_date(manifest_path: Path, endpoint: str, key: str) -> Optional[dict]:
+    """Return the recorded {"id", "examples", "testCases"} if the manifest
+    already holds the entry generated from exactly these inputs."""
+    index = load_index()
+    built = index["endpoints"].get(endpoint)
+    if not built or built.get("key") != key:
+        return None
+    recorded = _manifest_unchanged(index, manifest_path)
+    if recorded is None or built.get("id") not in recorded["entries"]:
+        return None
+    return built
+
+
+def record(endpoint: str, key: str, entry: dict) -> None:
+    """Remember which inputs produced the entry now in the manifest."""
+    with _locked():
+        index = load_index()
+        index["endpoints"][endpoint] = {
+            "key": key,
+            "id": entry.get("id"),
+            "examples": len(entry.get("examples", [])),
+            "testCases": len(entry.get("testCases", [])),
+        }
+        _save_index(index)
+
+
+def _entry_text(entry: dict, column: int) -> str:
+    return json.dumps(entry, indent=2).replace("\n", "\n" + " " * column)
+
+
+def _last_updated_span(text: str) -> Optional[list]:
+    # Top-level keys are the only ones indented by exactly two spaces
+    marker = '\n  "lastUpdated": "'
+    start = text.find(marker)
+    if start < 0:
+        return None
+    start += len(marker) - 1
+    end = text.find('"', start + 1) + 1
+    return [start, end]
+
+
+def write_manifest(manifest_path: Path, manifest: dict) -> None:
+    """Write the whole manifest and record where each generated entry landed."""
+    section = None
+    for s in manifest.get("sections", []):
+        if isinstance(s, dict) and s.get("id") == GENERATED_SECTION:
+            section = s
+            break
+
+    entries = section.get("endpoints", []) if section else []
+    token = secrets.token_hex(8)
+    markers = [f"__manifest_entry_{i}_{token}__" for i in range(len(entries))]
+
+    if section is not None:
+        section["endpoints"] = markers
+        try:
+            skeleton = json.dumps(manifest, indent=2)
+        finally:
+            section["endpoints"] = entries
+    else:
+        skeleton = json.dumps(manifest, indent=2)
+
+    pieces, spans, ids = [], {}, []
+    pos = length = 0
+    for marker, entry in zip(markers, entries):
+        at = skeleton.index(f'"{marker}"', pos)
+        column = at - (skeleton.rfind("\n", 0, at) + 1)
+        pieces.append(skeleton[pos:at])
+        length += at - pos
+        text = _entry_text(entry, column)
+        entry_id = entry.get("id") if isinstance(entry, dict) else None
+        ids.append(entry_id)
+        spans[entry_id] = [length, length + len(text), column]
+        pieces.append(text)
+        length += len(text)
+        pos = at + len(marker) + 2
+    pieces.append(skeleton[pos:])
+    text = "".join(pieces)
+
+    # Entries without an id, or sharing one, cannot be patched by id
+    spans = {i: span for i, span in spans.items() if i is not None and ids.count(i) == 1}
+
+    with _locked():
+        _atomic_write(manifest_path, text)
+        index = load_index()
+        index["manifest"] = {
+            "path": str(manifest_path),
+            "stat": _stat_key(manifest_path),
+            "last_updated": _last_updated_span(text),
+            "entries": spans,
+        }
+        _save_index(index)
+
+
+def patch_entry(manifest_path: Path, entry: dict) -> bool:
+    """Replace an existing generated entry in place.
+
+    Returns False (leaving the file alone) when the entry is new or the
+    manifest changed since we last wrote it; the caller then rewrites it.
+    """
+    with _locked():
+        index = load_index()
+        recorded = _manifest_unchanged(index, manifest_path)
+        if recorded is None or entry.get("id") not in recorded["entries"]:
+            return False
+
+        text = manifest_path.read_text()
+        start, end, column = recorded["entries"][entry["id"]]
+        edits = [(start, end, _entry_text(entry, column))]
+        if recorded.get("last_updated"):
+            lu_start, lu_end = recorded["last_updated"]
+            edits.append((lu_start, lu_end, json.dumps(datetime.now().strftime("%Y-%m-%d"))))
+
+        for e_start, e_end, replacement in sorted(edits, reverse=True):
+            text = text[:e_start] + replacement + text[e_end:]
+
+        def shift(offset: int) -> int:
+            return offset + sum(len(r) - (e - s) for s, e, r in edits if e <= offset)
+
+        for entry_id, (s, e, col) in recorded["entries"].items():
+            if entry_id == entry["id"]:
+                recorded["entries"][entry_id] = [shift(s), shift(s) + len(edits[0][2]), col]
+            else:
+                recorded["entries"][entry_id] = [shift(s), shift(e), col]
+        if recorded.get("last_updated"):
+            lu_start = shift(recorded["last_updated"][0])
+            recorded["last_updated"] = [lu_start, lu_start + len(edits[-1][2])]
+
+        _atomic_write(manifest_path, text)
+        recorded["stat"] = _stat_key(manifest_path)
+        _save_index(index)
+    return True
@@ -0,0 +1,588 @@
+"""
+In-process versions of scripts/generate-test-manifest.ts and
+scripts/extract-parameters.ts for verify-after-green.py.
+
+verify-after-green used to launch `npx tsx` for each script after every green
+test run. Every launch paid for npx resolution and TypeScript compilation
+(seconds each) before doing a few milliseconds of regex work. These functions
+do the same work in the hook process.
+
+The output files are byte-identical to what the TypeScript scripts write
+(apart from the generatedAt timestamps): same file walk order, same regexes,
+same key order and JSON.stringify(..., null, 2) formatting. The TypeScript
+scripts remain the command-line versions; changes to either side must be
+mirrored in the other.
+
+collect-test-results.ts still runs through npx, since it has to run Vitest
+anyway.
+
+Added in v3.11.0.
+"""
+import json
+import math
+import os
+import re
+from datetime import datetime, timezone
+
+EXCLUDE_DIRS = ("node_modules", ".git", "dist")
+
+MANIFEST_VERSION = "3.0.0"
+
+# JS regexes: \w and \d are ASCII-only in JavaScript
+_A = re.ASCII
+
+# generate-test-manifest.ts
+_ENDPOINT_RE = re.compile(r"(?:/api/[\w/-]+)", _A)
+_METHOD_RE = re.compile(r"(?:GET|POST|PUT|DELETE|PATCH)\s*(?:request|endpoint)?", _A | re.I)
+_DESCRIBE_RE = re.compile(r"describe\s*\(\s*['\"`]([^'\"`]+)['\"`]", _A)
+_TEST_RE = re.compile(r"(?:it|test)\s*\(\s*['\"`]([^'\"`]+)['\"`]", _A)
+_TEST_FILE_RE = re.compile(r"\.(test|spec)\.(ts|tsx)$", _A)
+_SCHEMA_FILE_RE = re.compile(r"schema.*\.ts$", _A)
+_OBJECT_BLOCK_RE = re.compile(r"z\.object\s*\(\s*\{([^}]+)\}", _A | re.S)
+_FIELD_RE = re.compile(r"(\w+)\s*:\s*z\.(\w+)\s*\(\s*([^)]*)\s*\)([^,\n]*)", _A)
+_DESCRIBE_ARG_RE = re.compile(r"\.describe\s*\(\s*['\"`]([^'\"`]+)['\"`]\s*\)", _A)
+_DEFAULT_ARG_RE = re.compile(r"\.default\s*\(\s*([^)]+)\s*\)", _A)
+_ENUM_ARGS_RE = re.compile(r"\[([^\]]+)\]", _A)
+_ROUTE_METHOD_RES = (
+    re.compile(r"export\s+(?:async\s+)?function\s+(GET|POST|PUT|DELETE|PATCH)", _A),
+    re.compile(r"export\s+const\s+(GET|POST|PUT|DELETE|PATCH)\s*=", _A),
+)
+_JSDOC_RE = re.compile(r"/\*\*\s*\n\s*\*\s*([^\n*]+)", _A)
+
+# extract-parameters.ts
+_PARAM_SCHEMA_FILE_RE = re.compile(r"schema.*\.ts$|schemas?/.*\.ts$", _A)
+_ROUTE_FILE_RE = re.compile(r"route\.(ts|tsx)$", _A)
+_ZOD_OBJECT_RE = re.compile(r"z\.object\s*\(\s*\{([^}]+(?:\{[^}]*\}[^}]*)*)\}", _A | re.S)
+_ZOD_FIELD_RE = re.compile(r"(\w+)\s*:\s*(z\.(?:[^,\n]+(?:\([^)]*\))?)+)", _A)
+_ZOD_TYPE_RE = re.compile(r"z\.(\w+)", _A)
+_ZOD_ENUM_RE = re.compile(r"z\.enum\s*\(\s*\[([^\]]+)\]", _A)
+_MIN_RE = re.compile(r"\.min\s*\(\s*(\d+)\s*\)", _A)
+_MAX_RE = re.compile(r"\.max\s*\(\s*(\d+)\s*\)", _A)
+_REGEX_ARG_RE = re.compile(r"\.regex\s*\(\s*/([^/]+)/", _A)
+_QUERY_PARAM_RE = re.compile(r"searchParams\.get\s*\(\s*['\"`](\w+)['\"`]\s*\)", _A)
+_HEADER_PARAM_RE = re.compile(r"headers\.get\s*\(\s*['\"`]([^'\"`]+)['\"`]\s*\)", _A)
+_PATH_PARAM_RE = re.compile(r"params\.(\w+)|{\s*(\w+)\s*}\s*=\s*params", _A)
+_BODY_PARAM_RE = re.compile(r"body\s*:\s*(?:JSON\.stringify\s*\()?\s*\{([^}]+)\}", _A)
+_BODY_KEY_RE = re.compile(r"(\w+)\s*:", _A)
+_QUERY_STRING_RE = re.compile(r"[?&](\w+)=", _A)
+_HEADER_KEY_RE = re.compile(r"['\"`](X-[\w-]+|Authorization|Content-Type)['\"`]\s*:", _A | re.I)
+
+_MANIFEST_TYPES = {
+    "string": "string", "number": "number", "boolean": "boolean", "array": "array",
+    "object": "object", "enum": "enum", "literal": "literal", "union": "union",
+    "date": "date", "any": "any", "unknown": "unknown", "null": "null",
+    "undefined": "undefined", "void": "void", "never": "never", "bigint": "bigint",
+    "symbol": "symbol",
+}
+
+_PARAMETER_TYPES = {
+    "string": "string", "number": "number", "boolean": "boolean", "array": "array",
+    "object": "object", "enum": "enum", "literal": "literal", "union": "union",
+    "date": "string (ISO date)", "coerce": "coerced",
+}
+
+
+# ============================================
+# JavaScript compatibility helpers
+# ============================================
+
+def _iso_now() -> str:
+    """new Date().toISOString()"""
+    now = datetime.now(timezone.utc)
+    return now.strftime("%Y-%m-%dT%H:%M:%S.") + f"{now.microsecond // 1000:03d}Z"
+
+
+def _read(path: str) -> str:
+    """fs.readFileSync(path, 'utf-8')"""
+    with open(path, encoding="utf-8", errors="replace", newline="") as f:
+        return f.read()
+
+
+def _write_json(path: str, data) -> None:
+    """fs.writeFileSync(path, JSON.stringify(data, null, 2))"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(json.dumps(data, indent=2, ensure_ascii=False))
+
+
+def _truthy(value) -> bool:
+    """JavaScript truthiness ({} and [] are truthy)."""
+    if isinstance(value, (dict, list)):
+        return True
+    return bool(value)
+
+
+def _js_number(value):
+    """Normalize a parsed number the way JSON.stringify would print it."""
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e21:
+        return int(value)
+    if isinstance(value, dict):
+        return {k: _js_number(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_js_number(v) for v in value]
+    return value
+
+
+def _json_parse(text: str):
+    """JSON.parse(text); raises ValueError where JSON.parse would throw."""
+    def reject(name):
+        raise ValueError(name)
+    return _js_number(json.loads(text, parse_constant=reject))
+
+
+def _strip_quotes(values: str, quotes: str) -> list:
+    """values.split(',').map(s => s.trim().replace(/[quotes]/g, ''))"""
+    return [re.sub(f"[{quotes}]", "", s.strip()) for s in values.split(",")]
+
+
+def find_files(base_dir: str, pattern, exclude=EXCLUDE_DIRS) -> list:
+    """Recursive walk in the order of the TypeScript findFiles() (sorted entries)."""
+    files = []
+
+    def walk(directory):
+        try:
+            entries = sorted(os.scandir(directory), key=lambda e: e.name)
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name in exclude:
+                continue
+            full_path = os.path.normpath(os.path.join(directory, entry.name))
+            if entry.is_dir(follow_symlinks=False):
+                walk(full_path)
+            elif entry.is_file(follow_symlinks=False) and pattern.search(entry.name):
+                files.append(full_path)
+
+    walk(base_dir)
+    return files
+
+
+# ============================================
+# generate-test-manifest.ts
+# ============================================
+
+def parse_test_file(file_path: str) -> tuple:
+    """Return (groups, endpoint, method) for a Vitest file."""
+    content = _read(file_path)
+
+    root_groups = []
+    group_stack = []
+    brace_count = 0
+    describe_start_brace = 0
+
+    match = _ENDPOINT_RE.search(content)
+    endpoint = match.group(0) if match else None
+
+    match = _METHOD_RE.search(content)
+    method = re.split(r"\s", match.group(0))[0].upper() if match else None
+
+    for i, line in enumerate(content.split("\n")):
+        describe = _DESCRIBE_RE.search(line)
+        if describe:
+            group = {"name": describe.group(1), "tests": [], "groups": []}
+            if group_stack:
+                group_stack[-1]["groups"].append(group)
+            else:
+                root_groups.append(group)
+            group_stack.append(group)
+            describe_start_brace = brace_count
+
+        test = _TEST_RE.search(line)
+        if test and group_stack:
+            group_stack[-1]["tests"].append({"name": test.group(1), "line": i + 1})
+
+        brace_count += line.count("{") - line.count("}")
+
+        if brace_count <= describe_start_brace and group_stack:
+            group_stack.pop()
+            if group_stack:
+                describe_start_brace = brace_count
+
+    return root_groups, endpoint, method
+
+
+def parse_zod_parameters(file_path: str) -> list:
+    content = _read(file_path)
+    parameters = []
+
+    for block in _OBJECT_BLOCK_RE.finditer(content):
+        for match in _FIELD_RE.finditer(block.group(0)):
+            name, zod_type, type_args, modifiers = match.groups()
+
+            param = {
+                "name": name,
+                "type": _MANIFEST_TYPES.get(zod_type, zod_type),
+                "required": ".optional()" not in modifiers and ".nullable()" not in modifiers,
+            }
+
+            desc = _DESCRIBE_ARG_RE.search(modifiers)
+            if desc:
+                param["description"] = desc.group(1)
+
+            default = _DEFAULT_ARG_RE.search(modifiers)
+            if default:
+                try:
+                    param["default"] = _json_parse(default.group(1))
+                except ValueError:
+                    param["default"] = default.group(1)
+
+            if zod_type == "enum" and type_args:
+                values = _ENUM_ARGS_RE.search(type_args)
+                if values:
+                    param["enum"] = _strip_quotes(values.group(1), "'\"`")
+
+            parameters.append(param)
+
+    return parameters
+
+
+def parse_route_file(file_path: str) -> dict:
+    content = _read(file_path)
+    methods = []
+    for pattern in _ROUTE_METHOD_RES:
+        for match in pattern.finditer(content):
+            if match.group(1) not in methods:
+                methods.append(match.group(1))
+
+    jsdoc = _JSDOC_RE.search(content)
+    return {"methods": methods, "description": jsdoc.group(1).strip() if jsdoc else None}
+
+
+def read_interview_decisions(base_dir: str) -> dict:
+    state_file = os.path.join(base_dir, ".claude", "api-dev-state.json")
+    decisions = {}
+    if not os.path.exists(state_file):
+        return decisions
+
+    try:
+        state = _json_parse(_read(state_file))
+    except ValueError:
+        return decisions
+
+    endpoints = state.get("endpoints") if isinstance(state, dict) else None
+    if isinstance(endpoints, list):
+        for ep in endpoints:
+            if ep is None:
+                break  # ep.endpoint throws; the script returns what it has
+            if not isinstance(ep, dict):
+                continue
+            if _truthy(ep.get("endpoint")) and _truthy(ep.get("decisions")) \
+                    and isinstance(ep["endpoint"], str):
+                decisions[ep["endpoint"]] = ep["decisions"]
+    return decisions
+
+
+def generate_test_manifest(base_dir: str) -> dict:
+    """Build the api-tests-manifest.json document (generateManifest())."""
+    base_dir = os.path.normpath(base_dir)
+    test_files = find_files(base_dir, _TEST_FILE_RE)
+    schema_files = find_files(base_dir, _SCHEMA_FILE_RE)
+    interview_decisions = read_interview_decisions(base_dir)
+
+    endpoints = []
+    categories = {}
+    total_tests = 0
+
+    for test_file in test_files:
+        relative_path = os.path.relpath(test_file, base_dir)
+        groups, endpoint, method = parse_test_file(test_file)
+
+        test_cases = []
+
+        def count_tests(grps):
+            count = 0
+            for g in grps:
+                for t in g["tests"]:
+                    count += 1
+                    test_cases.append(t["name"])
+                count += count_tests(g["groups"])
+            return count
+
+        test_count = count_tests(groups)
+        total_tests += test_count
+
+        if not endpoint:
+            continue
+
+        path_parts = relative_path.split(os.sep)
+        category = "General"
+        if "api" in path_parts:
+            api_index = path_parts.index("api")
+            if api_index + 1 < len(path_parts):
+                category = path_parts[api_index + 1]
+        categories[category] = True
+
+        route_dir = os.path.dirname(test_file).replace("__tests__", "", 1).replace(".test", "", 1)
+        possible_routes = [
+            os.path.normpath(os.path.join(route_dir, "route.ts")),
+            os.path.normpath(os.path.join(route_dir, "route.tsx")),
+            _TEST_FILE_RE.sub(".ts", test_file, count=1),
+        ]
+
+        route_info = {"methods": [method or "GET"], "description": None}
+        for route_path in possible_routes:
+            if os.path.exists(route_path):
+                route_info = parse_route_file(route_path)
+                break
+
+        schema_base_name = _TEST_FILE_RE.sub("", os.path.basename(test_file), count=1)
+        matching_schemas = [s for s in schema_files
+                            if schema_base_name in s or category.lower() in s]
+
+        parameters = []
+        for schema_file in matching_schemas:
+            parameters.extend(parse_zod_parameters(schema_file))
+
+        endpoint_id = re.sub(r"^/api/", "", endpoint, count=1)
+        endpoint_id = endpoint_id.replace("/", "-")
+        endpoint_id = re.sub(r"[^a-z0-9-]", "", endpoint_id, flags=re.I | _A)
+
+        route_methods = route_info["methods"]
+        entry = {
+            "id": endpoint_id,
+            "name": groups[0]["name"] if groups and groups[0]["name"] else endpoint_id,
+            "endpoint": endpoint,
+            "method": (route_methods[0] if route_methods else None) or method or "GET",
+            "description": route_info["description"] or f"API endpoint: {endpoint}",
+            "category": category,
+            "parameters": {
+                "query": [p for p in parameters if not p["name"].startswith("body")],
+                "body": [p for p in parameters if p["name"].startswith("body") or p["name"] == "data"],
+                "headers": [],
+            },
+            "responses": {
+                "success": {"status": 200, "description": "Successful response"},
+                "error": [
+                    {"status": 400, "description": "Bad request"},
+                    {"status": 500, "description": "Internal server error"},
+                ],
+            },
+            "testFile": relative_path,
+            "testCount": test_count,
+            "testCases": test_cases,
+        }
+        if endpoint in interview_decisions:
+            entry["interviewDecisions"] = interview_decisions[endpoint]
+        entry["generatedAt"] = _iso_now()
+        endpoints.append(entry)
+
+    return {
+        "version": MANIFEST_VERSION,
+        "generatedAt": _iso_now(),
+        "endpoints": endpoints,
+        "summary": {
+            "totalEndpoints": len(endpoints),
+            "totalTests": total_tests,
+            "categories": list(categories),
+        },
+    }
+
+
+def write_test_manifest(base_dir: str, output_path: str = None) -> dict:
+    """generate-test-manifest.ts <baseDir> [outputPath]"""
+    output_path = output_path or os.path.join(base_dir, "src", "app", "api-test", "api-tests-manifest.json")
+    manifest = generate_test_manifest(base_dir)
+    _write_json(output_path, manifest)
+    return manifest
+
+
+# ============================================
+# extract-parameters.ts
+# ============================================
+
+def parse_zod_chain(name: str, chain: str):
+    type_match = _ZOD_TYPE_RE.search(chain)
+    if not type_match:
+        return None
+    base_type = type_match.group(1)
+
+    param = {
+        "name": name,
+        "location": "body",
+        "type": _PARAMETER_TYPES.get(base_type, base_type),
+        "required": True,
+    }
+
+    if ".optional()" in chain or ".nullable()" in chain:
+        param["required"] = False
+
+    desc = _DESCRIBE_ARG_RE.search(chain)
+    if desc:
+        param["description"] = desc.group(1)
+
+    default = _DEFAULT_ARG_RE.search(chain)
+    if default:
+        try:
+            param["default"] = _json_parse(default.group(1).replace("'", '"'))
+        except ValueError:
+            param["default"] = re.sub(r"['\"]", "", default.group(1))
+        param["required"] = False
+
+    if base_type == "enum":
+        values = _ZOD_ENUM_RE.search(chain)
+        if values:
+            param["enum"] = _strip_quotes(values.group(1), "'\"`")
+
+    minimum = _MIN_RE.search(chain)
+    if minimum:
+        param["min"] = int(minimum.group(1))
+
+    maximum = _MAX_RE.search(chain)
+    if maximum:
+        param["max"] = int(maximum.group(1))
+
+    pattern = _REGEX_ARG_RE.search(chain)
+    if pattern:
+        param["pattern"] = pattern.group(1)
+
+    return param
+
+
+def extract_from_zod_schema(content: str) -> list:
+    params = []
+    for obj in _ZOD_OBJECT_RE.finditer(content):
+        for field in _ZOD_FIELD_RE.finditer(obj.group(1)):
+            param = parse_zod_chain(field.group(1), field.group(2))
+            if param:
+                params.append(param)
+    return params
+
+
+def extract_from_route_file(content: str, existing_params: list) -> list:
+    params = []
+
+    def known(name):
+        return any(p["name"] == name for p in existing_params) or any(p["name"] == name for p in params)
+
+    for match in _QUERY_PARAM_RE.finditer(content):
+        name = match.group(1)
+        if not known(name):
+            params.append({"name": name, "location": "query", "type": "string", "required": False})
+
+    for match in _HEADER_PARAM_RE.finditer(content):
+        name = match.group(1)
+        if not known(name):
+            params.append({"name": name, "location": "header", "type": "string", "required": False})
+
+    for match in _PATH_PARAM_RE.finditer(content):
+        name = match.group(1) or match.group(2)
+        if not known(name):
+            params.append({"name": name, "location": "path", "type": "string", "required": True})
+
+    return params
+
+
+def extract_tested_params(content: str) -> list:
+    tested = {}
+
+    for match in _BODY_PARAM_RE.finditer(content):
+        for key in _BODY_KEY_RE.finditer(match.group(1)):
+            tested[key.group(0).replace(":", "", 1).strip()] = True
+
+    for match in _QUERY_STRING_RE.finditer(content):
+        tested[match.group(1)] = True
+
+    for match in _HEADER_KEY_RE.finditer(content):
+        tested[match.group(1)] = True
+
+    return list(tested)
+
+
+def _endpoint_from_path(relative_path: str, drop_last: bool = False):
+    """'/' + path parts from the first 'api' directory on, or None."""
+    path_parts = relative_path.split(os.sep)
+    if "api" not in path_parts:
+        return None
+    api_index = path_parts.index("api")
+    parts = path_parts[api_index:-1] if drop_last else path_parts[api_index:]
+    return "/" + "/".join(parts)
+
+
+def _new_endpoint(endpoint: str, method: str) -> dict:
+    return {
+        "endpoint": endpoint,
+        "method": method,
+        "parameters": [],
+        "sourceFiles": [],
+        "testedParameters": [],
+        "untestedParameters": [],
+    }
+
+
+def extract_all_parameters(base_dir: str) -> dict:
+    """Build the parameter-matrix.json document (extractAllParameters())."""
+    base_dir = os.path.normpath(base_dir)
+    schema_files = find_files(base_dir, _PARAM_SCHEMA_FILE_RE)
+    route_files = find_files(base_dir, _ROUTE_FILE_RE)
+    test_files = find_files(base_dir, _TEST_FILE_RE)
+
+    endpoints = {}
+
+    for schema_file in schema_files:
+        params = extract_from_zod_schema(_read(schema_file))
+        if not params:
+            continue
+        relative_path = os.path.relpath(schema_file, base_dir)
+        endpoint = _endpoint_from_path(relative_path)
+        if endpoint is None:
+            endpoint = "/api/unknown"
+        else:
+            endpoint = re.sub(r"/schema.*\.ts$", "", endpoint, count=1, flags=_A)
+
+        existing = endpoints.get(endpoint) or _new_endpoint(endpoint, "POST")
+        existing["parameters"].extend(params)
+        existing["sourceFiles"].append(relative_path)
+        endpoints[endpoint] = existing
+
+    for route_file in route_files:
+        content = _read(route_file)
+        relative_path = os.path.relpath(route_file, base_dir)
+        endpoint = _endpoint_from_path(relative_path, drop_last=True) or "/api/unknown"
+
+        existing = endpoints.get(endpoint) or _new_endpoint(endpoint, "GET")
+        if "export async function POST" in content or "export const POST" in content:
+            existing["method"] = "POST"
+
+        route_params = extract_from_route_file(content, existing["parameters"])
+        existing["parameters"].extend(route_params)
+        if relative_path not in existing["sourceFiles"]:
+            existing["sourceFiles"].append(relative_path)
+        endpoints[endpoint] = existing
+
+    for test_file in test_files:
+        content = _read(test_file)
+        match = _ENDPOINT_RE.search(content)
+        if not match:
+            continue
+        existing = endpoints.get(match.group(0))
+        if existing:
+            tested = extract_tested_params(content)
+            existing["testedParameters"] = list(dict.fromkeys(existing["testedParameters"] + tested))
+
+    total_params = 0
+    tested_params = 0
+    for ep in endpoints.values():
+        ep["untestedParameters"] = [p["name"] for p in ep["parameters"]
+                                    if p["name"] not in ep["testedParameters"]]
+        total_params += len(ep["parameters"])
+        tested_params += len(ep["testedParameters"])
+
+    return {
+        "version": MANIFEST_VERSION,
+        "generatedAt": _iso_now(),
+        "endpoints": list(endpoints.values()),
+        "coverage": {
+            "totalParameters": total_params,
+            "testedParameters": tested_params,
+            # Math.round: halves round up
+            "coveragePercent": math.floor(tested_params / total_params * 100 + 0.5) if total_params > 0 else 0,
+        },
+    }
+
+
+def write_parameter_matrix(base_dir: str, output_path: str = None) -> dict:
+    """extract-parameters.ts <baseDir> [outputPath]"""
+    output_path = output_path or os.path.join(base_dir, "src", "app", "api-test", "parameter-matrix.json")
+    matrix = extract_all_parameters(base_dir)
+    _write_json(output_path, matrix)
+    return matrix
@@ -24,6 +24,8 @@ import os
 from datetime import datetime
 from pathlib import Path
 
+import state_store
+
 # Configuration
 REGROUND_INTERVAL = 7  # Re-ground every N turns
 
@@ -45,15 +47,17 @@ def main():
         sys.exit(0)
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"continue": True}))
         sys.exit(0)
 
-    # Increment turn count
+    # Increment turn count (logged as operations, not a full state rewrite)
     turn_count = state.get("turn_count", 0) + 1
-    state["turn_count"] = turn_count
-    state["last_turn_timestamp"] = datetime.now().isoformat()
+    ops = [
+        {"op": "incr", "path": ["turn_count"], "value": 1},
+        {"op": "set", "path": ["last_turn_timestamp"], "value": datetime.now().isoformat()},
+    ]
 
     # Check if we should re-ground
     should_reground = turn_count % REGROUND_INTERVAL == 0
@@ -120,18 +124,20 @@ def main():
         context_parts.append("")
         context_parts.append("**Key Files:** .claude/api-dev-state.json, .claude/research/")
 
-        # Add to reground history
-        reground_history = state.setdefault("reground_history", [])
-        reground_history.append({
-            "turn": turn_count,
-            "timestamp": datetime.now().isoformat(),
-            "phase": current_phase
+        # Add to reground history, keeping only the last 10 reground events
+        ops.append({
+            "op": "append",
+            "path": ["reground_history"],
+            "value": {
+                "turn": turn_count,
+                "timestamp": datetime.now().isoformat(),
+                "phase": current_phase
+            },
+            "limit": 10
         })
-        # Keep only last 10 reground events
-        state["reground_history"] = reground_history[-10:]
 
         # Save state
-        STATE_FILE.write_text(json.dumps(state, indent=2))
+        state_store.apply_ops(state, ops, STATE_FILE)
 
         # Output with context injection
         output = {
@@ -144,7 +150,7 @@ def main():
         print(json.dumps(output))
     else:
         # Just update turn count and continue
-        STATE_FILE.write_text(json.dumps(state, indent=2))
+        state_store.apply_ops(state, ops, STATE_FILE)
         print(json.dumps({"continue": True}))
 
     sys.exit(0)
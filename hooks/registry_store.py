@@ -0,0 +1,348 @@
+"""
+Indexed store for the central registry (APIs, components, pages, combined).
+
+update-registry.py loaded and rewrote all of .claude/registry.json on every
+completion, and api-workflow-check.py, enforce-page-components.py and the
+showcase hooks each parsed the whole file to answer one question. Two
+workflows completing together could also lose one of the entries.
+
+The registry now lives in .claude/registry.db (stdlib sqlite3):
+
+  entries (kind, name, type, status, created_at, data)
+      kind is the registry section (apis, components, pages, combined);
+      data is the entry's JSON. Indexed by kind + type, kind + status and
+      created_at.
+  refs (kind, name, relation, target)
+      one row per item of an entry's "combines", "uses_components" and
+      "data_sources" lists, indexed by target, so "what combines X" is a
+      lookup.
+
+Writes (upsert, add) touch only the entry's rows and record the entry as
+pending export. registry.json, which the showcase pages and slash commands
+read, is rewritten by export(): once at the end of an update-registry run,
+at session end (api-workflow-check.py) and on demand. If registry.json is
+edited by hand (or by an older version of the hooks), the next open notices
+the changed file and imports it, then re-applies the entries still pending
+export so neither side is lost.
+
+  add(kind, name, entry)        insert unless present; True if inserted
+  upsert(kind, name, entry)     insert or replace, keeping the entry's position
+  export(force=False)           rewrite registry.json if writes are pending
+  get / exists / names / count  single lookups
+  entries(kind, type=, status=, since=)
+  referencing(target, relation=None)   entries that list target
+
+  python3 .claude/hooks/registry_store.py export
+
+Added in v3.11.0.
+"""
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+REGISTRY_FILE = Path(__file__).parent.parent / "registry.json"
+DB_FILE = Path(__file__).parent.parent / "registry.db"
+
+SCHEMA_VERSION = 1
+
+KINDS = ["apis", "components", "pages", "combined"]
+
+# Entry list fields indexed in refs
+REF_FIELDS = ["combines", "uses_components", "data_sources"]
+
+DEFAULT_HEADER = {
+    "version": "1.0.0",
+    "updated_at": "",
+    "description": "Central registry tracking all APIs, components, and pages created through Hustle Dev Tools",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT,
+    status TEXT,
+    created_at TEXT,
+    data TEXT NOT NULL,
+    UNIQUE (kind, name)
+);
+CREATE INDEX IF NOT EXISTS entries_type ON entries (kind, type);
+CREATE INDEX IF NOT EXISTS entries_status ON entries (kind, status);
+CREATE INDEX IF NOT EXISTS entries_created ON entries (created_at);
+CREATE TABLE IF NOT EXISTS refs (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    relation TEXT NOT NULL,
+    target TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS refs_target ON refs (target, relation);
+CREATE INDEX IF NOT EXISTS refs_entry ON refs (kind, name);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def present() -> bool:
+    """Whether the project has a registry at all."""
+    return REGISTRY_FILE.exists() or DB_FILE.exists()
+
+
+def _file_key() -> str:
+    try:
+        st = REGISTRY_FILE.stat()
+    except OSError:
+        return ""
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def _meta(conn, key: str, default=None):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", [key]).fetchone()
+    return row[0] if row else default
+
+
+def _set_meta(conn, key: str, value: str) -> None:
+    conn.execute("INSERT INTO meta (key, value) VALUES (?, ?) "
+                 "ON CONFLICT (key) DO UPDATE SET value = excluded.value", [key, value])
+
+
+def connect() -> sqlite3.Connection:
+    """Open the store, importing registry.json if it changed outside the store."""
+    conn = sqlite3.connect(DB_FILE, timeout=10, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        with _write(conn):
+            # executescript() would commit the open transaction first
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    if _meta(conn, "file_key", "") != _file_key():
+        with _write(conn):
+            # Re-check under the write lock: another process may have imported it
+            if _meta(conn, "file_key", "") != _file_key():
+                if REGISTRY_FILE.exists():
+                    _import(conn)
+                else:
+                    _export(conn)
+    return conn
+
+
+class _write:
+    """BEGIN IMMEDIATE ... COMMIT (ROLLBACK on error)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+def _pending(conn) -> list:
+    return [tuple(p) for p in json.loads(_meta(conn, "pending", "[]"))]
+
+
+def _import(conn) -> None:
+    """Replace the store's contents with registry.json, keeping unexported writes."""
+    try:
+        registry = json.loads(REGISTRY_FILE.read_text())
+    except (OSError, json.JSONDecodeError):
+        return  # keep what we have; the next export rewrites the file
+    pending = []
+    for kind, name in _pending(conn):
+        row = conn.execute("SELECT data FROM entries WHERE kind = ? AND name = ?", [kind, name]).fetchone()
+        if row:
+            pending.append((kind, name, json.loads(row["data"])))
+    conn.execute("DELETE FROM entries")
+    conn.execute("DELETE FROM refs")
+    header = {k: v for k, v in registry.items() if k not in KINDS}
+    _set_meta(conn, "header", json.dumps(header))
+    for kind in KINDS:
+        section = registry.get(kind)
+        if isinstance(section, dict):
+            for name, entry in section.items():
+                if isinstance(entry, dict):
+                    _store(conn, kind, name, entry)
+    for kind, name, entry in pending:
+        _store(conn, kind, name, entry)
+    _set_meta(conn, "file_key", _file_key())
+
+
+def _export(conn) -> None:
+    """Write registry.json from the store (caller holds the write lock)."""
+    header = json.loads(_meta(conn, "header", "null") or "null") or dict(DEFAULT_HEADER)
+    registry = dict(header)
+    registry["updated_at"] = datetime.now().isoformat()
+    for kind in KINDS:
+        registry[kind] = {}
+    for row in conn.execute("SELECT kind, name, data FROM entries ORDER BY id"):
+        registry.setdefault(row["kind"], {})[row["name"]] = json.loads(row["data"])
+
+    tmp = REGISTRY_FILE.with_name(f".{REGISTRY_FILE.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps(registry, indent=2))
+        os.replace(tmp, REGISTRY_FILE)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    _set_meta(conn, "header", json.dumps({k: v for k, v in registry.items() if k not in KINDS}))
+    _set_meta(conn, "file_key", _file_key())
+    _set_meta(conn, "pending", "[]")
+
+
+def _store(conn, kind: str, name: str, entry: dict) -> None:
+    created_at = entry.get("created_at")
+    conn.execute(
+        "INSERT INTO entries (kind, name, type, status, created_at, data) VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (kind, name) DO UPDATE SET type = excluded.type, status = excluded.status, "
+        "created_at = excluded.created_at, data = excluded.data",
+        [kind, name, _text(entry.get("type")), _text(entry.get("status")),
+         _text(created_at), json.dumps(entry)],
+    )
+    conn.execute("DELETE FROM refs WHERE kind = ? AND name = ?", [kind, name])
+    for relation in REF_FIELDS:
+        targets = entry.get(relation)
+        if not isinstance(targets, list):
+            continue
+        for target in dict.fromkeys(_ref_name(t) for t in targets):
+            if target:
+                conn.execute("INSERT INTO refs (kind, name, relation, target) VALUES (?, ?, ?, ?)",
+                             [kind, name, relation, target])
+
+
+def _text(value):
+    return value if isinstance(value, str) else None
+
+
+def _ref_name(target):
+    # combines/uses_components hold names; data_sources may hold {"name"/"endpoint": ...}
+    if isinstance(target, dict):
+        target = target.get("name") or target.get("endpoint") or target.get("route")
+    return target if isinstance(target, str) else None
+
+
+def _mark_pending(conn, kind: str, name: str) -> None:
+    pending = _pending(conn)
+    if (kind, name) not in pending:
+        _set_meta(conn, "pending", json.dumps(pending + [(kind, name)]))
+
+
+def upsert(kind: str, name: str, entry: dict) -> None:
+    """Insert or replace an entry (registry.json follows on the next export())."""
+    conn = connect()
+    try:
+        with _write(conn):
+            _store(conn, kind, name, entry)
+            _mark_pending(conn, kind, name)
+    finally:
+        conn.close()
+
+
+def add(kind: str, name: str, entry: dict) -> bool:
+    """Insert an entry unless one with that name exists. True if it was added."""
+    conn = connect()
+    try:
+        with _write(conn):
+            if conn.execute("SELECT 1 FROM entries WHERE kind = ? AND name = ?", [kind, name]).fetchone():
+                return False
+            _store(conn, kind, name, entry)
+            _mark_pending(conn, kind, name)
+        return True
+    finally:
+        conn.close()
+
+
+def export(force: bool = False) -> bool:
+    """Rewrite registry.json if entries were written since the last export. True if written."""
+    if not present():
+        return False
+    conn = connect()
+    try:
+        with _write(conn):
+            if not force and not _pending(conn):
+                return False
+            _export(conn)
+        return True
+    finally:
+        conn.close()
+
+
+def _query(sql: str, params: list) -> list:
+    if not present():
+        return []  # lookups never create a registry
+    conn = connect()
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def get(kind: str, name: str):
+    rows = _query("SELECT data FROM entries WHERE kind = ? AND name = ?", [kind, name])
+    return json.loads(rows[0]["data"]) if rows else None
+
+
+def exists(kind: str, name: str) -> bool:
+    return bool(_query("SELECT 1 FROM entries WHERE kind = ? AND name = ?", [kind, name]))
+
+
+def names(kind: str) -> list:
+    return [r["name"] for r in _query("SELECT name FROM entries WHERE kind = ? ORDER BY id", [kind])]
+
+
+def count(kind: str) -> int:
+    return _query("SELECT COUNT(*) AS n FROM entries WHERE kind = ?", [kind])[0]["n"]
+
+
+def entries(kind: str, type: str = None, status: str = None, since: str = None) -> dict:
+    """{name: entry} for a registry section, in registry order, optionally filtered."""
+    sql, params = "SELECT name, data FROM entries WHERE kind = ?", [kind]
+    if type:
+        sql += " AND type = ?"
+        params.append(type)
+    if status:
+        sql += " AND status = ?"
+        params.append(status)
+    if since:
+        sql += " AND created_at >= ?"
+        params.append(since)
+    return {r["name"]: json.loads(r["data"]) for r in _query(sql + " ORDER BY id", params)}
+
+
+def referencing(target: str, relation: str = None) -> list:
+    """(kind, name, relation) of every entry whose combines/uses_components/data_sources list target."""
+    sql, params = "SELECT kind, name, relation FROM refs WHERE target = ?", [target]
+    if relation:
+        sql += " AND relation = ?"
+        params.append(relation)
+    return [(r["kind"], r["name"], r["relation"]) for r in _query(sql + " ORDER BY kind, name", params)]
+
+
+def load() -> dict:
+    """The whole registry as registry.json would hold it."""
+    return {kind: entries(kind) for kind in KINDS}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv != ["export"]:
+        print("Usage: registry_store.py export", file=sys.stderr)
+        return 1
+    export(force=True)
+    print(f"Exported {REGISTRY_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,398 @@
+"""
+Inverted full-text index over an endpoint's cached research.
+
+enforce-questions-sourced.py and verify-implementation.py rebuilt their
+keyword sets on every call by loading the whole source history and scanning
+" ".join(str(s) for s in sources) substring by substring, which grows with
+every WebSearch/WebFetch of the session.
+
+.claude/cache/research-index.db (stdlib sqlite3) indexes per endpoint, as
+one document each:
+
+  - every research source in the endpoint's history segments (history_store),
+    including the fetched page stored for it in research/objects/
+    (research_store)
+  - the endpoint's CURRENT.md
+
+  docs (endpoint, doc, label, length)
+  postings (endpoint, term, doc, tf)    indexed by endpoint + term
+  terms (endpoint, term, df)            one row per distinct term, so word
+                                        lookups and top terms are index scans
+  progress (endpoint, key, value)       bytes read per segment, CURRENT.md
+                                        signature
+
+The index remembers how far into each segment it has read, so update()
+(called by track-tool-use.py after a source is recorded, and before every
+query) only parses records appended since and inserts their postings; a
+rewritten segment or an edited CURRENT.md rebuilds the endpoint's rows.
+
+  missing_terms(endpoint, terms)   terms whose words never occur in research
+  search(endpoint, text)           sources ranked by BM25 against the text
+  top_terms(endpoint)              most widespread research terms
+
+Endpoints whose history predates the segments pass their inline source list
+and get an in-memory index instead.
+
+Added in v3.11.0.
+"""
+import json
+import math
+import re
+import sqlite3
+from collections import Counter
+from pathlib import Path
+
+import history_store
+import research_store
+
+CACHE_DIR = Path(__file__).parent.parent / "cache"
+DB_FILE = CACHE_DIR / "research-index.db"
+RESEARCH_DIR = Path(__file__).parent.parent / "research"
+
+# Bump when the index layout changes
+SCHEMA_VERSION = 2
+
+# Research files indexed besides the source history
+RESEARCH_FILES = ["CURRENT.md"]
+
+# Source fields that carry no research text
+SKIP_FIELDS = {"timestamp", "success", "type", "content"}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+TOKEN = re.compile(r"\w+")
+
+# Query words too common to say anything about a question's origin
+STOPWORDS = {
+    "about", "after", "also", "been", "before", "being", "both", "could", "does",
+    "each", "from", "have", "into", "just", "like", "make", "more", "most", "much",
+    "need", "only", "other", "over", "same", "should", "some", "such", "than",
+    "that", "their", "them", "then", "there", "these", "they", "this", "those",
+    "through", "very", "want", "what", "when", "where", "which", "while", "will",
+    "with", "would", "your",
+}
+
+# Upper bound for a prefix range scan: term >= word AND term < word + PREFIX_END
+PREFIX_END = chr(0x10FFFF)
+
+SCHEMA = """
+DROP TABLE IF EXISTS docs;
+DROP TABLE IF EXISTS postings;
+DROP TABLE IF EXISTS terms;
+DROP TABLE IF EXISTS progress;
+CREATE TABLE docs (
+    endpoint TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    label TEXT,
+    length INTEGER NOT NULL,
+    PRIMARY KEY (endpoint, doc)
+);
+CREATE TABLE postings (
+    endpoint TEXT NOT NULL,
+    term TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    tf INTEGER NOT NULL
+);
+CREATE INDEX postings_term ON postings (endpoint, term);
+CREATE TABLE terms (
+    endpoint TEXT NOT NULL,
+    term TEXT NOT NULL,
+    df INTEGER NOT NULL,
+    PRIMARY KEY (endpoint, term)
+) WITHOUT ROWID;
+CREATE INDEX terms_df ON terms (endpoint, df DESC, term);
+CREATE TABLE progress (
+    endpoint TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (endpoint, key)
+);
+"""
+
+
+def tokenize(text: str) -> list:
+    return TOKEN.findall(text.lower())
+
+
+def _create(conn) -> sqlite3.Connection:
+    conn.row_factory = sqlite3.Row
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        with _write(conn):
+            # Re-check under the write lock: another process may have created it
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                # executescript() would commit the open transaction first
+                for statement in SCHEMA.split(";"):
+                    if statement.strip():
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def connect(memory: bool = False) -> sqlite3.Connection:
+    """Open the index (an empty in-memory one with memory=True)."""
+    if memory:
+        return _create(sqlite3.connect(":memory:", isolation_level=None))
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    return _create(sqlite3.connect(DB_FILE, timeout=10, isolation_level=None))
+
+
+class _write:
+    """BEGIN IMMEDIATE ... COMMIT (ROLLBACK on error)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+def _source_text(source) -> str:
+    """Research text of a source record: its string fields plus any stored page."""
+    if not isinstance(source, dict):
+        return str(source)
+    parts = []
+
+    def collect(value):
+        if isinstance(value, str):
+            parts.append(value)
+        elif isinstance(value, dict):
+            for v in value.values():
+                collect(v)
+        elif isinstance(value, list):
+            for v in value:
+                collect(v)
+
+    for key, value in source.items():
+        if key not in SKIP_FIELDS:
+            collect(value)
+
+    content = source.get("content")
+    if isinstance(content, dict) and content.get("sha256"):
+        try:
+            parts.append(research_store.get(content["sha256"]).decode("utf-8", "replace"))
+        except (KeyError, OSError, ValueError):
+            pass  # object store pruned or unreadable: index the metadata alone
+    return "\n".join(parts)
+
+
+def _source_label(source) -> str:
+    if not isinstance(source, dict):
+        return str(source)[:100]
+    return source.get("url") or source.get("query") or source.get("library") or source.get("tool") or "source"
+
+
+def _add_doc(conn, endpoint: str, label: str, text: str) -> None:
+    counts = Counter(tokenize(text))
+    doc = conn.execute("SELECT COALESCE(MAX(doc) + 1, 0) FROM docs WHERE endpoint = ?",
+                       [endpoint]).fetchone()[0]
+    conn.execute("INSERT INTO docs (endpoint, doc, label, length) VALUES (?, ?, ?, ?)",
+                 [endpoint, doc, label, sum(counts.values())])
+    conn.executemany("INSERT INTO postings (endpoint, term, doc, tf) VALUES (?, ?, ?, ?)",
+                     [(endpoint, term, doc, tf) for term, tf in counts.items()])
+    conn.executemany("INSERT INTO terms (endpoint, term, df) VALUES (?, ?, 1) "
+                     "ON CONFLICT (endpoint, term) DO UPDATE SET df = df + 1",
+                     [(endpoint, term) for term in counts])
+
+
+def _file_signature(endpoint: str) -> str:
+    signature = {}
+    for name in RESEARCH_FILES:
+        try:
+            st = (RESEARCH_DIR / endpoint / name).stat()
+        except OSError:
+            continue
+        signature[name] = [st.st_mtime_ns, st.st_size]
+    return json.dumps(signature, sort_keys=True)
+
+
+def _add_files(conn, endpoint: str) -> None:
+    for name in RESEARCH_FILES:
+        try:
+            _add_doc(conn, endpoint, name, (RESEARCH_DIR / endpoint / name).read_text())
+        except OSError:
+            continue
+
+
+def _progress(conn, endpoint: str) -> dict:
+    rows = conn.execute("SELECT key, value FROM progress WHERE endpoint = ?", [endpoint])
+    return {r["key"]: r["value"] for r in rows}
+
+
+def _stale(progress: dict, files: str, sizes: dict) -> bool:
+    if progress.get("files") != files:
+        return True
+    return any(key.startswith("segment:") and (key[8:] not in sizes or sizes[key[8:]] < int(value))
+               for key, value in progress.items())
+
+
+def _pending(progress: dict, sizes: dict) -> bool:
+    return any(size != int(progress.get(f"segment:{name}", 0)) for name, size in sizes.items())
+
+
+def _sync(conn, endpoint: str, segments: list) -> None:
+    sizes = {}
+    for path in segments:
+        try:
+            sizes[path.name] = path.stat().st_size
+        except OSError:
+            continue
+    files = _file_signature(endpoint)
+
+    # Nothing appended and nothing edited: no write lock needed
+    progress = _progress(conn, endpoint)
+    if not _stale(progress, files, sizes) and not _pending(progress, sizes):
+        return
+
+    with _write(conn):
+        progress = _progress(conn, endpoint)  # another hook may have indexed it meanwhile
+        if _stale(progress, files, sizes):
+            for table in ("docs", "postings", "terms", "progress"):
+                conn.execute(f"DELETE FROM {table} WHERE endpoint = ?", [endpoint])
+            conn.execute("INSERT INTO progress (endpoint, key, value) VALUES (?, 'files', ?)",
+                         [endpoint, files])
+            _add_files(conn, endpoint)
+            progress = {}
+
+        for path in segments:
+            start = int(progress.get(f"segment:{path.name}", 0))
+            if path.name not in sizes or sizes[path.name] == start:
+                continue
+            with open(path, "rb") as f:
+                f.seek(start)
+                data = f.read(sizes[path.name] - start)
+            end = data.rfind(b"\n") + 1  # a record still being written is read next time
+            for line in data[:end].splitlines():
+                try:
+                    source = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn write from a crashed hook, skipped like history_store does
+                _add_doc(conn, endpoint, _source_label(source), _source_text(source))
+            if end:
+                conn.execute("INSERT OR REPLACE INTO progress (endpoint, key, value) VALUES (?, ?, ?)",
+                             [endpoint, f"segment:{path.name}", str(start + end)])
+
+
+def _open(endpoint: str, inline: list = None) -> sqlite3.Connection:
+    """The index, brought up to date with the endpoint's research.
+
+    Falls back to an in-memory index of the inline sources when the endpoint
+    has no history segments yet.
+    """
+    segments = history_store.segment_paths(endpoint, "sources")
+    if not segments:
+        conn = connect(memory=True)
+        _add_files(conn, endpoint)
+        for source in inline if isinstance(inline, list) else []:
+            _add_doc(conn, endpoint, _source_label(source), _source_text(source))
+        return conn
+
+    conn = connect()
+    try:
+        _sync(conn, endpoint, segments)
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+def update(endpoint: str) -> None:
+    """Index the research recorded for the endpoint since the last update."""
+    segments = history_store.segment_paths(endpoint, "sources")
+    if segments:
+        conn = connect()
+        try:
+            _sync(conn, endpoint, segments)
+        finally:
+            conn.close()
+
+
+def _present(conn, endpoint: str, word: str) -> bool:
+    # Exact term or a longer one it prefixes ("gateway" matches "gateways"),
+    # as one range scan of the terms index
+    return conn.execute("SELECT 1 FROM terms WHERE endpoint = ? AND term >= ? AND term < ? LIMIT 1",
+                        [endpoint, word, word + PREFIX_END]).fetchone() is not None
+
+
+def missing_terms(endpoint: str, terms: list, inline: list = None) -> list:
+    """The terms (phrases) with a word that occurs nowhere in the research."""
+    conn = _open(endpoint, inline)
+    try:
+        return [term for term in terms
+                if not all(_present(conn, endpoint, w) for w in tokenize(term))]
+    finally:
+        conn.close()
+
+
+def _query_terms(text: str) -> list:
+    return list(dict.fromkeys(t for t in tokenize(text) if len(t) > 3 and t not in STOPWORDS))
+
+
+def search(endpoint: str, text: str, limit: int = 5, inline: list = None) -> list:
+    """Research documents ranked by BM25 against a text.
+
+    Returns [{"label": ..., "score": ..., "terms": [matched terms]}], best first.
+    """
+    conn = _open(endpoint, inline)
+    try:
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs WHERE endpoint = ?",
+                                    [endpoint]).fetchone()
+        if not count:
+            return []
+        average = total / count or 1.0
+
+        scores = {}
+        matched = {}
+        for term in _query_terms(text):
+            entries = conn.execute(
+                "SELECT p.doc, p.tf, d.length FROM postings p "
+                "JOIN docs d ON d.endpoint = p.endpoint AND d.doc = p.doc "
+                "WHERE p.endpoint = ? AND p.term = ?", [endpoint, term]).fetchall()
+            if not entries:
+                continue
+            idf = math.log(1 + (count - len(entries) + 0.5) / (len(entries) + 0.5))
+            for doc, tf, length in entries:
+                norm = K1 * (1 - B + B * length / average)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+                matched.setdefault(doc, []).append(term)
+
+        ranked = sorted(scores, key=lambda d: (-scores[d], d))[:limit]
+        labels = {}
+        for doc in ranked:
+            labels[doc] = conn.execute("SELECT label FROM docs WHERE endpoint = ? AND doc = ?",
+                                       [endpoint, doc]).fetchone()[0]
+        return [{"label": labels[d], "score": round(scores[d], 3), "terms": matched[d]} for d in ranked]
+    finally:
+        conn.close()
+
+
+def top_terms(endpoint: str, limit: int = 10, inline: list = None) -> list:
+    """Research terms occurring in the most documents (ignoring short and common words)."""
+    conn = _open(endpoint, inline)
+    try:
+        found = []
+        rows = conn.execute("SELECT term FROM terms WHERE endpoint = ? AND length(term) > 3 "
+                            "ORDER BY df DESC, term", [endpoint])
+        for (term,) in rows:
+            if term not in STOPWORDS and not term.isdigit():
+                found.append(term)
+                if len(found) == limit:
+                    break
+        return found
+    finally:
+        conn.close()
+
+
+def term_count(endpoint: str, inline: list = None) -> int:
+    """Number of distinct terms in the endpoint's research."""
+    conn = _open(endpoint, inline)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM terms WHERE endpoint = ?", [endpoint]).fetchone()[0]
+    finally:
+        conn.close()
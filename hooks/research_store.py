@@ -0,0 +1,135 @@
+"""
+Content-addressed, compressed blob store for research content.
+
+session-logger.py copied every file in .claude/research/<endpoint>/ into each
+.claude/api-sessions/<endpoint>_<ts>/research-cache/ it saved, and WebFetch
+pages were not kept at all, so the same documentation was either lost or
+duplicated once per session.
+
+Content now lives once, keyed by the sha256 of its uncompressed bytes:
+
+  .claude/research/objects/ab/cdef0123...   (zlib, or lzma if configured)
+
+Anything that wants to keep content stores a reference instead:
+
+  {"sha256": "abcdef01...", "size": 18234}
+
+so the same page fetched for two endpoints, or the same sources.json saved
+by ten sessions, takes the space of one compressed copy. Objects are written
+atomically and never modified; writing content that is already stored is a
+stat.
+
+  put(data)               store bytes (or str), return the reference
+  get(digest)             the stored bytes (KeyError if missing)
+  snapshot(directory)     store every file under a directory (history/
+                          segments included), return a {relative path:
+                          reference} manifest
+  materialize(manifest, directory)
+                          write a manifest's files back out
+
+The per-endpoint working files (sources.json, CURRENT.md, ...) stay plain
+files, since other hooks and the model read them directly.
+
+Compression defaults to zlib, which is fast enough to run inside a hook;
+API_DEV_RESEARCH_COMPRESSION=lzma trades CPU for smaller objects. Readers
+detect the format from the object itself, so both can be mixed.
+
+Added in v3.11.0.
+"""
+import hashlib
+import lzma
+import os
+import zlib
+from pathlib import Path
+
+RESEARCH_DIR = Path(__file__).parent.parent / "research"
+OBJECTS_DIR = RESEARCH_DIR / "objects"
+
+COMPRESSION_ENV = "API_DEV_RESEARCH_COMPRESSION"
+
+LZMA_MAGIC = b"\xfd7zXZ\x00"
+
+
+def _object_path(digest: str) -> Path:
+    return OBJECTS_DIR / digest[:2] / digest[2:]
+
+
+def _compress(data: bytes) -> bytes:
+    if os.environ.get(COMPRESSION_ENV) == "lzma":
+        return lzma.compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(blob: bytes) -> bytes:
+    if blob.startswith(LZMA_MAGIC):
+        return lzma.decompress(blob)
+    return zlib.decompress(blob)
+
+
+def digest_of(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def has(digest: str) -> bool:
+    return _object_path(digest).is_file()
+
+
+def put(data) -> dict:
+    """Store content (bytes or str) once and return its reference."""
+    if isinstance(data, str):
+        data = data.encode()
+    digest = digest_of(data)
+    path = _object_path(digest)
+    if not path.is_file():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_bytes(_compress(data))
+            os.replace(tmp, path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+    return {"sha256": digest, "size": len(data)}
+
+
+def get(digest: str) -> bytes:
+    """The content stored under a digest."""
+    try:
+        blob = _object_path(digest).read_bytes()
+    except FileNotFoundError:
+        raise KeyError(digest) from None
+    return _decompress(blob)
+
+
+def snapshot(directory: Path) -> dict:
+    """Store the files under a directory; {path relative to it: reference}.
+
+    Subdirectories are included, so an endpoint's history/ segments are kept
+    along with its working files. Dot files (in-progress writes) and lock
+    files are skipped.
+    """
+    manifest = {}
+    directory = Path(directory)
+    if not directory.is_dir():
+        return manifest
+    for path in sorted(directory.rglob("*")):
+        relative = path.relative_to(directory)
+        if path.is_file() and path.suffix != ".lock" and not any(p.startswith(".") for p in relative.parts):
+            manifest[relative.as_posix()] = put(path.read_bytes())
+    return manifest
+
+
+def materialize(manifest: dict, directory: Path) -> list:
+    """Write a snapshot manifest's files into a directory; returns the paths written."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, ref in manifest.items():
+        relative = Path(name)
+        if relative.is_absolute() or ".." in relative.parts:
+            raise ValueError(f"snapshot path outside the target directory: {name}")
+        target = directory / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(get(ref["sha256"]))
+        written.append(str(target))
+    return written
@@ -0,0 +1,174 @@
+"""
+Persistent index of the project's Next.js API route files.
+
+check-api-routes.py used to run four recursive globs over src/app/api and
+app/api every time it listed the existing routes, which on a large app/ tree
+costs hundreds of milliseconds per Write.
+
+The index lives in .claude/cache/route-index.json and records, for every
+directory under the API roots, its mtime and its subdirectories and route
+files. A directory's mtime changes whenever an entry is added, removed or
+renamed in it, so refreshing the index only stats the known directories and
+re-lists the ones whose mtime moved; unchanged directories are never listed.
+Directories modified within RACY_NS of being listed are re-listed on the next
+refresh, in case a change landed within the filesystem's mtime granularity.
+
+  routes()          "/api/..." route names, same strings the old globs produced
+  route_files()     the route files themselves (relative to the project root)
+  route_exists(r)   whether /api/<r> has a route file: a stat, no index needed
+
+Paths are relative to the working directory, like the globs they replace.
+
+Added in v3.11.0.
+"""
+import json
+import os
+import time
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent.parent / "cache"
+INDEX_FILE = CACHE_DIR / "route-index.json"
+
+# Bump when the index layout changes
+INDEX_VERSION = 1
+
+API_ROOTS = ["src/app/api", "app/api"]
+ROUTE_EXTENSIONS = (".ts", ".tsx")
+
+# Directory mtimes closer than this to the listing are not trusted yet
+RACY_NS = 2_000_000_000
+
+
+def _is_route_file(path: str) -> bool:
+    # Same test the recursive globs applied to every *.ts / *.tsx file
+    return path.endswith(ROUTE_EXTENSIONS) and ("route.ts" in path or "route.tsx" in path)
+
+
+def route_name(path: str) -> str:
+    """Route name of a route file: src/app/api/users/[id]/route.ts -> /api/users/[id]."""
+    route = path.replace("src/app/api/", "/api/")
+    route = route.replace("app/api/", "/api/")
+    route = route.replace("/route.ts", "")
+    route = route.replace("/route.tsx", "")
+    return route
+
+
+def _load_index() -> dict:
+    try:
+        index = json.loads(INDEX_FILE.read_text())
+    except (OSError, json.JSONDecodeError):
+        index = {}
+    if index.get("version") != INDEX_VERSION or index.get("base") != os.getcwd():
+        index = {"version": INDEX_VERSION, "base": os.getcwd(), "dirs": {}}
+    return index
+
+
+def _save_index(index: dict) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = INDEX_FILE.with_name(f".{INDEX_FILE.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps(index))
+        os.replace(tmp, INDEX_FILE)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _drop(dirs: dict, path: str) -> None:
+    """Forget a directory and everything indexed below it."""
+    prefix = path + "/"
+    for known in [d for d in dirs if d == path or d.startswith(prefix)]:
+        del dirs[known]
+
+
+def _list_dir(path: str, now_ns: int) -> list:
+    subdirs, files = [], []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue  # the globs skipped hidden entries too
+            try:
+                if entry.is_dir():
+                    subdirs.append(entry.name)
+                elif _is_route_file(f"{path}/{entry.name}"):
+                    files.append(entry.name)
+            except OSError:
+                continue
+    mtime = os.stat(path).st_mtime_ns
+    if now_ns - mtime < RACY_NS:
+        mtime = None  # re-list next time
+    return [mtime, sorted(subdirs), sorted(files)]
+
+
+def _refresh_dir(dirs: dict, path: str, now_ns: int, seen: set) -> bool:
+    """Bring one directory (and below) up to date. True if anything changed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        if path in dirs:
+            _drop(dirs, path)
+            return True
+        return False
+
+    # Symlinked directories are followed, like the globs did, but not in a loop
+    if (st.st_dev, st.st_ino) in seen:
+        return False
+    seen.add((st.st_dev, st.st_ino))
+
+    changed = False
+    entry = dirs.get(path)
+    if entry is None or entry[0] is None or entry[0] != st.st_mtime_ns:
+        try:
+            fresh = _list_dir(path, now_ns)
+        except OSError:
+            _drop(dirs, path)
+            return True
+        if entry is not None:
+            for gone in set(entry[1]) - set(fresh[1]):
+                _drop(dirs, f"{path}/{gone}")
+        changed = fresh != entry
+        dirs[path] = entry = fresh
+
+    for sub in entry[1]:
+        changed = _refresh_dir(dirs, f"{path}/{sub}", now_ns, seen) or changed
+    return changed
+
+
+def route_files() -> list:
+    """Every route file under the API roots, refreshing the index as needed."""
+    index = _load_index()
+    dirs = index["dirs"]
+    now_ns = time.time_ns()
+
+    changed = False
+    for root in API_ROOTS:
+        changed = _refresh_dir(dirs, root, now_ns, set()) or changed
+    if changed:
+        try:
+            _save_index(index)
+        except OSError:
+            pass  # a read-only .claude/ only costs us the cache
+
+    files = []
+    for root in API_ROOTS:
+        prefix = root + "/"
+        for path in sorted(d for d in dirs if d == root or d.startswith(prefix)):
+            files.extend(f"{path}/{name}" for name in dirs[path][2])
+    return files
+
+
+def routes() -> list:
+    """Existing API routes as "/api/..." names."""
+    return [route_name(path) for path in route_files()]
+
+
+def route_exists(route: str) -> bool:
+    """Whether "/api/<route>" (or "<route>") has a route.ts/route.tsx file."""
+    route = route.strip("/")
+    if route.startswith("api/"):
+        route = route[len("api/"):]
+    for root in API_ROOTS:
+        for ext in ROUTE_EXTENSIONS:
+            if os.path.isfile(os.path.join(root, route, f"route{ext}")):
+                return True
+    return False
@@ -13,6 +13,13 @@ It saves the session data for the completed workflow including:
 
 Added in v3.6.7 for session logging support.
 
+Updated in v3.11.0:
+  - Research files are stored once in .claude/research/objects/
+    (research_store.py); a session keeps a research-cache.json manifest of
+    references instead of a research-cache/ copy
+  - Sessions are recorded in .claude/api-sessions/sessions.db (session_store.py)
+    instead of rewriting index.json on every save
+
 Returns:
   - JSON with session save info
 """
@@ -21,30 +28,16 @@ import sys
 import os
 from datetime import datetime
 from pathlib import Path
-import shutil
+
+import research_store
+import session_store
+import state_store
 
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 SESSIONS_DIR = Path(__file__).parent.parent / "api-sessions"
 RESEARCH_DIR = Path(__file__).parent.parent / "research"
 
 
-def get_active_endpoint(state):
-    """Get active endpoint - supports both old and new state formats."""
-    # New format (v3.6.7+): endpoints object with active_endpoint pointer
-    if "endpoints" in state and "active_endpoint" in state:
-        active = state.get("active_endpoint")
-        if active and active in state["endpoints"]:
-            return active, state["endpoints"][active]
-        return None, None
-
-    # Old format: single endpoint field
-    endpoint = state.get("endpoint")
-    if endpoint:
-        return endpoint, state
-
-    return None, None
-
-
 def get_completed_phases(endpoint_data):
     """Get list of completed phases."""
     completed = []
@@ -189,45 +182,38 @@ def save_session(endpoint, endpoint_data, state):
     summary = generate_summary(endpoint, endpoint_data, state)
     (session_dir / "summary.md").write_text(summary)
 
-    # 4. Copy research cache if exists
+    # 4. Reference the research cache (content is stored once in research/objects/)
     research_src = RESEARCH_DIR / endpoint
+    research_manifest = None
     if research_src.exists():
-        research_dst = session_dir / "research-cache"
-        research_dst.mkdir(exist_ok=True)
-        for f in research_src.iterdir():
-            if f.is_file():
-                shutil.copy2(f, research_dst / f.name)
+        manifest = {
+            "saved_at": datetime.now().isoformat(),
+            "source": f".claude/research/{endpoint}/",
+            "files": research_store.snapshot(research_src)
+        }
+        (session_dir / "research-cache.json").write_text(json.dumps(manifest, indent=2))
+        research_manifest = f"{session_dir.name}/research-cache.json"
 
-    # 5. Update sessions index
-    update_sessions_index(endpoint, timestamp, endpoint_data)
+    # 5. Record the session in the sessions database
+    update_sessions_index(endpoint, timestamp, endpoint_data, summary, research_manifest)
 
     return session_dir
 
 
-def update_sessions_index(endpoint, timestamp, endpoint_data):
-    """Update the sessions index file."""
-    index_file = SESSIONS_DIR / "index.json"
-
-    if index_file.exists():
-        try:
-            index = json.loads(index_file.read_text())
-        except json.JSONDecodeError:
-            index = {"version": "3.6.7", "sessions": []}
-    else:
-        index = {"version": "3.6.7", "sessions": []}
-
-    # Add this session
+def update_sessions_index(endpoint, timestamp, endpoint_data, summary=None, research_manifest=None):
+    """Record the session in .claude/api-sessions/sessions.db."""
+    folder = f"{endpoint}_{timestamp}"
     completed = get_completed_phases(endpoint_data)
-    index["sessions"].append({
-        "endpoint": endpoint,
-        "timestamp": timestamp,
-        "folder": f"{endpoint}_{timestamp}",
-        "status": endpoint_data.get("status", "unknown"),
-        "phases_completed": len(completed),
-        "created_at": datetime.now().isoformat()
-    })
-
-    index_file.write_text(json.dumps(index, indent=2))
+    session_store.record(
+        endpoint=endpoint,
+        timestamp=timestamp,
+        folder=folder,
+        status=endpoint_data.get("status", "unknown"),
+        phases_completed=len(completed),
+        summary=summary,
+        snapshot_path=f"{folder}/state-snapshot.json",
+        research_manifest=research_manifest
+    )
 
 
 def main():
@@ -243,13 +229,13 @@ def main():
         sys.exit(0)
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"continue": True}))
         sys.exit(0)
 
     # Get active endpoint
-    endpoint, endpoint_data = get_active_endpoint(state)
+    endpoint, endpoint_data = state_store.get_active_endpoint(state)
     if not endpoint or not endpoint_data:
         print(json.dumps({"continue": True}))
         sys.exit(0)
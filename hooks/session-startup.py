@@ -25,6 +25,8 @@ import os
 from datetime import datetime
 from pathlib import Path
 
+import state_store
+
 # State file is in .claude/ directory (sibling to hooks/)
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 RESEARCH_INDEX = Path(__file__).parent.parent / "research" / "index.json"
@@ -46,36 +48,6 @@ def get_workflow_type(state):
     return "api-create"
 
 
-def get_active_endpoint(state):
-    """Get active endpoint - supports both old and new state formats."""
-    # New format (v3.6.7+): endpoints object with active_endpoint pointer
-    if "endpoints" in state and "active_endpoint" in state:
-        active = state.get("active_endpoint")
-        if active and active in state["endpoints"]:
-            return active, state["endpoints"][active]
-        return None, None
-
-    # Support for elements (UI workflow)
-    if "elements" in state and "active_element" in state:
-        active = state.get("active_element")
-        if active and active in state["elements"]:
-            return active, state["elements"][active]
-        return None, None
-
-    # Old format: single endpoint field
-    endpoint = state.get("endpoint")
-    if endpoint:
-        # Return endpoint name and the entire state as endpoint data
-        return endpoint, state
-
-    # Try active_element without elements dict
-    active = state.get("active_element")
-    if active:
-        return active, state
-
-    return None, None
-
-
 def load_research_index():
     """Load research index from .claude/research/index.json file."""
     if not RESEARCH_INDEX.exists():
@@ -115,13 +87,13 @@ def main():
         sys.exit(0)
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"continue": True}))
         sys.exit(0)
 
     # Get active endpoint (supports both old and new formats)
-    endpoint, endpoint_data = get_active_endpoint(state)
+    endpoint, endpoint_data = state_store.get_active_workflow(state)
     if not endpoint or not endpoint_data:
         # No active endpoint - just continue
         print(json.dumps({"continue": True}))
@@ -0,0 +1,289 @@
+"""
+SQLite index of saved API development sessions.
+
+session-logger.py used to load, append to and rewrite all of
+.claude/api-sessions/index.json on every save, and /hustle-api-sessions had
+to parse the whole file to list or find anything.
+
+Sessions are now rows in .claude/api-sessions/sessions.db (stdlib sqlite3),
+with indexes on endpoint + created_at, created_at, status and
+phases_completed. The summary is stored in the row; the state snapshot and
+research manifest stay files in the session folder and are referenced by
+path.
+
+  record(...)                 add (or replace) a saved session
+  latest(endpoint=None)       newest session for one endpoint, or the
+                              newest per endpoint
+  in_range(since, until)      sessions saved in a date range
+  sessions(...)               filtered listing, newest first
+  delete_before(before)       drop rows older than a date
+
+An existing index.json is imported the first time the database is created
+and left in place.
+
+The sessions command runs the same queries from the shell:
+
+  python3 .claude/hooks/session_store.py list [--endpoint E] [--status S]
+      [--since DATE] [--until DATE] [--min-phases N] [--limit N] [--json]
+  python3 .claude/hooks/session_store.py latest [ENDPOINT] [--json]
+  python3 .claude/hooks/session_store.py cleanup --before DATE   (also deletes the folders)
+
+Added in v3.11.0.
+"""
+import argparse
+import json
+import shutil
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+SESSIONS_DIR = Path(__file__).parent.parent / "api-sessions"
+DB_FILE = SESSIONS_DIR / "sessions.db"
+LEGACY_INDEX = SESSIONS_DIR / "index.json"
+
+SCHEMA_VERSION = 1
+
+COLUMNS = [
+    "endpoint", "timestamp", "folder", "status", "phases_completed",
+    "created_at", "summary", "snapshot_path", "research_manifest",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    folder TEXT NOT NULL UNIQUE,
+    status TEXT,
+    phases_completed INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    summary TEXT,
+    snapshot_path TEXT,
+    research_manifest TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_endpoint_created ON sessions (endpoint, created_at);
+CREATE INDEX IF NOT EXISTS sessions_created ON sessions (created_at);
+CREATE INDEX IF NOT EXISTS sessions_status ON sessions (status);
+CREATE INDEX IF NOT EXISTS sessions_phases ON sessions (phases_completed);
+"""
+
+
+def connect() -> sqlite3.Connection:
+    """Open the database, creating it (and importing index.json) if needed."""
+    SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(DB_FILE, timeout=10)
+    conn.row_factory = sqlite3.Row
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        with conn:
+            conn.executescript(SCHEMA)
+            _import_legacy_index(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def _import_legacy_index(conn: sqlite3.Connection) -> None:
+    try:
+        legacy = json.loads(LEGACY_INDEX.read_text())
+    except (OSError, json.JSONDecodeError):
+        return
+    for entry in legacy.get("sessions", []):
+        if not isinstance(entry, dict) or not entry.get("folder"):
+            continue
+        folder = SESSIONS_DIR / entry["folder"]
+        _insert(conn, {
+            "endpoint": entry.get("endpoint", ""),
+            "timestamp": entry.get("timestamp", ""),
+            "folder": entry["folder"],
+            "status": entry.get("status", "unknown"),
+            "phases_completed": entry.get("phases_completed", 0),
+            "created_at": entry.get("created_at", ""),
+            "summary": None,
+            "snapshot_path": _existing(folder / "state-snapshot.json"),
+            "research_manifest": _existing(folder / "research-cache.json"),
+        })
+
+
+def _existing(path: Path):
+    return str(path.relative_to(SESSIONS_DIR)) if path.exists() else None
+
+
+def _insert(conn: sqlite3.Connection, row: dict) -> None:
+    conn.execute(
+        f"INSERT OR REPLACE INTO sessions ({', '.join(COLUMNS)}) "
+        f"VALUES ({', '.join('?' for _ in COLUMNS)})",
+        [row.get(c) for c in COLUMNS],
+    )
+
+
+def record(endpoint: str, timestamp: str, folder: str, status: str, phases_completed: int,
+           summary: str = None, snapshot_path: str = None, research_manifest: str = None) -> None:
+    """Add a saved session (paths relative to .claude/api-sessions/)."""
+    conn = connect()
+    try:
+        with conn:
+            _insert(conn, {
+                "endpoint": endpoint,
+                "timestamp": timestamp,
+                "folder": folder,
+                "status": status,
+                "phases_completed": phases_completed,
+                "created_at": datetime.now().isoformat(),
+                "summary": summary,
+                "snapshot_path": snapshot_path,
+                "research_manifest": research_manifest,
+            })
+    finally:
+        conn.close()
+
+
+def _as_dicts(rows, with_summary: bool) -> list:
+    result = []
+    for row in rows:
+        entry = dict(row)
+        entry.pop("id", None)
+        if not with_summary:
+            entry.pop("summary", None)
+        result.append(entry)
+    return result
+
+
+def _until(value: str) -> str:
+    # A bare date includes the whole day
+    return value + "T23:59:59.999999" if len(value) == 10 else value
+
+
+def sessions(endpoint: str = None, status: str = None, since: str = None, until: str = None,
+             min_phases: int = None, limit: int = None, with_summary: bool = False) -> list:
+    """Saved sessions matching the filters, newest first. Dates are ISO dates or datetimes."""
+    clauses, params = [], []
+    if endpoint:
+        clauses.append("endpoint = ?")
+        params.append(endpoint)
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+    if since:
+        clauses.append("created_at >= ?")
+        params.append(since)
+    if until:
+        clauses.append("created_at <= ?")
+        params.append(_until(until))
+    if min_phases is not None:
+        clauses.append("phases_completed >= ?")
+        params.append(min_phases)
+
+    sql = "SELECT * FROM sessions"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY created_at DESC, id DESC"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    conn = connect()
+    try:
+        return _as_dicts(conn.execute(sql, params), with_summary)
+    finally:
+        conn.close()
+
+
+def in_range(since: str, until: str = None) -> list:
+    """Sessions saved between two dates (inclusive), newest first."""
+    return sessions(since=since, until=until)
+
+
+def latest(endpoint: str = None, with_summary: bool = False):
+    """The newest session of an endpoint (or None); without an endpoint, the newest of each."""
+    if endpoint:
+        found = sessions(endpoint=endpoint, limit=1, with_summary=with_summary)
+        return found[0] if found else None
+
+    # One index seek per endpoint on (endpoint, created_at)
+    sql = """
+        SELECT s.* FROM (SELECT DISTINCT endpoint FROM sessions) e
+        JOIN sessions s ON s.id = (
+            SELECT id FROM sessions WHERE endpoint = e.endpoint
+            ORDER BY created_at DESC, id DESC LIMIT 1
+        )
+        ORDER BY s.created_at DESC
+    """
+    conn = connect()
+    try:
+        return _as_dicts(conn.execute(sql), with_summary)
+    finally:
+        conn.close()
+
+
+def delete_before(before: str) -> list:
+    """Remove sessions saved before a date from the index; returns their folders."""
+    conn = connect()
+    try:
+        with conn:
+            folders = [r["folder"] for r in conn.execute(
+                "SELECT folder FROM sessions WHERE created_at < ?", [before])]
+            conn.execute("DELETE FROM sessions WHERE created_at < ?", [before])
+        return folders
+    finally:
+        conn.close()
+
+
+def _print_table(rows: list) -> None:
+    if not rows:
+        print("No saved sessions.")
+        return
+    print(f"{'#':>3} │ {'Endpoint':<20} │ {'Date':<19} │ {'Phases':>6} │ Status")
+    for i, row in enumerate(rows, 1):
+        print(f"{i:>3} │ {row['endpoint']:<20} │ {(row['created_at'] or '')[:19]:<19} │ "
+              f"{row['phases_completed']:>3}/13 │ {row['status']}")
+    print(f"\nTotal: {len(rows)} sessions")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query saved API development sessions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_cmd = commands.add_parser("list", help="list sessions, newest first")
+    list_cmd.add_argument("--endpoint")
+    list_cmd.add_argument("--status")
+    list_cmd.add_argument("--since", help="ISO date or datetime")
+    list_cmd.add_argument("--until", help="ISO date or datetime (a date includes the whole day)")
+    list_cmd.add_argument("--min-phases", type=int)
+    list_cmd.add_argument("--limit", type=int)
+    list_cmd.add_argument("--json", action="store_true")
+
+    latest_cmd = commands.add_parser("latest", help="newest session of an endpoint, or of every endpoint")
+    latest_cmd.add_argument("endpoint", nargs="?")
+    latest_cmd.add_argument("--json", action="store_true")
+
+    cleanup_cmd = commands.add_parser("cleanup", help="remove sessions saved before a date")
+    cleanup_cmd.add_argument("--before", required=True)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        rows = sessions(endpoint=args.endpoint, status=args.status, since=args.since,
+                        until=args.until, min_phases=args.min_phases, limit=args.limit)
+        if args.json:
+            print(json.dumps(rows, indent=2))
+        else:
+            _print_table(rows)
+    elif args.command == "latest":
+        found = latest(args.endpoint, with_summary=bool(args.endpoint))
+        rows = [found] if isinstance(found, dict) else (found or [])
+        if args.json:
+            print(json.dumps(found, indent=2))
+        elif args.endpoint and found and found.get("summary"):
+            print(found["summary"])
+        else:
+            _print_table(rows)
+    elif args.command == "cleanup":
+        for folder in delete_before(args.before):
+            path = SESSIONS_DIR / Path(folder).name
+            if path.is_dir():
+                shutil.rmtree(path)
+            print(f"Removed {folder}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
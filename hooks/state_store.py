@@ -0,0 +1,332 @@
+"""
+Shared access to .claude/api-dev-state.json for hook scripts.
+
+Hooks used to call `json.loads(STATE_FILE.read_text())` on every run. When
+several hooks run in one interpreter (hook-dispatcher.py), that meant parsing
+the same file once per hook. load_state() parses the file once and reuses the
+parsed object until the file changes on disk.
+
+The returned dict is shared between callers in the same process. Hooks that
+modify it must persist the change with save_state() or apply_ops() so later
+readers see the same data they would have read from disk.
+
+The cache is keyed by the file's (inode, mtime, size), so a state file that is
+edited, replaced or rewritten by another process is re-read on the next load.
+
+Writes:
+  - save_state() takes an advisory lock (api-dev-state.json.lock) and
+    replaces the file atomically (temp file + rename), so readers never see
+    a half-written file.
+  - load_state(for_update=True) takes the same lock before reading and holds
+    it until save_state() (or until the hook finishes), so parallel hooks
+    doing read-modify-write no longer overwrite each other's updates.
+  - apply_ops() records small mutations (set / incr / append) in an
+    append-only log (api-dev-state.oplog.jsonl) instead of re-serializing
+    the whole document. load_state() replays the log on top of the file;
+    the next save_state(), or the log growing past COMPACT_AFTER_BYTES,
+    folds it back into api-dev-state.json.
+
+Logged operations remember which version of api-dev-state.json they were
+made against. If the file is replaced outside state_store (e.g. edited by
+hand), the stale operations are dropped instead of being replayed over it.
+
+get_active_endpoint(), get_active_element() and get_active_workflow() replace
+the per-hook copies of the active endpoint lookup and cover all three state
+formats:
+  - endpoints + active_endpoint (v3.6.7+ API workflows)
+  - elements + active_element (UI and combine workflows)
+  - legacy single-workflow state with top-level endpoint/phases
+
+Added in v3.11.0 for the single-process hook dispatcher.
+"""
+import contextlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writes are still atomic
+    fcntl = None
+
+STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
+
+# Fold the operation log into the state file once it grows past this
+COMPACT_AFTER_BYTES = 64 * 1024
+
+# Give up waiting for the lock (and write anyway) rather than stall a tool call
+LOCK_TIMEOUT_SECONDS = 10
+
+# path -> (stat key, parsed state or JSONDecodeError)
+_cache = {}
+
+# path -> [open lock file, depth]
+_locks = {}
+
+# paths locked by load_state(for_update=True), released by save_state()
+_updating = set()
+
+# Bytes of state file + operation log read from / written to disk by this
+# process (hook_profiler.py attributes the difference to each hook run)
+io_bytes = {"read": 0, "written": 0}
+
+
+def _stat_key(path: Path):
+    st = path.stat()
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _oplog_path(path: Path) -> Path:
+    return path.with_suffix(".oplog.jsonl")
+
+
+def _state_key(path: Path):
+    """Cache key covering the state file and its operation log."""
+    oplog = _oplog_path(path)
+    return (_stat_key(path), _stat_key(oplog) if oplog.exists() else None)
+
+
+def _acquire(path: Path) -> None:
+    key = str(path)
+    if key in _locks:
+        _locks[key][1] += 1
+        return
+
+    lock_file = open(path.with_name(path.name + ".lock"), "a")
+    if fcntl is not None:
+        deadline = time.monotonic() + LOCK_TIMEOUT_SECONDS
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    break
+                time.sleep(0.005)
+    _locks[key] = [lock_file, 1]
+
+
+def _release(path: Path) -> None:
+    key = str(path)
+    if key not in _locks:
+        return
+    _locks[key][1] -= 1
+    if _locks[key][1] == 0:
+        _locks.pop(key)[0].close()
+
+
+@contextlib.contextmanager
+def locked(path: Path = STATE_FILE):
+    """Hold the state file's advisory lock (re-entrant within a process)."""
+    path = Path(path)
+    _acquire(path)
+    try:
+        yield
+    finally:
+        _release(path)
+
+
+def release_locks() -> None:
+    """Release every lock this process holds (called when a hook finishes)."""
+    for lock_file, _ in _locks.values():
+        lock_file.close()
+    _locks.clear()
+    _updating.clear()
+
+
+def _apply(state: dict, op: dict) -> None:
+    target = state
+    for key in op["path"][:-1]:
+        target = target.setdefault(key, {})
+    last = op["path"][-1]
+
+    if op["op"] == "set":
+        target[last] = op["value"]
+    elif op["op"] == "incr":
+        target[last] = target.get(last, 0) + op["value"]
+    elif op["op"] == "append":
+        items = target.get(last)
+        if not isinstance(items, list):
+            items = []
+        items.append(op["value"])
+        if op.get("limit"):
+            items = items[-op["limit"]:]
+        target[last] = items
+
+
+def _replay(state: dict, path: Path) -> None:
+    oplog = _oplog_path(path)
+    if not oplog.exists():
+        return
+    base = list(_stat_key(path))
+    for line in oplog.read_text().splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue  # torn write from a crashed hook
+        if record.get("base") == base:
+            _apply(state, record)
+
+
+def load_state(path: Path = STATE_FILE, for_update: bool = False):
+    """Load and parse the state file, reusing the parse while the file is unchanged.
+
+    Operations logged with apply_ops() are replayed on top of the file. With
+    for_update=True the state lock is taken first and held until save_state().
+
+    Raises FileNotFoundError if the file is missing and json.JSONDecodeError if
+    it is malformed, matching `json.loads(path.read_text())`.
+    """
+    path = Path(path)
+    if for_update and str(path) not in _updating:
+        _acquire(path)
+        _updating.add(str(path))
+
+    key = _state_key(path)
+    cached = _cache.get(str(path))
+    if cached is not None and cached[0] == key:
+        result = cached[1]
+    else:
+        try:
+            result = json.loads(path.read_text())
+            _replay(result, path)
+        except json.JSONDecodeError as e:
+            result = e
+        _cache[str(path)] = (key, result)
+        io_bytes["read"] += key[0][2] + (key[1][2] if key[1] else 0)
+
+    if isinstance(result, json.JSONDecodeError):
+        raise result
+    return result
+
+
+def save_state(state: dict, path: Path = STATE_FILE) -> None:
+    """Atomically write the whole state file and fold in the operation log.
+
+    Releases the lock taken by load_state(for_update=True).
+    """
+    path = Path(path)
+    with locked(path):
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            text = json.dumps(state, indent=2)
+            tmp.write_text(text)
+            os.replace(tmp, path)
+            io_bytes["written"] += len(text)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        _oplog_path(path).unlink(missing_ok=True)
+        _cache[str(path)] = (_state_key(path), state)
+
+    if str(path) in _updating:
+        _updating.discard(str(path))
+        _release(path)
+
+
+def apply_ops(state: dict, ops: list, path: Path = STATE_FILE) -> None:
+    """Apply small mutations to state and append them to the operation log.
+
+    Each op is a dict: {"op": "set" | "incr" | "append", "path": [keys...],
+    "value": ...}, plus an optional "limit" for append to keep only the last
+    N items. Intermediate keys are created as needed.
+    """
+    path = Path(path)
+    for op in ops:
+        _apply(state, op)
+
+    with locked(path):
+        before = _state_key(path)
+        base = list(before[0])
+        with open(_oplog_path(path), "a") as f:
+            for op in ops:
+                line = json.dumps({"base": base, **op}) + "\n"
+                f.write(line)
+                io_bytes["written"] += len(line)
+
+        cached = _cache.get(str(path))
+        if cached is not None and cached[0] == before and cached[1] is state:
+            _cache[str(path)] = (_state_key(path), state)
+        else:
+            _cache.pop(str(path), None)
+
+        if _oplog_path(path).stat().st_size > COMPACT_AFTER_BYTES:
+            compact(path)
+
+
+def compact(path: Path = STATE_FILE) -> None:
+    """Fold the operation log into the state file."""
+    path = Path(path)
+    with locked(path):
+        try:
+            state = load_state(path)
+        except json.JSONDecodeError:
+            return
+        save_state(state, path)
+
+
+def forget(path: Path = None) -> None:
+    """Drop cached parses (all of them if no path is given).
+
+    Used after a hook crashed, since it may have modified the shared state
+    without saving it.
+    """
+    if path is None:
+        _cache.clear()
+    else:
+        _cache.pop(str(Path(path)), None)
+
+
+def get_active_endpoint(state: dict) -> tuple[Optional[str], Optional[dict]]:
+    """Return (endpoint name, endpoint data) for the active API endpoint.
+
+    With the endpoints format the endpoint data is state["endpoints"][name];
+    with the legacy format it is the whole state. Returns (None, None) if no
+    endpoint is active.
+    """
+    if "endpoints" in state and "active_endpoint" in state:
+        active = state.get("active_endpoint")
+        if active and active in state["endpoints"]:
+            return active, state["endpoints"][active]
+        return None, None
+
+    endpoint = state.get("endpoint")
+    if endpoint:
+        return endpoint, state
+
+    return None, None
+
+
+def get_active_element(state: dict) -> tuple[Optional[str], Optional[dict]]:
+    """Return (element name, element data) for the active UI/combine element.
+
+    Falls back to the whole state when active_element is set without an
+    elements object. Returns (None, None) if no element is active.
+    """
+    if "elements" in state and "active_element" in state:
+        active = state.get("active_element")
+        if active and active in state["elements"]:
+            return active, state["elements"][active]
+        return None, None
+
+    active = state.get("active_element")
+    if active:
+        return active, state
+
+    return None, None
+
+
+def get_active_workflow(state: dict) -> tuple[Optional[str], Optional[dict]]:
+    """Return the active endpoint or element, whichever workflow is running.
+
+    Checked in order: endpoints, elements, legacy endpoint, bare active_element.
+    """
+    if "endpoints" in state and "active_endpoint" in state:
+        return get_active_endpoint(state)
+    if "elements" in state and "active_element" in state:
+        return get_active_element(state)
+    if state.get("endpoint"):
+        return get_active_endpoint(state)
+    return get_active_element(state)
@@ -0,0 +1,293 @@
+"""
+Index pairing source files (API routes) with their test files.
+
+enforce-tdd-red.py probed six fixed candidate paths for every route write,
+and missed the layout the workflow itself generates
+(src/app/api/v2/<endpoint>/__tests__/<endpoint>.api.test.ts, see
+update-registry.py). verify-implementation.py re-derived "is this a test"
+with its own substring checks.
+
+A test for <dir>/<name>.ts can only live in one of three directories:
+
+  <dir>/                   <name>.test.ts, <name>.spec.ts, ...
+  <dir>/__tests__/         <name>.test.ts, <name>.api.test.ts, and for
+                           route files <dir-name>.test.ts / .api.test.ts
+  <dir>/../__tests__/      <dir-name>.test.ts for route files
+
+.claude/cache/test-index.json records, for every directory scanned, its
+mtime and its source and test file names, plus the pairing derived from
+those listings in both directions (test -> source, source -> tests). The
+directories under SCAN_ROOTS are scanned once when the index is created;
+other directories are added the first time a lookup needs them.
+
+A lookup stats only the directories its answer can depend on (at most
+three) and re-lists those whose mtime changed; re-listing a directory
+re-pairs just the tests that can pair with files in it. The answer then
+comes from the pairing, without probing candidate paths. record_test()
+flags a directory as soon as a hook sees a test being written into it.
+
+  tests_for(source)   test files for a source file, best match first
+  source_for(test)    the source file a test covers, if it exists
+  is_test_file(path)  the .test./.spec./__tests__ check the hooks share
+
+Paths are keyed relative to the working directory; results come back in
+the form (relative or absolute) the caller passed in.
+
+Added in v3.11.0.
+"""
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent.parent / "cache"
+INDEX_FILE = CACHE_DIR / "test-index.json"
+
+# Bump when the index layout changes
+INDEX_VERSION = 2
+
+TESTS_DIR = "__tests__"
+
+# Scanned when the index is created; anything else is added on lookup
+SCAN_ROOTS = ["src", "app", "lib", "tests", TESTS_DIR]
+SKIP_DIRS = {"node_modules", "dist", "build", "coverage", "out"}
+
+# name(.api)?.test|spec.ts|tsx|js|jsx -> name
+TEST_NAME = re.compile(r"^(?P<stem>.+?)(?:\.api)?\.(?P<kind>test|spec)\.(?P<ext>tsx?|jsx?)$")
+# Files a test can cover (see _pair)
+SOURCE_EXTENSIONS = (".ts", ".tsx")
+
+# Directory mtimes closer than this to the listing are not trusted yet
+RACY_NS = 2_000_000_000
+
+
+def is_test_file(path: str) -> bool:
+    return ".test." in path or "/__tests__/" in path or ".spec." in path
+
+
+def _key(path: str) -> str:
+    """Index key of a path: relative to the working directory when inside it."""
+    path = os.path.abspath(path)
+    rel = os.path.relpath(path)
+    if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+        return path
+    return rel
+
+
+def _parent(key: str) -> str:
+    return os.path.dirname(key) or "."
+
+
+def _join(directory: str, name: str) -> str:
+    return os.path.normpath(os.path.join(directory, name))
+
+
+def _display(key: str, like: str) -> str:
+    """A key in the same form (relative or absolute) as the caller's path."""
+    return os.path.join(os.getcwd(), key) if os.path.isabs(like) else key
+
+
+def _load_index() -> dict:
+    try:
+        index = json.loads(INDEX_FILE.read_text())
+    except (OSError, json.JSONDecodeError):
+        index = {}
+    if index.get("version") != INDEX_VERSION or index.get("base") != os.getcwd():
+        index = {"version": INDEX_VERSION, "base": os.getcwd(), "dirs": {}, "source": {}, "tests": {}}
+        _scan(index)
+        index["changed"] = True
+    return index
+
+
+def _save_index(index: dict) -> None:
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = INDEX_FILE.with_name(f".{INDEX_FILE.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(index, separators=(",", ":")))
+            os.replace(tmp, INDEX_FILE)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+    except OSError:
+        pass  # a read-only .claude/ only costs us the cache
+
+
+def _list_dir(directory: str, mtime: int, now_ns: int) -> list:
+    """[mtime, source and test file names] for one directory."""
+    names = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith(".") or not (TEST_NAME.match(entry.name) or entry.name.endswith(SOURCE_EXTENSIONS)):
+                continue
+            try:
+                if entry.is_file():
+                    names.append(entry.name)
+            except OSError:
+                continue
+    if now_ns - mtime < RACY_NS:
+        mtime = None  # re-list next time
+    return [mtime, sorted(names)]
+
+
+def _pair(dirs: dict, test: str):
+    """The source a test covers, from the directory listings, or None."""
+    m = TEST_NAME.match(os.path.basename(test))
+    stem = m.group("stem")
+    directory = _parent(test)
+
+    if os.path.basename(directory) == TESTS_DIR:
+        base = _parent(directory)
+        candidates = [(base, f"{stem}.ts"), (base, f"{stem}.tsx"), (_join(base, stem), "route.ts")]
+        if os.path.basename(os.path.abspath(base)) == stem:
+            candidates.append((base, "route.ts"))
+    else:
+        candidates = [(directory, f"{stem}.ts"), (directory, f"{stem}.tsx")]
+
+    for where, name in candidates:
+        entry = dirs.get(where)
+        if entry is not None and name in entry[1]:
+            return _join(where, name)
+    return None
+
+
+def _link(index: dict, test: str, source) -> None:
+    """Point a test at its source (or at nothing), keeping both maps in step."""
+    old = index["source"].pop(test, None)
+    if old is not None:
+        tests = index["tests"][old]
+        tests.remove(test)
+        if not tests:
+            del index["tests"][old]
+    if source is not None:
+        index["source"][test] = source
+        index["tests"].setdefault(source, []).append(test)
+
+
+def _repair(index: dict, directories: set) -> None:
+    """Re-pair every test listed in the given directories."""
+    dirs = index["dirs"]
+    for directory in directories:
+        entry = dirs.get(directory)
+        if entry is None:
+            continue
+        for name in entry[1]:
+            if TEST_NAME.match(name):
+                test = _join(directory, name)
+                _link(index, test, _pair(dirs, test))
+
+
+def _scan(index: dict) -> None:
+    """List every directory under SCAN_ROOTS and pair all tests found."""
+    dirs = index["dirs"]
+    now_ns = time.time_ns()
+    for root in SCAN_ROOTS:
+        for directory, subdirs, _files in os.walk(root):
+            subdirs[:] = [d for d in subdirs if not d.startswith(".") and d not in SKIP_DIRS]
+            try:
+                dirs[directory] = _list_dir(directory, os.stat(directory).st_mtime_ns, now_ns)
+            except OSError:
+                continue
+    _repair(index, set(dirs))
+
+
+def _refresh(index: dict, directory: str, now_ns: int) -> bool:
+    """Re-list a directory if its mtime moved. True if the index changed."""
+    dirs = index["dirs"]
+    entry = dirs.get(directory)
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+        if entry is not None and entry[0] == mtime:
+            return False
+        fresh = _list_dir(directory, mtime, now_ns)
+    except OSError:
+        if entry is None:
+            return False
+        fresh = None
+
+    if fresh is None:
+        del dirs[directory]
+    else:
+        dirs[directory] = fresh
+    gone = set(entry[1] if entry else []) - set(fresh[1] if fresh else [])
+    for name in gone:
+        if TEST_NAME.match(name):
+            _link(index, _join(directory, name), None)
+
+    # Tests that can pair with a file in this directory (see _pair)
+    _repair(index, {directory, _join(directory, TESTS_DIR), _join(_parent(directory), TESTS_DIR)})
+    return True
+
+
+def _lookup(places: list) -> dict:
+    """The index, with the directories an answer depends on brought up to date."""
+    index = _load_index()
+    changed = index.pop("changed", False)
+    now_ns = time.time_ns()
+    for directory in places:
+        changed = _refresh(index, directory, now_ns) or changed
+    if changed:
+        _save_index(index)
+    return index
+
+
+def _rank(name: str) -> tuple:
+    # Same preference as the old fixed candidates: .test before .spec, .ts first
+    m = TEST_NAME.match(name)
+    return (m.group("kind") != "test", m.group("ext") != "ts", name)
+
+
+def tests_for(source_path: str) -> list:
+    """Existing test files for a source file, best match first."""
+    source = _key(source_path)
+    directory = _parent(source)
+
+    places = [directory, _join(directory, TESTS_DIR)]
+    if Path(source).stem == "route":
+        places.append(_join(_parent(directory), TESTS_DIR))
+
+    index = _lookup(places)
+    order = {place: i for i, place in enumerate(places)}
+    tests = sorted(
+        index["tests"].get(source, []),
+        key=lambda t: (order.get(_parent(t), len(places)), _rank(os.path.basename(t))),
+    )
+    return [_display(t, source_path) for t in tests]
+
+
+def source_for(test_path: str):
+    """The source file a test covers, or None."""
+    test = _key(test_path)
+    m = TEST_NAME.match(os.path.basename(test))
+    if not m:
+        return None
+
+    directory = _parent(test)
+    places = [directory]
+    if os.path.basename(directory) == TESTS_DIR:
+        base = _parent(directory)
+        places += [base, _join(base, m.group("stem"))]
+
+    source = _lookup(places)["source"].get(test)
+    return _display(source, test_path) if source else None
+
+
+def record_test(test_path: str) -> None:
+    """Note a test file that is being written.
+
+    Its directory is re-listed on the next lookup even if the write lands
+    within the filesystem's mtime resolution of the last listing. The name
+    is not added directly: another hook may still block the write.
+    """
+    test = _key(test_path)
+    if not TEST_NAME.match(os.path.basename(test)):
+        return
+    index = _load_index()
+    changed = index.pop("changed", False)
+    entry = index["dirs"].get(_parent(test))
+    if entry is not None and entry[0] is not None:
+        entry[0] = None
+        changed = True
+    if changed:
+        _save_index(index)
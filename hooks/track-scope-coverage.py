@@ -18,22 +18,9 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
-STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
-
-
-def get_active_endpoint(state):
-    """Get active endpoint - supports both old and new state formats."""
-    if "endpoints" in state and "active_endpoint" in state:
-        active = state.get("active_endpoint")
-        if active and active in state["endpoints"]:
-            return active, state["endpoints"][active]
-        return None, None
+import state_store
 
-    endpoint = state.get("endpoint")
-    if endpoint:
-        return endpoint, state
-
-    return None, None
+STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 
 
 def extract_feature_from_question(question, options):
@@ -117,12 +104,12 @@ def main():
         sys.exit(0)
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE, for_update=True)
     except json.JSONDecodeError:
         print(json.dumps({"continue": True}))
         sys.exit(0)
 
-    endpoint, endpoint_data = get_active_endpoint(state)
+    endpoint, endpoint_data = state_store.get_active_endpoint(state)
     if not endpoint or not endpoint_data:
         print(json.dumps({"continue": True}))
         sys.exit(0)
@@ -202,7 +189,7 @@ def main():
         scope["coverage_percent"] = round((implemented / total) * 100, 1)
 
     # Save state
-    STATE_FILE.write_text(json.dumps(state, indent=2))
+    state_store.save_state(state, STATE_FILE)
 
     output = {
         "hookSpecificOutput": {
@@ -16,6 +16,17 @@ Updated in v3.6.7:
   - Support multi-API state structure
   - Populate .claude/research/index.json for freshness tracking
 
+Updated in v3.11.0:
+  - Full question/source history goes to .claude/research/<endpoint>/history/
+    (history_store.py); the state keeps the latest entries plus counters
+  - Fetched page/doc content is stored once in .claude/research/objects/
+    (research_store.py); the source entry keeps a "content" reference
+  - Each recorded source is added to the endpoint's full-text index
+    (research_index.py)
+  - Answers about latency, response size, upstream calls and cold start
+    are recorded as budget decisions for verify-api-budgets.py
+  - The answer to the caching question is recorded as cache_strategy
+
 Returns:
   - {"continue": true} - Always continues (logging only, no blocking)
 """
@@ -24,6 +35,11 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
+import history_store
+import research_index
+import research_store
+import state_store
+
 # State file is in .claude/ directory (sibling to hooks/)
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 RESEARCH_DIR = Path(__file__).parent.parent / "research"
@@ -33,23 +49,6 @@ RESEARCH_INDEX = RESEARCH_DIR / "index.json"
 REGROUND_INTERVAL = 7
 
 
-def get_active_endpoint(state):
-    """Get active endpoint - supports both old and new state formats."""
-    # New format (v3.6.7+): endpoints object with active_endpoint pointer
-    if "endpoints" in state and "active_endpoint" in state:
-        active = state.get("active_endpoint")
-        if active and active in state["endpoints"]:
-            return active, state["endpoints"][active]
-        return None, None
-
-    # Old format: single endpoint field
-    endpoint = state.get("endpoint")
-    if endpoint:
-        return endpoint, state
-
-    return None, None
-
-
 def update_research_index(endpoint, source_entry):
     """Update the research index.json with new research activity."""
     RESEARCH_DIR.mkdir(parents=True, exist_ok=True)
@@ -127,7 +126,7 @@ def main():
     # Load or create state file
     if STATE_FILE.exists():
         try:
-            state = json.loads(STATE_FILE.read_text())
+            state = state_store.load_state(STATE_FILE, for_update=True)
         except json.JSONDecodeError:
             state = create_initial_state()
     else:
@@ -155,7 +154,6 @@ def main():
         })
 
         # Track the question
-        questions = interview.setdefault("questions", [])
         user_count = interview.get("user_question_count", 0) + 1
         interview["user_question_count"] = user_count
 
@@ -200,14 +198,30 @@ def main():
             "user_response": user_response[:500] if user_response else None,  # Capture actual response
             "selected_value": selected_value  # Matched option value if applicable
         }
-        questions.append(question_entry)
+        # Full history goes to .claude/research/<endpoint>/history/, state keeps the latest few
+        interview["questions"] = history_store.append(
+            history_store.history_endpoint(state), "questions", question_entry, interview.get("questions", [])
+        )
 
         # Track key decisions in a summary dict for easy reference during implementation
         decisions = interview.setdefault("decisions", {})
         question_text = tool_input.get("question", "").lower()
 
         # Categorize common decision types
-        if "provider" in question_text or "ai provider" in question_text:
+        # (caching and performance budgets first: "upstream calls" would otherwise read as
+        # external services; verify-api-budgets.py turns the budget answers into the
+        # endpoint's API budgets, generate-manifest-entry.py the cache answer into cache tests)
+        if "cach" in question_text:
+            decisions["cache_strategy"] = {"response": user_response, "value": selected_value}
+        elif "latency" in question_text or "response time" in question_text:
+            decisions["latency_budget"] = {"response": user_response, "value": selected_value}
+        elif "cold start" in question_text:
+            decisions["cold_start_budget"] = {"response": user_response, "value": selected_value}
+        elif "upstream call" in question_text:
+            decisions["upstream_calls_budget"] = {"response": user_response, "value": selected_value}
+        elif "response size" in question_text or "payload size" in question_text:
+            decisions["response_size_budget"] = {"response": user_response, "value": selected_value}
+        elif "provider" in question_text or "ai provider" in question_text:
             decisions["provider"] = {"response": user_response, "value": selected_value}
         elif "purpose" in question_text or "primary purpose" in question_text:
             decisions["purpose"] = {"response": user_response, "value": selected_value}
@@ -272,7 +286,7 @@ def main():
             }
 
         # Save and exit
-        STATE_FILE.write_text(json.dumps(state, indent=2))
+        state_store.save_state(state, STATE_FILE)
         print(json.dumps({"continue": True}))
         sys.exit(0)
 
@@ -288,8 +302,16 @@ def main():
         research["status"] = "in_progress"
         research["started_at"] = datetime.now().isoformat()
 
-    # Get sources list
+    # Get sources list (only the latest few are kept inline) and per-type counters
     sources = research.setdefault("sources", [])
+    source_counts = research.get("source_counts")
+    if not isinstance(source_counts, dict):
+        # State written before counters existed: its inline list is the full history
+        source_counts = {}
+        for s in sources:
+            if isinstance(s, dict):
+                source_counts[s.get("type", "other")] = source_counts.get(s.get("type", "other"), 0) + 1
+        research["source_counts"] = source_counts
 
     # Create source entry based on tool type
     timestamp = datetime.now().isoformat()
@@ -307,6 +329,9 @@ def main():
             source_entry["library"] = tool_input["libraryName"]
         if "libraryId" in tool_input:
             source_entry["library_id"] = tool_input["libraryId"]
+        content = store_content(tool_output)
+        if content:
+            source_entry["content"] = content
 
     elif tool_name == "WebSearch":
         source_entry = {
@@ -323,6 +348,10 @@ def main():
             "timestamp": timestamp,
             "success": True
         }
+        # Identical pages fetched for different endpoints are stored once
+        content = store_content(tool_output)
+        if content:
+            source_entry["content"] = content
 
     else:
         # Generic research tool
@@ -333,11 +362,16 @@ def main():
             "success": True
         }
 
-    # Add to sources list
-    sources.append(source_entry)
+    # Add to sources history
+    research["sources"] = history_store.append(
+        history_store.history_endpoint(state), "sources", source_entry, sources
+    )
+    # Index the new source now so the interview/verify hooks only read the index
+    research_index.update(history_store.history_endpoint(state))
+    source_counts[source_entry["type"]] = source_counts.get(source_entry["type"], 0) + 1
 
     # v3.6.7: Update research index.json for freshness tracking
-    endpoint, _ = get_active_endpoint(state)
+    endpoint, _ = state_store.get_active_endpoint(state)
     if endpoint:
         update_research_index(endpoint, source_entry)
 
@@ -366,17 +400,17 @@ def main():
 
     # Update last activity timestamp
     research["last_activity"] = timestamp
-    research["source_count"] = len(sources)
+    research["source_count"] = sum(source_counts.values())
 
     # Check if we have enough sources to consider research "complete"
     # More robust criteria:
     # - At least 2 sources total (prevents single accidental search from completing)
     # - At least one of: Context7 docs fetch, WebFetch of docs page
     # - At least one search (WebSearch or Context7 resolve)
-    context7_count = sum(1 for s in sources if s.get("type") == "context7")
-    websearch_count = sum(1 for s in sources if s.get("type") == "websearch")
-    webfetch_count = sum(1 for s in sources if s.get("type") == "webfetch")
-    total_sources = len(sources)
+    context7_count = source_counts.get("context7", 0)
+    websearch_count = source_counts.get("websearch", 0)
+    webfetch_count = source_counts.get("webfetch", 0)
+    total_sources = research["source_count"]
 
     # Minimum threshold: 2+ sources with at least one being docs-related
     has_docs = webfetch_count >= 1 or context7_count >= 1
@@ -397,7 +431,7 @@ def main():
             }
 
     # Save state file
-    STATE_FILE.write_text(json.dumps(state, indent=2))
+    state_store.save_state(state, STATE_FILE)
 
     # Return success
     print(json.dumps({"continue": True}))
@@ -659,6 +693,22 @@ def sanitize_input(tool_input):
     return sanitized
 
 
+def store_content(tool_output):
+    """Store fetched content once in research/objects/ and return its reference (or None)."""
+    content = tool_output
+    if isinstance(tool_output, dict):
+        content = tool_output.get("result", tool_output.get("content"))
+    if isinstance(content, list):
+        # MCP results: [{"type": "text", "text": ...}, ...]
+        content = "\n".join(c.get("text", "") for c in content if isinstance(c, dict))
+    if not isinstance(content, str) or not content.strip():
+        return None
+    try:
+        return research_store.put(content)
+    except OSError:
+        return None  # the source is still tracked, just without its content
+
+
 def extract_terms(query: str) -> list:
     """Extract searchable terms from a query string."""
     import re
@@ -18,9 +18,11 @@ import sys
 from pathlib import Path
 import shutil
 
-# State and registry files in .claude/ directory
+import registry_store
+import state_store
+
+# State file in .claude/ directory
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
-REGISTRY_FILE = Path(__file__).parent.parent / "registry.json"
 
 
 def copy_showcase_templates(cwd):
@@ -80,7 +82,7 @@ def main():
 
     # Load state
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"continue": True}))
         sys.exit(0)
@@ -114,22 +116,8 @@ def main():
         print(json.dumps({"continue": True}))
         sys.exit(0)
 
-    # Check if we have APIs in registry
-    if not REGISTRY_FILE.exists():
-        print(json.dumps({"continue": True}))
-        sys.exit(0)
-
-    try:
-        registry = json.loads(REGISTRY_FILE.read_text())
-    except json.JSONDecodeError:
-        print(json.dumps({"continue": True}))
-        sys.exit(0)
-
-    apis = registry.get("apis", {})
-    combined = registry.get("combined", {})
-
-    # Create showcase if we have at least one API
-    if apis or combined:
+    # Create showcase if we have at least one API in the registry
+    if registry_store.count("apis") or registry_store.count("combined"):
         created_files = copy_showcase_templates(cwd)
 
         if created_files:
@@ -15,6 +15,15 @@ Supports:
 
 Version: 3.9.0
 
+Updated in v3.11.0:
+  - Entries are added through registry_store.py (.claude/registry.db);
+    registry.json is exported once, after the entry is stored
+  - Combined entries record their call graph (depends_on, error_strategy)
+    next to flow_type
+  - API entries keep the p50/p95 latency measured in Verify (latency_ms)
+  - Page entries record their data_sources (the API routes they fetch),
+    so impact.py can find the pages that use an API
+
 Returns:
   - {"continue": true} - Always continues (logging only, no blocking)
   - For UI workflows, includes notify message with UI Showcase link
@@ -24,51 +33,12 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
+import flow_graph
+import registry_store
+import state_store
+
 # State file is in .claude/ directory (sibling to hooks/)
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
-REGISTRY_FILE = Path(__file__).parent.parent / "registry.json"
-
-
-def get_active_endpoint(state):
-    """Get active endpoint - supports both old and new state formats."""
-    # New format (v3.6.7+): endpoints object with active_endpoint pointer
-    if "endpoints" in state and "active_endpoint" in state:
-        active = state.get("active_endpoint")
-        if active and active in state["endpoints"]:
-            return active, state["endpoints"][active]
-        return None, None
-
-    # Old format: single endpoint field
-    endpoint = state.get("endpoint")
-    if endpoint:
-        return endpoint, state
-
-    return None, None
-
-
-def load_registry():
-    """Load existing registry or create default."""
-    if REGISTRY_FILE.exists():
-        try:
-            return json.loads(REGISTRY_FILE.read_text())
-        except json.JSONDecodeError:
-            pass
-
-    return {
-        "version": "1.0.0",
-        "updated_at": "",
-        "description": "Central registry tracking all APIs, components, and pages created through Hustle Dev Tools",
-        "apis": {},
-        "components": {},
-        "pages": {},
-        "combined": {}
-    }
-
-
-def save_registry(registry):
-    """Save registry to file."""
-    registry["updated_at"] = datetime.now().isoformat()
-    REGISTRY_FILE.write_text(json.dumps(registry, indent=2))
 
 
 def extract_api_entry(endpoint_name, endpoint_state, state):
@@ -98,7 +68,7 @@ def extract_api_entry(endpoint_name, endpoint_state, state):
     if decisions.get("methods"):
         methods = decisions.get("methods", {}).get("value", ["POST"])
 
-    return {
+    entry = {
         "name": endpoint_name.replace("-", " ").title(),
         "description": purpose[:200] if purpose else f"API endpoint for {endpoint_name}",
         "route": impl_file,
@@ -109,6 +79,12 @@ def extract_api_entry(endpoint_name, endpoint_state, state):
         "status": "complete"
     }
 
+    # Latency measured in Verify, for latency_plan.py
+    measured = phases.get("verify", {}).get("api_budget", {}).get("measured")
+    if measured:
+        entry["latency_ms"] = {"p50": measured["p50_latency_ms"], "p95": measured["p95_latency_ms"]}
+    return entry
+
 
 def extract_combined_entry(endpoint_name, endpoint_state, state):
     """Extract registry entry for a combined API."""
@@ -125,10 +101,8 @@ def extract_combined_entry(endpoint_name, endpoint_state, state):
     scope = phases.get("scope", {})
     purpose = scope.get("purpose", "")
 
-    # Get flow type from interview
-    flow_type = decisions.get("execution_order", decisions.get("flow_type", "sequential"))
-    if isinstance(flow_type, dict):
-        flow_type = flow_type.get("value", "sequential")
+    # Call graph from combine_config (interview decisions as fallback)
+    graph = flow_graph.build_graph(combine_config, decisions)
 
     return {
         "name": endpoint_name.replace("-", " ").title(),
@@ -138,7 +112,9 @@ def extract_combined_entry(endpoint_name, endpoint_state, state):
         "route": f"src/app/api/v2/{endpoint_name}/route.ts",
         "schemas": f"src/app/api/v2/{endpoint_name}/schemas.ts",
         "tests": f"src/app/api/v2/{endpoint_name}/__tests__/",
-        "flow_type": flow_type,
+        "flow_type": graph["flow_type"],
+        "depends_on": {name: deps for name, deps in graph["depends_on"].items() if name in combines},
+        "error_strategy": graph["error_strategy"],
         "created_at": datetime.now().strftime("%Y-%m-%d"),
         "status": "complete"
     }
@@ -206,6 +182,9 @@ def extract_page_entry(element_name, element_state, state):
     if not uses_components:
         uses_components = ui_config.get("uses_components", [])
 
+    # API routes the page fetches from (reverse-dependency index, impact.py)
+    data_sources = ui_config.get("data_sources", [])
+
     # Get data fetching type from interview
     data_fetching = decisions.get("data_fetching", {}).get("value", "server")
     if isinstance(data_fetching, dict):
@@ -227,6 +206,7 @@ def extract_page_entry(element_name, element_state, state):
         "route": f"/{route_path}",
         "tests": f"tests/e2e/{route_path}.spec.ts",
         "uses_components": uses_components if isinstance(uses_components, list) else [],
+        "data_sources": data_sources if isinstance(data_sources, list) else [],
         "data_fetching": data_fetching,
         "auth_required": auth_required,
         "status": "complete",
@@ -238,12 +218,12 @@ def get_active_element(state):
     """Get active element - supports both API and UI workflows."""
     # UI workflow format: elements object with active_element pointer
     if "elements" in state and "active_element" in state:
-        active = state.get("active_element")
-        if active and active in state["elements"]:
-            return active, state["elements"][active]
+        element, element_state = state_store.get_active_element(state)
+        if element:
+            return element, element_state
 
     # Fall back to API endpoint format
-    return get_active_endpoint(state)
+    return state_store.get_active_endpoint(state)
 
 
 def main():
@@ -268,7 +248,7 @@ def main():
 
     # Load state
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"continue": True}))
         sys.exit(0)
@@ -280,7 +260,7 @@ def main():
     if workflow in ["ui-create-component", "ui-create-page"]:
         element_name, element_state = get_active_element(state)
     else:
-        element_name, element_state = get_active_endpoint(state)
+        element_name, element_state = state_store.get_active_endpoint(state)
 
     if not element_name or not element_state:
         print(json.dumps({"continue": True}))
@@ -294,54 +274,37 @@ def main():
         print(json.dumps({"continue": True}))
         sys.exit(0)
 
-    # Check if already in registry (avoid duplicates)
-    registry = load_registry()
-
     # Result object - may include notify for UI workflows
     result = {"continue": True}
 
     # Route to appropriate handler based on workflow
     if workflow == "ui-create-component":
-        # Component workflow
-        if element_name in registry.get("components", {}):
-            print(json.dumps(result))
-            sys.exit(0)
-
-        entry = extract_component_entry(element_name, element_state, state)
-        registry.setdefault("components", {})[element_name] = entry
-        result["notify"] = f"🎨 View in UI Showcase: http://localhost:3000/ui-showcase"
-
+        kind = "components"
+        extract = extract_component_entry
+        notify = f"🎨 View in UI Showcase: http://localhost:3000/ui-showcase"
     elif workflow == "ui-create-page":
-        # Page workflow
-        if element_name in registry.get("pages", {}):
-            print(json.dumps(result))
-            sys.exit(0)
-
-        entry = extract_page_entry(element_name, element_state, state)
-        registry.setdefault("pages", {})[element_name] = entry
-        result["notify"] = f"🎨 View in UI Showcase: http://localhost:3000/ui-showcase"
-
+        kind = "pages"
+        extract = extract_page_entry
+        notify = f"🎨 View in UI Showcase: http://localhost:3000/ui-showcase"
     elif workflow in ["combine-api", "combine-ui"]:
-        # Combined workflow
-        if element_name in registry.get("combined", {}):
-            print(json.dumps(result))
-            sys.exit(0)
-
-        entry = extract_combined_entry(element_name, element_state, state)
-        registry.setdefault("combined", {})[element_name] = entry
-
+        kind = "combined"
+        extract = extract_combined_entry
+        notify = None
     else:
         # Default: API workflow
-        if element_name in registry.get("apis", {}):
-            print(json.dumps(result))
-            sys.exit(0)
+        kind = "apis"
+        extract = extract_api_entry
+        notify = f"🔌 View in API Showcase: http://localhost:3000/api-showcase"
 
-        entry = extract_api_entry(element_name, element_state, state)
-        registry.setdefault("apis", {})[element_name] = entry
-        result["notify"] = f"🔌 View in API Showcase: http://localhost:3000/api-showcase"
+    # Check if already in registry (avoid duplicates); add() re-checks atomically
+    if registry_store.exists(kind, element_name):
+        print(json.dumps(result))
+        sys.exit(0)
 
-    # Save registry
-    save_registry(registry)
+    entry = extract(element_name, element_state, state)
+    if registry_store.add(kind, element_name, entry) and notify:
+        result["notify"] = notify
+    registry_store.export()
 
     # Return success (with optional notify for UI workflows)
     print(json.dumps(result))
@@ -22,9 +22,11 @@ from pathlib import Path
 import shutil
 from datetime import datetime
 
-# State and registry files in .claude/ directory
+import registry_store
+import state_store
+
+# State file in .claude/ directory
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
-REGISTRY_FILE = Path(__file__).parent.parent / "registry.json"
 
 
 def generate_showcase_data(registry, cwd):
@@ -136,7 +138,7 @@ def main():
 
     # Load state
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"continue": True}))
         sys.exit(0)
@@ -171,18 +173,12 @@ def main():
         sys.exit(0)
 
     # Check if we have components or pages in registry
-    if not REGISTRY_FILE.exists():
-        print(json.dumps({"continue": True}))
-        sys.exit(0)
-
-    try:
-        registry = json.loads(REGISTRY_FILE.read_text())
-    except json.JSONDecodeError:
-        print(json.dumps({"continue": True}))
-        sys.exit(0)
-
-    components = registry.get("components", {})
-    pages = registry.get("pages", {})
+    registry = {
+        "components": registry_store.entries("components"),
+        "pages": registry_store.entries("pages")
+    }
+    components = registry["components"]
+    pages = registry["pages"]
 
     # Create showcase if we have at least one component or page
     if components or pages:
@@ -15,6 +15,13 @@ The goal is to:
 
 Triggers on: Bash commands containing "test" that exit successfully
 
+Updated in v3.11.0:
+  - Test results are collected only for the active endpoint's tests and the
+    tests of registry entries built on it (impact.py), not the whole suite;
+    everything runs when the endpoint's own tests are not known. The
+    collector merges the rerun suites into test-results.json, so its
+    summary and the manifest's lastTestRun still cover the whole suite
+
 Returns:
   - {"continue": true} with additionalContext prompting verification
 """
@@ -25,6 +32,10 @@ import subprocess
 from datetime import datetime
 from pathlib import Path
 
+import impact
+import manifest_scripts
+import state_store
+
 # State file is in .claude/ directory (sibling to hooks/)
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 # Scripts locations (try in order):
@@ -39,7 +50,23 @@ SCRIPTS_LOCATIONS = [
 ]
 
 
-def run_manifest_scripts() -> dict:
+def affected_tests(state: dict):
+    """Unit tests of the active endpoint and of everything built on it.
+
+    Returns None (collect the whole suite) when there is no active workflow
+    or its own tests are not known.
+    """
+    endpoint, _ = state_store.get_active_workflow(state)
+    if not endpoint:
+        return None
+    result = impact.impact([endpoint], state)
+    own = impact.test_files({"changed": result["changed"], "affected": []}, state)
+    if not own["unit"]:
+        return None
+    return impact.test_files(result, state)["unit"]
+
+
+def run_manifest_scripts(test_files: list = None) -> dict:
     """
     Run the programmatic manifest generation scripts.
 
@@ -47,12 +74,16 @@ def run_manifest_scripts() -> dict:
     extract parameters from Zod schemas, and generate the manifest.
     NO LLM involvement.
 
+    test_files limits test result collection to those files (Vitest path
+    filters); None collects the whole suite.
+
     Returns dict with results of each script.
     """
     results = {
         "manifest_generated": False,
         "parameters_extracted": False,
         "results_collected": False,
+        "tests_scoped": test_files,
         "errors": []
     }
 
@@ -69,37 +100,21 @@ def run_manifest_scripts() -> dict:
 
     project_root = PROJECT_ROOT
 
-    # Run generate-test-manifest.ts
+    # generate-test-manifest.ts and extract-parameters.ts run in-process
+    # (manifest_scripts.py writes byte-identical output without npx/tsx startup)
     manifest_script = scripts_dir / "generate-test-manifest.ts"
     if manifest_script.exists():
         try:
-            subprocess.run(
-                ["npx", "tsx", str(manifest_script), str(project_root)],
-                cwd=str(project_root),
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            manifest_scripts.write_test_manifest(str(project_root))
             results["manifest_generated"] = True
-        except subprocess.TimeoutExpired:
-            results["errors"].append("Manifest generation timed out")
         except Exception as e:
             results["errors"].append(f"Manifest generation failed: {e}")
 
-    # Run extract-parameters.ts
     params_script = scripts_dir / "extract-parameters.ts"
     if params_script.exists():
         try:
-            subprocess.run(
-                ["npx", "tsx", str(params_script), str(project_root)],
-                cwd=str(project_root),
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            manifest_scripts.write_parameter_matrix(str(project_root))
             results["parameters_extracted"] = True
-        except subprocess.TimeoutExpired:
-            results["errors"].append("Parameter extraction timed out")
         except Exception as e:
             results["errors"].append(f"Parameter extraction failed: {e}")
 
@@ -107,8 +122,13 @@ def run_manifest_scripts() -> dict:
     results_script = scripts_dir / "collect-test-results.ts"
     if results_script.exists():
         try:
+            # One --file per test file: each reaches `vitest run` as its own
+            # argument, so spaces and [param] directories survive
+            command = ["npx", "tsx", str(results_script), str(project_root)]
+            for test_file in test_files or []:
+                command += ["--file", test_file]
             subprocess.run(
-                ["npx", "tsx", str(results_script), str(project_root)],
+                command,
                 cwd=str(project_root),
                 capture_output=True,
                 text=True,
@@ -169,8 +189,15 @@ def main():
         print(json.dumps({"continue": True}))
         sys.exit(0)
 
-    # Tests passed - run manifest generation scripts
-    manifest_output = run_manifest_scripts()
+    # Tests passed - run manifest generation scripts, collecting results
+    # only for the tests the active endpoint can affect
+    test_files = None
+    if STATE_FILE.exists():
+        try:
+            test_files = affected_tests(state_store.load_state(STATE_FILE))
+        except json.JSONDecodeError:
+            pass
+    manifest_output = run_manifest_scripts(test_files)
 
     # Tests passed - check state file
     if not STATE_FILE.exists():
@@ -178,7 +205,7 @@ def main():
         sys.exit(0)
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE, for_update=True)
     except json.JSONDecodeError:
         print(json.dumps({"continue": True}))
         sys.exit(0)
@@ -216,7 +243,7 @@ def main():
     state["manifest_generation"]["test_results_collected"] = manifest_output.get("results_collected", False)
 
     # Save state
-    STATE_FILE.write_text(json.dumps(state, indent=2))
+    state_store.save_state(state, STATE_FILE)
 
     # Build verification prompt
     endpoint = state.get("endpoint", "the endpoint")
@@ -233,7 +260,12 @@ def main():
         if manifest_output.get("parameters_extracted"):
             context_parts.append("  - ✓ parameter-matrix.json")
         if manifest_output.get("results_collected"):
-            context_parts.append("  - ✓ test-results.json")
+            scoped = manifest_output.get("tests_scoped")
+            if scoped:
+                context_parts.append(f"  - ✓ test-results.json ({len(scoped)} affected test file(s): "
+                                     f"{', '.join(scoped)})")
+            else:
+                context_parts.append("  - ✓ test-results.json")
         if manifest_output.get("errors"):
             context_parts.append("")
             context_parts.append("⚠️ Some scripts had issues:")
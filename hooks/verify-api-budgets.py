@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Hook: PostToolUse for Bash (after test runs, next to verify-after-green.py)
+Purpose: Benchmark the endpoint against its API budgets in Phase 10 (Verify)
+
+performance-budgets.json only had UI budgets, so a generated route could
+pass every test and still take seconds per request or return megabytes.
+Its "api" section sets:
+
+  p95_latency_max_ms    p95 latency under the benchmark load
+  response_max_kb       largest response body seen
+  upstream_calls_max    upstream call sites in the route (fetch/axios/got/ky
+                        calls, counted statically)
+  cold_start_max_ms     advisory only: compared with the run's first request,
+                        which is cold (compile and module init) only on the
+                        first run after the dev server starts; reported,
+                        never blocks
+  error_rate_max_pct    benchmark requests that failed or got a status other
+                        than their test case expects (default 1, so a route
+                        that answers every request with an error cannot
+                        pass on its latency alone)
+  benchmark             rps / duration_s / concurrency of the load run
+  endpoints             per-endpoint overrides
+
+Interview answers about latency, response size, upstream calls and cold
+start (recorded by track-tool-use.py) override both.
+
+When tests pass after TDD Green is complete (and Verify is not), and a
+server answers at the manifest's base URL (http://localhost:3001), this hook
+sends one probe request and then replays the endpoint's test cases with
+load_test.py. The replay calls the route for real, and through it any
+upstream (possibly paid) API, so it runs once per version of the route and
+schema: the result is recorded with a hash of both files and the budgets,
+and later test runs skip the benchmark until one of them changes.
+Measurements and violations are recorded in phases.verify.api_budget;
+api-workflow-check.py blocks completion while a budget is exceeded. Without
+a running server the check is recorded as skipped and the model is asked to
+start one.
+
+Added in v3.11.0.
+
+Returns:
+  - {"continue": true} with additionalContext reporting the measured numbers
+"""
+import hashlib
+import json
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import hook_runtime
+import load_test
+import state_store
+
+STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
+BUDGETS_FILE = Path(__file__).parent.parent / "performance-budgets.json"
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+MANIFEST_FILE = PROJECT_ROOT / "src" / "app" / "api-test" / "api-tests-manifest.json"
+
+BUDGET_KEYS = ["p95_latency_max_ms", "response_max_kb", "upstream_calls_max", "cold_start_max_ms",
+               "error_rate_max_pct"]
+
+# Reported against the measurement but never a violation
+ADVISORY_KEYS = {"cold_start_max_ms"}
+
+# Applied whenever the endpoint has budgets, also for budget files without the key
+DEFAULT_ERROR_RATE_MAX_PCT = 1
+
+DEFAULT_BENCHMARK = {"rps": 10, "duration_s": 5, "concurrency": 5}
+
+# Interview decisions (track-tool-use.py) -> (budget key, unit of a bare number)
+DECISION_BUDGETS = {
+    "latency_budget": ("p95_latency_max_ms", "ms"),
+    "response_size_budget": ("response_max_kb", "kb"),
+    "upstream_calls_budget": ("upstream_calls_max", None),
+    "cold_start_budget": ("cold_start_max_ms", "ms"),
+}
+
+UNITS = {"ms": 1, "s": 1000, "sec": 1000, "seconds": 1000, "b": 1 / 1024, "bytes": 1 / 1024, "kb": 1, "mb": 1024}
+
+# A number that is not part of a word ("p95", "v2") or of another number
+AMOUNT = re.compile(r"(?<![\w.])(\d+(?:\.\d+)?)\s*(ms|seconds|sec|s|bytes|b|kb|mb)?\b", re.I)
+
+# Units a budget in the given unit can be stated in
+UNIT_GROUPS = [{"ms", "s", "sec", "seconds"}, {"b", "bytes", "kb", "mb"}]
+
+UPSTREAM_CALL = re.compile(r"\b(?:fetch|axios(?:\.\w+)?|got(?:\.\w+)?|ky(?:\.\w+)?)\s*\(")
+
+TEST_COMMANDS = ["pnpm test", "npm test", "vitest", "jest", "test:run"]
+
+
+# An answer that turns a budget off
+NO_BUDGET = re.compile(r"\b(?:no|none|skip|unlimited)\b", re.I)
+
+
+def parse_budget(text, unit):
+    """A budget from an interview answer ("300ms", "p95 under 1.5 s", "200 KB", "3").
+
+    A number stated in the budget's unit family wins over bare numbers. None
+    without a number, or when the answer names several different amounts.
+    """
+    group = next((g for g in UNIT_GROUPS if unit in g), set())
+    with_unit, bare = set(), set()
+    for match in AMOUNT.finditer(str(text or "")):
+        value = float(match.group(1))
+        given = (match.group(2) or "").lower()
+        if given in group:
+            with_unit.add(round(value * UNITS[given] / UNITS[unit], 2))
+        elif not given:
+            bare.add(round(value, 2))
+    candidates = with_unit or bare
+    return candidates.pop() if len(candidates) == 1 else None
+
+
+def _number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def load_budgets(endpoint: str, decisions: dict) -> tuple[dict, dict]:
+    """(budgets, benchmark settings) for an endpoint; budgets may be empty."""
+    try:
+        api = json.loads(BUDGETS_FILE.read_text()).get("api", {})
+    except (OSError, json.JSONDecodeError, AttributeError):
+        api = {}
+    api = api if isinstance(api, dict) else {}
+
+    budgets = {k: api[k] for k in BUDGET_KEYS if _number(api.get(k))}
+    override = api.get("endpoints", {}).get(endpoint, {}) if isinstance(api.get("endpoints"), dict) else {}
+    override = override if isinstance(override, dict) else {}
+    # null switches a budget off for the endpoint; other non-numbers are ignored
+    budgets.update({k: v for k, v in override.items() if k in BUDGET_KEYS and (v is None or _number(v))})
+
+    for decision, (key, unit) in DECISION_BUDGETS.items():
+        answer = decisions.get(decision)
+        if isinstance(answer, dict):
+            text = str(answer.get("value") or answer.get("response") or "")
+            value = parse_budget(text, unit)
+            if value is not None:
+                budgets[key] = value
+            elif NO_BUDGET.search(text):
+                budgets.pop(key, None)
+
+    budgets = {k: v for k, v in budgets.items() if v is not None}
+    if budgets:
+        budgets.setdefault("error_rate_max_pct", DEFAULT_ERROR_RATE_MAX_PCT)
+    # Like the overrides: only positive numbers for known settings replace the defaults
+    settings = api.get("benchmark") if isinstance(api.get("benchmark"), dict) else {}
+    benchmark = {**DEFAULT_BENCHMARK,
+                 **{k: v for k, v in settings.items() if k in DEFAULT_BENCHMARK and _number(v) and v > 0}}
+    return budgets, benchmark
+
+
+def benchmark_key(paths: list, budgets: dict, benchmark: dict) -> str:
+    """Hash of the route and schema files and the budgets they are measured against."""
+    digest = hashlib.sha256(json.dumps([budgets, benchmark], sort_keys=True, default=str).encode())
+    for path in paths:
+        try:
+            digest.update(Path(path).read_bytes())
+        except (OSError, TypeError):
+            digest.update(b"\0")  # missing file
+    return digest.hexdigest()
+
+
+def count_upstream_calls(route_path) -> int:
+    try:
+        return len(UPSTREAM_CALL.findall(Path(route_path).read_text()))
+    except (OSError, TypeError):
+        return 0
+
+
+def manifest_entry(endpoint: str, endpoint_data: dict, state: dict):
+    """(entry, base URL): the manifest's entry for the endpoint, or one generated from its schema."""
+    manifest = {}
+    try:
+        manifest = json.loads(MANIFEST_FILE.read_text())
+    except (OSError, json.JSONDecodeError):
+        pass
+    base_url = manifest.get("baseUrl") or load_test.DEFAULT_BASE_URL
+
+    for entry in load_test.find_entries(manifest, endpoint):
+        if load_test.request_plan(entry):
+            return entry, base_url
+
+    # The generated entry is only written in Phase 12: build it in memory now
+    generator = hook_runtime.load_hook("generate-manifest-entry")
+    return generator.generate_manifest_entry(endpoint, endpoint_data, state), base_url
+
+
+def measure(entry: dict, base_url: str, route_path, benchmark: dict) -> dict:
+    first = load_test.probe(entry, base_url)
+    stats = load_test.load_endpoint(
+        entry, base_url, rps=float(benchmark["rps"]), duration=float(benchmark["duration_s"]),
+        concurrency=int(benchmark["concurrency"]),
+    )
+    if not stats["statusCodes"]:
+        raise load_test.LoadTestError("no benchmark request got a response")
+    return {
+        "p95_latency_ms": stats["latencyMs"]["p95"],
+        "p50_latency_ms": stats["latencyMs"]["p50"],
+        "response_kb": round(max(stats["maxResponseBytes"], first["bytes"]) / 1024, 2),
+        "upstream_calls": count_upstream_calls(route_path),
+        "first_request_ms": first["latencyMs"],
+        "requests": stats["requests"],
+        "error_rate": stats["errorRate"],
+        "error_rate_pct": round(stats["errorRate"] * 100, 2),
+        "failures": stats["failures"],
+        "throughput": stats["throughput"],
+    }
+
+
+# budget key -> (measured key, label, unit)
+CHECKS = {
+    "p95_latency_max_ms": ("p95_latency_ms", "p95 latency", "ms"),
+    "response_max_kb": ("response_kb", "Largest response", "KB"),
+    "upstream_calls_max": ("upstream_calls", "Upstream call sites", ""),
+    "cold_start_max_ms": ("first_request_ms", "First request (advisory)", "ms"),
+    "error_rate_max_pct": ("error_rate_pct", "Error rate", "%"),
+}
+
+
+def check(budgets: dict, measured: dict) -> list:
+    violations = []
+    for key, limit in budgets.items():
+        if key in ADVISORY_KEYS:
+            continue
+        value_key, label, unit = CHECKS[key]
+        if measured[value_key] > limit:
+            violations.append(f"{label}: {measured[value_key]}{unit} > {limit}{unit}")
+    return violations
+
+
+def report(endpoint: str, result: dict) -> str:
+    lines = [f"## API Budgets: {endpoint}", ""]
+    if result["status"] == "skipped":
+        lines.append(f"⚠️ Budget check skipped: {result['reason']}")
+        lines.append("")
+        lines.append("Start the dev server (e.g. `pnpm dev --port 3001`) and re-run the tests so the")
+        lines.append("endpoint can be benchmarked against .claude/performance-budgets.json.")
+        return "\n".join(lines)
+
+    measured = result["measured"]
+    lines.append("| Budget | Limit | Measured | |")
+    lines.append("|--------|-------|----------|-|")
+    for key, limit in result["budgets"].items():
+        value_key, label, unit = CHECKS[key]
+        ok = measured[value_key] <= limit
+        mark = "✓" if ok else "⚠️" if key in ADVISORY_KEYS else "❌"
+        lines.append(f"| {label} | {limit}{unit} | {measured[value_key]}{unit} | {mark} |")
+    lines.append("")
+    lines.append(f"Load: {measured['requests']} requests, {measured['throughput']} req/s, "
+                 f"p50 {measured['p50_latency_ms']}ms, error rate {measured['error_rate'] * 100:.1f}%")
+    if result["status"] == "exceeded":
+        lines.append("")
+        lines.append("❌ BUDGET EXCEEDED - completion is blocked until the endpoint fits its budgets:")
+        lines.extend(f"  • {v}" for v in result["violations"])
+        if measured.get("failures") and measured["error_rate_pct"] > result["budgets"].get("error_rate_max_pct", 100):
+            top = sorted(measured["failures"].items(), key=lambda item: -item[1])[:5]
+            lines.append("    Failed requests: " + ", ".join(f"{reason} ×{n}" for reason, n in top))
+        lines.append("")
+        lines.append("Optimize the route (caching, fewer upstream calls, smaller payloads) and re-run the")
+        lines.append("tests, or change the budget in .claude/performance-budgets.json with the user's approval.")
+    return "\n".join(lines)
+
+
+def main():
+    try:
+        input_data = hook_runtime.read_input()
+    except json.JSONDecodeError:
+        print(json.dumps({"continue": True}))
+        sys.exit(0)
+
+    if input_data.get("tool_name") != "Bash":
+        print(json.dumps({"continue": True}))
+        sys.exit(0)
+
+    command = input_data.get("tool_input", {}).get("command", "").lower()
+    if not any(keyword in command for keyword in TEST_COMMANDS):
+        print(json.dumps({"continue": True}))
+        sys.exit(0)
+
+    # Same pass/fail reading of the output as verify-after-green.py
+    tool_output = input_data.get("tool_output", {})
+    output_text = tool_output if isinstance(tool_output, str) else (
+        tool_output.get("output", tool_output.get("stdout", "")) if isinstance(tool_output, dict) else "")
+    output_lower = output_text.lower()
+    tests_passed = any(i in output_lower for i in ["passed", "✓", "pass", "0 failed"]) and not any(
+        f in output_lower for f in ["failed", "error", "fail"])
+    if not tests_passed or not STATE_FILE.exists():
+        print(json.dumps({"continue": True}))
+        sys.exit(0)
+
+    try:
+        state = state_store.load_state(STATE_FILE)
+    except json.JSONDecodeError:
+        print(json.dumps({"continue": True}))
+        sys.exit(0)
+
+    endpoint, endpoint_data = state_store.get_active_endpoint(state)
+    if not endpoint or not endpoint_data:
+        print(json.dumps({"continue": True}))
+        sys.exit(0)
+
+    # Green runs are red/green iterations on a route still being written: benchmark once it is done
+    phases = endpoint_data.get("phases", {})
+    green = phases.get("tdd_green", {}).get("status")
+    verify_status = phases.get("verify", {}).get("status")
+    if green != "complete" or verify_status == "complete":
+        print(json.dumps({"continue": True}))
+        sys.exit(0)
+
+    decisions = phases.get("interview", {}).get("decisions", {})
+    budgets, benchmark = load_budgets(endpoint, decisions)
+    if not budgets:
+        print(json.dumps({"continue": True}))
+        sys.exit(0)
+
+    _, schema_path, route_path = hook_runtime.load_hook("generate-manifest-entry").find_source_files(
+        endpoint, endpoint_data, state)
+    key = benchmark_key([route_path, schema_path], budgets, benchmark)
+    previous = phases.get("verify", {}).get("api_budget", {})
+    if previous.get("key") == key and previous.get("status") in ("passed", "exceeded"):
+        # Already benchmarked this route and schema; a skipped check is retried
+        print(json.dumps({"continue": True}))
+        sys.exit(0)
+
+    entry, base_url = manifest_entry(endpoint, endpoint_data, state)
+
+    result = {"checked_at": datetime.now().isoformat(), "base_url": base_url, "budgets": budgets, "key": key}
+    if not load_test.reachable(base_url):
+        result.update(status="skipped", reason=f"no server at {base_url}")
+    elif not load_test.request_plan(entry):
+        result.update(status="skipped", reason="no test cases or examples to replay")
+    else:
+        try:
+            measured = measure(entry, base_url, route_path, benchmark)
+        except load_test.LoadTestError as e:
+            result.update(status="skipped", reason=f"requests to {base_url} failed: {e}")
+        else:
+            violations = check(budgets, measured)
+            result.update(status="exceeded" if violations else "passed", measured=measured, violations=violations)
+
+    # Re-read for the update: the benchmark took seconds and other hooks may have saved meanwhile
+    state = state_store.load_state(STATE_FILE, for_update=True)
+    _, current = state_store.get_active_endpoint(state)
+    if current is not None:
+        current.setdefault("phases", {}).setdefault("verify", {})["api_budget"] = result
+    state_store.save_state(state, STATE_FILE)
+
+    print(json.dumps({
+        "continue": True,
+        "hookSpecificOutput": {
+            "hookEventName": "PostToolUse",
+            "additionalContext": report(endpoint, result)
+        }
+    }))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,12 @@ import sys
 import re
 from pathlib import Path
 
+import history_store
+import hook_runtime
+import research_index
+import state_store
+import test_index
+
 # State file is in .claude/ directory (sibling to hooks/)
 STATE_FILE = Path(__file__).parent.parent / "api-dev-state.json"
 
@@ -56,25 +62,22 @@ def check_research_used_exact_terms(state: dict) -> list[str]:
     research = state.get("phases", {}).get("research_initial", {})
     deep_research = state.get("phases", {}).get("research_deep", {})
 
-    questions = interview.get("questions", [])
+    # Full history lives in the endpoint's history segments (history_store)
+    endpoint = history_store.history_endpoint(state)
+    questions = history_store.load(endpoint, "questions", interview.get("questions", []))
     if isinstance(questions, list) and len(questions) > 0:
         # Extract key terms from all interview answers
         all_text = " ".join(str(q) for q in questions)
         key_terms = extract_key_terms(all_text)
 
-        # Check if these terms appear in research sources
-        research_sources = research.get("sources", []) + deep_research.get("sources", [])
-        research_text = " ".join(str(s) for s in research_sources).lower()
+        # Check if these terms appear in research sources (indexed, pages included);
+        # a term counts if all its words occur (e.g., "AI Gateway" in "Vercel AI Gateway")
+        missing_terms = research_index.missing_terms(endpoint, key_terms, research.get("sources", []))
 
-        missing_terms = []
-        for term in key_terms:
-            # Check if term or close variant appears in research
-            term_lower = term.lower()
-            if term_lower not in research_text:
-                # Check for partial matches (e.g., "AI Gateway" in "Vercel AI Gateway")
-                words = term_lower.split()
-                if not any(all(w in research_text for w in words) for _ in [1]):
-                    missing_terms.append(term)
+        # Deep research sources are only kept inline in the state
+        deep_text = " ".join(str(s) for s in deep_research.get("sources", [])).lower()
+        if deep_text:
+            missing_terms = [t for t in missing_terms if not all(w in deep_text for w in t.lower().split())]
 
         if missing_terms:
             issues.append(
@@ -101,7 +104,7 @@ def check_files_tracked(state: dict, file_path: str) -> list[str]:
     normalized_path = file_path.replace("\\", "/")
 
     # Check if this file is a test file
-    is_test = ".test." in file_path or "/__tests__/" in file_path or ".spec." in file_path
+    is_test = test_index.is_test_file(file_path)
 
     # For non-test files in api/ or lib/, they should be tracked
     is_trackable = ("/api/" in file_path or "/lib/" in file_path) and file_path.endswith(".ts")
@@ -116,8 +119,10 @@ def check_files_tracked(state: dict, file_path: str) -> list[str]:
 
         # Don't block, but log that this file should be tracked
         if not found:
-            state.setdefault("files_modified", []).append(normalized_path.split("/src/")[-1] if "/src/" in normalized_path else normalized_path)
-            STATE_FILE.write_text(json.dumps(state, indent=2))
+            tracked_path = normalized_path.split("/src/")[-1] if "/src/" in normalized_path else normalized_path
+            state_store.apply_ops(state, [
+                {"op": "append", "path": ["files_modified"], "value": tracked_path}
+            ], STATE_FILE)
 
     return issues
 
@@ -129,14 +134,15 @@ def check_test_production_alignment(state: dict, file_path: str, content: str =
     """
     issues = []
 
-    is_test = ".test." in file_path or "/__tests__/" in file_path or ".spec." in file_path
-
-    if not is_test:
+    if not test_index.is_test_file(file_path):
         return issues
 
+    # Keep the route <-> test index current for enforce-tdd-red
+    test_index.record_test(file_path)
+
     # Check interview for key configuration patterns
     interview = state.get("phases", {}).get("interview", {})
-    questions = interview.get("questions", [])
+    questions = history_store.load(history_store.history_endpoint(state), "questions", interview.get("questions", []))
     all_text = " ".join(str(q) for q in questions)
 
     # Look for environment variable patterns mentioned in interview
@@ -156,11 +162,13 @@ def check_test_production_alignment(state: dict, file_path: str, content: str =
             found_old = [p for p in old_patterns if p in content]
 
             if found_old and "AI_GATEWAY" not in content:
+                source = test_index.source_for(file_path)
                 issues.append(
                     f"⚠️ Gap 5 Warning: Test may be checking wrong environment variables.\n"
                     f"   Interview mentioned: gateway/single key pattern\n"
                     f"   Test checks: {found_old}\n"
-                    f"   Consider: Should test check AI_GATEWAY_API_KEY instead?"
+                    + (f"   Production file: {source}\n" if source else "")
+                    + f"   Consider: Should test check AI_GATEWAY_API_KEY instead?"
                 )
 
     return issues
@@ -169,7 +177,7 @@ def check_test_production_alignment(state: dict, file_path: str, content: str =
 def main():
     # Read hook input from stdin
     try:
-        input_data = json.load(sys.stdin)
+        input_data = hook_runtime.read_input()
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
@@ -192,7 +200,7 @@ def main():
         sys.exit(0)
 
     try:
-        state = json.loads(STATE_FILE.read_text())
+        state = state_store.load_state(STATE_FILE)
     except json.JSONDecodeError:
         print(json.dumps({"permissionDecision": "allow"}))
         sys.exit(0)
@@ -213,8 +221,10 @@ def main():
     # The user can review these in the state file
     if all_issues:
         # Store warnings in state for later review
-        state.setdefault("verification_warnings", []).extend(all_issues)
-        STATE_FILE.write_text(json.dumps(state, indent=2))
+        state_store.apply_ops(state, [
+            {"op": "append", "path": ["verification_warnings"], "value": issue}
+            for issue in all_issues
+        ], STATE_FILE)
 
     # Allow the operation - these are warnings, not blockers
     print(json.dumps({"permissionDecision": "allow"}))
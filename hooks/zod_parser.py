@@ -0,0 +1,672 @@
+"""
+Zod schema parser for generate-manifest-entry.py.
+
+generate-manifest-entry.py used to match `field: z.type(args)` with a single
+regex and then re-scan the rest of the line for .optional()/.min()/.describe().
+That missed nested z.object(), z.array(z.object(...)), unions, chains split
+over several lines and anything whose arguments contain a ")".
+
+This module tokenizes the schema file once and parses the Zod builder DSL with
+a small recursive-descent parser, producing JSON Schema directly:
+
+  z.object({...})        -> {"type": "object", "properties": {...}, "required": [...]}
+  z.array(T), T.array()  -> {"type": "array", "items": T}
+  z.enum([...])          -> {"type": "string", "enum": [...]}
+  z.union([...]), T.or() -> {"anyOf": [...]} (a union of literals becomes an enum)
+  .min()/.max()/...      -> minLength/maxLength, minItems/maxItems or minimum/maximum
+  .optional()/.default() -> field left out of "required"
+
+References to other `const` schemas in the same file (`api1: Api1Schema`,
+`BaseSchema.extend({...})`) are resolved. Calls the parser does not model
+(.refine(), .transform(), arrow functions, ...) are skipped without affecting
+the rest of the schema.
+
+Results are memoized by a hash of the file content, in memory and under
+.claude/cache/zod/, so re-running the documentation phase does not re-parse
+schemas that have not changed. The on-disk cache keeps one file per schema
+path (a changed schema replaces its entry) and at most MAX_CACHE_ENTRIES
+files, dropping the least recently written.
+
+Added in v3.11.0.
+"""
+import copy
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+CACHE_DIR = Path(__file__).parent.parent / "cache" / "zod"
+
+# Bump when the output format changes so stale cache entries are ignored
+PARSER_VERSION = "1"
+
+# Files kept under CACHE_DIR; the oldest are removed past this
+MAX_CACHE_ENTRIES = 200
+
+# Names that mark the request schema when a file exports several
+REQUEST_NAME_HINTS = ("Request", "Input", "Body", "Params", "Query")
+
+# content hash -> parsed schema
+_memo = {}
+
+_TOKEN_RE = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`)
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?n?)
+  | (?P<ident>[A-Za-z_$][\w$]*)
+  | (?P<punct>=>|\.\.\.|\?\.|[^\s\w])
+""", re.S | re.X)
+
+# A "/" after one of these starts a regex literal, not a division
+_REGEX_PREFIX = set("(,=:[!&|?{};") | {"=>", "return"}
+
+_OPEN = {"(": ")", "[": "]", "{": "}"}
+_CLOSE = set(_OPEN.values())
+
+_STRING_FORMATS = {
+    "email": "email",
+    "url": "uri",
+    "uuid": "uuid",
+    "cuid": "cuid",
+    "cuid2": "cuid2",
+    "ulid": "ulid",
+    "datetime": "date-time",
+    "date": "date",
+    "time": "time",
+    "ip": "ip",
+    "emoji": "emoji",
+}
+
+_JS_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0"}
+
+
+class _Skip:
+    """Argument the parser does not model (arrow function, `new X()`, ...)."""
+
+
+SKIP = _Skip()
+
+
+class ZodNode:
+    """A parsed Zod schema: its JSON Schema plus whether the field is optional."""
+
+    __slots__ = ("schema", "optional")
+
+    def __init__(self, schema: dict, optional: bool = False):
+        self.schema = schema
+        self.optional = optional
+
+    def copy(self) -> "ZodNode":
+        return ZodNode(copy.deepcopy(self.schema), self.optional)
+
+
+def tokenize(source: str) -> list:
+    """Split TypeScript source into (kind, value) tokens, dropping whitespace and comments."""
+    tokens = []
+    pos, end = 0, len(source)
+    while pos < end:
+        if source[pos] == "/" and (not tokens or tokens[-1][1] in _REGEX_PREFIX) \
+                and source[pos + 1:pos + 2] not in ("/", "*"):
+            literal, pos = _scan_regex(source, pos)
+            tokens.append(("regex", literal))
+            continue
+
+        match = _TOKEN_RE.match(source, pos)
+        if match is None:  # unterminated string or similar: drop one character
+            pos += 1
+            continue
+        pos = match.end()
+        kind = match.lastgroup
+        if kind in ("space", "comment"):
+            continue
+        tokens.append((kind, match.group()))
+    return tokens
+
+
+def _scan_regex(source: str, pos: int) -> tuple[str, int]:
+    """Scan a /pattern/flags literal starting at pos; returns (pattern, end)."""
+    i, in_class = pos + 1, False
+    while i < len(source) and source[i] != "\n":
+        ch = source[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "[":
+            in_class = True
+        elif ch == "]":
+            in_class = False
+        elif ch == "/" and not in_class:
+            pattern = source[pos + 1:i]
+            i += 1
+            while i < len(source) and (source[i].isalnum() or source[i] == "_"):
+                i += 1
+            return pattern, i
+        i += 1
+    return source[pos + 1:i], i
+
+
+def _unquote(literal: str) -> str:
+    body = literal[1:-1]
+    if "\\" not in body:
+        return body
+    out, i = [], 0
+    while i < len(body):
+        ch = body[i]
+        if ch == "\\" and i + 1 < len(body):
+            i += 1
+            out.append(_JS_ESCAPES.get(body[i], body[i]))
+        else:
+            out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def _number(literal: str):
+    literal = literal.rstrip("n")
+    try:
+        return int(literal)
+    except ValueError:
+        return float(literal)
+
+
+def _json_type(value) -> str:
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if value is None:
+        return "null"
+    return "string"
+
+
+def _object_schema(fields: dict) -> dict:
+    properties, required = {}, []
+    for name, value in fields.items():
+        if not isinstance(value, ZodNode):
+            continue
+        properties[name] = value.schema
+        if not value.optional:
+            required.append(name)
+    return {"type": "object", "properties": properties, "required": required}
+
+
+def _union_schema(options: list) -> dict:
+    schemas = [o.schema for o in options if isinstance(o, ZodNode)]
+    if schemas and all("const" in s for s in schemas):
+        types = {s.get("type") for s in schemas}
+        if len(types) == 1:
+            return {"type": types.pop(), "enum": [s["const"] for s in schemas]}
+    return {"anyOf": schemas}
+
+
+class _Parser:
+    def __init__(self, tokens: list):
+        self.tokens = tokens
+        self.pos = 0
+        self.declarations = {}
+
+    # -- token helpers ---------------------------------------------------
+
+    def peek(self, offset: int = 0) -> tuple:
+        i = self.pos + offset
+        return self.tokens[i] if i < len(self.tokens) else ("eof", "")
+
+    def next(self) -> tuple:
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def at(self, value: str, offset: int = 0) -> bool:
+        kind, text = self.peek(offset)
+        return text == value and kind in ("punct", "ident")
+
+    def accept(self, value: str) -> bool:
+        if self.at(value):
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, value: str) -> None:
+        if not self.accept(value):
+            raise ValueError(f"expected {value!r}, got {self.peek()[1]!r}")
+
+    def skip_balanced(self) -> None:
+        """Skip one bracketed group starting at the current token."""
+        depth = 0
+        while self.peek()[0] != "eof":
+            _, text = self.next()
+            if text in _OPEN:
+                depth += 1
+            elif text in _CLOSE:
+                depth -= 1
+                if depth <= 0:
+                    return
+
+    def skip_expression(self) -> None:
+        """Skip tokens up to the next ',' or closing bracket at this depth."""
+        while self.peek()[0] != "eof":
+            kind, text = self.peek()
+            if kind == "punct" and (text == "," or text in _CLOSE or text == ";"):
+                return
+            if kind == "punct" and text in _OPEN:
+                self.skip_balanced()
+            else:
+                self.pos += 1
+
+    def skip_type_arguments(self) -> None:
+        """Skip `<...>` after a callee, e.g. z.custom<File>()."""
+        if not self.at("<"):
+            return
+        depth = 0
+        while self.peek()[0] != "eof":
+            _, text = self.next()
+            if text == "<":
+                depth += 1
+            elif text == ">":
+                depth -= 1
+                if depth == 0:
+                    return
+
+    # -- declarations ----------------------------------------------------
+
+    def parse_module(self) -> None:
+        """Collect every top-level `const NAME = <zod expression>`."""
+        while self.peek()[0] != "eof":
+            kind, text = self.peek()
+            if kind == "ident" and text in ("const", "let", "var") and self.peek(1)[0] == "ident":
+                self.pos += 1
+                name = self.next()[1]
+                if self.at(":"):  # type annotation
+                    while self.peek()[0] != "eof" and not self.at("="):
+                        self.pos += 1
+                if self.accept("="):
+                    start = self.pos
+                    try:
+                        value = self.parse_value()
+                    except ValueError:
+                        self.pos = start + 1
+                        continue
+                    if isinstance(value, ZodNode):
+                        self.declarations[name] = value
+                continue
+            self.pos += 1
+
+    def first_object(self) -> Optional[ZodNode]:
+        """Parse the first z.object(...) in the file, wherever it appears."""
+        for i, (kind, text) in enumerate(self.tokens):
+            if text == "z" and self.tokens[i + 1:i + 3] == [("punct", "."), ("ident", "object")]:
+                self.pos = i
+                try:
+                    return self.parse_expression()
+                except ValueError:
+                    return None
+        return None
+
+    # -- expressions -----------------------------------------------------
+
+    def parse_value(self):
+        """Parse one argument / property value: a Zod expression or a JS literal."""
+        kind, text = self.peek()
+
+        if kind == "string":
+            self.pos += 1
+            return _unquote(text)
+        if kind == "number":
+            self.pos += 1
+            return _number(text)
+        if kind == "regex":
+            self.pos += 1
+            return text
+        if text == "-" and self.peek(1)[0] == "number":
+            self.pos += 2
+            return -_number(self.tokens[self.pos - 1][1])
+        if text == "{" and kind == "punct":
+            return self.parse_object_literal()
+        if text == "[" and kind == "punct":
+            return self.parse_array_literal()
+
+        if kind == "ident":
+            if text in ("true", "false"):
+                self.pos += 1
+                return text == "true"
+            if text in ("null", "undefined"):
+                self.pos += 1
+                return None
+            if self.at("=>", 1) or text in ("async", "function", "new"):
+                self.skip_expression()
+                return SKIP
+            return self.parse_expression()
+
+        if text == "(" and kind == "punct":
+            start = self.pos
+            self.skip_balanced()
+            if self.at("=>") or self.at(":"):  # arrow function, maybe with return type
+                self.skip_expression()
+                return SKIP
+            self.pos = start
+            return self.parse_expression()
+
+        self.skip_expression()
+        return SKIP
+
+    def parse_object_literal(self) -> dict:
+        self.expect("{")
+        fields = {}
+        while not self.accept("}"):
+            if self.peek()[0] == "eof":
+                raise ValueError("unterminated object literal")
+            if self.accept(","):
+                continue
+            kind, text = self.next()
+            if text == "...":
+                spread = self.parse_value()
+                if isinstance(spread, ZodNode):  # ...Other.shape
+                    fields.update(_fields_of(spread))
+                continue
+            if text == "[":  # computed key
+                self.pos -= 1
+                self.skip_balanced()
+                self.expect(":")
+                self.skip_expression()
+                continue
+            key = _unquote(text) if kind == "string" else text
+            if self.accept(":"):
+                fields[key] = self.parse_value()
+            elif self.at("("):  # method shorthand
+                self.skip_expression()
+            else:  # shorthand property: { NameSchema }
+                fields[key] = self.resolve(key)
+        return fields
+
+    def parse_array_literal(self) -> list:
+        self.expect("[")
+        items = []
+        while not self.accept("]"):
+            if self.peek()[0] == "eof":
+                raise ValueError("unterminated array literal")
+            if self.accept(","):
+                continue
+            items.append(self.parse_value())
+        self.accept("as")  # [...] as const
+        self.accept("const")
+        return items
+
+    def parse_args(self) -> list:
+        self.expect("(")
+        args = []
+        while not self.accept(")"):
+            if self.peek()[0] == "eof":
+                raise ValueError("unterminated argument list")
+            if self.accept(","):
+                continue
+            args.append(self.parse_value())
+        return args
+
+    def resolve(self, name: str):
+        node = self.declarations.get(name)
+        return node.copy() if node is not None else ZodNode({"type": "any"})
+
+    def parse_expression(self):
+        """Parse `z.builder(...)` or a schema reference, followed by a method chain."""
+        if self.accept("("):
+            node = self.parse_value()
+            self.expect(")")
+        else:
+            kind, text = self.next()
+            if kind != "ident":
+                raise ValueError(f"unexpected {text!r}")
+            if text == "z" and self.at("."):
+                self.expect(".")
+                name = self.next()[1]
+                if name == "coerce" and self.accept("."):
+                    name = self.next()[1]
+                self.skip_type_arguments()
+                args = self.parse_args() if self.at("(") else []
+                node = self.build(name, args)
+            else:
+                node = self.resolve(text)
+                self.skip_type_arguments()
+                if self.at("("):  # helper call: makeSchema(...)
+                    self.skip_balanced()
+
+        while self.at(".") or self.at("?."):
+            self.pos += 1
+            method = self.next()[1]
+            args = self.parse_args() if self.at("(") else None
+            if isinstance(node, ZodNode):
+                node = self.apply(node, method, args or [])
+            while self.at("["):  # .shape["field"]
+                self.skip_balanced()
+        return node
+
+    # -- builders and methods --------------------------------------------
+
+    def build(self, name: str, args: list) -> ZodNode:
+        arg = args[0] if args else None
+
+        if name in ("string", "number", "boolean"):
+            return ZodNode({"type": name})
+        if name == "bigint":
+            return ZodNode({"type": "integer"})
+        if name == "date":
+            return ZodNode({"type": "string", "format": "date-time"})
+        if name in ("null", "undefined", "void", "never"):
+            return ZodNode({"type": "null"})
+        if name == "literal":
+            return ZodNode({"type": _json_type(arg), "const": arg})
+        if name == "enum":
+            values = arg if isinstance(arg, list) else []
+            return ZodNode({"type": "string", "enum": [v for v in values if isinstance(v, str)]})
+        if name == "nativeEnum":
+            return ZodNode({"type": "string"})
+        if name == "object" and isinstance(arg, dict):
+            return ZodNode(_object_schema(arg))
+        if name == "object":
+            return ZodNode({"type": "object", "properties": {}, "required": []})
+        if name == "array":
+            items = arg.schema if isinstance(arg, ZodNode) else {"type": "any"}
+            return ZodNode({"type": "array", "items": items})
+        if name in ("set",):
+            items = arg.schema if isinstance(arg, ZodNode) else {"type": "any"}
+            return ZodNode({"type": "array", "items": items, "uniqueItems": True})
+        if name == "union" and isinstance(arg, list):
+            return ZodNode(_union_schema(arg))
+        if name == "discriminatedUnion" and len(args) > 1 and isinstance(args[1], list):
+            return ZodNode(_union_schema(args[1]))
+        if name == "intersection":
+            return ZodNode({"allOf": [a.schema for a in args if isinstance(a, ZodNode)]})
+        if name == "record":
+            value = args[-1] if args else None
+            items = value.schema if isinstance(value, ZodNode) else {"type": "any"}
+            return ZodNode({"type": "object", "additionalProperties": items})
+        if name == "tuple" and isinstance(arg, list):
+            items = [a.schema for a in arg if isinstance(a, ZodNode)]
+            return ZodNode({"type": "array", "prefixItems": items,
+                            "minItems": len(items), "maxItems": len(items)})
+        if name in ("optional", "nullable", "nullish") and isinstance(arg, ZodNode):
+            return self.apply(arg, name, [])
+        return ZodNode({"type": "any"})
+
+    def apply(self, node: ZodNode, method: str, args: list) -> ZodNode:
+        schema = node.schema
+        arg = args[0] if args else None
+        kind = schema.get("type")
+
+        if method == "optional":
+            node.optional = True
+        elif method == "nullable":
+            schema["nullable"] = True
+        elif method == "nullish":
+            node.optional = True
+            schema["nullable"] = True
+        elif method == "default":
+            if not isinstance(arg, _Skip) and not isinstance(arg, ZodNode):
+                schema["default"] = arg
+            node.optional = True
+        elif method == "describe" and isinstance(arg, str):
+            schema["description"] = arg
+
+        elif method in ("min", "max", "length", "nonempty"):
+            bound = 1 if method == "nonempty" else arg
+            if not isinstance(bound, (int, float)) or isinstance(bound, bool):
+                return node
+            if kind == "string":
+                keys = {"min": ["minLength"], "max": ["maxLength"],
+                        "length": ["minLength", "maxLength"], "nonempty": ["minLength"]}
+            elif kind == "array":
+                keys = {"min": ["minItems"], "max": ["maxItems"],
+                        "length": ["minItems", "maxItems"], "nonempty": ["minItems"]}
+            elif kind in ("number", "integer"):
+                keys = {"min": ["minimum"], "max": ["maximum"]}
+            else:
+                keys = {}
+            for key in keys.get(method, []):
+                schema[key] = bound
+        elif method in ("gte", "gt", "lte", "lt") and isinstance(arg, (int, float)):
+            key = {"gte": "minimum", "gt": "exclusiveMinimum",
+                   "lte": "maximum", "lt": "exclusiveMaximum"}[method]
+            schema[key] = arg
+        elif method == "positive":
+            schema["exclusiveMinimum"] = 0
+        elif method == "nonnegative":
+            schema["minimum"] = 0
+        elif method == "negative":
+            schema["exclusiveMaximum"] = 0
+        elif method == "nonpositive":
+            schema["maximum"] = 0
+        elif method == "int":
+            schema["type"] = "integer"
+        elif method == "multipleOf" or method == "step":
+            if isinstance(arg, (int, float)):
+                schema["multipleOf"] = arg
+        elif method in _STRING_FORMATS and kind == "string":
+            schema["format"] = _STRING_FORMATS[method]
+        elif method == "regex" and isinstance(arg, str):
+            schema["pattern"] = arg
+
+        elif method == "array":
+            return ZodNode({"type": "array", "items": schema})
+        elif method == "or" and isinstance(arg, ZodNode):
+            return ZodNode(_union_schema([node, arg]))
+        elif method == "and" and isinstance(arg, ZodNode):
+            return ZodNode({"allOf": [schema, arg.schema]})
+
+        elif method == "extend" and isinstance(arg, dict):
+            _merge_fields(schema, _object_schema(arg))
+        elif method == "merge" and isinstance(arg, ZodNode):
+            _merge_fields(schema, arg.schema)
+        elif method == "partial" and "properties" in schema:
+            names = arg.keys() if isinstance(arg, dict) else schema["properties"].keys()
+            schema["required"] = [n for n in schema.get("required", []) if n not in names]
+        elif method == "required" and "properties" in schema:
+            names = arg.keys() if isinstance(arg, dict) else schema["properties"].keys()
+            schema["required"] = list(dict.fromkeys(schema.get("required", []) + list(names)))
+        elif method in ("pick", "omit") and isinstance(arg, dict) and "properties" in schema:
+            keep = (lambda n: n in arg) if method == "pick" else (lambda n: n not in arg)
+            schema["properties"] = {n: p for n, p in schema["properties"].items() if keep(n)}
+            schema["required"] = [n for n in schema.get("required", []) if keep(n)]
+        elif method == "strict":
+            schema["additionalProperties"] = False
+        elif method == "catchall" and isinstance(arg, ZodNode):
+            schema["additionalProperties"] = arg.schema
+        elif method == "keyof" and "properties" in schema:
+            return ZodNode({"type": "string", "enum": list(schema["properties"])})
+        elif method == "element" and kind == "array":
+            return ZodNode(schema.get("items", {"type": "any"}))
+        elif method == "unwrap":
+            node.optional = False
+            schema.pop("nullable", None)
+
+        # refine, superRefine, transform, pipe, brand, catch, trim, ... leave
+        # the schema as it is
+        return node
+
+
+def _fields_of(node: ZodNode) -> dict:
+    required = set(node.schema.get("required", []))
+    return {name: ZodNode(prop, name not in required)
+            for name, prop in node.schema.get("properties", {}).items()}
+
+
+def _merge_fields(schema: dict, other: dict) -> None:
+    properties = schema.setdefault("properties", {})
+    required = [n for n in schema.get("required", []) if n not in other.get("properties", {})]
+    properties.update(other.get("properties", {}))
+    schema["required"] = required + [n for n in other.get("required", []) if n not in required]
+
+
+def _pick_request_schema(declarations: dict) -> Optional[ZodNode]:
+    objects = {name: node for name, node in declarations.items() if node.schema.get("type") == "object"}
+    for hint in REQUEST_NAME_HINTS:
+        for name, node in objects.items():
+            if hint in name:
+                return node
+    for name, node in objects.items():
+        if "Response" not in name:
+            return node
+    return next(iter(objects.values()), None)
+
+
+def _parse(content: str) -> dict:
+    parser = _Parser(tokenize(content))
+    parser.parse_module()
+    node = _pick_request_schema(parser.declarations) or parser.first_object()
+
+    schema = node.schema if node is not None else {}
+    if schema.get("type") != "object":
+        return {"type": "object", "properties": {}, "required": []}
+    schema.setdefault("properties", {})
+    schema.setdefault("required", [])
+    return schema
+
+
+def _cache_file(digest: str, source: Optional[str]) -> Path:
+    # Keyed by the schema's path when known, so a changed schema overwrites
+    # its previous entry instead of adding one per revision
+    key = hashlib.sha256(str(Path(source).resolve()).encode()).hexdigest() if source else digest
+    return CACHE_DIR / f"{key}.json"
+
+
+def _prune_cache():
+    try:
+        files = sorted(CACHE_DIR.glob("*.json"), key=lambda f: f.stat().st_mtime, reverse=True)
+        for stale in files[MAX_CACHE_ENTRIES:]:
+            stale.unlink()
+    except OSError:
+        pass  # another run pruned it first
+
+
+def parse_schema(content: str, source: Optional[str] = None) -> dict:
+    """Parse a Zod schema file and return the request schema as JSON Schema.
+
+    The request schema is the object schema whose name contains Request, Input,
+    Body, Params or Query; otherwise the first object schema that is not a
+    Response schema. Results are memoized by content hash (see module docstring);
+    source is the schema file's path, used as the on-disk cache key.
+    """
+    digest = hashlib.sha256(f"{PARSER_VERSION}\0{content}".encode()).hexdigest()
+    if digest in _memo:
+        return copy.deepcopy(_memo[digest])
+
+    cache_file = _cache_file(digest, source)
+    try:
+        cached = json.loads(cache_file.read_text())
+        if cached.get("digest") != digest:
+            raise ValueError("schema changed")
+        schema = cached["schema"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        schema = _parse(content)
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_name(f".{cache_file.stem}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"digest": digest, "schema": schema}))
+            tmp.replace(cache_file)
+            _prune_cache()
+        except OSError:
+            pass  # caching is best-effort
+
+    _memo[digest] = schema
+    return copy.deepcopy(schema)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark enforce-external-research.py prompt classification.
+
+Runs detect_technical_question() over a prompt corpus and compares it with
+the reference per-pattern implementation it replaced (every pattern run
+separately, matches re-run to extract them, re.findall per term). Reports
+the time per prompt size bucket and fails if any prompt classifies
+differently.
+
+Corpus:
+  - the user prompts from demo/*.json
+  - every slash command in commands/*.md (typical long pasted prompts)
+  - a ~50 KB prompt made of the README, and a ~50 KB single-line log paste
+  - any extra files given on the command line: .jsonl files contribute
+    every "prompt" field (e.g. exported UserPromptSubmit payloads), other
+    files are used as one prompt each
+
+Usage:
+  python3 scripts/benchmark-prompt-detection.py [--repeat N] [files...]
+"""
+import argparse
+import importlib.util
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HOOK = ROOT / "hooks" / "enforce-external-research.py"
+
+
+def load_hook():
+    sys.path.insert(0, str(HOOK.parent))
+    spec = importlib.util.spec_from_file_location("enforce_external_research", HOOK)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def reference_detect(hook, prompt: str) -> dict:
+    """The pattern-at-a-time classification, kept as the baseline."""
+    if hook.is_excluded(prompt):
+        return {"detected": False, "terms": [], "patterns_matched": [], "confidence": "none"}
+
+    prompt_lower = prompt.lower()
+    detected_terms = []
+    patterns_matched = []
+
+    for pattern in hook.ALWAYS_RESEARCH_PHRASES:
+        if re.search(pattern, prompt_lower, re.IGNORECASE):
+            patterns_matched.append("always_research")
+            match = re.search(pattern, prompt_lower, re.IGNORECASE)
+            if match:
+                detected_terms.append(match.group(0)[:50])
+
+    for pattern in hook.TECHNICAL_TERMS:
+        matches = re.findall(pattern, prompt_lower, re.IGNORECASE)
+        if matches:
+            detected_terms.extend(matches[:3])
+            patterns_matched.append("technical_term")
+
+    for pattern in hook.QUESTION_PATTERNS:
+        if re.search(pattern, prompt_lower, re.IGNORECASE):
+            patterns_matched.append("question_pattern")
+            break
+
+    detected_terms = list(dict.fromkeys(detected_terms))[:10]
+    patterns_matched = list(set(patterns_matched))
+
+    if "always_research" in patterns_matched:
+        confidence = "critical"
+    elif "technical_term" in patterns_matched:
+        confidence = "high"
+    elif "question_pattern" in patterns_matched and len(prompt) > 30:
+        confidence = "medium"
+    elif len(prompt) > 50:
+        confidence = "low"
+    else:
+        confidence = "none"
+
+    return {
+        "detected": confidence != "none",
+        "terms": detected_terms,
+        "patterns_matched": patterns_matched,
+        "confidence": confidence,
+    }
+
+
+def build_corpus(extra: list) -> list:
+    prompts = []
+    for demo in sorted((ROOT / "demo").glob("*.json")):
+        steps = json.loads(demo.read_text()).get("steps", [])
+        prompts.extend(s["content"] for s in steps if s.get("type") == "user" and s.get("content"))
+    prompts.extend(p.read_text() for p in sorted((ROOT / "commands").glob("*.md")))
+
+    readme = (ROOT / "README.md").read_text()
+    prompts.append((readme * (50_000 // len(readme) + 1))[:50_000])
+    log_line = "2025-01-01T00:00:00Z worker-3 can retry job 1234 after backoff; state=queued "
+    prompts.append((log_line * (50_000 // len(log_line) + 1))[:50_000])
+
+    for name in extra:
+        path = Path(name)
+        if path.suffix == ".jsonl":
+            for line in path.read_text().splitlines():
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(record, dict) and isinstance(record.get("prompt"), str):
+                    prompts.append(record["prompt"])
+        else:
+            prompts.append(path.read_text())
+    return prompts
+
+
+def bucket(size: int) -> str:
+    if size < 1_000:
+        return "< 1 KB"
+    if size < 10_000:
+        return "1-10 KB"
+    return ">= 10 KB"
+
+
+def time_it(fn, prompt: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(prompt)
+    return (time.perf_counter() - start) / repeat
+
+
+def normalized(result: dict) -> dict:
+    # patterns_matched comes from a set, so its order is arbitrary
+    return {**result, "patterns_matched": sorted(result["patterns_matched"])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="extra prompt files (.jsonl or plain text)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per prompt (default 3)")
+    options = parser.parse_args()
+
+    hook = load_hook()
+    prompts = build_corpus(options.files)
+
+    mismatches = 0
+    totals = {}
+    for prompt in prompts:
+        if normalized(hook.detect_technical_question(prompt)) != normalized(reference_detect(hook, prompt)):
+            mismatches += 1
+            print(f"MISMATCH: {prompt[:80]!r}", file=sys.stderr)
+
+        old = time_it(lambda p: reference_detect(hook, p), prompt, options.repeat)
+        new = time_it(hook.detect_technical_question, prompt, options.repeat)
+        row = totals.setdefault(bucket(len(prompt)), [0, 0.0, 0.0, 0.0])
+        row[0] += 1
+        row[1] += old
+        row[2] += new
+        row[3] = max(row[3], old / new if new else 0.0)
+
+    print(f"{len(prompts)} prompts, {options.repeat} runs each\n")
+    print(f"{'size':<10}{'prompts':>8}{'reference ms':>15}{'compiled ms':>14}{'speedup':>10}{'max':>8}")
+    for name in ("< 1 KB", "1-10 KB", ">= 10 KB"):
+        if name not in totals:
+            continue
+        count, old, new, best = totals[name]
+        print(f"{name:<10}{count:>8}{old / count * 1000:>15.3f}{new / count * 1000:>14.3f}"
+              f"{old / new if new else 0:>9.1f}x{best:>7.1f}x")
+
+    if mismatches:
+        print(f"\n{mismatches} prompt(s) classified differently", file=sys.stderr)
+        sys.exit(1)
+    print("\nAll prompts classified identically.")
+
+
+if __name__ == "__main__":
+    main()
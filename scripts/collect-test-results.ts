@@ -8,10 +8,21 @@
  * IMPORTANT: This is 100% programmatic - NO LLM involvement.
  * Tests are executed and results are collected automatically.
  *
+ * With a filter, only the matching test files are run and their suites are
+ * merged into the existing results file: the project-wide summary and the
+ * manifest's lastTestRun still cover every test file collected so far.
+ *
+ * Usage: collect-test-results.ts [baseDir] [filter] [outputPath] [--file PATH ...]
+ *
+ * --file passes one test file to Vitest as its own argument (repeatable), so
+ * paths with spaces or brackets (Next.js [param] directories) reach Vitest
+ * unchanged; the positional filter is a space-separated list of patterns.
+ * Vitest is started without a shell either way.
+ *
  * @generated by @hustle-together/api-dev-tools v3.0
  */
 
-import { execSync, spawn } from 'child_process';
+import { execFileSync } from 'child_process';
 import fs from 'fs';
 import path from 'path';
 
@@ -212,20 +223,60 @@ function parseVitestConsole(output: string): CollectedResults {
 }
 
 // ============================================
-// Test Runner
+// Filtered Runs
 // ============================================
 
-function runVitest(baseDir: string, filter?: string): CollectedResults {
-  console.log('🧪 Running Vitest...');
+function summarize(suites: TestSuiteResult[]): CollectedResults['summary'] {
+  const passed = suites.reduce((n, s) => n + s.passed, 0);
+  const failed = suites.reduce((n, s) => n + s.failed, 0);
+  const skipped = suites.reduce((n, s) => n + s.skipped, 0);
+  return {
+    totalSuites: suites.length,
+    totalTests: passed + failed + skipped,
+    passed,
+    failed,
+    skipped,
+    duration: suites.reduce((n, s) => n + s.duration, 0),
+    success: failed === 0
+  };
+}
 
-  const vitestArgs = ['vitest', 'run', '--reporter=json'];
-  if (filter) {
-    vitestArgs.push(filter);
+/**
+ * Merge a filtered run into the previous results: rerun suites replace
+ * their earlier entries, all other suites are kept
+ */
+function mergeResults(outputPath: string, baseDir: string, results: CollectedResults): CollectedResults {
+  let previous: CollectedResults;
+  try {
+    previous = JSON.parse(fs.readFileSync(outputPath, 'utf-8'));
+  } catch {
+    return results;
+  }
+  if (!Array.isArray(previous.suites)) {
+    return results;
   }
 
+  // The JSON reporter reports absolute paths, the console fallback relative ones
+  const key = (file: string) => path.relative(baseDir, path.resolve(baseDir, file));
+  const rerun = new Set(results.suites.map((suite) => key(suite.file)));
+  const suites = [
+    ...previous.suites.filter((suite) => !rerun.has(key(suite.file))),
+    ...results.suites
+  ];
+
+  return { ...results, suites, summary: summarize(suites) };
+}
+
+// ============================================
+// Test Runner
+// ============================================
+
+function runVitest(baseDir: string, filters: string[] = []): CollectedResults {
+  console.log('🧪 Running Vitest...');
+
   try {
     // Try running with JSON reporter
-    const result = execSync(`npx ${vitestArgs.join(' ')}`, {
+    const result = execFileSync('npx', ['vitest', 'run', '--reporter=json', ...filters], {
       cwd: baseDir,
       encoding: 'utf-8',
       stdio: ['pipe', 'pipe', 'pipe'],
@@ -250,7 +301,7 @@ function runVitest(baseDir: string, filter?: string): CollectedResults {
     console.log('   ⚠️  JSON reporter failed, trying console output...');
 
     try {
-      const consoleResult = execSync(`npx vitest run ${filter || ''}`, {
+      const consoleResult = execFileSync('npx', ['vitest', 'run', ...filters], {
         cwd: baseDir,
         encoding: 'utf-8',
         stdio: ['pipe', 'pipe', 'pipe']
@@ -318,10 +369,24 @@ function updateManifest(manifestPath: string, results: CollectedResults): void {
 // CLI Entry Point
 // ============================================
 
+function parseArgs(argv: string[]): { positional: string[]; files: string[] } {
+  const positional: string[] = [];
+  const files: string[] = [];
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === '--file' && i + 1 < argv.length) {
+      files.push(argv[++i]);
+    } else {
+      positional.push(argv[i]);
+    }
+  }
+  return { positional, files };
+}
+
 function main() {
-  const args = process.argv.slice(2);
+  const { positional: args, files } = parseArgs(process.argv.slice(2));
   const baseDir = args[0] || process.cwd();
-  const filter = args[1] || undefined;
+  const filters = [...(args[1] || '').split(/\s+/).filter(Boolean), ...files];
+  const filter = filters.length > 0 ? filters.join(' ') : undefined;
   const outputPath = args[2] || path.join(baseDir, 'src', 'app', 'api-test', 'test-results.json');
   const manifestPath = path.join(baseDir, 'src', 'app', 'api-test', 'api-tests-manifest.json');
 
@@ -336,7 +401,7 @@ function main() {
   console.log(`📄 Output file: ${outputPath}\n`);
 
   try {
-    const results = runVitest(baseDir, filter);
+    const results = runVitest(baseDir, filters);
 
     // Ensure output directory exists
     const outputDir = path.dirname(outputPath);
@@ -344,11 +409,15 @@ function main() {
       fs.mkdirSync(outputDir, { recursive: true });
     }
 
-    // Write results
-    fs.writeFileSync(outputPath, JSON.stringify(results, null, 2));
+    // Write results (a filtered run updates only the suites it reran)
+    const collected = filter ? mergeResults(outputPath, baseDir, results) : results;
+    fs.writeFileSync(outputPath, JSON.stringify(collected, null, 2));
 
     // Update manifest with results
-    updateManifest(manifestPath, results);
+    updateManifest(manifestPath, collected);
+    if (filter) {
+      console.log(`   ✅ Merged ${results.suites.length} rerun suite(s) into ${collected.summary.totalSuites} collected`);
+    }
 
     console.log('\n═══════════════════════════════════════════════════════════════');
     if (results.summary.success) {
@@ -14,6 +14,9 @@
  *
  * IMPORTANT: This is 100% programmatic - NO LLM involvement.
  *
+ * verify-after-green.py runs the Python port in hooks/manifest_scripts.py
+ * instead of this script. Keep the two in sync (output must stay byte-identical).
+ *
  * @generated by @hustle-together/api-dev-tools v3.0
  */
 
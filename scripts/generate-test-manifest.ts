@@ -11,6 +11,9 @@
  * IMPORTANT: This is 100% programmatic - NO LLM involvement.
  * Tests are the SOURCE OF TRUTH.
  *
+ * verify-after-green.py runs the Python port in hooks/manifest_scripts.py
+ * instead of this script. Keep the two in sync (output must stay byte-identical).
+ *
  * @generated by @hustle-together/api-dev-tools v3.0
  */
 
@@ -0,0 +1,281 @@
+/**
+ * Dependency-graph orchestrator for combined API routes
+ *
+ * Runs a combined endpoint's source API calls as a graph instead of a chain:
+ * each call starts as soon as the calls it depends on have finished, so
+ * independent calls run concurrently and the request takes about as long as
+ * its slowest dependency chain (the critical path), not the sum of all calls.
+ *
+ * The graph comes from the /hustle-combine interview (combine_config):
+ *   - dependsOn:      which calls need another call's result
+ *   - timeoutMs:      per-call timeout; the call's AbortSignal fires on expiry
+ *   - maxConcurrency: upper bound on calls in flight
+ *   - errorStrategy:  fail-fast - the first failure aborts every call in flight
+ *                     partial   - failed calls and everything depending on
+ *                                 them are skipped, the rest still run
+ *                     retry     - each failed call is retried once, then fail-fast
+ *
+ * runFlow() returns per-call timings plus totalMs and criticalPathMs, which
+ * the route passes back in meta so tests can check the calls overlapped.
+ *
+ * @generated by @hustle-together/api-dev-tools v3.11.0
+ */
+
+// ============================================
+// Types
+// ============================================
+
+export type ErrorStrategy = 'fail-fast' | 'partial' | 'retry';
+
+export interface FlowCall {
+  /** Source API calls whose results this call needs */
+  dependsOn?: string[];
+  /** Milliseconds before the call is aborted (default: options.defaultTimeoutMs) */
+  timeoutMs?: number;
+  /** Receives the results of its dependencies; must honor the signal */
+  run: (deps: Record<string, unknown>, signal: AbortSignal) => Promise<unknown>;
+}
+
+export interface FlowOptions {
+  errorStrategy: ErrorStrategy;
+  maxConcurrency?: number;
+  defaultTimeoutMs?: number;
+}
+
+export interface CallTiming {
+  startMs: number;
+  durationMs: number;
+}
+
+export interface FlowResult {
+  results: Record<string, unknown>;
+  errors: Record<string, string>;
+  skipped: string[];
+  timings: Record<string, CallTiming>;
+  totalMs: number;
+  criticalPathMs: number;
+}
+
+/**
+ * Thrown by runFlow() under fail-fast; carries what finished before the failure
+ */
+export class FlowError extends Error {
+  constructor(
+    public readonly call: string,
+    public readonly error: unknown,
+    public readonly partial: FlowResult
+  ) {
+    super(`${call} failed: ${error instanceof Error ? error.message : String(error)}`);
+    this.name = 'FlowError';
+  }
+}
+
+export class CallTimeoutError extends Error {
+  constructor(call: string, timeoutMs: number) {
+    super(`${call} timed out after ${timeoutMs}ms`);
+    this.name = 'CallTimeoutError';
+  }
+}
+
+// ============================================
+// Graph
+// ============================================
+
+/**
+ * Check a flow's calls before running them: unknown dependencies and cycles throw
+ */
+export function defineFlow<T extends Record<string, FlowCall>>(calls: T): T {
+  const names = Object.keys(calls);
+  for (const name of names) {
+    for (const dep of calls[name].dependsOn ?? []) {
+      if (!(dep in calls)) {
+        throw new Error(`Flow call "${name}" depends on unknown call "${dep}"`);
+      }
+    }
+  }
+
+  const visiting = new Set<string>();
+  const visited = new Set<string>();
+  const visit = (name: string) => {
+    if (visited.has(name)) return;
+    if (visiting.has(name)) {
+      throw new Error(`Flow has a dependency cycle through "${name}"`);
+    }
+    visiting.add(name);
+    for (const dep of calls[name].dependsOn ?? []) visit(dep);
+    visiting.delete(name);
+    visited.add(name);
+  };
+  names.forEach(visit);
+
+  return calls;
+}
+
+/**
+ * Longest chain of measured durations through the graph
+ */
+function criticalPath(calls: Record<string, FlowCall>, timings: Record<string, CallTiming>): number {
+  const finish = new Map<string, number>();
+  const end = (name: string): number => {
+    if (!finish.has(name)) {
+      const deps = calls[name].dependsOn ?? [];
+      const start = Math.max(0, ...deps.map(end));
+      finish.set(name, start + (timings[name]?.durationMs ?? 0));
+    }
+    return finish.get(name)!;
+  };
+  return Math.max(0, ...Object.keys(calls).map(end));
+}
+
+// ============================================
+// Execution
+// ============================================
+
+function withTimeout<T>(
+  name: string,
+  timeoutMs: number,
+  flowSignal: AbortSignal,
+  run: (signal: AbortSignal) => Promise<T>
+): Promise<T> {
+  const controller = new AbortController();
+  const abort = () => controller.abort(flowSignal.reason);
+  flowSignal.addEventListener('abort', abort, { once: true });
+
+  let timer: ReturnType<typeof setTimeout> | undefined;
+  const timeout = new Promise<never>((_, reject) => {
+    timer = setTimeout(() => {
+      const error = new CallTimeoutError(name, timeoutMs);
+      controller.abort(error);
+      reject(error);
+    }, timeoutMs);
+  });
+
+  // The race also covers calls that ignore their signal
+  return Promise.race([run(controller.signal), timeout]).finally(() => {
+    clearTimeout(timer);
+    flowSignal.removeEventListener('abort', abort);
+  });
+}
+
+/**
+ * Run every call of the flow, each as soon as its dependencies are done
+ */
+export async function runFlow(
+  calls: Record<string, FlowCall>,
+  options: FlowOptions
+): Promise<FlowResult> {
+  const names = Object.keys(calls);
+  const maxConcurrency = Math.max(1, options.maxConcurrency ?? names.length);
+  const defaultTimeoutMs = options.defaultTimeoutMs ?? 10000;
+  const attempts = options.errorStrategy === 'retry' ? 2 : 1;
+
+  const controller = new AbortController();
+  const started = performance.now();
+  const result: FlowResult = {
+    results: {},
+    errors: {},
+    skipped: [],
+    timings: {},
+    totalMs: 0,
+    criticalPathMs: 0,
+  };
+
+  const waiting = new Set(names);
+  const failed = new Set<string>();
+  let running = 0;
+
+  return new Promise<FlowResult>((resolve, reject) => {
+    let settled = false;
+
+    const finish = () => {
+      result.totalMs = Math.round(performance.now() - started);
+      result.criticalPathMs = Math.round(criticalPath(calls, result.timings));
+    };
+
+    const fail = (name: string, error: unknown) => {
+      settled = true;
+      controller.abort(error);
+      finish();
+      reject(new FlowError(name, error, result));
+    };
+
+    const start = (name: string) => {
+      const call = calls[name];
+      const deps = Object.fromEntries((call.dependsOn ?? []).map((d) => [d, result.results[d]]));
+      const timeoutMs = call.timeoutMs ?? defaultTimeoutMs;
+      const callStart = performance.now();
+      waiting.delete(name);
+      running++;
+
+      const attempt = async () => {
+        for (let i = 1; ; i++) {
+          try {
+            return await withTimeout(name, timeoutMs, controller.signal, (signal) => call.run(deps, signal));
+          } catch (error) {
+            if (i >= attempts || controller.signal.aborted) throw error;
+          }
+        }
+      };
+
+      const record = () => {
+        result.timings[name] = {
+          startMs: Math.round(callStart - started),
+          durationMs: Math.round(performance.now() - callStart),
+        };
+      };
+
+      attempt()
+        .then(
+          (value) => {
+            record();
+            result.results[name] = value;
+          },
+          (error) => {
+            record();
+            if (settled) return;
+            if (options.errorStrategy !== 'partial') {
+              fail(name, error);
+              return;
+            }
+            failed.add(name);
+            result.errors[name] = error instanceof Error ? error.message : String(error);
+          }
+        )
+        .finally(() => {
+          running--;
+          if (!settled) schedule();
+        });
+    };
+
+    const schedule = () => {
+      // partial: anything that needs a failed or skipped call is skipped too
+      let changed = true;
+      while (changed) {
+        changed = false;
+        for (const name of waiting) {
+          if ((calls[name].dependsOn ?? []).some((d) => failed.has(d))) {
+            waiting.delete(name);
+            failed.add(name);
+            result.skipped.push(name);
+            changed = true;
+          }
+        }
+      }
+
+      for (const name of [...waiting]) {
+        if (running >= maxConcurrency) break;
+        if ((calls[name].dependsOn ?? []).every((d) => d in result.results)) {
+          start(name);
+        }
+      }
+
+      if (running === 0 && !settled) {
+        settled = true;
+        finish();
+        resolve(result);
+      }
+    };
+
+    schedule();
+  });
+}
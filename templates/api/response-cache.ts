@@ -0,0 +1,199 @@
+/**
+ * Response cache for generated API routes
+ *
+ * Wraps a route's upstream call so repeated requests with the same validated
+ * input are answered without calling the upstream API again.
+ *
+ * Strategies (the cache_strategy decision of the /hustle-api-create interview):
+ *   - lru:       in-memory LRU with a TTL, per server instance
+ *   - swr:       lru + stale-while-revalidate: an expired entry is still
+ *                served for staleSeconds while one background call refreshes it
+ *   - next-tags: Next.js data cache (unstable_cache) with revalidate + tags,
+ *                shared by all instances; invalidate with revalidateTag(name)
+ *   - none:      every request calls the upstream API
+ *
+ * The key is the Zod-parsed input (defaults applied, unknown keys stripped)
+ * serialized with sorted keys, so equivalent requests share one entry.
+ * Concurrent misses on the same key share one upstream call, and failed
+ * calls are never cached.
+ *
+ * Routes report the outcome in an X-Cache header (HIT, MISS, STALE or
+ * BYPASS). A request with "Cache-Control: no-cache" skips the lookup and
+ * refreshes the entry.
+ *
+ * @generated by @hustle-together/api-dev-tools v3.11.0
+ */
+
+import { unstable_cache } from 'next/cache';
+
+// ============================================
+// Types
+// ============================================
+
+export type CacheStrategy = 'lru' | 'swr' | 'next-tags' | 'none';
+
+export type CacheStatus = 'HIT' | 'MISS' | 'STALE' | 'BYPASS';
+
+export interface ResponseCacheOptions {
+  strategy: CacheStrategy;
+  /** Seconds an entry is served as fresh */
+  ttlSeconds: number;
+  /** swr: seconds an expired entry is still served while it is refreshed */
+  staleSeconds?: number;
+  /** lru/swr: entries kept before the least recently used one is dropped */
+  maxEntries?: number;
+  /** next-tags: extra tags for revalidateTag() (the cache name is always a tag) */
+  tags?: string[];
+}
+
+export interface CachedResult<T> {
+  value: T;
+  status: CacheStatus;
+}
+
+export interface ResponseCache<I, T> {
+  get(input: I, load: () => Promise<T>, options?: { bypass?: boolean }): Promise<CachedResult<T>>;
+  delete(input: I): void;
+  clear(): void;
+}
+
+interface Entry<T> {
+  value: T;
+  freshUntil: number;
+  staleUntil: number;
+}
+
+// ============================================
+// Keys
+// ============================================
+
+function stable(value: unknown): string {
+  if (Array.isArray(value)) {
+    return `[${value.map(stable).join(',')}]`;
+  }
+  if (value !== null && typeof value === 'object' && !(value instanceof Date)) {
+    const record = value as Record<string, unknown>;
+    const fields = Object.keys(record)
+      .filter((key) => record[key] !== undefined)
+      .sort()
+      .map((key) => `${JSON.stringify(key)}:${stable(record[key])}`);
+    return `{${fields.join(',')}}`;
+  }
+  return JSON.stringify(value) ?? 'null';
+}
+
+/**
+ * Cache key for a validated input: key order and undefined fields do not matter
+ */
+export function cacheKey(input: unknown): string {
+  return stable(input);
+}
+
+/**
+ * True if the client asked for a fresh response (Cache-Control/Pragma: no-cache)
+ */
+export function wantsFresh(request: Request): boolean {
+  const cacheControl = request.headers.get('cache-control') || '';
+  const pragma = request.headers.get('pragma') || '';
+  return /no-cache|no-store|max-age=0/i.test(cacheControl) || /no-cache/i.test(pragma);
+}
+
+// ============================================
+// Cache
+// ============================================
+
+/**
+ * Create the cache for one route; call once at module level
+ */
+export function createResponseCache<I, T>(
+  name: string,
+  options: ResponseCacheOptions
+): ResponseCache<I, T> {
+  const ttlMs = options.ttlSeconds * 1000;
+  const staleMs = options.strategy === 'swr' ? (options.staleSeconds ?? options.ttlSeconds) * 1000 : 0;
+  const maxEntries = options.maxEntries ?? 500;
+
+  // Map iteration order is insertion order: the first key is the least recently used
+  const entries = new Map<string, Entry<T>>();
+  const pending = new Map<string, Promise<T>>();
+
+  function remember(key: string, value: T) {
+    const now = Date.now();
+    entries.delete(key);
+    entries.set(key, { value, freshUntil: now + ttlMs, staleUntil: now + ttlMs + staleMs });
+    while (entries.size > maxEntries) {
+      entries.delete(entries.keys().next().value as string);
+    }
+  }
+
+  // One upstream call per key at a time; only successful results are stored
+  function refresh(key: string, load: () => Promise<T>): Promise<T> {
+    let call = pending.get(key);
+    if (!call) {
+      call = load()
+        .then((value) => {
+          remember(key, value);
+          return value;
+        })
+        .finally(() => pending.delete(key));
+      pending.set(key, call);
+    }
+    return call;
+  }
+
+  async function getNext(key: string, load: () => Promise<T>, bypass: boolean): Promise<CachedResult<T>> {
+    if (bypass) {
+      return { value: await load(), status: 'BYPASS' };
+    }
+    let loaded = false;
+    const cached = unstable_cache(
+      async () => {
+        loaded = true;
+        return load();
+      },
+      [name, key],
+      { revalidate: options.ttlSeconds, tags: [name, ...(options.tags ?? [])] }
+    );
+    const value = await cached();
+    return { value, status: loaded ? 'MISS' : 'HIT' };
+  }
+
+  return {
+    async get(input, load, { bypass = false } = {}) {
+      if (options.strategy === 'none') {
+        return { value: await load(), status: 'BYPASS' };
+      }
+
+      const key = cacheKey(input);
+      if (options.strategy === 'next-tags') {
+        return getNext(key, load, bypass);
+      }
+
+      const entry = bypass ? undefined : entries.get(key);
+      const now = Date.now();
+
+      if (entry && now < entry.freshUntil) {
+        // Refresh recency
+        entries.delete(key);
+        entries.set(key, entry);
+        return { value: entry.value, status: 'HIT' };
+      }
+
+      if (entry && now < entry.staleUntil) {
+        // Serve the stale value; a failed refresh keeps it until staleUntil
+        refresh(key, load).catch(() => undefined);
+        return { value: entry.value, status: 'STALE' };
+      }
+
+      return { value: await refresh(key, load), status: 'MISS' };
+    },
+
+    delete(input) {
+      entries.delete(cacheKey(input));
+    },
+
+    clear() {
+      entries.clear();
+    },
+  };
+}
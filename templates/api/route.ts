@@ -0,0 +1,93 @@
+/**
+ * __API_NAME__ API
+ *
+ * __API_DESCRIPTION__
+ *
+ * Validates the request with __API_NAME__RequestSchema, then answers from the
+ * response cache (keyed by the validated input) or calls the upstream API.
+ * The X-Cache response header reports HIT, MISS, STALE or BYPASS.
+ *
+ * @generated by @hustle-together/api-dev-tools v3.11.0
+ */
+
+import { NextRequest, NextResponse } from 'next/server';
+import {
+  __API_NAME__RequestSchema,
+  type __API_NAME__Request,
+} from '@/lib/schemas/__ENDPOINT_NAME__';
+import { createResponseCache, wantsFresh } from '@/lib/response-cache';
+
+// ============================================
+// Cache (cache_strategy interview decision)
+// ============================================
+
+const cache = createResponseCache<__API_NAME__Request, unknown>('__ENDPOINT_NAME__', {
+  strategy: '__CACHE_STRATEGY__',
+  ttlSeconds: __CACHE_TTL_SECONDS__,
+  staleSeconds: __CACHE_STALE_SECONDS__,
+  maxEntries: 500,
+});
+
+// ============================================
+// Upstream
+// ============================================
+
+/**
+ * Call the upstream API. Throws on failure so the error is not cached.
+ */
+async function callUpstream(input: __API_NAME__Request): Promise<unknown> {
+  const response = await fetch('__UPSTREAM_URL__', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(input),
+  });
+
+  if (!response.ok) {
+    throw new Error(`Upstream request failed: ${response.status}`);
+  }
+
+  return response.json();
+}
+
+// ============================================
+// API Handler
+// ============================================
+
+export async function POST(request: NextRequest) {
+  let body: unknown;
+  try {
+    body = await request.json();
+  } catch {
+    return NextResponse.json(
+      { success: false, error: 'Request body must be JSON' },
+      { status: 400 }
+    );
+  }
+
+  const parsed = __API_NAME__RequestSchema.safeParse(body);
+  if (!parsed.success) {
+    return NextResponse.json(
+      { success: false, error: 'Invalid request', details: parsed.error.flatten() },
+      { status: 400 }
+    );
+  }
+
+  try {
+    const { value, status } = await cache.get(
+      parsed.data,
+      () => callUpstream(parsed.data),
+      { bypass: wantsFresh(request) }
+    );
+
+    return NextResponse.json(
+      { success: true, data: value },
+      { headers: { 'X-Cache': status } }
+    );
+  } catch (error) {
+    console.error('__API_NAME__ upstream error:', error);
+    return NextResponse.json(
+      { success: false, error: 'Upstream request failed', details: String(error) },
+      { status: 502 }
+    );
+  }
+}
@@ -0,0 +1,189 @@
+/**
+ * Performance harness for component tests
+ *
+ * Measures what .claude/performance-budgets.json promises, so the budgets
+ * are TDD gates instead of comments:
+ *   - renders: commits of the component's subtree, counted by a React
+ *     <Profiler> onRender callback (mount, prop change, interaction)
+ *   - memory:  heap retained by a mounted instance (component_max_mb) and
+ *     heap left behind by repeated mount/unmount cycles
+ *     (heap_growth_max_mb), from heap usage after a forced garbage
+ *     collection in the jsdom test process
+ *
+ * The budget file is read when the tests run, so changing a threshold does
+ * not require regenerating the tests. A failing check reports the measured
+ * value and the budget it exceeded.
+ *
+ * Copy to src/test/performance-harness.tsx (once per project).
+ *
+ * @generated by @hustle-together/api-dev-tools v3.11.0
+ */
+
+import fs from 'fs';
+import path from 'path';
+import vm from 'vm';
+import v8 from 'v8';
+import { Profiler, type ProfilerOnRenderCallback, type ReactElement } from 'react';
+import { cleanup, render, type RenderResult } from '@testing-library/react';
+
+// ============================================
+// Budgets
+// ============================================
+
+export interface ComponentBudgets {
+  renders: {
+    mount_max: number;
+    prop_change_max: number;
+    state_change_max: number;
+  };
+  memory: {
+    component_max_mb: number;
+    heap_growth_max_mb: number;
+  };
+}
+
+/** Used for any value missing from performance-budgets.json */
+const DEFAULT_BUDGETS: ComponentBudgets = {
+  renders: { mount_max: 1, prop_change_max: 1, state_change_max: 1 },
+  memory: { component_max_mb: 10, heap_growth_max_mb: 5 },
+};
+
+/**
+ * .claude/performance-budgets.json of the nearest directory above the test
+ * run (PERFORMANCE_BUDGETS overrides the path)
+ */
+export function findBudgetFile(start: string = process.cwd()): string | undefined {
+  if (process.env.PERFORMANCE_BUDGETS) {
+    return process.env.PERFORMANCE_BUDGETS;
+  }
+  for (let dir = path.resolve(start); ; dir = path.dirname(dir)) {
+    const candidate = path.join(dir, '.claude', 'performance-budgets.json');
+    if (fs.existsSync(candidate)) return candidate;
+    if (path.dirname(dir) === dir) return undefined;
+  }
+}
+
+export function loadBudgets(file: string | undefined = findBudgetFile()): ComponentBudgets {
+  const budgets = file ? JSON.parse(fs.readFileSync(file, 'utf-8')) : {};
+  return {
+    renders: { ...DEFAULT_BUDGETS.renders, ...budgets.renders },
+    memory: { ...DEFAULT_BUDGETS.memory, ...budgets.memory },
+  };
+}
+
+/**
+ * Fail with the measured value and the budget it exceeded
+ */
+export function expectWithinBudget(label: string, measured: number, budget: number, key: string): void {
+  if (measured > budget) {
+    throw new Error(
+      `${label}: measured ${Number(measured.toFixed(2))}, budget ${key} = ${budget} ` +
+        '(.claude/performance-budgets.json)'
+    );
+  }
+}
+
+// ============================================
+// Render counts
+// ============================================
+
+export interface RenderProfile {
+  /** Commits of the component's subtree by phase since the last reset() */
+  counts: { mount: number; update: number };
+  /** Summed actualDuration of those commits, in ms */
+  durationMs: number;
+  result: RenderResult;
+  rerender(ui: ReactElement): void;
+  reset(): void;
+}
+
+/**
+ * Render ui inside a Profiler and count its commits
+ */
+export function profileRenders(ui: ReactElement, id = 'component'): RenderProfile {
+  const profile = {
+    counts: { mount: 0, update: 0 },
+    durationMs: 0,
+  } as RenderProfile;
+
+  const onRender: ProfilerOnRenderCallback = (_id, phase, actualDuration) => {
+    // 'nested-update' (an update scheduled during commit) counts as an update
+    profile.counts[phase === 'mount' ? 'mount' : 'update']++;
+    profile.durationMs += actualDuration;
+  };
+  const wrap = (element: ReactElement) => (
+    <Profiler id={id} onRender={onRender}>
+      {element}
+    </Profiler>
+  );
+
+  profile.result = render(wrap(ui));
+  profile.rerender = (element) => profile.result.rerender(wrap(element));
+  profile.reset = () => {
+    profile.counts = { mount: 0, update: 0 };
+    profile.durationMs = 0;
+  };
+  return profile;
+}
+
+// ============================================
+// Heap
+// ============================================
+
+const MB = 1024 * 1024;
+
+let collect: (() => void) | undefined;
+
+/**
+ * Force a full garbage collection; works without node --expose-gc
+ */
+export function gc(): void {
+  if (!collect) {
+    const exposed = (globalThis as { gc?: () => void }).gc;
+    if (exposed) {
+      collect = exposed;
+    } else {
+      v8.setFlagsFromString('--expose-gc');
+      collect = vm.runInNewContext('gc') as () => void;
+    }
+  }
+  // Twice: the first pass can leave objects with finalizers behind
+  collect();
+  collect();
+}
+
+function heapUsedMb(): number {
+  gc();
+  return process.memoryUsage().heapUsed / MB;
+}
+
+/**
+ * Heap retained while one instance of ui is mounted, in MB
+ */
+export function measureMountedHeap(ui: () => ReactElement): number {
+  cleanup();
+  const before = heapUsedMb();
+  const { unmount } = render(ui());
+  const mounted = heapUsedMb() - before;
+  unmount();
+  return Math.max(0, mounted);
+}
+
+/**
+ * Heap left behind after mounting and unmounting ui repeatedly, in MB
+ *
+ * A warm-up cycle runs first so module-level caches (styles, memoized
+ * class names) are not counted as growth.
+ */
+export function measureHeapGrowth(ui: () => ReactElement, cycles = 50): number {
+  cleanup();
+  render(ui());
+  cleanup();
+  const before = heapUsedMb();
+  for (let i = 0; i < cycles; i++) {
+    // cleanup() also removes the container render() appended to the body
+    render(ui());
+    cleanup();
+  }
+  return Math.max(0, heapUsedMb() - before);
+}